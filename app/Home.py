@@ -1,13 +1,16 @@
 import streamlit as st
 from dotenv import load_dotenv
 
+from app.state import current_store
+from src.export import EXPORT_FORMATS, export_zip, iter_sessions
 from src.models import ReportSession
-from src.storage import list_sessions, save_session
 
 load_dotenv()
 
 st.set_page_config(page_title="Healthcare Report Assistant", layout="wide")
 
+store = current_store()
+
 st.title("Healthcare Report Assistant")
 st.markdown(
     "Upload your glucose monitoring PDF, review and correct the data, "
@@ -34,11 +37,11 @@ if submitted and session_name:
     else:
         session = ReportSession.create_new(
             name=session_name,
-            date_range_start=str(date_start),
-            date_range_end=str(date_end),
+            date_range_start=date_start,
+            date_range_end=date_end,
             selected_dates=[],
         )
-        save_session(session)
+        store.save(session)
         st.session_state["current_session_id"] = session.id
         st.session_state["_session_created"] = session_name
         st.rerun()
@@ -51,7 +54,7 @@ st.divider()
 # --- Existing Sessions ---
 st.subheader("Existing Sessions")
 
-sessions = list_sessions()
+sessions = store.list()
 if sessions:
     for s in sessions:
         col1, col2, col3 = st.columns([3, 2, 1])
@@ -64,3 +67,32 @@ if sessions:
             st.markdown(f":{status_color}[{s['status']}]")
 else:
     st.info("No sessions yet. Create one above to get started.")
+
+# --- Export ---
+if sessions:
+    st.divider()
+    st.subheader("Export Data")
+    starts = [s["date_range_start"] for s in sessions if s["date_range_start"]]
+    ends = [s["date_range_end"] for s in sessions if s["date_range_end"]]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        export_format = st.selectbox("Format", EXPORT_FORMATS)
+    with col2:
+        export_from = st.date_input("From", value=min(starts, default=None), key="export_from")
+    with col3:
+        export_to = st.date_input("To", value=max(ends, default=None), key="export_to")
+    export_start = export_from or None
+    export_end = export_to or None
+    # Built only when clicked, one session at a time (callable data needs streamlit 1.52)
+    st.download_button(
+        "Download entries (zip)",
+        data=lambda: export_zip(
+            iter_sessions(store.base_dir, export_start, export_end),
+            export_format,
+            start=export_start,
+            end=export_end,
+        ),
+        file_name=f"healthcare-export-{export_format}.zip",
+        mime="application/zip",
+        on_click="ignore",
+    )
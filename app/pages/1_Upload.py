@@ -1,14 +1,19 @@
-from pathlib import Path, PurePosixPath
+from pathlib import PurePosixPath
 
 import streamlit as st
 
-from src.pdf_parser import filter_by_dates, parse_pdf
-from src.storage import load_session, save_session
+from app.state import current_store, parse_cache, upload_handle
+from src.mapped_io import stream_to_file
+from src.pdf_parser import dates_between, filter_by_dates, parse_pdf
+from src.pipeline import default_selected_dates
+from src.session_merge import merge_parse_result
 
 st.set_page_config(page_title="Upload Glucose PDF", layout="wide")
 
 st.title("Upload Glucose PDF")
 
+store = current_store()
+
 # --- Session guard ---
 if "current_session_id" not in st.session_state:
     st.warning("No active session. Please create one on the Home page first.")
@@ -16,7 +21,7 @@ if "current_session_id" not in st.session_state:
 
 session_id = st.session_state["current_session_id"]
 try:
-    session = load_session(session_id)
+    session = store.load(session_id)
 except FileNotFoundError:
     st.error("Session file not found. Please return to the Home page and create a new session.")
     st.stop()
@@ -27,39 +32,41 @@ st.info(f"Session: **{session.name}**")
 uploaded_file = st.file_uploader("Upload your Dexcom Clarity PDF", type=["pdf"])
 
 if uploaded_file is not None:
-    # Save uploaded file to data/uploads/
-    uploads_dir = Path("data/uploads")
-    uploads_dir.mkdir(parents=True, exist_ok=True)
+    # Save uploaded file to the user's uploads directory
     safe_name = PurePosixPath(uploaded_file.name).name
-    pdf_path = uploads_dir / safe_name
-    pdf_path.write_bytes(uploaded_file.getvalue())
-
-    # Parse PDF (cache result to avoid re-parsing on rerun)
-    current_filename = uploaded_file.name
-    if (
-        st.session_state.get("_upload_filename") != current_filename
-        or "_upload_parse_result" not in st.session_state
-    ):
+    pdf_path = store.uploads_dir / safe_name
+    # Stream to disk in chunks rather than copying the whole upload with getvalue()
+    uploaded_file.seek(0)
+    stream_to_file(uploaded_file, pdf_path)
+
+    # The parse lives in the shared, budgeted cache under a handle derived from
+    # the upload, and is rebuilt from the saved upload if it was evicted
+    cache = parse_cache()
+    handle = upload_handle(pdf_path)
+    result = cache.get(handle)
+    if result is None:
         with st.spinner("Parsing PDF..."):
             result = parse_pdf(pdf_path)
-        st.session_state["_upload_parse_result"] = result
-        st.session_state["_upload_filename"] = current_filename
-    else:
-        result = st.session_state["_upload_parse_result"]
+        cache.put(handle, st.session_state["user_id"], result)
 
     # --- Parse summary ---
     st.subheader("Parse Summary")
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4, col5 = st.columns(5)
     with col1:
         st.metric("Meal Entries", len(result.glucose_entries))
     with col2:
         st.metric("Exercise Entries", len(result.exercise_entries))
     with col3:
+        st.metric("Insulin Entries", len(result.insulin_entries))
+    with col4:
+        st.metric("Notes", len(result.note_entries))
+    with col5:
         st.metric("Days Found", len(result.available_dates))
 
     if result.available_dates:
         st.caption(
             f"Date range: {result.available_dates[0]} to {result.available_dates[-1]}"
+            f" • continuous glucose trace for {len(result.cgm_traces)} days"
         )
 
     # --- Warnings ---
@@ -70,13 +77,18 @@ if uploaded_file is not None:
 
     # --- Date selection ---
     st.subheader("Select Dates for Report")
-    # Default to last 5 dates (most recent, excluding the very last which may be today/incomplete)
+    # Default to last 5 dates, skipping the most recent (potentially incomplete)
     available = result.available_dates
-    if len(available) > 5:
-        # Skip the most recent (potentially incomplete), take the 5 before it
-        default_dates = available[-6:-1]
-    else:
-        default_dates = available
+    default_dates = default_selected_dates(available)
+
+    # The range slider sets the selection; the multiselect refines it
+    if len(available) > 1 and default_dates:
+        range_start, range_end = st.select_slider(
+            "Date range",
+            options=available,
+            value=(default_dates[0], default_dates[-1]),
+        )
+        default_dates = dates_between(result, range_start, range_end)
 
     selected_dates = st.multiselect(
         "Choose which dates to include in your report",
@@ -90,18 +102,18 @@ if uploaded_file is not None:
             f"Selected: {len(filtered.glucose_entries)} meals, "
             f"{len(filtered.exercise_entries)} exercises across {len(selected_dates)} days"
         )
+        if session.glucose_entries or session.exercise_entries:
+            _, diff = merge_parse_result(session, result, selected_dates)
+            st.info(
+                f"Merging into this session's existing data: {diff.summary()}. "
+                "Your corrections on existing entries are kept."
+            )
 
     # --- Confirm and continue ---
     st.divider()
     if st.button("Confirm and Continue", type="primary", disabled=not selected_dates):
-        filtered = filter_by_dates(result, selected_dates)
-        session.glucose_entries = filtered.glucose_entries
-        session.exercise_entries = filtered.exercise_entries
-        session.selected_dates = sorted(selected_dates)
-        session.source_filename = current_filename
-        if selected_dates:
-            session.date_range_start = sorted(selected_dates)[0]
-            session.date_range_end = sorted(selected_dates)[-1]
-        save_session(session)
+        session, _ = merge_parse_result(session, result, selected_dates)
+        session.source_filename = safe_name
+        store.save(session)
         st.success("Data saved! Navigating to Review page...")
         st.switch_page("pages/2_Review_Data.py")
@@ -1,13 +1,16 @@
-import pandas as pd
 import streamlit as st
 
-from src.models import GlucoseEntry, MealType
-from src.storage import load_session, save_session
+from app.state import current_store
+from src.cgm_trace import chart_series
+from src.models import MealType
+from src.postprandial import DEFAULT_WINDOW_MINUTES, food_responses, meal_responses
 
 st.set_page_config(page_title="Review & Correct Data", layout="wide")
 
 st.title("Review & Correct Data")
 
+store = current_store()
+
 # --- Session guard ---
 if "current_session_id" not in st.session_state:
     st.warning("No active session. Please create one on the Home page first.")
@@ -15,7 +18,7 @@ if "current_session_id" not in st.session_state:
 
 session_id = st.session_state["current_session_id"]
 try:
-    session = load_session(session_id)
+    session = store.load(session_id)
 except FileNotFoundError:
     st.error("Session file not found. Please return to the Home page and create a new session.")
     st.stop()
@@ -27,13 +30,18 @@ if not session.glucose_entries:
     st.info("No glucose data found. Please upload a PDF on the Upload page first.")
     st.stop()
 
+# --- Continuous glucose trace ---
+if session.cgm_traces:
+    st.subheader("Continuous Glucose")
+    st.line_chart(chart_series(session.cgm_traces), x="time", y="mg/dL")
+
 # --- Glucose entries table ---
 st.subheader(f"Glucose Entries ({len(session.glucose_entries)})")
 
-# Build DataFrame from entries
+# Rows are plain dicts; Streamlit loads its dataframe backend only when rendering
 glucose_data = [
     {
-        "date": e.date,
+        "date": e.date.isoformat(),
         "time": e.time,
         "food_item": e.food_item,
         "meal_type": e.meal_type.value,
@@ -41,12 +49,10 @@ glucose_data = [
     }
     for e in session.glucose_entries
 ]
-df = pd.DataFrame(glucose_data)
-
 meal_type_options = [mt.value for mt in MealType]
 
-edited_df = st.data_editor(
-    df,
+edited_rows = st.data_editor(
+    glucose_data,
     column_config={
         "date": st.column_config.TextColumn("Date", disabled=True),
         "time": st.column_config.TextColumn("Time", disabled=True),
@@ -62,7 +68,7 @@ edited_df = st.data_editor(
             max_value=600,
         ),
     },
-    use_container_width=True,
+    width="stretch",
     num_rows="fixed",
     key="glucose_editor",
 )
@@ -81,7 +87,46 @@ if session.exercise_entries:
         }
         for e in session.exercise_entries
     ]
-    st.dataframe(pd.DataFrame(exercise_data), use_container_width=True)
+    st.dataframe(exercise_data, width="stretch")
+
+# --- Postprandial responses ---
+responses = meal_responses(session)
+foods = food_responses(responses)
+if foods:
+    st.subheader("Meal Responses")
+    st.caption(
+        f"Glucose peak within {DEFAULT_WINDOW_MINUTES} minutes after each meal, "
+        "from exercise, insulin and note readings and the continuous trace."
+    )
+    st.dataframe(
+        [
+            {
+                "food item": f.food_item,
+                "meals": f.meals,
+                "mean rise (mg/dL)": f.mean_delta,
+                "max rise (mg/dL)": f.max_delta,
+                "mean time to peak (min)": f.mean_minutes_to_peak,
+            }
+            for f in foods
+        ],
+        width="stretch",
+    )
+    with st.expander("Per meal"):
+        st.dataframe(
+            [
+                {
+                    "date": r.date,
+                    "time": r.time,
+                    "food item": r.food_item,
+                    "at meal (mg/dL)": r.baseline,
+                    "peak (mg/dL)": r.peak,
+                    "rise (mg/dL)": r.delta,
+                    "time to peak (min)": r.minutes_to_peak,
+                }
+                for r in responses if r.readings
+            ],
+            width="stretch",
+        )
 
 # --- Save corrections ---
 st.divider()
@@ -90,25 +135,24 @@ col1, col2 = st.columns(2)
 with col1:
     if st.button("Save Corrections", type="primary"):
         try:
-            updated_entries = []
-            for _, row in edited_df.iterrows():
-                entry = GlucoseEntry(
-                    date=str(row["date"]),
-                    time=str(row["time"]),
+            # Rows are fixed, so each row is the entry at the same position;
+            # corrected() records what the user changed for later re-uploads
+            session.glucose_entries = [
+                entry.corrected(
                     glucose_reading=int(row["glucose_reading"]),
                     food_item=str(row["food_item"]),
                     meal_type=MealType(str(row["meal_type"])),
                 )
-                updated_entries.append(entry)
-            session.glucose_entries = updated_entries
-            save_session(session)
+                for entry, row in zip(session.glucose_entries, edited_rows)
+            ]
+            store.save(session)
             st.success("Corrections saved!")
         except Exception as e:
             st.error(f"Validation error: {e}")
 
 with col2:
     if st.button("Continue to Mood Entry"):
-        if not df.equals(edited_df):
+        if edited_rows != glucose_data:
             st.warning("You have unsaved changes. Please click 'Save Corrections' first.")
         else:
             st.switch_page("pages/3_Mood_Entry.py")
@@ -1,7 +1,67 @@
 import streamlit as st
 
+from app.state import current_store
+from src.chat_context import build_context
+from src.llm_client import ChatClient, client_from_env
+
+SYSTEM_PROMPT = (
+    "You are a helpful assistant for a patient preparing a glucose and mood "
+    "report for their healthcare advisor. Answer general health and nutrition "
+    "questions clearly and concisely. You are not a doctor; recommend "
+    "consulting the advisor for medical decisions."
+)
+
 st.set_page_config(page_title="AI Chat", layout="wide")
 
 st.title("AI Chat")
-st.info("This page will provide an AI chat agent for general health Q&A.")
-st.markdown("**Coming in Phase 4.**")
+
+
+@st.cache_resource
+def get_chat_client() -> ChatClient:
+    """One client per server process so the cache and concurrency limit are shared."""
+    return client_from_env()
+
+
+client = get_chat_client()
+
+session = None
+if "current_session_id" in st.session_state:
+    try:
+        session = current_store().load(st.session_state["current_session_id"])
+    except FileNotFoundError:
+        session = None
+
+include_session = False
+if session is not None:
+    include_session = st.toggle(f"Include data from session **{session.name}**", value=True)
+
+if "chat_messages" not in st.session_state:
+    st.session_state["chat_messages"] = []
+
+for message in st.session_state["chat_messages"]:
+    with st.chat_message(message["role"]):
+        st.markdown(message["content"])
+
+if prompt := st.chat_input("Ask a health or nutrition question"):
+    st.session_state["chat_messages"].append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    if include_session and session is not None:
+        context = build_context(session, question=prompt)
+        messages.append({"role": "system", "content": f"The patient's data:\n{context}"})
+    messages.extend(st.session_state["chat_messages"])
+
+    with st.chat_message("assistant"):
+        try:
+            reply = st.write_stream(client.stream_chat(messages))
+        except Exception as e:
+            st.error(f"Chat request failed: {e}")
+            st.stop()
+
+    st.session_state["chat_messages"].append({"role": "assistant", "content": str(reply)})
+
+if st.session_state["chat_messages"] and st.button("Clear conversation"):
+    st.session_state["chat_messages"] = []
+    st.rerun()
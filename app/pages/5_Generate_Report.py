@@ -1,7 +1,97 @@
 import streamlit as st
 
+from app.state import current_store
+from src.pdf_generator import build_report_days, report_filename
+from src.report_queue import render_reports
+
 st.set_page_config(page_title="Generate Report", layout="wide")
 
 st.title("Generate Report")
-st.info("This page will combine all data and generate the final PDF report.")
-st.markdown("**Coming in Phase 3.**")
+
+store = current_store()
+
+# --- Session guard ---
+if "current_session_id" not in st.session_state:
+    st.warning("No active session. Please create one on the Home page first.")
+    st.stop()
+
+session_id = st.session_state["current_session_id"]
+try:
+    session = store.load(session_id)
+except FileNotFoundError:
+    st.error("Session file not found. Please return to the Home page and create a new session.")
+    st.stop()
+
+st.info(f"Session: **{session.name}** ({session.date_range_start} to {session.date_range_end})")
+
+if not session.glucose_entries and not session.mood_entries:
+    st.info("No data to report yet. Please upload a PDF on the Upload page first.")
+    st.stop()
+
+# --- Preview ---
+st.subheader("Preview")
+for day in build_report_days(session):
+    st.markdown(f"**{day.title}**")
+    st.dataframe(
+        [
+            dict(zip(["Event", "Time", "Details", "Energy", "Mood"], row))
+            for row in day.rows
+        ],
+        width="stretch",
+        hide_index=True,
+    )
+
+# --- Generate ---
+st.divider()
+if st.button("Generate PDF", type="primary"):
+    with st.spinner("Generating report..."):
+        (outcome,) = render_reports([(store, session.id)])
+    if outcome.path is None:
+        st.error(f"Could not generate the report: {outcome.detail}")
+    else:
+        st.session_state["_report_path"] = str(outcome.path)
+
+report_path = st.session_state.get("_report_path")
+if report_path and report_path.endswith(report_filename(session)):
+    with open(report_path, "rb") as f:
+        st.download_button(
+            "Download Report",
+            data=f,
+            file_name=report_filename(session),
+            mime="application/pdf",
+        )
+
+# --- Several sessions ---
+st.divider()
+st.subheader("Reports for several sessions")
+summaries = store.list()
+labels = {
+    s["id"]: f"{s['name']} ({s['date_range_start']} to {s['date_range_end']}, {s['id'][:8]})"
+    for s in summaries
+}
+chosen = st.multiselect(
+    "Sessions", options=list(labels), format_func=labels.__getitem__,
+)
+if st.button("Generate selected reports", disabled=not chosen):
+    bar = st.progress(0.0, text="Rendering reports...")
+
+    def show_progress(outcome, done: int, total: int) -> None:
+        bar.progress(done / total, text=f"{done}/{total}: {outcome.summary()}")
+
+    st.session_state["_batch_outcomes"] = render_reports(
+        [(store, session_id) for session_id in chosen], progress=show_progress
+    )
+
+for outcome in st.session_state.get("_batch_outcomes", []):
+    if outcome.path is not None and outcome.path.exists():
+        with open(outcome.path, "rb") as f:
+            st.download_button(
+                f"Download {labels.get(outcome.session_id, outcome.session_id)}",
+                data=f,
+                file_name=outcome.path.name,
+                mime="application/pdf",
+                key=f"download_{outcome.session_id}",
+            )
+    else:
+        st.warning(f"{labels.get(outcome.session_id, outcome.session_id)}: "
+                   f"{outcome.action} ({outcome.detail})")
@@ -0,0 +1,81 @@
+import streamlit as st
+
+from app.state import current_store
+from src.postprandial import DEFAULT_WINDOW_MINUTES, responses_across_sessions
+
+st.set_page_config(page_title="Food Search", layout="wide")
+
+st.title("Food Search")
+st.markdown("Search every saved session for a food and see the glucose readings after it.")
+
+query = st.text_input("Food", placeholder="e.g., granola, pasta, wine")
+
+if query:
+    store = current_store()
+    hits = store.search_foods(query)
+    if not hits:
+        st.info("No matching food entries found.")
+        st.stop()
+
+    # Over every match, not just the best-ranked page of hits listed below
+    stats = store.food_search_stats(query)
+    if stats is not None:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Matches", stats.matches)
+        with col2:
+            st.metric("Average Glucose", f"{stats.mean_glucose:.0f} mg/dL")
+        with col3:
+            st.metric("Range", f"{stats.min_glucose}-{stats.max_glucose} mg/dL")
+
+    if stats is not None and stats.matches > len(hits):
+        st.caption(f"Showing the {len(hits)} best matches.")
+
+    st.dataframe(
+        [
+            {
+                "date": h.record.date,
+                "time": h.record.time,
+                "food_item": h.record.food_item,
+                "meal_type": h.record.meal_type,
+                "glucose (mg/dL)": h.record.glucose_reading,
+            }
+            for h in hits
+        ],
+        width="stretch",
+    )
+
+    # --- Glucose response after the matching meals ---
+    # Overlapping uploads repeat meals; responses_across_sessions counts each once
+    sessions = []
+    for session_id in dict.fromkeys(h.record.session_id for h in hits):
+        try:
+            sessions.append(store.load(session_id))
+        except FileNotFoundError:
+            continue
+    matched = {(h.record.date, h.record.time, h.record.food_item) for h in hits}
+    responses = [
+        r for r in responses_across_sessions(sessions)
+        if (r.date, r.time, r.food_item) in matched and r.readings
+    ]
+    if responses:
+        st.subheader("Glucose Response")
+        st.caption(
+            f"Glucose peak within {DEFAULT_WINDOW_MINUTES} minutes after each matching meal, "
+            f"across {len(sessions)} session(s)."
+        )
+        st.dataframe(
+            [
+                {
+                    "date": r.date,
+                    "time": r.time,
+                    "food item": r.food_item,
+                    "at meal (mg/dL)": r.baseline,
+                    "peak (mg/dL)": r.peak,
+                    "rise (mg/dL)": r.delta,
+                    "time to peak (min)": r.minutes_to_peak,
+                }
+                for r in responses
+            ],
+            width="stretch",
+        )
@@ -0,0 +1,44 @@
+import hashlib
+from pathlib import Path
+
+import streamlit as st
+
+from src.state_cache import ParseCache, budget_from_env
+from src.tenants import SessionStore, store_for_user, user_id_from_env
+
+
+def resolve_user_id() -> str:
+    """The signed-in user's e-mail when Streamlit auth is configured.
+
+    Falls back to HEALTHCARE_USER_ID, then the default single-user tenant.
+    """
+    user = st.user
+    if user.get("is_logged_in"):
+        return str(user.get("email") or user.get("sub"))
+    return user_id_from_env()
+
+
+@st.cache_resource
+def _store_for(user_id: str) -> SessionStore:
+    """One store handle per user, shared by every page and rerun."""
+    return store_for_user(user_id)
+
+
+def current_store() -> SessionStore:
+    """The current user's store; the user is resolved once per browser session."""
+    if "user_id" not in st.session_state:
+        st.session_state["user_id"] = resolve_user_id()
+    return _store_for(st.session_state["user_id"])
+
+
+@st.cache_resource
+def parse_cache() -> ParseCache:
+    """The process-wide parse cache every user and tab shares."""
+    return ParseCache(budget_bytes=budget_from_env())
+
+
+def upload_handle(pdf_path: Path) -> str:
+    """This tab's handle for an upload, keyed by the file's content."""
+    with pdf_path.open("rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    return ParseCache.handle(st.session_state["user_id"], digest)
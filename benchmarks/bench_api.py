@@ -0,0 +1,122 @@
+"""Measure HTTP API throughput with an in-process client.
+
+Drives src.api.ApiApp through httpx's ASGI transport, so no server or
+socket is involved: what is timed is routing, the bounded executor,
+storage and streaming. Each scenario runs --requests requests with
+--concurrency in flight and checks every response. Run from the
+repository root:
+
+    python -m benchmarks.bench_api [--requests 200] [--concurrency 16] [--days 365]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+import httpx
+
+from benchmarks.bench_session_format import synthetic_session
+from benchmarks.load_test import SAMPLE_PDF, percentile
+from src.api import ApiApp
+from src.models import ReportSession
+
+Request = Callable[[httpx.AsyncClient, int], Awaitable[None]]
+
+
+async def _scenario(
+    client: httpx.AsyncClient, request: Request, count: int, concurrency: int
+) -> tuple[float, list[float]]:
+    """Wall time and per-request latencies of count requests."""
+    latencies: list[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await request(client, i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(count)))
+    return time.perf_counter() - start, latencies
+
+
+def _expect(response: httpx.Response, status: int) -> httpx.Response:
+    if response.status_code != status:
+        raise SystemExit(f"{response.request.method} {response.request.url.path}: "
+                         f"{response.status_code} {response.text[:200]}")
+    return response
+
+
+async def run(args: argparse.Namespace, tmp: Path) -> None:
+    app = ApiApp(
+        root=tmp / "sessions", uploads_root=tmp / "uploads", reports_root=tmp / "reports",
+        workers=args.workers, max_pending=max(args.concurrency, 32),
+    )
+    big = synthetic_session(args.days)
+    small = synthetic_session(7)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://api") as client:
+        for session in (big, small):
+            _expect(await client.post(
+                "/sessions", content=session.model_dump_json(),
+                headers={"Content-Type": "application/json"},
+            ), 201)
+
+        async def get_big(client: httpx.AsyncClient, i: int) -> None:
+            response = _expect(await client.get(f"/sessions/{big.id}"), 200)
+            if i == 0 and ReportSession.model_validate_json(response.content) != big:
+                raise SystemExit("streamed session differs from the saved one")
+
+        async def get_small(client: httpx.AsyncClient, i: int) -> None:
+            _expect(await client.get(f"/sessions/{small.id}"), 200)
+
+        async def list_sessions(client: httpx.AsyncClient, i: int) -> None:
+            _expect(await client.get("/sessions"), 200)
+
+        async def put_small(client: httpx.AsyncClient, i: int) -> None:
+            _expect(await client.put(
+                f"/sessions/{small.id}", content=small.model_dump_json()
+            ), 200)
+
+        pdf = SAMPLE_PDF.read_bytes()
+
+        async def parse(client: httpx.AsyncClient, i: int) -> None:
+            _expect(await client.post("/parse", content=pdf), 200)
+
+        scenarios: list[tuple[str, Request, int]] = [
+            (f"GET session ({args.days} days)", get_big, args.requests),
+            ("GET session (7 days)", get_small, args.requests),
+            ("GET /sessions", list_sessions, args.requests),
+            ("PUT session (7 days)", put_small, args.requests),
+            ("POST /parse", parse, args.parse_requests),
+        ]
+        print(f"{args.concurrency} in flight, {args.workers} executor threads")
+        print(f"{'scenario':<28}{'requests':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}")
+        for label, request, count in scenarios:
+            wall, latencies = await _scenario(client, request, count, args.concurrency)
+            print(f"{label:<28}{count:>9}{count / wall:>9.1f}"
+                  f"{percentile(latencies, 50) * 1000:>9.1f}"
+                  f"{percentile(latencies, 95) * 1000:>9.1f}")
+    app.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--parse-requests", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(args, Path(tmp)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Time the date-heavy loops over a long session with typed dates.
+
+Builds a synthetic --days session and times loading it, then the loops
+that sort, group and range-filter entries by day, against the same loop
+reparsing ISO date strings as the models used to require. Run from the
+repository root:
+
+    python -m benchmarks.bench_dates [--days 365] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import defaultdict
+from datetime import date, timedelta
+
+from benchmarks.bench_session_format import _time, synthetic_session
+from src.cgm_trace import MINUTES_PER_DAY
+from src.history_index import time_to_minute
+from src.models import ReportSession
+from src.pdf_generator import build_report_days
+from src.postprandial import build_timeline
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    session = synthetic_session(args.days)
+    content = session.model_dump_json()
+    entries = session.glucose_entries
+    iso = [e.date.isoformat() for e in entries]
+    start = session.date_range_start + timedelta(days=args.days // 2)
+    end = start + timedelta(days=30)
+    start_iso, end_iso = start.isoformat(), end.isoformat()
+
+    def sort_native() -> object:
+        return sorted(entries, key=lambda e: (
+            e.date.toordinal() * MINUTES_PER_DAY + time_to_minute(e.time)
+        ))
+
+    def sort_reparse() -> object:
+        return sorted(range(len(entries)), key=lambda i: (
+            date.fromisoformat(iso[i]).toordinal() * MINUTES_PER_DAY
+            + time_to_minute(entries[i].time)
+        ))
+
+    def group_by_weekday(days: list) -> object:
+        groups: dict[int, list[int]] = defaultdict(list)
+        for d, e in zip(days, entries):
+            weekday = d.weekday() if isinstance(d, date) else date.fromisoformat(d).weekday()
+            groups[weekday].append(e.glucose_reading)
+        return groups
+
+    rows = [
+        ("load session JSON", lambda: ReportSession.model_validate_json(content), None),
+        ("sort by time", sort_native, sort_reparse),
+        ("group by weekday", lambda: group_by_weekday([e.date for e in entries]),
+         lambda: group_by_weekday(iso)),
+        ("filter 30 days", lambda: [e for e in entries if start <= e.date <= end],
+         lambda: [d for d in iso
+                  if date.fromisoformat(start_iso) <= date.fromisoformat(d)
+                  <= date.fromisoformat(end_iso)]),
+        ("report days", lambda: build_report_days(session), None),
+        ("glucose timeline", lambda: build_timeline(session), None),
+    ]
+
+    print(f"{args.days} days, {len(entries)} meals, best of {args.repeat}")
+    print(f"{'step':<22}{'native ms':>11}{'reparse ms':>12}")
+    for name, native, reparse in rows:
+        native_ms = _time(native, args.repeat)
+        reparse_col = f"{_time(reparse, args.repeat):>12.2f}" if reparse else f"{'-':>12}"
+        print(f"{name:<22}{native_ms:>11.2f}{reparse_col}")
+
+
+if __name__ == "__main__":
+    main()
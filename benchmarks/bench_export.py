@@ -0,0 +1,54 @@
+"""Time exporting years of sessions to CSV, Parquet and Arrow.
+
+Saves --sessions synthetic year-long sessions, then exports them in each
+format, reporting rows per second, output MB per second and the peak
+Python memory traced during the export. The peak should stay flat as
+--sessions grows. Run from the repository root:
+
+    python -m benchmarks.bench_export [--sessions 10] [--days 365]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_session_format import synthetic_session
+from src.export import EXPORT_FORMATS, export_sessions, iter_sessions
+from src.storage import save_session
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--binary", action="store_true", help="save sessions in binary format")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp) / "sessions"
+        for _ in range(args.sessions):
+            save_session(synthetic_session(args.days), base_dir, binary=args.binary)
+        stored = sum(p.stat().st_size for p in base_dir.iterdir()) / 2**20
+        print(f"{args.sessions} sessions of {args.days} days, {stored:.1f} MiB stored")
+        print(f"{'format':<10}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'MiB/s':>8}"
+              f"{'peak MiB':>10}")
+        for fmt in EXPORT_FORMATS:
+            out_dir = Path(tmp) / fmt
+            tracemalloc.start()
+            start = time.perf_counter()
+            result = export_sessions(iter_sessions(base_dir), out_dir, fmt)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            rows = sum(result.rows.values())
+            written = sum(p.stat().st_size for p in result.paths.values()) / 2**20
+            print(f"{fmt:<10}{rows:>10,}{elapsed:>10.2f}{rows / elapsed:>12,.0f}"
+                  f"{written / elapsed:>8.1f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
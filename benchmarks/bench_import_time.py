@@ -0,0 +1,105 @@
+"""Measure cold import time of the src modules with `python -X importtime`.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import_time [--top 15] [module ...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pkgutil
+import subprocess
+import sys
+from dataclasses import dataclass
+
+import src
+
+# Loaded only on the code paths that need them (parsing, rendering, chat)
+HEAVY_MODULES = ("pdfplumber", "pandas", "reportlab", "litellm", "streamlit")
+
+# Cumulative import budget for any single src module, in milliseconds
+IMPORT_BUDGET_MS = 1000.0
+
+
+@dataclass(frozen=True)
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> list[ImportTiming]:
+    """Parse `-X importtime` output into one timing per imported module.
+
+    Lines look like ``import time:   self |  cumulative | <indent>module``;
+    the header line and any other stderr output are skipped.
+    """
+    timings = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        if not self_us.strip().isdigit():
+            continue
+        stripped = name.lstrip(" ")
+        timings.append(ImportTiming(
+            module=stripped,
+            self_us=int(self_us),
+            cumulative_us=int(cumulative_us),
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return timings
+
+
+def src_modules() -> list[str]:
+    return sorted(f"src.{m.name}" for m in pkgutil.iter_modules(src.__path__))
+
+
+def measure_imports(modules: list[str]) -> list[ImportTiming]:
+    """Import modules in a fresh interpreter and return its import timings."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+    return parse_importtime(proc.stderr)
+
+
+def cold_start_ms(module: str) -> tuple[float, list[str]]:
+    """Cumulative import time of module alone, and the heavy modules it loaded."""
+    timings = measure_imports([module])
+    loaded = {t.module for t in timings}
+    total = next(t.cumulative_us for t in timings if t.module == module)
+    return total / 1000, [m for m in HEAVY_MODULES if m in loaded]
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", help="modules to measure (default: all of src)")
+    parser.add_argument("--top", type=int, default=15,
+                        help="show the slowest dependencies by self time")
+    args = parser.parse_args(argv)
+    modules = args.modules or src_modules()
+
+    print(f"{'module':<24}{'cold import (ms)':>18}  heavy deps")
+    over_budget = []
+    for module in modules:
+        total_ms, heavy = cold_start_ms(module)
+        flag = "  OVER BUDGET" if total_ms > IMPORT_BUDGET_MS else ""
+        print(f"{module:<24}{total_ms:>18.1f}  {', '.join(heavy) or '-'}{flag}")
+        if flag:
+            over_budget.append(module)
+
+    timings = sorted(measure_imports(modules), key=lambda t: t.self_us, reverse=True)
+    print(f"\nslowest {args.top} imports by self time (all modules together)")
+    for t in timings[:args.top]:
+        print(f"{t.module:<40}{t.self_us / 1000:>10.1f} ms")
+
+    if over_budget:
+        sys.exit(f"over the {IMPORT_BUDGET_MS:.0f} ms budget: {', '.join(over_budget)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Compare the row pipeline of parse_tables with the per-row reference path.
+
+Feeds a synthetic stream of Clarity-style tables (mixed column layouts,
+legend tables, wrapped details, insulin and notes) to both and checks
+they produce identical ParseResults. Run from the repository root:
+
+    python -m benchmarks.bench_parse_rows [--rows 1000000] [--check-rows 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date, timedelta
+
+from src.models import ExerciseEntry, GlucoseEntry, InsulinEntry, MealType, NoteEntry
+from src.pdf_parser import (
+    _ACTIVITY_EVENTS,
+    _NOTE_EVENTS,
+    DATE_PATTERN,
+    ParseResult,
+    Table,
+    _classify_row,
+    _has_event_rows,
+    _parse_exercise_details,
+    _parse_glucose_value,
+    _parse_insulin_units,
+    parse_iso_date,
+    parse_tables,
+)
+
+_FOOTER = ["Data uploaded: Mon, Feb 23, 2026 10:22 AM MST • Dexcom Clarity", None]
+_LEGEND: Table = [[""], ["x 2"], [""]]
+_EVENTS = [
+    ("Meal", "Granola with yogurt and blueberries", "--"),
+    ("Meal", "Egg omelette, salad, cottage cheese", "--"),
+    ("Meal", "Tuna salad with cheese and pickle", "--"),
+    ("Walking", "33 min • 88 BPM", "--"),
+    ("Meal", "Glass of white wine", "--"),
+    ("Insulin", "Fast-Acting", "4 units"),
+    ("Meal", "Salad with bread and sauce", "--"),
+    ("Note", "Felt tired after lunch", "--"),
+]
+
+
+def _row(i: int, time_str: str, event: str, details: str, units: str) -> list[str | None]:
+    glucose = f"{80 + i % 90} mg/dL"
+    match i % 3:
+        case 0:  # 9-column export, cells shifted right
+            return [time_str, None, "CGM", None, event, None, details, units, glucose]
+        case 1:  # 9-column export, cells shifted left
+            return [time_str, "CGM", None, event, None, details, None, units, glucose]
+        case _:  # 6-column export
+            return [time_str, "CGM", event, details, units, glucose]
+
+
+def synthetic_page_tables(rows: int, rows_per_day: int = 8) -> Iterator[list[Table]]:
+    """Yield pages of tables holding `rows` data rows, one day per page."""
+    day = date(2020, 1, 1)
+    emitted = 0
+    while emitted < rows:
+        table: list[list[str | None]] = [
+            [f"Daily\n{day.strftime('%a, %b %-d, %Y')}\n400\nTime Device Event", None],
+        ]
+        for j in range(min(rows_per_day, rows - emitted)):
+            i = emitted + j
+            event, details, units = _EVENTS[i % len(_EVENTS)]
+            table.append(_row(i, f"{7 + j}:{i % 60:02d} {'AM' if j < 5 else 'PM'}",
+                              event, details, units))
+            if i % 50 == 0:
+                table.append(["", None, None, "and a banana", None, None])
+        emitted += min(rows_per_day, rows - emitted)
+        table.append(_FOOTER)
+        yield [_LEGEND, table]
+        day += timedelta(days=1)
+
+
+def _reference_add_event(
+    result: ParseResult, date: date, values: Sequence[str], page_label: str
+) -> GlucoseEntry | NoteEntry | None:
+    time_str, _, event_type, details, units_str, glucose_str = values
+    glucose = _parse_glucose_value(glucose_str)
+    if event_type == "Insulin":
+        units = _parse_insulin_units(units_str)
+        if units is None:
+            result.warnings.append(
+                f"{page_label}: could not parse insulin units from '{units_str}'"
+            )
+            return None
+        result.insulin_entries.append(InsulinEntry(
+            date=date, time=time_str, insulin_type=details or "Insulin",
+            units=units, glucose_reading=glucose,
+        ))
+        return None
+    if event_type in _NOTE_EVENTS:
+        note = NoteEntry(date=date, time=time_str, text=details, glucose_reading=glucose)
+        result.note_entries.append(note)
+        return note
+    if glucose is None:
+        result.warnings.append(f"{page_label}: could not parse glucose from '{glucose_str}'")
+        return None
+    if event_type == "Meal":
+        entry = GlucoseEntry(
+            date=date, time=time_str, glucose_reading=glucose,
+            food_item=details, meal_type=MealType.BREAKFAST,
+        )
+        result.glucose_entries.append(entry)
+        return entry
+    exercise = _parse_exercise_details(details)
+    if exercise is not None:
+        result.exercise_entries.append(ExerciseEntry(
+            date=date, time=time_str, activity_type=event_type,
+            duration_minutes=exercise[0], heart_rate_bpm=exercise[1],
+            glucose_reading=glucose,
+        ))
+    elif event_type in _ACTIVITY_EVENTS:
+        result.warnings.append(f"{page_label}: could not parse exercise details '{details}'")
+    else:
+        result.warnings.append(f"{page_label}: unknown event type '{event_type}'")
+    return None
+
+
+def reference_parse_tables(page_tables: Iterable[Sequence[Table]]) -> ParseResult:
+    """The straightforward path: classify, then build one model, per row."""
+    result = ParseResult()
+    current_date: date | None = None
+    last_entry: GlucoseEntry | NoteEntry | None = None
+    for page_num, tables in enumerate(page_tables):
+        page_label = f"Page {page_num + 1}"
+        for table in tables:
+            if not _has_event_rows(table):
+                continue
+            for row in table:
+                row_type, values = _classify_row(row)
+                if row_type == "header":
+                    match = DATE_PATTERN.search(values[0])
+                    if match:
+                        current_date = parse_iso_date(match)
+                    last_entry = None
+                elif row_type == "continuation":
+                    if isinstance(last_entry, GlucoseEntry):
+                        last_entry.food_item = f"{last_entry.food_item} {values[0].strip()}"
+                    elif isinstance(last_entry, NoteEntry):
+                        last_entry.text = f"{last_entry.text} {values[0].strip()}"
+                elif row_type == "data":
+                    if current_date is None:
+                        result.warnings.append(
+                            f"{page_label}: data row before any date header: {values}"
+                        )
+                        continue
+                    last_entry = _reference_add_event(result, current_date, values, page_label)
+    result.available_dates = sorted({
+        e.date for entries in (
+            result.glucose_entries, result.exercise_entries,
+            result.insulin_entries, result.note_entries,
+        ) for e in entries
+    })
+    return result
+
+
+def _time(fn: Callable[[list[list[Table]]], ParseResult], pages: list[list[Table]]) -> float:
+    start = time.perf_counter()
+    fn(pages)
+    return time.perf_counter() - start
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--check-rows", type=int, default=20_000,
+                        help="rows in the stream compared for identical output")
+    args = parser.parse_args(argv)
+
+    check_pages = list(synthetic_page_tables(args.check_rows))
+    if reference_parse_tables(check_pages) != parse_tables(check_pages):
+        raise SystemExit("parse_tables output differs from the reference path")
+    print(f"identical ParseResult on {args.check_rows:,} rows")
+
+    pages = list(synthetic_page_tables(args.rows))
+    reference = _time(reference_parse_tables, pages)
+    optimized = _time(parse_tables, pages)
+    print(f"{args.rows:,} rows in {len(pages):,} pages")
+    print(f"{'path':<12}{'seconds':>10}{'rows/s':>14}")
+    for label, seconds in (("reference", reference), ("optimized", optimized)):
+        print(f"{label:<12}{seconds:>10.2f}{args.rows / seconds:>14,.0f}")
+    print(f"speedup {reference / optimized:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
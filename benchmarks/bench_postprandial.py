@@ -0,0 +1,119 @@
+"""Time postprandial analysis of a year of meals against a nested-loop scan.
+
+Builds a synthetic session with 5-minute CGM traces, checks meal_responses
+matches a reference that scans every reading for every meal, and times
+both, plus the cached call. Run from the repository root:
+
+    python -m benchmarks.bench_postprandial [--days 365] [--meals-per-day 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import Any
+
+from src.history_index import time_to_minute
+from src.models import CgmTrace, GlucoseEntry, MealType, ReportSession
+from src.postprandial import (
+    DEFAULT_WINDOW_MINUTES,
+    MealResponse,
+    build_timeline,
+    food_responses,
+    meal_responses,
+)
+
+_FOODS = ("Granola with yogurt", "Pasta with sauce", "Salad", "Burger and fries",
+          "Glass of white wine", "Oatmeal")
+
+
+def synthetic_session(days: int, meals_per_day: int = 4) -> ReportSession:
+    start = date(2025, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(days)]
+    session = ReportSession.create_new(
+        name=f"Synthetic {days} days", date_range_start=dates[0],
+        date_range_end=dates[-1], selected_dates=dates,
+    )
+    minutes = list(range(0, 24 * 60, 5))
+    for i, d in enumerate(dates):
+        values = [round(110 + 40 * math.sin((m + i * 17) / 90)) for m in minutes]
+        session.cgm_traces.append(CgmTrace.from_points(d, minutes, values))
+        for k in range(meals_per_day):
+            hour = 7 + k * 4
+            clock = f"{(hour - 1) % 12 + 1}:{(i + k * 7) % 60:02d}"
+            session.glucose_entries.append(GlucoseEntry(
+                date=d,
+                time=f"{clock} {'AM' if hour < 12 else 'PM'}",
+                glucose_reading=values[hour * 12],
+                food_item=_FOODS[(i + k) % len(_FOODS)],
+                meal_type=list(MealType)[k % len(MealType)],
+            ))
+    return session
+
+
+def reference_responses(
+    session: ReportSession, window: int = DEFAULT_WINDOW_MINUTES
+) -> list[MealResponse]:
+    """For every meal, scan every reading of the session."""
+    timeline = build_timeline(session)
+    responses = []
+    for meal in session.glucose_entries:
+        start = meal.date.toordinal() * 1440 + time_to_minute(meal.time)
+        peak, peak_at, readings = meal.glucose_reading, start, 0
+        for t, v in zip(timeline.times, timeline.values):
+            if start < t <= start + window:
+                readings += 1
+                if v > peak:
+                    peak, peak_at = v, t
+        responses.append(MealResponse(
+            date=meal.date, time=meal.time, food_item=meal.food_item,
+            meal_type=meal.meal_type.value, baseline=meal.glucose_reading,
+            peak=peak, delta=peak - meal.glucose_reading,
+            minutes_to_peak=peak_at - start, readings=readings,
+        ))
+    return responses
+
+
+def _time(fn: Callable[..., Any], *args: Any) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--meals-per-day", type=int, default=4)
+    parser.add_argument("--check-days", type=int, default=30,
+                        help="days compared against the nested-loop reference")
+    args = parser.parse_args(argv)
+
+    check = synthetic_session(args.check_days, args.meals_per_day)
+    if meal_responses(check) != reference_responses(check):
+        raise SystemExit("meal_responses differs from the reference scan")
+    print(f"identical responses on {args.check_days} days")
+
+    session = synthetic_session(args.days, args.meals_per_day)
+    readings = len(build_timeline(session).times)
+    cold, responses = _time(meal_responses, session)
+    warm, _ = _time(meal_responses, session)
+    aggregate, foods = _time(food_responses, responses)
+    print(f"{len(session.glucose_entries):,} meals, {readings:,} readings")
+    print(f"{'step':<22}{'seconds':>10}")
+    for label, seconds in (
+        ("meal_responses cold", cold), ("meal_responses cached", warm),
+        ("food_responses", aggregate),
+    ):
+        print(f"{label:<22}{seconds:>10.4f}")
+    print(f"{len(foods)} foods; top: {foods[0].food_item} +{foods[0].mean_delta} mg/dL")
+
+    if args.days <= 60:
+        reference, _ = _time(reference_responses, session)
+        print(f"{'nested-loop reference':<22}{reference:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Time rendering the PDF reports of many sessions.
+
+Saves --sessions synthetic sessions of --days days into a temporary
+store and times rendering all of their reports in this process, then on
+a process pool of --workers workers, then again with every report
+cached. Run from the repository root:
+
+    python -m benchmarks.bench_reports [--sessions 16] [--days 14] [--workers 0]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_session_format import synthetic_session
+from src.report_queue import render_reports
+from src.tenants import store_for_user
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=16)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="pool size (default: one per CPU)")
+    args = parser.parse_args(argv)
+    workers = args.workers or os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        store = store_for_user("bench", root / "sessions", root / "uploads", root / "reports")
+        ids = []
+        for _ in range(args.sessions):
+            session = synthetic_session(args.days)
+            store.save(session)
+            ids.append(session.id)
+        jobs = [(store, session_id) for session_id in ids]
+
+        runs = [
+            ("inline", dict(workers=1, force=True)),
+            (f"pool x{workers}", dict(workers=workers, force=True)),
+            ("cached", dict(workers=workers)),
+        ]
+        print(f"{args.sessions} sessions of {args.days} days")
+        print(f"{'run':<12}{'seconds':>9}{'sessions/s':>12}")
+        for name, kwargs in runs:
+            start = time.perf_counter()
+            outcomes = render_reports(jobs, **kwargs)
+            elapsed = time.perf_counter() - start
+            assert all(o.action in ("rendered", "cached") for o in outcomes), outcomes
+            print(f"{name:<12}{elapsed:>9.2f}{len(outcomes) / elapsed:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Compare JSON and binary session files: size, full load, header-only open.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_session_format [--days 365] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+from src.models import ExerciseEntry, GlucoseEntry, MealType, ReportSession
+from src.session_format import LazySession, read_binary_session, read_header
+from src.storage import list_sessions, load_session, save_session
+
+
+def synthetic_session(days: int, meals_per_day: int = 5) -> ReportSession:
+    start = date(2025, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(days)]
+    session = ReportSession.create_new(
+        name=f"Synthetic {days} days",
+        date_range_start=dates[0],
+        date_range_end=dates[-1],
+        selected_dates=dates,
+    )
+    meal_types = list(MealType)
+    for i, d in enumerate(dates):
+        for m in range(meals_per_day):
+            session.glucose_entries.append(GlucoseEntry(
+                date=d,
+                time=f"{7 + m * 3 % 12}:{(i * 7 + m) % 60:02d} {'AM' if m < 2 else 'PM'}",
+                glucose_reading=80 + (i * 13 + m * 29) % 120,
+                food_item=f"Granola, yogurt, blueberries and coffee variant {m}",
+                meal_type=meal_types[m % len(meal_types)],
+            ))
+        session.exercise_entries.append(ExerciseEntry(
+            date=d, time="10:56 AM", activity_type="Walking",
+            duration_minutes=20 + i % 30, heart_rate_bpm=90, glucose_reading=110,
+        ))
+    return session
+
+
+def _time(fn: Callable[[], object], repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    session = synthetic_session(args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir, bin_dir = Path(tmp) / "json", Path(tmp) / "binary"
+        json_path = save_session(session, base_dir=json_dir, binary=False)
+        bin_path = save_session(session, base_dir=bin_dir, binary=True)
+
+        rows = [
+            ("file size (KiB)",
+             json_path.stat().st_size / 1024, bin_path.stat().st_size / 1024),
+            ("full load (ms)",
+             _time(lambda: load_session(session.id, json_dir), args.repeat),
+             _time(lambda: read_binary_session(bin_path), args.repeat)),
+            ("summary only (ms)",
+             _time(lambda: list_sessions(json_dir), args.repeat),
+             _time(lambda: read_header(bin_path), args.repeat)),
+            ("open + glucose only (ms)",
+             _time(lambda: load_session(session.id, json_dir).glucose_entries, args.repeat),
+             _time(lambda: LazySession(bin_path).glucose_entries, args.repeat)),
+        ]
+
+    entries = len(session.glucose_entries) + len(session.exercise_entries)
+    print(f"{args.days} days, {entries} entries, best of {args.repeat}")
+    print(f"{'metric':<26}{'json':>12}{'binary':>12}{'ratio':>8}")
+    for label, json_value, bin_value in rows:
+        print(f"{label:<26}{json_value:>12.2f}{bin_value:>12.2f}"
+              f"{json_value / bin_value:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+"""Load-test the Home, Upload, Review and save flow with many users at once.
+
+Each simulated user gets their own tenant, pre-filled with synthetic
+sessions, and runs the flow against the sample Clarity PDF:
+
+  home    Home page (AppTest): create a session with the form
+  upload  Upload page (AppTest) and the work it does once a file is
+          chosen (AppTest cannot upload files): save the PDF, parse it
+          through the shared ParseCache, merge the default dates, save
+  review  Review page (AppTest): render the tables, chart and responses
+  save    Review page: click "Save Corrections"
+
+Users run on threads of one process, as Streamlit serves sessions, so
+they share one ParseCache and the memory figures are per app worker.
+AppTest page runs are serialized (see _APPTEST_LOCK): only the upload
+work between them overlaps, so page steps measure one user's run, not
+contention between users. Step latencies exclude the time spent
+waiting for the lock, which is reported per step under "lock_wait".
+Latency percentiles, flow throughput and memory are written to a JSON
+report; pass an earlier report as --baseline to print the change. Run
+from the repository root:
+
+    python -m benchmarks.load_test [--users 8] [--flows 3] [--out load.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_session_format import synthetic_session
+from src.mapped_io import stream_to_file
+from src.pdf_parser import parse_pdf
+from src.pipeline import default_selected_dates
+from src.session_merge import merge_parse_result
+from src.state_cache import ParseCache
+from src.tenants import store_for_user
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SAMPLE_PDF = REPO_ROOT / "docs" / "samples" / "clarity_2026-02-18_to_2026-02-22.pdf"
+PAGES = REPO_ROOT / "app"
+STEPS = ("home", "upload", "review", "save")
+
+# AppTest's own limit is 3 s; pages run slower with many users at once
+_PAGE_TIMEOUT = 120
+
+# AppTest sets up and tears down Streamlit's process-wide Runtime on every
+# run, so page scripts take turns; the upload work between them does not.
+# The scripts hold the GIL anyway, as they would on a real worker.
+_APPTEST_LOCK = threading.Lock()
+
+
+class _LockWait(threading.local):
+    """Seconds this thread has spent waiting for _APPTEST_LOCK."""
+
+    seconds = 0.0
+
+
+_lock_wait = _LockWait()
+
+
+def _page(script: str, user_id: str, session_id: str | None = None) -> AppTest:
+    at = AppTest.from_file(str(PAGES / script), default_timeout=_PAGE_TIMEOUT)
+    # current_store() keeps a user_id already in session state
+    at.session_state["user_id"] = user_id
+    if session_id is not None:
+        at.session_state["current_session_id"] = session_id
+    return at
+
+
+def _run(at: AppTest) -> AppTest:
+    start = time.perf_counter()
+    with _APPTEST_LOCK:
+        _lock_wait.seconds += time.perf_counter() - start
+        return at.run()
+
+
+def _check(at: AppTest, step: str) -> None:
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].message}")
+    if at.error:
+        raise RuntimeError(f"{step}: {at.error[0].value}")
+
+
+def _button(at: AppTest, label: str) -> Any:
+    return next(b for b in at.button if b.label == label)
+
+
+class _User:
+    def __init__(self, user_id: str, cache: ParseCache) -> None:
+        self.user_id = user_id
+        self.store = store_for_user(user_id)
+        self.cache = cache
+        self.session_id = ""
+
+    def home(self) -> None:
+        at = _run(_page("Home.py", self.user_id))
+        at.text_input[0].input(f"Load test {time.monotonic_ns()}")
+        _button(at, "Start New Session").click()
+        _run(at)
+        _check(at, "home")
+        self.session_id = at.session_state["current_session_id"]
+
+    def upload(self) -> None:
+        at = _run(_page("pages/1_Upload.py", self.user_id, self.session_id))
+        _check(at, "upload")
+        # What the page does once a file is chosen
+        pdf_path = self.store.uploads_dir / SAMPLE_PDF.name
+        with SAMPLE_PDF.open("rb") as f:
+            stream_to_file(f, pdf_path)
+        with pdf_path.open("rb") as f:
+            digest = hashlib.file_digest(f, "sha256").hexdigest()
+        handle = ParseCache.handle(self.user_id, digest)
+        result = self.cache.get(handle)
+        if result is None:
+            result = parse_pdf(pdf_path)
+            self.cache.put(handle, self.user_id, result)
+        session = self.store.load(self.session_id)
+        session, _ = merge_parse_result(
+            session, result, default_selected_dates(result.available_dates)
+        )
+        session.source_filename = pdf_path.name
+        self.store.save(session)
+
+    def review(self) -> AppTest:
+        at = _run(_page("pages/2_Review_Data.py", self.user_id, self.session_id))
+        _check(at, "review")
+        return at
+
+    def save(self, at: AppTest) -> None:
+        _button(at, "Save Corrections").click()
+        _run(at)
+        _check(at, "save")
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {step: [] for step in (*STEPS, "flow")}
+        self.lock_waits: dict[str, list[float]] = {step: [] for step in self.latencies}
+        self.errors: list[str] = []
+        self._lock = threading.Lock()
+
+    def time(self, step: str, fn: Callable[[], Any]) -> Any:
+        """Run fn, recording its time apart from any wait for _APPTEST_LOCK."""
+        waited = _lock_wait.seconds
+        start = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - start
+        waited = _lock_wait.seconds - waited
+        with self._lock:
+            self.latencies[step].append(elapsed - waited)
+            self.lock_waits[step].append(waited)
+        return value
+
+    def error(self, message: str) -> None:
+        with self._lock:
+            self.errors.append(message)
+
+
+def _run_user(user: _User, flows: int, recorder: _Recorder) -> None:
+    for _ in range(flows):
+        def flow() -> None:
+            recorder.time("home", user.home)
+            recorder.time("upload", user.upload)
+            at = recorder.time("review", user.review)
+            recorder.time("save", lambda: user.save(at))
+
+        try:
+            recorder.time("flow", flow)
+        except Exception as e:
+            recorder.error(f"{user.user_id}: {e}")
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of values; 0.0 when empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q * len(ordered) / 100) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _stats(values: list[float]) -> dict[str, float | int]:
+    return {
+        "count": len(values),
+        **{f"p{q}_ms": round(percentile(values, q) * 1000, 1) for q in (50, 90, 95, 99)},
+        "max_ms": round(max(values, default=0.0) * 1000, 1),
+    }
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process in MiB."""
+    with open("/proc/self/statm") as f:
+        pages = int(f.read().split()[1])
+    return pages * resource.getpagesize() / 2**20
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def run_load_test(
+    users: int, flows: int, sessions_per_user: int, days: int
+) -> dict[str, Any]:
+    """Run the flow for every user at once in the current directory."""
+    cache = ParseCache()
+    simulated = [_User(f"load-{i}@example.com", cache) for i in range(users)]
+    for user in simulated:
+        for _ in range(sessions_per_user):
+            user.store.save(synthetic_session(days))
+
+    # Warm imports and Streamlit's script machinery outside the timings
+    warmup = _User("warmup@example.com", cache)
+    _run_user(warmup, 1, _Recorder())
+
+    recorder = _Recorder()
+    rss_before = _rss_mb()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        for user in simulated:
+            pool.submit(_run_user, user, flows, recorder)
+    wall = time.perf_counter() - start
+
+    completed = len(recorder.latencies["flow"])
+    footprint = cache.footprint()
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "users": users, "flows_per_user": flows,
+            "sessions_per_user": sessions_per_user, "session_days": days,
+            "pdf": SAMPLE_PDF.name,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "wall_seconds": round(wall, 2),
+        "flows_completed": completed,
+        "throughput_flows_per_s": round(completed / wall, 3) if wall else 0.0,
+        "steps": {step: _stats(values) for step, values in recorder.latencies.items()},
+        "lock_wait": {step: _stats(values) for step, values in recorder.lock_waits.items()},
+        "memory": {
+            "rss_before_mb": round(rss_before, 1),
+            "rss_after_mb": round(_rss_mb(), 1),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "parse_cache_bytes": footprint.bytes,
+            "parse_cache_entries": footprint.entries,
+        },
+        "errors": recorder.errors,
+    }
+
+
+# Metrics compared against a baseline; for all but throughput, lower is better
+_COMPARED = (
+    ("throughput_flows_per_s", ("throughput_flows_per_s",)),
+    ("flow p50 (ms)", ("steps", "flow", "p50_ms")),
+    ("flow p95 (ms)", ("steps", "flow", "p95_ms")),
+    ("flow lock wait p95 (ms)", ("lock_wait", "flow", "p95_ms")),
+    *((f"{step} p95 (ms)", ("steps", step, "p95_ms")) for step in STEPS),
+    ("peak RSS (MiB)", ("memory", "peak_rss_mb")),
+)
+
+
+def _lookup(report: dict[str, Any], path: tuple[str, ...]) -> float | None:
+    value: Any = report
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> list[str]:
+    """One line per metric: baseline, current and change."""
+    lines = [f"{'metric':<26}{'baseline':>12}{'current':>12}{'change':>9}"]
+    for label, path in _COMPARED:
+        old, new = _lookup(baseline, path), _lookup(report, path)
+        if old is None or new is None:
+            continue
+        change = f"{(new - old) / old:+.0%}" if old else "n/a"
+        lines.append(f"{label:<26}{old:>12.2f}{new:>12.2f}{change:>9}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=8, help="simulated users, one thread each")
+    parser.add_argument("--flows", type=int, default=3, help="flows each user runs")
+    parser.add_argument("--sessions-per-user", type=int, default=5,
+                        help="synthetic sessions in each user's store beforehand")
+    parser.add_argument("--days", type=int, default=30,
+                        help="days in each synthetic session")
+    parser.add_argument("--out", type=Path, default=Path("load-test.json"),
+                        help="JSON report to write")
+    parser.add_argument("--baseline", type=Path, help="earlier report to compare against")
+    args = parser.parse_args(argv)
+
+    out = args.out.resolve()
+    baseline = json.loads(args.baseline.read_text()) if args.baseline else None
+    # Pages import app.state; the app's data/ paths resolve in a scratch directory
+    sys.path.insert(0, str(REPO_ROOT))
+    cwd = Path.cwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            report = run_load_test(args.users, args.flows, args.sessions_per_user, args.days)
+        finally:
+            os.chdir(cwd)
+
+    out.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"{args.users} users x {args.flows} flows: {report['flows_completed']} completed "
+          f"in {report['wall_seconds']} s, {report['throughput_flows_per_s']} flows/s")
+    print(f"{'step':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'wait p95':>10}")
+    for step, stats in report["steps"].items():
+        wait = report["lock_wait"][step]["p95_ms"]
+        print(f"{step:<10}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}"
+              f"{wait:>10}")
+    memory = report["memory"]
+    print(f"RSS {memory['rss_before_mb']} -> {memory['rss_after_mb']} MiB "
+          f"(peak {memory['peak_rss_mb']} MiB), parse cache "
+          f"{memory['parse_cache_bytes'] / 2**20:.1f} MiB")
+    print(f"report written to {out}")
+    if baseline is not None:
+        print("\n".join(compare(report, baseline)))
+    if report["errors"]:
+        print(f"{len(report['errors'])} flow(s) failed, first: {report['errors'][0]}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import re
+import sys
+import tempfile
+import uuid
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import date
+from functools import partial
+from pathlib import Path, PurePosixPath
+from typing import Any, TypeVar
+from urllib.parse import parse_qs
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.mapped_io import stream_to_file
+from src.migrations import SchemaVersionError, session_from_json
+from src.models import ReportSession, parse_day
+from src.pdf_generator import DEFAULT_REPORTS_DIR, generate_report, report_filename
+from src.pdf_parser import ENTRY_LISTS, ParseResult, parse_pdf
+from src.pipeline import DEFAULT_REPORT_DAYS, default_selected_dates, session_from_parse
+from src.session_format import ENTRY_FIELDS
+from src.storage import DEFAULT_SESSIONS_DIR
+from src.tenants import DEFAULT_UPLOADS_DIR, SessionStore, store_for_user, user_id_from_env
+
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 4
+# Offloaded jobs allowed to wait for a worker before requests get 503
+DEFAULT_MAX_PENDING = 32
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# Entries serialized per streamed body chunk
+STREAM_BATCH = 500
+
+Scope = dict[str, Any]
+Message = dict[str, Any]
+Receive = Callable[[], Awaitable[Message]]
+Send = Callable[[Message], Awaitable[None]]
+
+T = TypeVar("T")
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_ROUTE = re.compile(r"^/sessions/(?P<id>[^/]+)(?P<report>/report)?$")
+
+_LIST_ADAPTERS: dict[str, TypeAdapter[Any]] = {
+    name: TypeAdapter(list[model]) for name, model in ENTRY_FIELDS.items()
+}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, detail: str) -> None:
+        super().__init__(detail)
+        self.status = status
+        self.detail = detail
+
+
+def json_chunks(
+    header: dict[str, Any], lists: dict[str, list[BaseModel]], batch: int = STREAM_BATCH
+) -> Iterator[bytes]:
+    """A JSON object of header fields and entry lists, a few entries at a time.
+
+    Each batch is serialized on its own, so a large session never has to
+    exist as one serialized string.
+    """
+    head = json.dumps(header, separators=(",", ":")).encode()
+    yield head[:-1]
+    first_field = head == b"{}"
+    for name, entries in lists.items():
+        yield b"%s\"%s\":[" % (b"" if first_field else b",", name.encode())
+        first_field = False
+        adapter = _LIST_ADAPTERS[name]
+        for start in range(0, len(entries), batch):
+            chunk = adapter.dump_json(entries[start:start + batch])[1:-1]
+            yield (b"," if start else b"") + chunk
+        yield b"]"
+    yield b"}"
+
+
+def session_chunks(session: ReportSession) -> Iterator[bytes]:
+    lists = {name: getattr(session, name) for name in ENTRY_FIELDS}
+    return json_chunks(session.model_dump(mode="json", exclude=set(lists)), lists)
+
+
+def parse_result_chunks(result: ParseResult) -> Iterator[bytes]:
+    header = {
+        "available_dates": [d.isoformat() for d in result.available_dates],
+        "warnings": result.warnings,
+    }
+    return json_chunks(header, {name: getattr(result, name) for name in ENTRY_LISTS})
+
+
+class ApiApp:
+    """Local HTTP API over parsing, session storage and report generation.
+
+    A plain ASGI application, so it needs no web framework; serve it with
+    an ASGI server such as uvicorn (python -m src.api). Endpoints, JSON
+    unless noted:
+
+        GET    /health
+        POST   /parse                  body: PDF -> parsed entries and warnings
+        GET    /sessions               session summaries, newest first
+        POST   /sessions               body: PDF (?name=&start=&end=&days=) or a new
+                                       session's JSON
+        GET    /sessions/{id}          the full session
+        PUT    /sessions/{id}          body: session JSON, creating or replacing it
+        DELETE /sessions/{id}
+        POST   /sessions/{id}/report   -> the rendered report PDF
+
+    X-User-Id selects the user's store (default $HEALTHCARE_USER_ID). It
+    is trusted as sent, so the service is for local tools only.
+
+    Parsing, storage and rendering block, so they run on a bounded
+    executor; when max_pending jobs are already queued or running,
+    further requests get 503 instead of queueing without limit.
+    Sessions and parse results are streamed a batch of entries at a time.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_SESSIONS_DIR,
+        uploads_root: Path = DEFAULT_UPLOADS_DIR,
+        reports_root: Path = DEFAULT_REPORTS_DIR,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        executor: Executor | None = None,
+    ) -> None:
+        self.roots = (root, uploads_root, reports_root)
+        self.max_pending = max_pending
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="api"
+        )
+        self._pending = 0
+        # Held from the existence check to the save when a session is POSTed
+        self._create_lock = asyncio.Lock()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._http(scope, receive, send)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _offload(self, fn: Callable[..., T], *args: Any) -> T:
+        if self._pending >= self.max_pending:
+            raise HttpError(503, "server busy, retry later")
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(fn, *args))
+        finally:
+            self._pending -= 1
+
+    def _store(self, scope: Scope) -> SessionStore:
+        headers = dict(scope.get("headers") or [])
+        user_id = headers.get(b"x-user-id", b"").decode().strip() or user_id_from_env()
+        return store_for_user(user_id, *self.roots)
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await self._route(scope, receive, send)
+        except HttpError as e:
+            await _send_json(send, e.status, {"detail": e.detail})
+        except ValidationError as e:
+            await _send_json(send, 422, {"detail": json.loads(e.json(include_url=False))})
+
+    async def _route(self, scope: Scope, receive: Receive, send: Send) -> None:
+        method, path = scope["method"], scope["path"].rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+        store = self._store(scope)
+
+        if path == "/health" and method == "GET":
+            await _send_json(send, 200, {"status": "ok", "pending": self._pending})
+        elif path == "/parse" and method == "POST":
+            result = await self._offload(_parse_bytes, await _read_pdf(receive))
+            await _send_stream(send, 200, "application/json", parse_result_chunks(result))
+        elif path == "/sessions" and method == "GET":
+            await _send_json(send, 200, await self._offload(store.list))
+        elif path == "/sessions" and method == "POST":
+            session = await self._create_session(scope, store, query, receive)
+            await _send_json(send, 201, {"id": session.id, "name": session.name})
+        elif match := _ROUTE.match(path):
+            await self._session_route(
+                method, match["id"], bool(match["report"]), store, receive, send
+            )
+        else:
+            raise HttpError(404, f"no route for {method} {path}")
+
+    async def _session_route(
+        self,
+        method: str,
+        session_id: str,
+        report: bool,
+        store: SessionStore,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        if not _SESSION_ID.match(session_id):
+            raise HttpError(404, "session not found")
+        if report:
+            if method != "POST":
+                raise HttpError(405, "use POST to render a report")
+            session = await self._load(store, session_id)
+            if not session.selected_dates:
+                raise HttpError(409, "session has no selected dates")
+            report_path = await self._offload(
+                generate_report, session, store.reports_dir / report_filename(session)
+            )
+            await _send_stream(
+                send, 200, "application/pdf", _file_chunks(report_path),
+                [(b"content-disposition", f'attachment; filename="{report_path.name}"'.encode())],
+            )
+        elif method == "GET":
+            session = await self._load(store, session_id)
+            await _send_stream(send, 200, "application/json", session_chunks(session))
+        elif method == "PUT":
+            session = _session_from_body(await _read_body(receive))
+            if session.id != session_id:
+                raise HttpError(409, "session id does not match the URL")
+            await self._offload(store.save, session)
+            await _send_json(send, 200, {"id": session.id, "name": session.name})
+        elif method == "DELETE":
+            if not await self._offload(store.delete, session_id):
+                raise HttpError(404, "session not found")
+            await _send(send, 204, b"", "application/json")
+        else:
+            raise HttpError(405, f"{method} not allowed")
+
+    async def _load(self, store: SessionStore, session_id: str) -> ReportSession:
+        try:
+            return await self._offload(store.load, session_id)
+        except FileNotFoundError:
+            raise HttpError(404, "session not found") from None
+        except SchemaVersionError as e:
+            raise HttpError(409, str(e)) from None
+        except ValueError as e:
+            # Corrupt JSON, a malformed binary file or failed validation
+            raise HttpError(422, f"stored session is unreadable: {type(e).__name__}") from None
+
+    async def _save_upload(
+        self, store: SessionStore, query: dict[str, str], receive: Receive
+    ) -> Path:
+        body = await _read_pdf(receive)
+        # Unnamed uploads get a name of their own rather than replacing each other
+        name = PurePosixPath(query.get("filename") or f"upload_{uuid.uuid4().hex[:12]}.pdf").name
+        pdf_path = store.uploads_dir / name
+        await self._offload(stream_to_file, io.BytesIO(body), pdf_path)
+        return pdf_path
+
+    async def _create_session(
+        self, scope: Scope, store: SessionStore, query: dict[str, str], receive: Receive
+    ) -> ReportSession:
+        headers = dict(scope.get("headers") or [])
+        if not headers.get(b"content-type", b"").startswith(b"application/json"):
+            pdf_path = await self._save_upload(store, query, receive)
+            session = await self._offload(_session_from_pdf, pdf_path, query)
+            await self._offload(store.save, session)
+            return session
+
+        session = _session_from_body(await _read_body(receive))
+        if not _SESSION_ID.match(session.id):
+            raise HttpError(400, f"invalid session id {session.id!r}")
+        async with self._create_lock:
+            if await self._offload(store.exists, session.id):
+                raise HttpError(409, f"session {session.id} exists; use PUT to replace it")
+            await self._offload(store.save, session)
+        return session
+
+
+def _session_from_pdf(pdf_path: Path, query: dict[str, str]) -> ReportSession:
+    start, end = _query_day(query, "start"), _query_day(query, "end")
+    days = query.get("days") or str(DEFAULT_REPORT_DAYS)
+    if not days.isdigit():
+        raise HttpError(400, f"invalid days {days!r}")
+
+    result = _parse_upload(pdf_path)
+    selected = None
+    if not (start or end):
+        selected = default_selected_dates(result.available_dates, int(days))
+    return session_from_parse(
+        result,
+        name=query.get("name") or pdf_path.stem,
+        source_filename=pdf_path.name,
+        selected_dates=selected,
+        start=start,
+        end=end,
+    )
+
+
+def _query_day(query: dict[str, str], key: str) -> date | None:
+    value = query.get(key)
+    if value is None:
+        return None
+    try:
+        return parse_day(value)
+    except ValueError:
+        raise HttpError(400, f"invalid date {value!r}") from None
+
+
+def _parse_upload(pdf_path: Path) -> ParseResult:
+    """parse_pdf, with a file the PDF reader rejects reported as a 422."""
+    from pdfminer.psparser import PSException
+    from pdfplumber.utils.exceptions import PdfminerException
+
+    try:
+        return parse_pdf(pdf_path)
+    except (PdfminerException, PSException) as e:
+        raise HttpError(422, f"unreadable PDF: {e}") from None
+
+
+def _parse_bytes(body: bytes) -> ParseResult:
+    """Parse an uploaded PDF that is not kept."""
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = Path(tmp) / "upload.pdf"
+        pdf_path.write_bytes(body)
+        return _parse_upload(pdf_path)
+
+
+def _file_chunks(path: Path, size: int = 64 * 1024) -> Iterator[bytes]:
+    with path.open("rb") as f:
+        while chunk := f.read(size):
+            yield chunk
+
+
+def _session_from_body(body: bytes) -> ReportSession:
+    """A session sent as JSON; payloads from older app versions are upgraded."""
+    try:
+        session, _ = session_from_json(body)
+    except SchemaVersionError as e:
+        raise HttpError(422, str(e)) from None
+    except json.JSONDecodeError as e:
+        raise HttpError(400, f"invalid JSON: {e}") from None
+    except ValidationError:
+        raise
+    except ValueError as e:
+        raise HttpError(400, str(e)) from None
+    return session
+
+
+async def _read_body(receive: Receive, limit: int = MAX_UPLOAD_BYTES) -> bytes:
+    chunks: list[bytes] = []
+    total = 0
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            raise HttpError(400, "client disconnected")
+        chunk = message.get("body", b"")
+        total += len(chunk)
+        if total > limit:
+            raise HttpError(413, f"body larger than {limit:,} bytes")
+        chunks.append(chunk)
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+async def _read_pdf(receive: Receive) -> bytes:
+    body = await _read_body(receive)
+    if not body.startswith(b"%PDF"):
+        raise HttpError(415, "body is not a PDF")
+    return body
+
+
+def _start(
+    status: int, content_type: str, extra: list[tuple[bytes, bytes]] | None = None
+) -> Message:
+    return {
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", content_type.encode()), *(extra or [])],
+    }
+
+
+async def _send(send: Send, status: int, body: bytes, content_type: str) -> None:
+    await send(_start(status, content_type, [(b"content-length", str(len(body)).encode())]))
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_json(send: Send, status: int, payload: Any) -> None:
+    await _send(send, status, json.dumps(payload).encode(), "application/json")
+
+
+async def _send_stream(
+    send: Send,
+    status: int,
+    content_type: str,
+    chunks: Iterable[bytes],
+    extra: list[tuple[bytes, bytes]] | None = None,
+) -> None:
+    """Send chunks as they are produced, yielding to other requests between them."""
+    await send(_start(status, content_type, extra))
+    for chunk in chunks:
+        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await asyncio.sleep(0)
+    await send({"type": "http.response.body", "body": b""})
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve the local HTTP API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="threads for parsing, storage and report rendering")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="offloaded jobs allowed before requests get 503")
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        print(
+            "Serving the API needs an ASGI server: pip install uvicorn (or the [api] extra)",
+            file=sys.stderr,
+        )
+        return 1
+    app = ApiApp(workers=args.workers, max_pending=args.max_pending)
+    uvicorn.run(app, host=args.host, port=args.port, lifespan="on")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
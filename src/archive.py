@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from src.models import ReportSession, format_day, parse_day
+from src.session_format import decode_session, encode_session
+
+ARCHIVE_FILENAME = "archive.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS archived_sessions (
+    session_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    date_range_start TEXT NOT NULL,
+    date_range_end TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    source_filename TEXT NOT NULL,
+    archived_at TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS archived_by_range
+    ON archived_sessions (date_range_start, date_range_end);
+CREATE INDEX IF NOT EXISTS archived_by_source ON archived_sessions (source_filename);
+"""
+
+_SUMMARY_COLUMNS = (
+    "session_id, name, status, date_range_start, date_range_end, created_at, "
+    "source_filename, archived_at, length(data)"
+)
+
+
+@dataclass(frozen=True)
+class ArchivedSession:
+    id: str
+    name: str
+    status: str
+    date_range_start: str
+    date_range_end: str
+    created_at: str
+    source_filename: str
+    archived_at: str
+    size: int
+
+    def summary(self) -> dict[str, str]:
+        """The same keys list_sessions returns for live session files."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "date_range_start": self.date_range_start,
+            "date_range_end": self.date_range_end,
+            "created_at": self.created_at,
+        }
+
+
+def has_archive(base_dir: Path) -> bool:
+    return (base_dir / ARCHIVE_FILENAME).exists()
+
+
+@contextmanager
+def _connect(base_dir: Path) -> Iterator[sqlite3.Connection]:
+    base_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(base_dir / ARCHIVE_FILENAME)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def archive_session(session: ReportSession, base_dir: Path) -> int:
+    """Store a session in the archive under base_dir, replacing any older copy.
+
+    The session is kept in the binary session encoding, whose entry
+    blocks are zlib-compressed. Returns the stored size in bytes.
+    """
+    data = encode_session(session)
+    with _connect(base_dir) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO archived_sessions (session_id, name, status, "
+            "date_range_start, date_range_end, created_at, source_filename, "
+            "archived_at, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                session.id, session.name, session.status.value,
+                format_day(session.date_range_start), format_day(session.date_range_end),
+                session.created_at, session.source_filename,
+                datetime.now(timezone.utc).isoformat(), data,
+            ),
+        )
+    return len(data)
+
+
+def load_archived_session(session_id: str, base_dir: Path) -> ReportSession:
+    """Load a session from the archive.
+
+    Raises FileNotFoundError if the session is not archived.
+    """
+    row = None
+    if has_archive(base_dir):
+        with _connect(base_dir) as conn:
+            row = conn.execute(
+                "SELECT data FROM archived_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+    if row is None:
+        raise FileNotFoundError(f"session {session_id} is not archived in {base_dir}")
+    return decode_session(row[0])
+
+
+def is_archived(session_id: str, base_dir: Path) -> bool:
+    if not has_archive(base_dir):
+        return False
+    with _connect(base_dir) as conn:
+        row = conn.execute(
+            "SELECT 1 FROM archived_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+    return row is not None
+
+
+def discard_archived(session_id: str, base_dir: Path) -> bool:
+    """Remove a session from the archive. Returns True if it was archived."""
+    if not has_archive(base_dir):
+        return False
+    with _connect(base_dir) as conn:
+        cursor = conn.execute(
+            "DELETE FROM archived_sessions WHERE session_id = ?", (session_id,)
+        )
+    return cursor.rowcount > 0
+
+
+def query_archive(
+    base_dir: Path,
+    start: str | date | None = None,
+    end: str | date | None = None,
+    source_filename: str | None = None,
+) -> list[ArchivedSession]:
+    """Archived sessions overlapping [start, end], newest first.
+
+    start/end are inclusive dates or ISO date strings; source_filename
+    matches exactly.
+    """
+    if not has_archive(base_dir):
+        return []
+
+    clauses: list[str] = []
+    params: list[str] = []
+    if start is not None:
+        clauses.append("date_range_end >= ?")
+        params.append(format_day(parse_day(start)))
+    if end is not None:
+        clauses.append("date_range_start <= ?")
+        params.append(format_day(parse_day(end)))
+    if source_filename is not None:
+        clauses.append("source_filename = ?")
+        params.append(source_filename)
+
+    sql = f"SELECT {_SUMMARY_COLUMNS} FROM archived_sessions"
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY created_at DESC"
+
+    with _connect(base_dir) as conn:
+        return [ArchivedSession(*row) for row in conn.execute(sql, params)]
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import Any
+
+from src.models import CgmTrace
+from src.pdf_parser import DATE_PATTERN, parse_iso_date
+
+MINUTES_PER_DAY = 24 * 60
+# Points sent to the browser per chart: about one per pixel of a wide page
+CHART_WIDTH_PX = 1000
+
+_NUMBER = re.compile(r"^\d{2,3}$")
+
+# Gridlines and the trace span the chart; shorter lines are ticks and legends
+_MIN_CHART_WIDTH = 300.0
+# y-axis labels sit just right of the chart, level with their gridline
+_LABEL_GAP = 15.0
+_LABEL_TOLERANCE = 6.0
+# The trace is a dark grey stroke; target-range lines are coloured
+_MAX_TRACE_GREY = 0.5
+
+# A pdfplumber object (word, line, curve or search match) as a dict
+PdfObject = dict[str, Any]
+
+
+@dataclass
+class _Chart:
+    date: date
+    x0: float
+    x1: float
+    # Gridline tops and their mg/dL values, ordered by top
+    tops: list[float]
+    values: list[int]
+
+    def contains(self, curve: PdfObject) -> bool:
+        return (
+            curve["x0"] >= self.x0 - 2
+            and curve["x1"] <= self.x1 + 3
+            and curve["top"] >= self.tops[0] - 2 * _LABEL_TOLERANCE
+            and curve["bottom"] <= self.tops[-1] + 2 * _LABEL_TOLERANCE
+        )
+
+    def minute(self, x: float) -> int:
+        minute = round((x - self.x0) / (self.x1 - self.x0) * MINUTES_PER_DAY)
+        return min(max(minute, 0), MINUTES_PER_DAY - 1)
+
+    def value(self, top: float) -> int:
+        """mg/dL at a page position, interpolated between the two nearest gridlines."""
+        i = min(max(bisect_right(self.tops, top), 1), len(self.tops) - 1)
+        t0, t1 = self.tops[i - 1], self.tops[i]
+        v0, v1 = self.values[i - 1], self.values[i]
+        return max(round(v0 + (top - t0) * (v1 - v0) / (t1 - t0)), 1)
+
+
+def _is_trace(curve: PdfObject) -> bool:
+    color = curve.get("stroking_color")
+    return (
+        bool(curve.get("stroke"))
+        and not curve.get("fill")
+        and len(curve["pts"]) >= 2
+        and isinstance(color, tuple) and len(color) == 3
+        and color[0] == color[1] == color[2] and color[0] <= _MAX_TRACE_GREY
+    )
+
+
+def _find_charts(
+    headers: list[PdfObject], lines: list[PdfObject], words: list[PdfObject]
+) -> list[_Chart]:
+    """Calibrate each day's glucose chart from its gridlines and axis labels."""
+    gridlines = [
+        line for line in lines
+        if line["top"] == line["bottom"] and line["x1"] - line["x0"] >= _MIN_CHART_WIDTH
+    ]
+    labels = [w for w in words if _NUMBER.match(w["text"])]
+    charts: list[_Chart] = []
+    headers = sorted(headers, key=lambda h: h["top"])
+    for i, header in enumerate(headers):
+        below = headers[i + 1]["top"] if i + 1 < len(headers) else float("inf")
+        grid: dict[float, int] = {}
+        x0 = x1 = 0.0
+        for line in gridlines:
+            if not header["bottom"] < line["top"] < below:
+                continue
+            for label in labels:
+                centre = (label["top"] + label["bottom"]) / 2
+                if (
+                    0 <= label["x0"] - line["x1"] <= _LABEL_GAP
+                    and abs(centre - line["top"]) <= _LABEL_TOLERANCE
+                ):
+                    grid[line["top"]] = int(label["text"])
+                    x0, x1 = line["x0"], line["x1"]
+                    break
+        if len(grid) >= 2:
+            tops = sorted(grid)
+            charts.append(_Chart(
+                date=parse_iso_date(DATE_PATTERN.search(header["text"])),
+                x0=x0, x1=x1,
+                tops=tops, values=[grid[t] for t in tops],
+            ))
+    return charts
+
+
+def extract_traces(
+    headers: list[PdfObject],
+    lines: list[PdfObject],
+    words: list[PdfObject],
+    curves: list[PdfObject],
+) -> list[CgmTrace]:
+    """Read the plotted glucose trace of each day chart on a page.
+
+    headers are the page's day-header date matches; lines, words and
+    curves are pdfplumber page objects. The chart's time axis spans its
+    gridlines (midnight to midnight) and its mg/dL axis is interpolated
+    between labelled gridlines. Trace segments (a gap in CGM data
+    splits the curve) are merged in time order, one sample per minute.
+    """
+    traces: list[CgmTrace] = []
+    for chart in _find_charts(headers, lines, words):
+        samples: dict[int, int] = {}
+        for curve in curves:
+            if _is_trace(curve) and chart.contains(curve):
+                for x, top in curve["pts"]:
+                    samples.setdefault(chart.minute(x), chart.value(top))
+        if samples:
+            minutes = sorted(samples)
+            traces.append(CgmTrace.from_points(
+                chart.date, minutes, [samples[m] for m in minutes]
+            ))
+    return traces
+
+
+def page_traces(page: Any) -> list[CgmTrace]:
+    """The CGM traces of one pdfplumber page."""
+    return extract_traces(
+        page.search(DATE_PATTERN.pattern, regex=True),
+        page.lines,
+        page.extract_words(),
+        page.curves,
+    )
+
+
+def lttb(xs: Sequence[float], ys: Sequence[float], threshold: int) -> list[int]:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps.
+
+    Keeps the first and last points, and from each of threshold - 2
+    equal buckets the point forming the largest triangle with the
+    previously kept point and the next bucket's mean. Peaks and troughs
+    survive, which plain striding drops.
+    """
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+
+    kept = [0]
+    bucket = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket) + 1
+        end = int((i + 1) * bucket) + 1
+        next_end = min(int((i + 2) * bucket) + 1, n)
+        if end < next_end:
+            span = next_end - end
+            avg_x = sum(xs[end:next_end]) / span
+            avg_y = sum(ys[end:next_end]) / span
+        else:
+            avg_x, avg_y = xs[n - 1], ys[n - 1]
+
+        ax, ay = xs[a], ys[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return kept
+
+
+def downsample(
+    traces: Sequence[CgmTrace], width: int
+) -> tuple[list[date], list[int], list[int]]:
+    """Join traces into one series and reduce it to about `width` points.
+
+    Returns (dates, minutes, mg/dL) per kept point, ready to plot one
+    point per pixel column however many days are shown.
+    """
+    dates: list[date] = []
+    minutes: list[int] = []
+    values: list[int] = []
+    xs: list[int] = []
+    for trace in sorted(traces, key=lambda t: t.date):
+        trace_minutes, trace_values = trace.points()
+        day = trace.date.toordinal()
+        dates.extend([trace.date] * len(trace_minutes))
+        minutes.extend(trace_minutes)
+        values.extend(trace_values)
+        xs.extend(day * MINUTES_PER_DAY + m for m in trace_minutes)
+    kept = lttb(xs, values, width)
+    return [dates[i] for i in kept], [minutes[i] for i in kept], [values[i] for i in kept]
+
+
+def chart_series(
+    traces: Sequence[CgmTrace], width: int = CHART_WIDTH_PX
+) -> dict[str, list[datetime] | list[int]]:
+    """Downsampled traces as {"time": [...], "mg/dL": [...]} for st.line_chart."""
+    dates, minutes, values = downsample(traces, width)
+    return {
+        "time": [
+            datetime.combine(d, time(m // 60, m % 60))
+            for d, m in zip(dates, minutes)
+        ],
+        "mg/dL": values,
+    }
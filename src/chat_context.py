@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import math
+import re
+import statistics
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import date
+
+from src.history_index import normalize_food_tokens, time_to_minute
+from src.lru import LruCache
+from src.models import ReportSession, format_day, parse_day
+
+DEFAULT_TOKEN_BUDGET = 800
+HIGH_GLUCOSE = 180
+LOW_GLUCOSE = 70
+
+_CHARS_PER_TOKEN = 4
+_CACHE_SIZE = 64
+_TOP_FOODS = 8
+
+_ISO_DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+_MONTH_DAY_PATTERN = re.compile(
+    r"\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(\d{1,2})\b"
+)
+_MONTHS = ("jan", "feb", "mar", "apr", "may", "jun",
+           "jul", "aug", "sep", "oct", "nov", "dec")
+_WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday",
+             "friday", "saturday", "sunday")
+
+
+@dataclass
+class DayStats:
+    date: date
+    weekday: str
+    meals: int = 0
+    glucose_mean: int = 0
+    glucose_min: int = 0
+    glucose_max: int = 0
+    exercise_minutes: int = 0
+    mood_mean: float | None = None
+    food_tokens: set[str] = field(default_factory=set)
+
+
+@dataclass
+class SessionDigest:
+    """Compact, question-independent summary of a session."""
+
+    header: str
+    days: list[DayStats]
+    top_foods: list[str]
+    outliers: list[str]
+    meal_lines: dict[date, list[str]]
+
+
+_digest_cache: LruCache[SessionDigest] = LruCache(_CACHE_SIZE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about 4 characters per token for English text)."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def _build_digest(session: ReportSession) -> SessionDigest:
+    readings_by_day: dict[date, list[int]] = defaultdict(list)
+    tokens_by_day: dict[date, set[str]] = defaultdict(set)
+    exercise_by_day: dict[date, int] = defaultdict(int)
+    moods_by_day: dict[date, list[int]] = defaultdict(list)
+    meal_lines: dict[date, list[tuple[int, str]]] = defaultdict(list)
+    food_readings: dict[str, list[int]] = defaultdict(list)
+
+    for e in session.glucose_entries:
+        readings_by_day[e.date].append(e.glucose_reading)
+        tokens = normalize_food_tokens(e.food_item)
+        tokens_by_day[e.date].update(tokens)
+        for token in tokens:
+            food_readings[token].append(e.glucose_reading)
+        meal_lines[e.date].append((
+            time_to_minute(e.time),
+            f"{e.date} {e.time} {e.meal_type.value} {e.glucose_reading} {e.food_item}",
+        ))
+    for x in session.exercise_entries:
+        exercise_by_day[x.date] += x.duration_minutes
+    for m in session.mood_entries:
+        moods_by_day[m.date].append(m.mood)
+
+    all_dates = sorted(
+        set(readings_by_day) | set(exercise_by_day) | set(moods_by_day)
+    )
+    days: list[DayStats] = []
+    for d in all_dates:
+        readings = readings_by_day.get(d, [])
+        moods = moods_by_day.get(d, [])
+        days.append(DayStats(
+            date=d,
+            weekday=_WEEKDAYS[d.weekday()],
+            meals=len(readings),
+            glucose_mean=round(statistics.fmean(readings)) if readings else 0,
+            glucose_min=min(readings, default=0),
+            glucose_max=max(readings, default=0),
+            exercise_minutes=exercise_by_day.get(d, 0),
+            mood_mean=round(statistics.fmean(moods), 1) if moods else None,
+            food_tokens=tokens_by_day.get(d, set()),
+        ))
+
+    all_readings = [e.glucose_reading for e in session.glucose_entries]
+    header = (
+        f"Session '{session.name}' {format_day(session.date_range_start)} to "
+        f"{format_day(session.date_range_end)}: {len(session.glucose_entries)} meals, "
+        f"{len(session.exercise_entries)} exercise, "
+        f"{len(session.mood_entries)} mood entries"
+    )
+    if all_readings:
+        header += (
+            f"; glucose avg {round(statistics.fmean(all_readings))} "
+            f"min {min(all_readings)} max {max(all_readings)} mg/dL"
+        )
+
+    counts = Counter({token: len(r) for token, r in food_readings.items()})
+    top_foods = [
+        f"{token} {n}x avg {round(statistics.fmean(food_readings[token]))}"
+        for token, n in counts.most_common(_TOP_FOODS)
+    ]
+
+    # Flag clinical thresholds plus statistical outliers (> 2 SD from mean)
+    outliers: list[str] = []
+    if all_readings:
+        mean = statistics.fmean(all_readings)
+        sd = statistics.pstdev(all_readings) if len(all_readings) >= 5 else 0.0
+        for e in session.glucose_entries:
+            r = e.glucose_reading
+            if r >= HIGH_GLUCOSE or r <= LOW_GLUCOSE or (sd and abs(r - mean) > 2 * sd):
+                outliers.append(f"{e.date} {e.time} {r} after {e.food_item}")
+        for x in session.exercise_entries:
+            r = x.glucose_reading
+            if r >= HIGH_GLUCOSE or r <= LOW_GLUCOSE:
+                outliers.append(f"{x.date} {x.time} {r} during {x.activity_type}")
+
+    return SessionDigest(
+        header=header,
+        days=days,
+        top_foods=top_foods,
+        outliers=outliers,
+        meal_lines={
+            d: [line for _, line in sorted(lines)] for d, lines in meal_lines.items()
+        },
+    )
+
+
+def session_digest(session: ReportSession) -> SessionDigest:
+    """Return the digest for a session, cached by its content hash."""
+    return _digest_cache.get_or_compute(
+        session.content_hash(), lambda: _build_digest(session)
+    )
+
+
+def relevant_dates(digest: SessionDigest, question: str) -> list[date]:
+    """Return the session dates a question refers to, most recent first.
+
+    Dates are matched by ISO date, month/day ('Feb 22'), weekday name, or
+    a food mentioned in the question. Empty if nothing specific matches.
+    """
+    q = question.lower()
+    mentioned: set[date] = set()
+    for text in _ISO_DATE_PATTERN.findall(q):
+        try:
+            mentioned.add(parse_day(text))
+        except ValueError:
+            pass
+    month_days = {
+        (_MONTHS.index(m) + 1, int(d)) for m, d in _MONTH_DAY_PATTERN.findall(q)
+    }
+    weekdays = {w for w in _WEEKDAYS if w in q}
+    question_tokens = set(normalize_food_tokens(q))
+
+    matched: list[date] = []
+    for day in reversed(digest.days):
+        if (
+            day.date in mentioned
+            or (day.date.month, day.date.day) in month_days
+            or day.weekday in weekdays
+            or question_tokens & day.food_tokens
+        ):
+            matched.append(day.date)
+    return matched
+
+
+def _day_line(day: DayStats) -> str:
+    mood = "-" if day.mood_mean is None else f"{day.mood_mean:g}"
+    return (
+        f"{day.date} {day.weekday[:3].capitalize()}|{day.meals}|{day.glucose_mean}|"
+        f"{day.glucose_min}|{day.glucose_max}|{day.exercise_minutes}|{mood}"
+    )
+
+
+def build_context(
+    session: ReportSession,
+    question: str = "",
+    token_budget: int = DEFAULT_TOKEN_BUDGET,
+) -> str:
+    """Compress a session into a prompt context that fits token_budget.
+
+    Sections are added in priority order (overview, per-day stats, top
+    foods, outliers, then individual meals) and a section line is only
+    emitted if it fits the remaining budget. Days the question refers to
+    come first; if none match, the most recent days are used.
+    """
+    digest = session_digest(session)
+    focus = relevant_dates(digest, question)
+    day_order = focus or [d.date for d in reversed(digest.days)]
+    days_by_date = {d.date: d for d in digest.days}
+
+    lines: list[str] = []
+    used = 0
+
+    def add(line: str) -> bool:
+        nonlocal used
+        cost = estimate_tokens(line) + 1
+        if used + cost > token_budget:
+            return False
+        lines.append(line)
+        used += cost
+        return True
+
+    if not add(digest.header):
+        return ""
+
+    if digest.days and add("Days (date|meals|avg|min|max|exercise min|mood):"):
+        for d in day_order:
+            if not add(_day_line(days_by_date[d])):
+                break
+
+    if digest.top_foods:
+        add("Top foods: " + "; ".join(digest.top_foods))
+
+    if digest.outliers and add("Outliers:"):
+        for line in digest.outliers:
+            if not add(line):
+                break
+
+    if digest.meal_lines and add("Meals (date time type mg/dL food):"):
+        for d in day_order:
+            for line in digest.meal_lines.get(d, []):
+                if not add(line):
+                    return "\n".join(lines)
+
+    return "\n".join(lines)
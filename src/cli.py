@@ -0,0 +1,398 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+
+from src.export import EXPORT_FORMATS, EXPORT_TABLES, export_sessions, iter_sessions
+from src.food_normalizer import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_REQUESTS_PER_SECOND,
+    NormalizationError,
+    fake_normalization_responder,
+    normalize_foods_sync,
+)
+from src.history_index import rebuild_index
+from src.llm_client import client_from_env
+from src.maintenance import (
+    DEFAULT_ARCHIVE_AFTER_DAYS,
+    DEFAULT_ORPHAN_GRACE_HOURS,
+    DEFAULT_UPGRADE_LIMIT,
+    run_maintenance,
+)
+from src.models import parse_day
+from src.pdf_generator import DEFAULT_REPORTS_DIR, generate_report, report_filename
+from src.pdf_parser import parse_pdf
+from src.pipeline import DEFAULT_REPORT_DAYS, default_selected_dates, session_from_parse
+from src.report_queue import ReportOutcome, render_reports
+from src.storage import DEFAULT_SESSIONS_DIR, save_session
+from src.tenants import iter_stores, store_for_user, user_id_from_env
+from src.watcher import DEFAULT_POLL_SECONDS, DEFAULT_SETTLE_SECONDS, FolderWatcher
+
+
+@dataclass
+class IngestOptions:
+    sessions_dir: Path = DEFAULT_SESSIONS_DIR
+    reports_dir: Path = DEFAULT_REPORTS_DIR
+    days: int = DEFAULT_REPORT_DAYS
+    # Inclusive ISO dates; when either is set it replaces the `days` default
+    start: date | None = None
+    end: date | None = None
+    report: bool = True
+
+
+@dataclass
+class IngestResult:
+    pdf_path: Path
+    session_id: str = ""
+    meals: int = 0
+    exercises: int = 0
+    warnings: list[str] = field(default_factory=list)
+    timings: dict[str, float] = field(default_factory=dict)
+    report_path: Path | None = None
+    error: str = ""
+
+
+def ingest_pdf(pdf_path: Path, options: IngestOptions) -> IngestResult:
+    """Parse one Clarity PDF, save it as a draft session and render its report.
+
+    Runs in a worker process; errors are captured in the result rather
+    than raised so one bad file does not stop the batch.
+    """
+    result = IngestResult(pdf_path=pdf_path)
+    try:
+        start = time.perf_counter()
+        parsed = parse_pdf(pdf_path)
+        result.timings["parse"] = time.perf_counter() - start
+        result.warnings = parsed.warnings
+
+        start = time.perf_counter()
+        selected = None
+        if not (options.start or options.end):
+            selected = default_selected_dates(parsed.available_dates, options.days)
+        session = session_from_parse(
+            parsed,
+            name=pdf_path.stem,
+            source_filename=pdf_path.name,
+            selected_dates=selected,
+            start=options.start,
+            end=options.end,
+        )
+        save_session(session, base_dir=options.sessions_dir)
+        result.timings["save"] = time.perf_counter() - start
+        result.session_id = session.id
+        result.meals = len(session.glucose_entries)
+        result.exercises = len(session.exercise_entries)
+
+        if options.report and session.selected_dates:
+            start = time.perf_counter()
+            result.report_path = generate_report(
+                session, options.reports_dir / report_filename(session)
+            )
+            result.timings["report"] = time.perf_counter() - start
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    return result
+
+
+def _format_result(r: IngestResult) -> str:
+    timings = "  ".join(f"{k} {v:.2f}s" for k, v in r.timings.items())
+    if r.error:
+        return f"FAIL {r.pdf_path.name}  {timings}  {r.error}"
+    return (
+        f"ok   {r.pdf_path.name}  {timings}  {r.meals} meals, "
+        f"{r.exercises} exercise, {len(r.warnings)} warnings"
+    )
+
+
+def run_ingest(args: argparse.Namespace) -> int:
+    pdfs = sorted(args.input_dir.glob("*.pdf"))
+    if not pdfs:
+        print(f"No PDF files found in {args.input_dir}", file=sys.stderr)
+        return 1
+
+    store = store_for_user(args.user)
+    options = IngestOptions(
+        sessions_dir=args.sessions_dir or store.base_dir,
+        reports_dir=args.reports_dir or store.reports_dir,
+        days=args.days,
+        start=args.start,
+        end=args.end,
+        report=not args.no_report,
+    )
+    workers = args.workers or min(len(pdfs), os.cpu_count() or 1)
+
+    start = time.perf_counter()
+    results: list[IngestResult] = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for r in pool.map(ingest_pdf, pdfs, [options] * len(pdfs)):
+            print(_format_result(r))
+            for warning in r.warnings:
+                print(f"     warning: {warning}")
+            results.append(r)
+    elapsed = time.perf_counter() - start
+
+    failed = sum(1 for r in results if r.error)
+    warned = sum(1 for r in results if r.warnings)
+    print(
+        f"{len(results)} file(s) in {elapsed:.2f}s with {workers} worker(s): "
+        f"{failed} failed, {warned} with warnings"
+    )
+    if failed or (args.strict and warned):
+        return 1
+    return 0
+
+
+def run_maintain(args: argparse.Namespace) -> int:
+    while True:
+        stores = iter_stores() if args.all_users else [store_for_user(args.user)]
+        for store in stores:
+            report = run_maintenance(
+                store,
+                archive_after_days=args.archive_after_days,
+                orphan_grace_hours=args.orphan_grace_hours,
+                dry_run=args.dry_run,
+                upgrade_limit=args.upgrade_limit,
+            )
+            prefix = "[dry run] " if args.dry_run else ""
+            print(f"{prefix}{store.user_id}: {report.summary()}")
+        if not args.every:
+            return 0
+        time.sleep(args.every * 60)
+
+
+def run_export(args: argparse.Namespace) -> int:
+    store = store_for_user(args.user)
+    sessions = iter_sessions(
+        store.base_dir, args.start, args.end, set(args.session) if args.session else None
+    )
+    try:
+        result = export_sessions(
+            sessions, args.out, args.format, tables=args.table or tuple(EXPORT_TABLES),
+            start=args.start, end=args.end,
+        )
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(result.summary())
+    for path in result.paths.values():
+        print(f"     {path}")
+    return 0
+
+
+def run_normalize_foods(args: argparse.Namespace) -> int:
+    stores = list(iter_stores()) if args.all_users else [store_for_user(args.user)]
+    client = client_from_env(fake_normalization_responder)
+    distinct = normalized = indexed = 0
+    start = time.perf_counter()
+    # Each user keeps their own normalization cache, next to their index
+    for store in stores:
+        foods = [
+            e.food_item
+            for session in iter_sessions(store.base_dir)
+            for e in session.glucose_entries
+        ]
+        cache = store.normalization
+        known = len(cache)
+        try:
+            normalize_foods_sync(
+                foods, client, cache,
+                batch_size=args.batch_size, requests_per_second=args.requests_per_second,
+            )
+        except NormalizationError as e:
+            print(e, file=sys.stderr)
+            return 1
+        # Re-index so food search sees the canonical tokens
+        indexed += rebuild_index(store.base_dir, cache.tokens)
+        distinct += len(set(foods))
+        normalized += len(cache) - known
+    print(f"{distinct} distinct food item(s), {normalized} newly "
+          f"normalized in {time.perf_counter() - start:.2f}s; "
+          f"re-indexed {indexed} session(s)")
+    return 0
+
+
+def run_reports(args: argparse.Namespace) -> int:
+    stores = list(iter_stores()) if args.all_users else [store_for_user(args.user)]
+    jobs = [
+        (store, session_id)
+        for store in stores
+        for session_id in args.session_ids or [s["id"] for s in store.list()]
+    ]
+    if not jobs:
+        print("No sessions to report on", file=sys.stderr)
+        return 1
+
+    def progress(outcome: ReportOutcome, done: int, total: int) -> None:
+        print(f"[{done}/{total}] {outcome.summary()}", flush=True)
+
+    start = time.perf_counter()
+    outcomes = render_reports(jobs, workers=args.workers, force=args.force, progress=progress)
+    elapsed = time.perf_counter() - start
+    counts = {action: 0 for action in ("rendered", "cached", "skipped", "failed")}
+    for outcome in outcomes:
+        counts[outcome.action] += 1
+    print(f"{len(outcomes)} report(s) in {elapsed:.2f}s: "
+          + ", ".join(f"{n} {action}" for action, n in counts.items()))
+    return 1 if counts["failed"] else 0
+
+
+def run_watch(args: argparse.Namespace) -> int:
+    workers = args.workers or os.cpu_count() or 1
+    watcher = FolderWatcher(
+        args.watch_dir,
+        store_for_user(args.user),
+        settle_seconds=args.settle_seconds,
+        days=args.days,
+        executor=ProcessPoolExecutor(max_workers=workers),
+    )
+    print(f"Watching {args.watch_dir} every {args.interval:g}s with {workers} worker(s)")
+    try:
+        watcher.run(args.interval, report=lambda outcome: print(outcome.summary(), flush=True))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="healthcare-report",
+        description="Headless batch processing for the Healthcare Report Assistant.",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser(
+        "ingest", help="parse a directory of Clarity PDFs into sessions and reports"
+    )
+    ingest.add_argument("input_dir", type=Path)
+    ingest.add_argument("--user", default=user_id_from_env(),
+                        help="user whose session store receives the sessions "
+                             "(default: $HEALTHCARE_USER_ID or the default user)")
+    ingest.add_argument("--sessions-dir", type=Path,
+                        help="override the user's sessions directory")
+    ingest.add_argument("--reports-dir", type=Path,
+                        help="override the user's reports directory")
+    ingest.add_argument("--days", type=int, default=DEFAULT_REPORT_DAYS,
+                        help="number of report days to select per PDF")
+    ingest.add_argument("--start", type=parse_day, metavar="YYYY-MM-DD",
+                        help="select report dates from this date (overrides --days)")
+    ingest.add_argument("--end", type=parse_day, metavar="YYYY-MM-DD",
+                        help="select report dates up to this date (overrides --days)")
+    ingest.add_argument("--workers", type=int, default=0,
+                        help="worker processes (default: one per CPU, up to file count)")
+    ingest.add_argument("--no-report", action="store_true",
+                        help="skip PDF report generation")
+    ingest.add_argument("--strict", action="store_true",
+                        help="exit non-zero if any file has parse warnings")
+    ingest.set_defaults(func=run_ingest)
+
+    maintain = sub.add_parser(
+        "maintain",
+        help="archive finalized sessions and deduplicate and prune uploaded PDFs",
+    )
+    users = maintain.add_mutually_exclusive_group()
+    users.add_argument("--user", default=user_id_from_env(),
+                       help="user whose store is maintained "
+                            "(default: $HEALTHCARE_USER_ID or the default user)")
+    users.add_argument("--all-users", action="store_true",
+                       help="maintain every user's store")
+    maintain.add_argument("--archive-after-days", type=float,
+                          default=DEFAULT_ARCHIVE_AFTER_DAYS,
+                          help="archive finalized sessions not saved for this many days")
+    maintain.add_argument("--orphan-grace-hours", type=float,
+                          default=DEFAULT_ORPHAN_GRACE_HOURS,
+                          help="keep unreferenced uploads younger than this")
+    maintain.add_argument("--upgrade-limit", type=int, default=DEFAULT_UPGRADE_LIMIT,
+                          help="rewrite at most this many old-schema sessions per run")
+    maintain.add_argument("--dry-run", action="store_true",
+                          help="report what would change without changing anything")
+    maintain.add_argument("--every", type=float, default=0, metavar="MINUTES",
+                          help="keep running, repeating the job every MINUTES")
+    maintain.set_defaults(func=run_maintain)
+
+    export = sub.add_parser(
+        "export", help="write session entries to CSV, Parquet or Arrow files"
+    )
+    export.add_argument("out", type=Path, help="directory for one file per table")
+    export.add_argument("--user", default=user_id_from_env(),
+                        help="user whose sessions are exported "
+                             "(default: $HEALTHCARE_USER_ID or the default user)")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export.add_argument("--start", type=parse_day, metavar="YYYY-MM-DD",
+                        help="export entries from this date")
+    export.add_argument("--end", type=parse_day, metavar="YYYY-MM-DD",
+                        help="export entries up to this date")
+    export.add_argument("--session", action="append", metavar="ID",
+                        help="export only this session (repeatable)")
+    export.add_argument("--table", action="append", choices=tuple(EXPORT_TABLES),
+                        help="export only this table (repeatable; default: all)")
+    export.set_defaults(func=run_export)
+
+    normalize = sub.add_parser(
+        "normalize-foods",
+        help="normalize meal food items into canonical tokens with the LLM",
+    )
+    users = normalize.add_mutually_exclusive_group()
+    users.add_argument("--user", default=user_id_from_env(),
+                       help="user whose sessions are normalized "
+                            "(default: $HEALTHCARE_USER_ID or the default user)")
+    users.add_argument("--all-users", action="store_true",
+                       help="normalize the sessions of every user")
+    normalize.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                           help="food items per LLM request")
+    normalize.add_argument("--requests-per-second", type=float,
+                           default=DEFAULT_REQUESTS_PER_SECOND,
+                           help="LLM request rate limit (0 for none)")
+    normalize.set_defaults(func=run_normalize_foods)
+
+    reports = sub.add_parser(
+        "reports", help="render the PDF reports of many sessions in parallel"
+    )
+    reports.add_argument("session_ids", nargs="*", metavar="SESSION_ID",
+                         help="sessions to render (default: every session of the user)")
+    users = reports.add_mutually_exclusive_group()
+    users.add_argument("--user", default=user_id_from_env(),
+                       help="user whose sessions are rendered "
+                            "(default: $HEALTHCARE_USER_ID or the default user)")
+    users.add_argument("--all-users", action="store_true",
+                       help="render the sessions of every user")
+    reports.add_argument("--workers", type=int, default=0,
+                         help="worker processes (default: one per CPU, up to report count)")
+    reports.add_argument("--force", action="store_true",
+                         help="render again even if a session is unchanged since its report")
+    reports.set_defaults(func=run_reports)
+
+    watch = sub.add_parser(
+        "watch", help="ingest Clarity PDFs as they appear in a directory"
+    )
+    watch.add_argument("watch_dir", type=Path)
+    watch.add_argument("--user", default=user_id_from_env(),
+                       help="user whose session store receives the sessions "
+                            "(default: $HEALTHCARE_USER_ID or the default user)")
+    watch.add_argument("--interval", type=float, default=DEFAULT_POLL_SECONDS,
+                       help="seconds between directory scans")
+    watch.add_argument("--settle-seconds", type=float, default=DEFAULT_SETTLE_SECONDS,
+                       help="how long a file must stay unchanged before it is read")
+    watch.add_argument("--days", type=int, default=DEFAULT_REPORT_DAYS,
+                       help="number of report days to select per PDF")
+    watch.add_argument("--workers", type=int, default=0,
+                       help="parser processes (default: one per CPU)")
+    watch.set_defaults(func=run_watch)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import csv
+import io
+import tempfile
+import types
+import typing
+import zipfile
+from collections.abc import Collection, Iterable, Iterator
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Protocol
+
+from pydantic import BaseModel
+
+from src.models import (
+    ExerciseEntry,
+    GlucoseEntry,
+    InsulinEntry,
+    MoodEntry,
+    NoteEntry,
+    ReportSession,
+    parse_day,
+)
+from src.session_format import LazySession
+from src.storage import DEFAULT_SESSIONS_DIR, list_sessions, open_session
+
+EXPORT_FORMATS = ("csv", "parquet", "arrow")
+# Output table -> (session field, entry model)
+EXPORT_TABLES: dict[str, tuple[str, type[BaseModel]]] = {
+    "glucose": ("glucose_entries", GlucoseEntry),
+    "exercise": ("exercise_entries", ExerciseEntry),
+    "insulin": ("insulin_entries", InsulinEntry),
+    "notes": ("note_entries", NoteEntry),
+    "mood": ("mood_entries", MoodEntry),
+}
+# Rows buffered per table before they are written out
+DEFAULT_CHUNK_ROWS = 50_000
+# Entry fields that record app state rather than data
+_UNEXPORTED_FIELDS = frozenset({"edited_fields"})
+
+_SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+
+class _TableWriter(Protocol):
+    def write(self, columns: dict[str, list[Any]]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass
+class ExportResult:
+    paths: dict[str, Path] = field(default_factory=dict)
+    rows: dict[str, int] = field(default_factory=dict)
+    sessions: int = 0
+
+    def summary(self) -> str:
+        counts = ", ".join(f"{self.rows[t]:,} {t}" for t in self.paths)
+        return f"{self.sessions} session(s) exported: {counts}"
+
+
+def _column_kind(annotation: Any) -> str:
+    """'int', 'float', 'date' or 'str' for an entry field; enums export as their value."""
+    args = typing.get_args(annotation) if isinstance(annotation, types.UnionType) else ()
+    if args:
+        annotation = next(a for a in args if a is not type(None))
+    if annotation is int:
+        return "int"
+    if annotation is float:
+        return "float"
+    if annotation is date:
+        return "date"
+    return "str"
+
+
+def table_columns(table: str) -> dict[str, str]:
+    """Column name -> kind for an export table, session columns first."""
+    _, model = EXPORT_TABLES[table]
+    columns = {"session_id": "str", "session_name": "str"}
+    for name, info in model.model_fields.items():
+        if name not in _UNEXPORTED_FIELDS:
+            columns[name] = _column_kind(info.annotation)
+    return columns
+
+
+class _CsvWriter:
+    def __init__(self, path: Path, columns: dict[str, str]) -> None:
+        self._file = path.open("w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(columns)
+
+    def write(self, columns: dict[str, list[Any]]) -> None:
+        self._writer.writerows(zip(*columns.values()))
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ArrowWriter:
+    """Parquet or Arrow IPC file, one record batch per chunk."""
+
+    def __init__(self, path: Path, columns: dict[str, str], fmt: str) -> None:
+        import pyarrow as pa
+
+        types_ = {
+            "int": pa.int64(), "float": pa.float64(), "date": pa.date32(), "str": pa.string(),
+        }
+        self._schema = pa.schema([(name, types_[kind]) for name, kind in columns.items()])
+        self._pa = pa
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            self._writer: Any = pq.ParquetWriter(path, self._schema, compression="zstd")
+        else:
+            self._writer = pa.ipc.new_file(str(path), self._schema)
+
+    def write(self, columns: dict[str, list[Any]]) -> None:
+        batch = self._pa.RecordBatch.from_pydict(columns, schema=self._schema)
+        self._writer.write(batch)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+def _open_writer(path: Path, columns: dict[str, str], fmt: str) -> _TableWriter:
+    if fmt == "csv":
+        return _CsvWriter(path, columns)
+    try:
+        return _ArrowWriter(path, columns, fmt)
+    except ImportError:
+        raise RuntimeError(
+            f"{fmt} export needs pyarrow: pip install pyarrow (or the [export] extra)"
+        ) from None
+
+
+def iter_sessions(
+    base_dir: Path = DEFAULT_SESSIONS_DIR,
+    start: str | date | None = None,
+    end: str | date | None = None,
+    session_ids: Collection[str] | None = None,
+) -> Iterator[ReportSession | LazySession]:
+    """Sessions under base_dir overlapping [start, end], opened one at a time.
+
+    Sessions are chosen from the summary index, so only those selected are
+    read; binary sessions load just the entry blocks the export touches.
+    """
+    start = parse_day(start) if start else None
+    end = parse_day(end) if end else None
+    for summary in list_sessions(base_dir):
+        if session_ids is not None and summary["id"] not in session_ids:
+            continue
+        range_start, range_end = summary["date_range_start"], summary["date_range_end"]
+        if start and range_end and parse_day(range_end) < start:
+            continue
+        if end and range_start and parse_day(range_start) > end:
+            continue
+        yield open_session(summary["id"], base_dir)
+
+
+def export_sessions(
+    sessions: Iterable[ReportSession | LazySession],
+    out_dir: Path,
+    fmt: str = "csv",
+    tables: Collection[str] = tuple(EXPORT_TABLES),
+    start: str | date | None = None,
+    end: str | date | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> ExportResult:
+    """Write the entries of sessions to one file per table in out_dir.
+
+    Sessions are consumed one at a time and rows are flushed every
+    chunk_rows, so memory stays flat however much history is exported.
+    Entries outside [start, end] (inclusive) are skipped. Every
+    table file is written, with its header or schema, even when empty.
+    """
+    if fmt not in _SUFFIXES:
+        raise ValueError(f"unknown export format {fmt!r}; use one of {EXPORT_FORMATS}")
+    unknown = set(tables) - set(EXPORT_TABLES)
+    if unknown:
+        raise ValueError(f"unknown export tables: {', '.join(sorted(unknown))}")
+
+    start = parse_day(start) if start else None
+    end = parse_day(end) if end else None
+    out_dir.mkdir(parents=True, exist_ok=True)
+    result = ExportResult()
+    schemas = {t: table_columns(t) for t in EXPORT_TABLES if t in tables}
+    writers: dict[str, _TableWriter] = {}
+    buffers: dict[str, dict[str, list[Any]]] = {}
+    try:
+        for table, columns in schemas.items():
+            result.paths[table] = out_dir / f"{table}{_SUFFIXES[fmt]}"
+            result.rows[table] = 0
+            writers[table] = _open_writer(result.paths[table], columns, fmt)
+            buffers[table] = {name: [] for name in columns}
+
+        for session in sessions:
+            result.sessions += 1
+            for table, columns in schemas.items():
+                buffer = buffers[table]
+                fields = list(columns)[2:]
+                entries = getattr(session, EXPORT_TABLES[table][0])
+                for e in entries:
+                    if (start and e.date < start) or (end and e.date > end):
+                        continue
+                    buffer["session_id"].append(session.id)
+                    buffer["session_name"].append(session.name)
+                    for name in fields:
+                        buffer[name].append(getattr(e, name))
+                count = len(buffer["session_id"])
+                if count >= chunk_rows:
+                    writers[table].write(buffer)
+                    result.rows[table] += count
+                    buffers[table] = {name: [] for name in columns}
+
+        for table, buffer in buffers.items():
+            count = len(buffer["session_id"])
+            if count:
+                writers[table].write(buffer)
+                result.rows[table] += count
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return result
+
+
+def export_zip(
+    sessions: Iterable[ReportSession | LazySession],
+    fmt: str = "csv",
+    start: str | date | None = None,
+    end: str | date | None = None,
+) -> bytes:
+    """The export as a zip archive of its table files, for a download button."""
+    with tempfile.TemporaryDirectory() as tmp:
+        result = export_sessions(sessions, Path(tmp), fmt, start=start, end=end)
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path in result.paths.values():
+                zf.write(path, path.name)
+    return archive.getvalue()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from src.history_index import normalize_food_tokens
+from src.llm_client import ChatClient, Message
+
+DEFAULT_CACHE_PATH = Path("data/food_normalization.json")
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_REQUESTS_PER_SECOND = 1.0
+DEFAULT_MAX_RETRIES = 3
+
+NORMALIZE_PROMPT = (
+    "You normalize free-text food diary entries into canonical food tokens. "
+    "For each numbered entry, return a list of short lowercase singular food "
+    "names (e.g. 'Granola, yogurt, blueberries and coffee.' -> "
+    '["granola", "yogurt", "blueberry", "coffee"]). Respond with only a JSON '
+    "object mapping each entry number (as a string) to its list."
+)
+
+
+class NormalizationError(Exception):
+    """Raised when a batch cannot be normalized after all retries."""
+
+
+def cache_key(food_item: str) -> str:
+    """Collapse case, whitespace and trailing punctuation: 'Coffee.' == 'coffee'."""
+    return " ".join(food_item.lower().split()).strip(" .,;")
+
+
+class NormalizationCache:
+    """Persistent map from cache_key(food_item) to canonical tokens (JSON file)."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH) -> None:
+        self.path = path
+        self._data: dict[str, list[str]] = {}
+        if path.exists():
+            self._data = json.loads(path.read_text())
+
+    def get(self, food_item: str) -> list[str] | None:
+        return self._data.get(cache_key(food_item))
+
+    def tokens(self, food_item: str) -> list[str]:
+        """Heuristic tokens of food_item plus any cached canonical tokens."""
+        tokens = normalize_food_tokens(food_item)
+        for canonical in self.get(food_item) or []:
+            tokens.extend(normalize_food_tokens(canonical))
+        return list(dict.fromkeys(tokens))
+
+    def update(self, mapping: dict[str, list[str]]) -> None:
+        for food_item, tokens in mapping.items():
+            self._data[cache_key(food_item)] = tokens
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._data, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class RateLimiter:
+    """Space request starts at least 1/requests_per_second apart."""
+
+    def __init__(self, requests_per_second: float) -> None:
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_start - now
+            self._next_start = max(now, self._next_start) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def _batch_messages(batch: list[str]) -> list[Message]:
+    numbered = {str(i): item for i, item in enumerate(batch)}
+    return [
+        {"role": "system", "content": NORMALIZE_PROMPT},
+        {"role": "user", "content": json.dumps(numbered)},
+    ]
+
+
+def _parse_batch_response(response: str, batch: list[str]) -> dict[str, list[str]]:
+    """Map each batch item to its tokens. Raises ValueError on a bad reply."""
+    start, end = response.find("{"), response.rfind("}")
+    if start == -1 or end == -1:
+        raise ValueError("response contains no JSON object")
+    data = json.loads(response[start:end + 1])
+
+    mapping: dict[str, list[str]] = {}
+    for i, item in enumerate(batch):
+        tokens = data.get(str(i))
+        if not isinstance(tokens, list) or not all(isinstance(t, str) for t in tokens):
+            raise ValueError(f"missing or invalid tokens for entry {i}")
+        mapping[item] = [t.strip().lower() for t in tokens if t.strip()]
+    return mapping
+
+
+def fake_normalization_responder(messages: list[Message]) -> str:
+    """FakeProvider responder that answers normalization prompts offline."""
+    numbered = json.loads(messages[-1]["content"])
+    return json.dumps(
+        {key: normalize_food_tokens(item) for key, item in numbered.items()}
+    )
+
+
+async def normalize_foods(
+    food_items: Iterable[str],
+    client: ChatClient,
+    cache: NormalizationCache,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    retry_base_delay: float = 1.0,
+) -> dict[str, list[str]]:
+    """Normalize food items into canonical tokens, one LLM call per batch.
+
+    Items are deduplicated by cache_key and looked up in the persistent
+    cache first, so each distinct string is sent at most once ever. The
+    remaining items are sent batch_size at a time with at most
+    max_concurrency requests in flight, spaced by requests_per_second.
+    Failed batches are retried with exponential backoff, after evicting
+    any malformed reply from the client's response cache; the cache is
+    saved after every successful batch so an interrupted run resumes.
+
+    Returns a mapping for every input item (original spelling as key).
+    Raises NormalizationError if a batch still fails after max_retries.
+    """
+    items = list(dict.fromkeys(food_items))
+    pending: dict[str, str] = {}
+    for item in items:
+        key = cache_key(item)
+        if key and cache.get(item) is None and key not in pending:
+            pending[key] = item
+
+    uncached = list(pending.values())
+    batches = [
+        uncached[i:i + batch_size] for i in range(0, len(uncached), batch_size)
+    ]
+    semaphore = asyncio.Semaphore(max_concurrency)
+    limiter = RateLimiter(requests_per_second)
+
+    async def run_batch(batch: list[str]) -> None:
+        async with semaphore:
+            for attempt in range(max_retries + 1):
+                await limiter.wait()
+                messages = _batch_messages(batch)
+                try:
+                    response = await client.acomplete(messages)
+                    mapping = _parse_batch_response(response, batch)
+                except Exception as e:
+                    # Evict a malformed reply so the retry reaches the provider
+                    client.forget(messages)
+                    if attempt == max_retries:
+                        raise NormalizationError(
+                            f"batch of {len(batch)} items failed after "
+                            f"{max_retries + 1} attempts: {e}"
+                        ) from e
+                    await asyncio.sleep(retry_base_delay * 2 ** attempt)
+                    continue
+                cache.update(mapping)
+                cache.save()
+                return
+
+    await asyncio.gather(*(run_batch(batch) for batch in batches))
+
+    return {item: cache.get(item) or [] for item in items}
+
+
+def normalize_foods_sync(
+    food_items: Iterable[str],
+    client: ChatClient,
+    cache: NormalizationCache,
+    **kwargs: Any,
+) -> dict[str, list[str]]:
+    """Blocking wrapper around normalize_foods for scripts and page code."""
+    return asyncio.run(normalize_foods(food_items, client, cache, **kwargs))
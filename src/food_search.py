@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+from collections import defaultdict
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.history_index import INDEX_FILENAME, GlucoseRecord, normalize_food_tokens
+from src.storage import DEFAULT_SESSIONS_DIR
+
+# Weight of a prefix-only match relative to an exact token match
+_PREFIX_WEIGHT = 0.5
+
+
+@dataclass(frozen=True)
+class FoodSearchHit:
+    record: GlucoseRecord
+    score: float
+
+
+@dataclass(frozen=True)
+class FoodSearchStats:
+    matches: int
+    mean_glucose: float
+    min_glucose: int
+    max_glucose: int
+
+
+def _prefix_upper_bound(prefix: str) -> str:
+    """Smallest string greater than every string starting with prefix."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def search_foods(
+    query: str,
+    base_dir: Path = DEFAULT_SESSIONS_DIR,
+    limit: int = 50,
+) -> list[FoodSearchHit]:
+    """Search food items across all indexed sessions.
+
+    Each query token matches index tokens exactly or by prefix ('blue'
+    finds 'blueberry'). Hits are ranked by the sum of IDF weights of the
+    matched query tokens, with prefix-only matches discounted, then by
+    most recent date. Only the history index is read; session files are
+    never opened.
+    """
+    tokens = normalize_food_tokens(query)
+    index_path = base_dir / INDEX_FILENAME
+    if not tokens or not index_path.exists():
+        return []
+
+    conn = sqlite3.connect(index_path)
+    try:
+        total = conn.execute("SELECT COUNT(*) FROM glucose").fetchone()[0]
+        scores: dict[int, float] = defaultdict(float)
+
+        for token in tokens:
+            postings = conn.execute(
+                "SELECT token, glucose_id FROM food_tokens "
+                "WHERE token >= ? AND token < ?",
+                (token, _prefix_upper_bound(token)),
+            ).fetchall()
+
+            doc_freq: dict[str, int] = defaultdict(int)
+            for term, _ in postings:
+                doc_freq[term] += 1
+
+            # Best match per entry for this query token
+            best: dict[int, float] = {}
+            for term, glucose_id in postings:
+                weight = math.log(1 + total / doc_freq[term])
+                if term != token:
+                    weight *= _PREFIX_WEIGHT
+                if weight > best.get(glucose_id, 0.0):
+                    best[glucose_id] = weight
+            for glucose_id, weight in best.items():
+                scores[glucose_id] += weight
+
+        if not scores:
+            return []
+
+        records: dict[int, GlucoseRecord] = {}
+        ids = list(scores)
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for row in conn.execute(
+                "SELECT id, session_id, date, time, meal_type, food_item, "
+                f"glucose_reading FROM glucose WHERE id IN ({placeholders})",
+                chunk,
+            ):
+                records[row[0]] = GlucoseRecord.from_row(row[1:])
+    finally:
+        conn.close()
+
+    hits = [
+        FoodSearchHit(record=records[glucose_id], score=score)
+        for glucose_id, score in scores.items()
+        if glucose_id in records
+    ]
+    hits.sort(key=lambda h: (h.score, h.record.date), reverse=True)
+    return hits[:limit]
+
+
+def food_search_stats(
+    query: str, base_dir: Path = DEFAULT_SESSIONS_DIR
+) -> FoodSearchStats | None:
+    """Match count and glucose mean/min/max over every entry search_foods matches.
+
+    Aggregated in SQLite, so unlike a page of hits it is not capped by
+    search_foods' limit. Returns None when nothing matches.
+    """
+    tokens = normalize_food_tokens(query)
+    index_path = base_dir / INDEX_FILENAME
+    if not tokens or not index_path.exists():
+        return None
+
+    ranges = " OR ".join(["(token >= ? AND token < ?)"] * len(tokens))
+    params = [bound for token in tokens for bound in (token, _prefix_upper_bound(token))]
+    conn = sqlite3.connect(index_path)
+    try:
+        count, mean, low, high = conn.execute(
+            "SELECT COUNT(*), AVG(glucose_reading), MIN(glucose_reading), "
+            "MAX(glucose_reading) FROM glucose WHERE id IN "
+            f"(SELECT glucose_id FROM food_tokens WHERE {ranges})",
+            params,
+        ).fetchone()
+    finally:
+        conn.close()
+    if not count:
+        return None
+    return FoodSearchStats(matches=count, mean_glucose=mean, min_glucose=low, max_glucose=high)
@@ -0,0 +1,332 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from src.models import ReportSession, format_day, parse_day
+
+INDEX_FILENAME = "history.sqlite3"
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+_TIME_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})\s*([AaPp][Mm])$")
+
+_STOPWORDS = frozenset({
+    "a", "an", "and", "at", "for", "in", "of", "on", "or", "side",
+    "the", "to", "with",
+})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    digest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS glucose (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    meal_type TEXT NOT NULL,
+    food_item TEXT NOT NULL,
+    glucose_reading INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS glucose_by_date ON glucose (date, meal_type);
+CREATE INDEX IF NOT EXISTS glucose_by_session ON glucose (session_id);
+CREATE TABLE IF NOT EXISTS food_tokens (
+    token TEXT NOT NULL,
+    glucose_id INTEGER NOT NULL,
+    PRIMARY KEY (token, glucose_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS food_tokens_by_entry ON food_tokens (glucose_id);
+CREATE TABLE IF NOT EXISTS exercise (
+    id INTEGER PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    time TEXT NOT NULL,
+    minute INTEGER NOT NULL,
+    activity_type TEXT NOT NULL,
+    duration_minutes INTEGER NOT NULL,
+    heart_rate_bpm INTEGER NOT NULL,
+    glucose_reading INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS exercise_by_date ON exercise (date);
+CREATE INDEX IF NOT EXISTS exercise_by_session ON exercise (session_id);
+"""
+
+
+@dataclass(frozen=True)
+class GlucoseRecord:
+    session_id: str
+    date: date
+    time: str
+    meal_type: str
+    food_item: str
+    glucose_reading: int
+
+    @classmethod
+    def from_row(cls, row: tuple[Any, ...]) -> GlucoseRecord:
+        session_id, day, *rest = row
+        return cls(session_id, parse_day(day), *rest)
+
+
+@dataclass(frozen=True)
+class ExerciseRecord:
+    session_id: str
+    date: date
+    time: str
+    activity_type: str
+    duration_minutes: int
+    heart_rate_bpm: int
+    glucose_reading: int
+
+    @classmethod
+    def from_row(cls, row: tuple[Any, ...]) -> ExerciseRecord:
+        session_id, day, *rest = row
+        return cls(session_id, parse_day(day), *rest)
+
+
+def _singularize(token: str) -> str:
+    """Strip simple English plural endings ('berries' -> 'berry')."""
+    if len(token) <= 3 or token.endswith("ss"):
+        return token
+    if token.endswith("ies"):
+        return token[:-3] + "y"
+    if token.endswith(("oes", "shes", "ches", "xes")):
+        return token[:-2]
+    if token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def normalize_food_tokens(text: str) -> list[str]:
+    """Split a free-text food item into normalized, de-duplicated tokens.
+
+    'Granola, yogurt, blueberries and coffee.' -> ['granola', 'yogurt',
+    'blueberry', 'coffee']. Order of first appearance is preserved.
+    """
+    tokens: list[str] = []
+    seen: set[str] = set()
+    for raw in _TOKEN_PATTERN.findall(text.lower()):
+        if raw in _STOPWORDS or raw.isdigit():
+            continue
+        token = _singularize(raw)
+        if token not in seen:
+            seen.add(token)
+            tokens.append(token)
+    return tokens
+
+
+@lru_cache(maxsize=4096)
+def time_to_minute(time_str: str) -> int:
+    """Convert '9:40 AM' to minutes since midnight. Returns -1 if unparseable.
+
+    Cached: a day has at most 1,440 distinct times, each seen many times.
+    """
+    match = _TIME_PATTERN.match(time_str.strip())
+    if not match:
+        return -1
+    hour, minute = int(match.group(1)) % 12, int(match.group(2))
+    if match.group(3).upper() == "PM":
+        hour += 12
+    return hour * 60 + minute
+
+
+def _session_digest(session: ReportSession) -> str:
+    """Hash only the indexed parts of a session so metadata edits are no-ops."""
+    h = hashlib.sha256()
+    for e in session.glucose_entries:
+        h.update(
+            f"g|{e.date}|{e.time}|{e.meal_type.value}|{e.food_item}|{e.glucose_reading}\n".encode()
+        )
+    for x in session.exercise_entries:
+        h.update(
+            f"x|{x.date}|{x.time}|{x.activity_type}|{x.duration_minutes}"
+            f"|{x.heart_rate_bpm}|{x.glucose_reading}\n".encode()
+        )
+    return h.hexdigest()
+
+
+@contextmanager
+def _connect(base_dir: Path) -> Iterator[sqlite3.Connection]:
+    base_dir.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(base_dir / INDEX_FILENAME)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _delete_rows(conn: sqlite3.Connection, session_id: str) -> None:
+    conn.execute(
+        "DELETE FROM food_tokens WHERE glucose_id IN "
+        "(SELECT id FROM glucose WHERE session_id = ?)",
+        (session_id,),
+    )
+    conn.execute("DELETE FROM glucose WHERE session_id = ?", (session_id,))
+    conn.execute("DELETE FROM exercise WHERE session_id = ?", (session_id,))
+    conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+
+def index_session(
+    session: ReportSession,
+    base_dir: Path,
+    food_tokens: Callable[[str], list[str]] = normalize_food_tokens,
+) -> bool:
+    """Add or refresh a session's entries in the index under base_dir.
+
+    food_tokens splits a food item into its search tokens (pass a
+    NormalizationCache's tokens to add canonical names). Returns False
+    (and touches nothing) if the indexed entries are unchanged.
+    """
+    digest = _session_digest(session)
+    with _connect(base_dir) as conn:
+        row = conn.execute(
+            "SELECT digest FROM sessions WHERE session_id = ?", (session.id,)
+        ).fetchone()
+        if row is not None and row[0] == digest:
+            return False
+
+        _delete_rows(conn, session.id)
+        for e in session.glucose_entries:
+            cursor = conn.execute(
+                "INSERT INTO glucose (session_id, date, time, minute, meal_type, "
+                "food_item, glucose_reading) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    session.id, e.date.isoformat(), e.time, time_to_minute(e.time),
+                    e.meal_type.value, e.food_item, e.glucose_reading,
+                ),
+            )
+            conn.executemany(
+                "INSERT INTO food_tokens (token, glucose_id) VALUES (?, ?)",
+                [(token, cursor.lastrowid) for token in food_tokens(e.food_item)],
+            )
+        conn.executemany(
+            "INSERT INTO exercise (session_id, date, time, minute, activity_type, "
+            "duration_minutes, heart_rate_bpm, glucose_reading) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    session.id, x.date.isoformat(), x.time, time_to_minute(x.time),
+                    x.activity_type, x.duration_minutes, x.heart_rate_bpm,
+                    x.glucose_reading,
+                )
+                for x in session.exercise_entries
+            ],
+        )
+        conn.execute(
+            "INSERT INTO sessions (session_id, digest) VALUES (?, ?)",
+            (session.id, digest),
+        )
+    return True
+
+
+def remove_session(session_id: str, base_dir: Path) -> None:
+    """Retract all of a session's entries from the index."""
+    if not (base_dir / INDEX_FILENAME).exists():
+        return
+    with _connect(base_dir) as conn:
+        _delete_rows(conn, session_id)
+
+
+def rebuild_index(
+    base_dir: Path, food_tokens: Callable[[str], list[str]] = normalize_food_tokens
+) -> int:
+    """Re-index every session file under base_dir. Returns the session count."""
+    from src.storage import list_sessions, load_session
+
+    (base_dir / INDEX_FILENAME).unlink(missing_ok=True)
+    summaries = list_sessions(base_dir)
+    for summary in summaries:
+        index_session(load_session(summary["id"], base_dir), base_dir, food_tokens)
+    return len(summaries)
+
+
+def _date_clauses(
+    start: str | date | None, end: str | date | None
+) -> tuple[list[str], list[str | int]]:
+    clauses: list[str] = []
+    params: list[str | int] = []
+    if start is not None:
+        clauses.append("date >= ?")
+        params.append(format_day(parse_day(start)))
+    if end is not None:
+        clauses.append("date <= ?")
+        params.append(format_day(parse_day(end)))
+    return clauses, params
+
+
+def query_glucose(
+    base_dir: Path,
+    start: str | date | None = None,
+    end: str | date | None = None,
+    food: str | None = None,
+    meal_type: str | None = None,
+) -> list[GlucoseRecord]:
+    """Return indexed glucose entries in chronological order.
+
+    start/end are inclusive dates or ISO date strings. food matches entries containing
+    every normalized token of the query ('pasta', 'white wine').
+    """
+    if not (base_dir / INDEX_FILENAME).exists():
+        return []
+
+    clauses, params = _date_clauses(start, end)
+    if meal_type is not None:
+        clauses.append("meal_type = ?")
+        params.append(meal_type)
+    if food is not None:
+        tokens = normalize_food_tokens(food)
+        if not tokens:
+            return []
+        for token in tokens:
+            clauses.append("id IN (SELECT glucose_id FROM food_tokens WHERE token = ?)")
+            params.append(token)
+
+    sql = (
+        "SELECT session_id, date, time, meal_type, food_item, glucose_reading "
+        "FROM glucose"
+    )
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY date, minute"
+
+    with _connect(base_dir) as conn:
+        return [GlucoseRecord.from_row(row) for row in conn.execute(sql, params)]
+
+
+def query_exercise(
+    base_dir: Path,
+    start: str | date | None = None,
+    end: str | date | None = None,
+    activity_type: str | None = None,
+) -> list[ExerciseRecord]:
+    """Return indexed exercise entries in chronological order."""
+    if not (base_dir / INDEX_FILENAME).exists():
+        return []
+
+    clauses, params = _date_clauses(start, end)
+    if activity_type is not None:
+        clauses.append("activity_type = ?")
+        params.append(activity_type)
+
+    sql = (
+        "SELECT session_id, date, time, activity_type, duration_minutes, "
+        "heart_rate_bpm, glucose_reading FROM exercise"
+    )
+    if clauses:
+        sql += " WHERE " + " AND ".join(clauses)
+    sql += " ORDER BY date, minute"
+
+    with _connect(base_dir) as conn:
+        return [ExerciseRecord.from_row(row) for row in conn.execute(sql, params)]
@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Protocol
+
+DEFAULT_MODEL = "anthropic/claude-3-5-sonnet-20241022"
+DEFAULT_CACHE_DIR = Path("data/llm_cache")
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_CACHE_MAX_ENTRIES = 500
+DEFAULT_MAX_CONCURRENCY = 4
+
+Message = dict[str, str]
+
+
+class Provider(Protocol):
+    def stream(self, messages: list[Message], model: str) -> Iterator[str]:
+        """Yield response text chunks as they are generated."""
+        ...
+
+    async def acomplete(self, messages: list[Message], model: str) -> str:
+        """Return the full response without blocking the event loop."""
+        ...
+
+
+class LiteLLMProvider:
+    """Provider backed by litellm. litellm is imported on first use."""
+
+    def stream(self, messages: list[Message], model: str) -> Iterator[str]:
+        import litellm
+
+        response = litellm.completion(model=model, messages=messages, stream=True)
+        for chunk in response:
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    async def acomplete(self, messages: list[Message], model: str) -> str:
+        import litellm
+
+        response = await litellm.acompletion(model=model, messages=messages)
+        return response.choices[0].message.content or ""
+
+
+def _echo_responder(messages: list[Message]) -> str:
+    question = next(
+        (m["content"] for m in reversed(messages) if m["role"] == "user"), ""
+    )
+    digest = hashlib.sha256(question.encode()).hexdigest()[:8]
+    return f"[fake:{digest}] You asked: {question}"
+
+
+class FakeProvider:
+    """Deterministic offline provider for tests and load tests.
+
+    The reply is produced by `responder` (by default an echo of the last
+    user message) and streamed word by word, sleeping `token_delay`
+    seconds between chunks to mimic generation latency.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[list[Message]], str] = _echo_responder,
+        token_delay: float = 0.0,
+    ) -> None:
+        self.responder = responder
+        self.token_delay = token_delay
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def stream(self, messages: list[Message], model: str) -> Iterator[str]:
+        with self._lock:
+            self.calls += 1
+        reply = self.responder(messages)
+        words = reply.split(" ")
+        for i, word in enumerate(words):
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield word if i == len(words) - 1 else word + " "
+
+    async def acomplete(self, messages: list[Message], model: str) -> str:
+        with self._lock:
+            self.calls += 1
+        if self.token_delay:
+            await asyncio.sleep(self.token_delay)
+        return self.responder(messages)
+
+
+class ResponseCache:
+    """On-disk response cache keyed by prompt hash, with TTL and LRU eviction.
+
+    Each entry is a small JSON file; file mtime records the last access
+    and drives least-recently-used eviction once max_entries is exceeded.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model: str, messages: list[Message]) -> str:
+        payload = json.dumps({"model": model, "messages": messages}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        """Return the cached response, or None if missing or expired."""
+        path = self._path(key)
+        with self._lock:
+            try:
+                data = json.loads(path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                return None
+            now = self._clock()
+            if now - data["created_at"] > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                return None
+            os.utime(path, (now, now))
+            return data["response"]
+
+    def put(self, key: str, response: str) -> None:
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            now = self._clock()
+            path = self._path(key)
+            path.write_text(json.dumps({"created_at": now, "response": response}))
+            os.utime(path, (now, now))
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        entries = list(self.cache_dir.glob("*.json"))
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        for path in entries[:excess]:
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        if not self.cache_dir.exists():
+            return 0
+        return sum(1 for _ in self.cache_dir.glob("*.json"))
+
+
+class ChatClient:
+    """Streaming chat client with a response cache and bounded concurrency.
+
+    Cached responses are replayed immediately as a single chunk. Live
+    responses are yielded chunk by chunk as the provider produces them
+    and stored once complete. At most max_concurrency provider calls run
+    at once across all threads sharing the client.
+    """
+
+    def __init__(
+        self,
+        provider: Provider | None = None,
+        cache: ResponseCache | None = None,
+        model: str = DEFAULT_MODEL,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ) -> None:
+        self.provider = provider if provider is not None else LiteLLMProvider()
+        self.cache = cache
+        self.model = model
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+
+    def stream_chat(self, messages: list[Message]) -> Iterator[str]:
+        key = ResponseCache.make_key(self.model, messages)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        parts: list[str] = []
+        with self._semaphore:
+            for chunk in self.provider.stream(messages, self.model):
+                parts.append(chunk)
+                yield chunk
+
+        if self.cache is not None:
+            self.cache.put(key, "".join(parts))
+
+    def complete(self, messages: list[Message]) -> str:
+        return "".join(self.stream_chat(messages))
+
+    async def acomplete(self, messages: list[Message]) -> str:
+        """Async, non-streaming completion for batch pipelines.
+
+        Uses the response cache but not the thread semaphore; async
+        callers bound their own concurrency.
+        """
+        key = ResponseCache.make_key(self.model, messages)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = await self.provider.acomplete(messages, self.model)
+        if self.cache is not None:
+            self.cache.put(key, response)
+        return response
+
+    def forget(self, messages: list[Message]) -> None:
+        """Drop the cached response to messages, e.g. after it failed validation."""
+        if self.cache is not None:
+            self.cache.delete(ResponseCache.make_key(self.model, messages))
+
+
+def client_from_env(
+    fake_responder: Callable[[list[Message]], str] = _echo_responder,
+) -> ChatClient:
+    """Build a ChatClient from LLM_PROVIDER / LLM_MODEL environment variables.
+
+    LLM_PROVIDER=fake selects the offline FakeProvider, answering with
+    fake_responder.
+    """
+    provider: Provider
+    if os.environ.get("LLM_PROVIDER", "litellm").lower() == "fake":
+        provider = FakeProvider(responder=fake_responder)
+    else:
+        provider = LiteLLMProvider()
+    return ChatClient(
+        provider=provider,
+        cache=ResponseCache(),
+        model=os.environ.get("LLM_MODEL", DEFAULT_MODEL),
+    )
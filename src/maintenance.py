@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from src.archive import archive_session, query_archive
+from src.migrations import payload_version
+from src.models import SCHEMA_VERSION, SessionStatus
+from src.session_format import BINARY_SUFFIX, SessionFormatError, read_header
+from src.storage import SUMMARY_INDEX_FILENAME, list_sessions, load_session
+from src.tenants import SessionStore
+
+DEFAULT_ARCHIVE_AFTER_DAYS = 30
+# Uploads are written before their session is confirmed on the Upload page
+DEFAULT_ORPHAN_GRACE_HOURS = 24
+# Old-schema session files rewritten per maintenance run, and the pause between
+# rewrites, so the upgrade pass never holds the disk for long
+DEFAULT_UPGRADE_LIMIT = 200
+DEFAULT_UPGRADE_PAUSE_SECONDS = 0.01
+
+_DAY = 24 * 60 * 60
+
+# JSON sessions are written with schema_version as their last field
+_TRAILING_VERSION = re.compile(rb'"schema_version":\s*(\d+)\s*}\s*$')
+
+
+@dataclass
+class MaintenanceReport:
+    archived: list[str] = field(default_factory=list)
+    archived_bytes_before: int = 0
+    archived_bytes_after: int = 0
+    deduplicated: list[str] = field(default_factory=list)
+    removed_orphans: list[str] = field(default_factory=list)
+    bytes_reclaimed: int = 0
+    upgraded: list[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        return (
+            f"{len(self.archived)} session(s) archived "
+            f"({self.archived_bytes_before:,} -> {self.archived_bytes_after:,} bytes), "
+            f"{len(self.deduplicated)} duplicate upload(s) linked, "
+            f"{len(self.removed_orphans)} orphaned upload(s) removed, "
+            f"{self.bytes_reclaimed:,} bytes reclaimed, "
+            f"{len(self.upgraded)} session(s) upgraded"
+        )
+
+
+def _session_files(base_dir: Path) -> list[Path]:
+    if not base_dir.exists():
+        return []
+    return [
+        path for path in base_dir.iterdir()
+        if path.name != SUMMARY_INDEX_FILENAME
+        and path.suffix in (".json", BINARY_SUFFIX)
+    ]
+
+
+def stored_version(path: Path) -> int:
+    """Schema version of a session file, reading as little of it as possible."""
+    if path.suffix == BINARY_SUFFIX:
+        return payload_version(read_header(path))
+    with path.open("rb") as f:
+        f.seek(max(path.stat().st_size - 64, 0))
+        match = _TRAILING_VERSION.search(f.read())
+    if match:
+        return int(match[1])
+    return payload_version(json.loads(path.read_bytes()))
+
+
+def upgrade_sessions(
+    base_dir: Path,
+    limit: int = DEFAULT_UPGRADE_LIMIT,
+    pause: float = DEFAULT_UPGRADE_PAUSE_SECONDS,
+    dry_run: bool = False,
+    report: MaintenanceReport | None = None,
+) -> MaintenanceReport:
+    """Rewrite up to limit session files stored with an older schema version.
+
+    load_session already upgrades a file when it is opened; this pass
+    reaches the ones nobody opens, a bounded batch per run with a pause
+    between rewrites, so a large store upgrades over several runs
+    without downtime.
+    """
+    report = report or MaintenanceReport()
+    for path in sorted(_session_files(base_dir)):
+        if len(report.upgraded) >= limit:
+            break
+        try:
+            version = stored_version(path)
+        except (SessionFormatError, json.JSONDecodeError, OSError, TypeError, ValueError):
+            continue
+        if version == SCHEMA_VERSION:
+            continue
+        session_id = path.name.removesuffix(path.suffix)
+        report.upgraded.append(session_id)
+        if not dry_run:
+            load_session(session_id, base_dir)
+            time.sleep(pause)
+    return report
+
+
+def archive_finalized(
+    base_dir: Path,
+    older_than_days: float = DEFAULT_ARCHIVE_AFTER_DAYS,
+    dry_run: bool = False,
+    report: MaintenanceReport | None = None,
+) -> MaintenanceReport:
+    """Move finalized sessions not saved for older_than_days into the archive.
+
+    The session file is removed once its archived copy is committed;
+    load_session and list_sessions fall back to the archive.
+    """
+    report = report or MaintenanceReport()
+    cutoff = time.time() - older_than_days * _DAY
+    finalized = {
+        s["id"] for s in list_sessions(base_dir) if s["status"] == SessionStatus.FINALIZED
+    }
+    for path in _session_files(base_dir):
+        session_id = path.name.removesuffix(path.suffix)
+        stat = path.stat()
+        if session_id not in finalized or stat.st_mtime > cutoff:
+            continue
+        report.archived.append(session_id)
+        report.archived_bytes_before += stat.st_size
+        if dry_run:
+            continue
+        session = load_session(session_id, base_dir)
+        report.archived_bytes_after += archive_session(session, base_dir)
+        path.unlink()
+    return report
+
+
+def referenced_uploads(base_dir: Path) -> set[str]:
+    """Upload file names referenced by every live and archived session under base_dir.
+
+    Uploads are saved under the final component of the client's file
+    name; sessions saved before source_filename was stored that way may
+    still hold the full name, so both reduce to the saved file's name.
+    """
+    names: set[str] = set()
+    for path in _session_files(base_dir):
+        try:
+            if path.suffix == BINARY_SUFFIX:
+                data = read_header(path)
+            else:
+                data = json.loads(path.read_bytes())
+        except (SessionFormatError, json.JSONDecodeError, OSError):
+            continue
+        if isinstance(data, dict) and data.get("source_filename"):
+            names.add(data["source_filename"])
+    names.update(a.source_filename for a in query_archive(base_dir) if a.source_filename)
+    return {PurePosixPath(name).name for name in names}
+
+
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _uploads(uploads_dir: Path) -> list[Path]:
+    if not uploads_dir.exists():
+        return []
+    return sorted(p for p in uploads_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf")
+
+
+def deduplicate_uploads(
+    uploads_dir: Path,
+    dry_run: bool = False,
+    report: MaintenanceReport | None = None,
+) -> MaintenanceReport:
+    """Hard-link uploads with identical content to one copy.
+
+    File names are kept, so every session's source_filename still
+    resolves; only the duplicate bytes are freed. Files are hashed only
+    when another upload has the same size.
+    """
+    report = report or MaintenanceReport()
+    by_size: dict[int, list[Path]] = {}
+    for path in _uploads(uploads_dir):
+        by_size.setdefault(path.stat().st_size, []).append(path)
+
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        keep: dict[str, tuple[Path, os.stat_result]] = {}
+        for path in paths:
+            digest = _file_digest(path)
+            stat = path.stat()
+            if digest not in keep:
+                keep[digest] = (path, stat)
+                continue
+            original, original_stat = keep[digest]
+            if (stat.st_dev, stat.st_ino) == (original_stat.st_dev, original_stat.st_ino):
+                continue
+            report.deduplicated.append(path.name)
+            report.bytes_reclaimed += size
+            if dry_run:
+                continue
+            tmp_path = path.with_name(f".{path.name}.link")
+            os.link(original, tmp_path)
+            os.replace(tmp_path, path)
+    return report
+
+
+def collect_orphan_uploads(
+    uploads_dir: Path,
+    base_dir: Path,
+    grace_hours: float = DEFAULT_ORPHAN_GRACE_HOURS,
+    dry_run: bool = False,
+    report: MaintenanceReport | None = None,
+) -> MaintenanceReport:
+    """Delete uploads no live or archived session references.
+
+    Uploads modified within grace_hours are kept, since a PDF is saved
+    before the user confirms the session that will reference it.
+    """
+    report = report or MaintenanceReport()
+    referenced = referenced_uploads(base_dir)
+    cutoff = time.time() - grace_hours * 60 * 60
+    for path in _uploads(uploads_dir):
+        stat = path.stat()
+        if path.name in referenced or stat.st_mtime > cutoff:
+            continue
+        report.removed_orphans.append(path.name)
+        # Hard-linked copies free their bytes only with the last link
+        if stat.st_nlink == 1:
+            report.bytes_reclaimed += stat.st_size
+        if not dry_run:
+            path.unlink()
+    return report
+
+
+def run_maintenance(
+    store: SessionStore,
+    archive_after_days: float = DEFAULT_ARCHIVE_AFTER_DAYS,
+    orphan_grace_hours: float = DEFAULT_ORPHAN_GRACE_HOURS,
+    dry_run: bool = False,
+    upgrade_limit: int = DEFAULT_UPGRADE_LIMIT,
+) -> MaintenanceReport:
+    """Upgrade old-schema sessions, archive old finalized ones, then dedupe and
+    prune one user's uploads."""
+    report = MaintenanceReport()
+    upgrade_sessions(store.base_dir, upgrade_limit, dry_run=dry_run, report=report)
+    archive_finalized(store.base_dir, archive_after_days, dry_run, report)
+    collect_orphan_uploads(
+        store.uploads_dir, store.base_dir, orphan_grace_hours, dry_run, report
+    )
+    deduplicate_uploads(store.uploads_dir, dry_run, report)
+    return report
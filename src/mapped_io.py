@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import mmap
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[mmap.mmap | bytes]:
+    """Map a file read-only for the duration of the block.
+
+    Pages come from the OS page cache and are shared by every process
+    mapping the same file, instead of each reader holding a private copy.
+    Empty files (which cannot be mapped) yield b"". Callers must release
+    any memoryview of the mapping before the block exits.
+    """
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b""
+            return
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def stream_to_file(
+    source: BinaryIO, dest: Path, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> int:
+    """Copy a binary stream to dest in fixed-size chunks.
+
+    Writes to a temporary sibling and renames it into place, so readers
+    never see a partially written file. Returns the number of bytes written.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = dest.with_name(dest.name + ".part")
+    with tmp_path.open("wb") as out:
+        shutil.copyfileobj(source, out, chunk_size)
+        written = out.tell()
+    os.replace(tmp_path, dest)
+    return written
+
+
+def write_atomic(dest: Path, data: bytes) -> None:
+    """Replace dest with data so readers see the old file or the new one, never a mix.
+
+    The data goes to a uniquely named temporary sibling first, so
+    concurrent writers of the same file never share a temporary file.
+    """
+    tmp = tempfile.NamedTemporaryFile(dir=dest.parent, suffix=".tmp", delete=False)
+    try:
+        with tmp:
+            tmp.write(data)
+        os.replace(tmp.name, dest)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from pydantic import ValidationError
+
+from src.models import CORRECTABLE_GLUCOSE_FIELDS, SCHEMA_VERSION, ReportSession
+
+Payload = dict[str, Any]
+Migration = Callable[[Payload], Payload]
+
+
+class SchemaVersionError(ValueError):
+    """Raised for a session stored by a newer version of the app."""
+
+
+# from_version -> function turning a payload of that version into the next
+_MIGRATIONS: dict[int, Migration] = {}
+
+
+def migration(from_version: int) -> Callable[[Migration], Migration]:
+    """Register a step upgrading payloads of from_version to from_version + 1.
+
+    Steps work on the plain JSON payload (entry lists are lists of dicts),
+    so they can rename or reshape fields the current models would reject.
+    """
+    def register(fn: Migration) -> Migration:
+        if from_version in _MIGRATIONS:
+            raise ValueError(f"migration from version {from_version} already registered")
+        _MIGRATIONS[from_version] = fn
+        return fn
+    return register
+
+
+@migration(0)
+def _add_schema_version(payload: Payload) -> Payload:
+    """Sessions saved before versioning differ only by the missing stamp."""
+    return payload
+
+
+@migration(1)
+def _track_glucose_corrections(payload: Payload) -> Payload:
+    """Version 1 did not record which glucose fields the user corrected.
+
+    Every correctable field counts as corrected, so re-uploads keep them
+    as version 1 merges did.
+    """
+    for entry in payload.get("glucose_entries", []):
+        entry.setdefault("edited_fields", list(CORRECTABLE_GLUCOSE_FIELDS))
+    return payload
+
+
+def payload_version(payload: Mapping[str, Any]) -> int:
+    return int(payload.get("schema_version", 0))
+
+
+def is_current(session: ReportSession) -> bool:
+    """True if session was validated from a payload stamped with SCHEMA_VERSION."""
+    return (
+        "schema_version" in session.model_fields_set
+        and session.schema_version == SCHEMA_VERSION
+    )
+
+
+def upgrade_payload(payload: Payload) -> Payload:
+    """Apply every registered step from the payload's version to SCHEMA_VERSION."""
+    version = payload_version(payload)
+    if version > SCHEMA_VERSION:
+        raise SchemaVersionError(
+            f"session schema version {version} is newer than this app ({SCHEMA_VERSION})"
+        )
+    while version < SCHEMA_VERSION:
+        payload = _MIGRATIONS[version](payload)
+        version += 1
+        payload["schema_version"] = version
+    return payload
+
+
+def session_from_payload(payload: Payload) -> ReportSession:
+    return ReportSession.model_validate(upgrade_payload(payload))
+
+
+def session_from_json(content: bytes | str) -> tuple[ReportSession, int]:
+    """Validate a stored JSON session, upgrading it if it is older.
+
+    Returns the session and the version it was stored with. Current
+    payloads take pydantic's JSON fast path; older ones are parsed to a
+    dict, upgraded and validated.
+    """
+    try:
+        session = ReportSession.model_validate_json(content)
+    except ValidationError:
+        session = None
+    if session is not None and is_current(session):
+        return session, SCHEMA_VERSION
+    payload = json.loads(content)
+    if not isinstance(payload, dict):
+        raise ValueError("stored session is not a JSON object")
+    version = payload_version(payload)
+    return session_from_payload(payload), version
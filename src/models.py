@@ -1,10 +1,37 @@
 from __future__ import annotations
 
+import hashlib
+import sys
 import uuid
-from datetime import datetime, timezone
+from array import array
+from collections.abc import Iterable
+from datetime import date, datetime, timezone
 from enum import StrEnum
+from functools import lru_cache
 
-from pydantic import BaseModel, ConfigDict, field_validator
+from pydantic import BaseModel, ConfigDict, field_serializer, field_validator
+
+
+@lru_cache(maxsize=8192)
+def _parse_iso_day(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def parse_day(value: str | date) -> date:
+    """A date from an ISO 'YYYY-MM-DD' string, or the date itself.
+
+    For dates arriving as text outside model validation (CLI arguments,
+    query parameters, summary index fields). A store holds few distinct
+    days, so parsed strings are cached. Raises ValueError if malformed.
+    """
+    if isinstance(value, date):
+        return value
+    return _parse_iso_day(value.strip())
+
+
+def format_day(value: date | None) -> str:
+    """ISO text of a date, '' for None, as stored in session files and indexes."""
+    return value.isoformat() if value else ""
 
 
 class MealType(StrEnum):
@@ -26,14 +53,20 @@ class SessionStatus(StrEnum):
     FINALIZED = "finalized"
 
 
+# Glucose entry fields the user can correct on the Review page
+CORRECTABLE_GLUCOSE_FIELDS = ("food_item", "meal_type", "glucose_reading")
+
+
 class GlucoseEntry(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
-    date: str
+    date: date
     time: str
     glucose_reading: int
     food_item: str
     meal_type: MealType
+    # Fields the user corrected; a re-upload keeps their values
+    edited_fields: list[str] = []
 
     @field_validator("glucose_reading")
     @classmethod
@@ -42,11 +75,18 @@ class GlucoseEntry(BaseModel):
             raise ValueError("glucose_reading must be positive")
         return v
 
+    def corrected(self, **values: object) -> GlucoseEntry:
+        """A validated copy with values applied, adding the fields they change to edited_fields."""
+        entry = GlucoseEntry.model_validate({**self.model_dump(), **values})
+        changed = {name for name in values if getattr(entry, name) != getattr(self, name)}
+        entry.edited_fields = sorted(changed.union(self.edited_fields))
+        return entry
+
 
 class ExerciseEntry(BaseModel):
     model_config = ConfigDict(str_strip_whitespace=True)
 
-    date: str
+    date: date
     time: str
     activity_type: str
     duration_minutes: int
@@ -61,8 +101,66 @@ class ExerciseEntry(BaseModel):
         return v
 
 
+class InsulinEntry(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    date: date
+    time: str
+    insulin_type: str
+    units: float
+    glucose_reading: int | None = None
+
+    @field_validator("units")
+    @classmethod
+    def units_must_be_positive(cls, v: float) -> float:
+        if v <= 0:
+            raise ValueError("units must be positive")
+        return v
+
+
+class NoteEntry(BaseModel):
+    model_config = ConfigDict(str_strip_whitespace=True)
+
+    date: date
+    time: str
+    text: str
+    glucose_reading: int | None = None
+
+
+class CgmTrace(BaseModel):
+    """One day's continuous glucose trace, read from the Clarity chart.
+
+    Samples are packed little-endian uint16 (minute of day, mg/dL) pairs,
+    about 1 KB for a day of 5-minute readings; JSON holds them base64.
+    """
+
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
+    date: date
+    samples: bytes = b""
+
+    @classmethod
+    def from_points(
+        cls, date: date, minutes: Iterable[int], values: Iterable[int]
+    ) -> CgmTrace:
+        packed = array("H")
+        for minute, value in zip(minutes, values, strict=True):
+            packed.append(minute)
+            packed.append(value)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return cls(date=date, samples=packed.tobytes())
+
+    def points(self) -> tuple[array, array]:
+        """(minutes, mg/dL) as two uint16 arrays."""
+        packed = array("H", self.samples)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed[0::2], packed[1::2]
+
+
 class MoodEntry(BaseModel):
-    date: str
+    date: date
     time_slot: TimeSlot
     time: str
     energy: str
@@ -76,26 +174,45 @@ class MoodEntry(BaseModel):
         return v
 
 
+# Shape of stored sessions; bump it together with a migration in src/migrations.py
+SCHEMA_VERSION = 2
+
+
 class ReportSession(BaseModel):
     id: str
     name: str
     created_at: str
-    date_range_start: str
-    date_range_end: str
-    selected_dates: list[str]
+    # None for a session with no dates yet; stored as ""
+    date_range_start: date | None
+    date_range_end: date | None
+    selected_dates: list[date]
     glucose_entries: list[GlucoseEntry] = []
     exercise_entries: list[ExerciseEntry] = []
+    insulin_entries: list[InsulinEntry] = []
+    note_entries: list[NoteEntry] = []
+    cgm_traces: list[CgmTrace] = []
     mood_entries: list[MoodEntry] = []
     status: SessionStatus = SessionStatus.DRAFT
     source_filename: str = ""
+    # Payloads stored before versioning have none, which reads as version 0
+    schema_version: int = SCHEMA_VERSION
+
+    @field_validator("date_range_start", "date_range_end", mode="before")
+    @classmethod
+    def empty_range_is_none(cls, v: object) -> object:
+        return None if v == "" else v
+
+    @field_serializer("date_range_start", "date_range_end")
+    def serialize_range(self, v: date | None) -> str:
+        return format_day(v)
 
     @classmethod
     def create_new(
         cls,
         name: str,
-        date_range_start: str,
-        date_range_end: str,
-        selected_dates: list[str],
+        date_range_start: str | date | None,
+        date_range_end: str | date | None,
+        selected_dates: Iterable[str | date],
     ) -> ReportSession:
         return cls(
             id=str(uuid.uuid4()),
@@ -103,5 +220,9 @@ class ReportSession(BaseModel):
             created_at=datetime.now(timezone.utc).isoformat(),
             date_range_start=date_range_start,
             date_range_end=date_range_end,
-            selected_dates=selected_dates,
+            selected_dates=list(selected_dates),
         )
+
+    def content_hash(self) -> str:
+        """SHA-256 of the serialized session; changes whenever any field does."""
+        return hashlib.sha256(self.model_dump_json().encode()).hexdigest()
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from xml.sax.saxutils import escape
+
+from src.cgm_trace import MINUTES_PER_DAY, lttb
+from src.history_index import time_to_minute
+from src.models import CgmTrace, ReportSession, TimeSlot, format_day
+
+DEFAULT_REPORTS_DIR = Path("data/reports")
+
+TABLE_HEADER = [
+    "Event", "Time of Day", "Details",
+    "Energy (Description)", "Mood (Description & Score 1-5)",
+]
+
+_SLOT_LABELS = {
+    TimeSlot.AFTER_BREAKING_FAST: "After Breaking Fast",
+    TimeSlot.AROUND_NOON: "Around Noon",
+    TimeSlot.AFTER_DINNER: "After Dinner",
+    TimeSlot.BEFORE_BED: "Before Bed",
+}
+
+# Minutes since midnight used to place mood rows without a parseable time
+_SLOT_DEFAULT_MINUTE = {
+    TimeSlot.AFTER_BREAKING_FAST: 8 * 60,
+    TimeSlot.AROUND_NOON: 12 * 60,
+    TimeSlot.AFTER_DINNER: 19 * 60,
+    TimeSlot.BEFORE_BED: 24 * 60,
+}
+
+
+# mg/dL axis of the trace chart, and the target range shaded on it
+_TRACE_AXIS = (40, 400)
+_TARGET_RANGE = (70, 180)
+
+
+@dataclass
+class ReportDay:
+    title: str
+    rows: list[list[str]]
+    mood_rows: set[int]
+    trace: CgmTrace | None = None
+
+
+def report_filename(session: ReportSession) -> str:
+    return (
+        f"report_{format_day(session.date_range_start)}_to_"
+        f"{format_day(session.date_range_end)}"
+        f"_{session.id[:8]}.pdf"
+    )
+
+
+def build_report_days(session: ReportSession) -> list[ReportDay]:
+    """Arrange a session into per-day report tables, most recent day first.
+
+    Each day's rows interleave mood check-ins (bold in the PDF), meals
+    and exercise in time order. Row indices of mood rows are returned so
+    the renderer can style them.
+    """
+    events: dict[date, list[tuple[int, int, list[str]]]] = {}
+
+    def add(day: date, minute: int, order: int, row: list[str]) -> None:
+        events.setdefault(day, []).append((minute, order, row))
+
+    for m in session.mood_entries:
+        minute = time_to_minute(m.time)
+        if minute < 0:
+            minute = _SLOT_DEFAULT_MINUTE[m.time_slot]
+        add(m.date, minute, 0, [
+            _SLOT_LABELS[m.time_slot], m.time, "", m.energy, str(m.mood),
+        ])
+    for e in session.glucose_entries:
+        add(e.date, time_to_minute(e.time), 1, [
+            e.meal_type.value.capitalize(), e.time, e.food_item, "", "",
+        ])
+    for x in session.exercise_entries:
+        details = f"{x.duration_minutes} min"
+        if x.heart_rate_bpm:
+            details += f" • {x.heart_rate_bpm} BPM"
+        if x.activity_type != "Walking":
+            details = f"{x.activity_type}, {details}"
+        add(x.date, time_to_minute(x.time), 1, ["Exercise", x.time, details, "", ""])
+    for i in session.insulin_entries:
+        add(i.date, time_to_minute(i.time), 1, [
+            "Insulin", i.time, f"{i.units:g} units • {i.insulin_type}", "", "",
+        ])
+    for n in session.note_entries:
+        add(n.date, time_to_minute(n.time), 1, ["Note", n.time, n.text, "", ""])
+
+    traces = {t.date: t for t in session.cgm_traces}
+    days: list[ReportDay] = []
+    for i, day in enumerate(sorted(events, reverse=True)):
+        ordered = sorted(events[day], key=lambda item: (item[0], item[1]))
+        title = f"Day {i + 1}: {day.strftime('%A, %b %d, %Y')}"
+        days.append(ReportDay(
+            title=title,
+            rows=[row for _, _, row in ordered],
+            mood_rows={j for j, (_, order, _) in enumerate(ordered) if order == 0},
+            trace=traces.get(day),
+        ))
+    return days
+
+
+@lru_cache(maxsize=1)
+def report_styles() -> dict[str, Any]:
+    """ReportLab paragraph styles, built once per process."""
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+
+    sheet = getSampleStyleSheet()
+    return {
+        "title": sheet["Title"],
+        "heading": sheet["Heading3"],
+        "body": sheet["BodyText"],
+        "cell": ParagraphStyle("cell", parent=sheet["BodyText"], fontSize=8, leading=10),
+        "cell_bold": ParagraphStyle(
+            "cell_bold", parent=sheet["BodyText"],
+            fontName="Helvetica-Bold", fontSize=8, leading=10,
+        ),
+    }
+
+
+def trace_drawing(trace: CgmTrace, width: float, height: float) -> Any:
+    """A day's glucose trace as a ReportLab drawing, one point per point of width."""
+    from reportlab.graphics.shapes import Drawing, PolyLine, Rect
+    from reportlab.lib import colors
+
+    low, high = _TRACE_AXIS
+
+    def y(value: int) -> float:
+        return (min(max(value, low), high) - low) / (high - low) * height
+
+    drawing = Drawing(width, height)
+    drawing.add(Rect(0, 0, width, height, fillColor=None, strokeColor=colors.grey,
+                     strokeWidth=0.5))
+    band_low, band_high = (y(v) for v in _TARGET_RANGE)
+    drawing.add(Rect(0, band_low, width, band_high - band_low, strokeColor=None,
+                     fillColor=colors.Color(0.85, 0.93, 0.85)))
+
+    minutes, values = trace.points()
+    kept = lttb(minutes, values, int(width))
+    points: list[float] = []
+    for i in kept:
+        points.extend((minutes[i] / MINUTES_PER_DAY * width, y(values[i])))
+    if len(kept) >= 2:
+        drawing.add(PolyLine(points, strokeColor=colors.black, strokeWidth=0.8))
+    return drawing
+
+
+def generate_report(session: ReportSession, output_path: Path) -> Path:
+    """Render the advisor report for a session as a PDF at output_path."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    if session.date_range_start is None or session.date_range_end is None:
+        raise ValueError("session has no date range")
+    styles = report_styles()
+    start = session.date_range_start.strftime("%B %d, %Y")
+    end = session.date_range_end.strftime("%B %d, %Y")
+    days = build_report_days(session)
+
+    story: list[Any] = [
+        Paragraph(f"{len(days)}-Day Food, Energy, and Mood Journal", styles["title"]),
+        Paragraph(f"<b>Session:</b> {escape(session.name)}", styles["body"]),
+        Paragraph(f"<b>Dates:</b> {start} - {end}", styles["body"]),
+    ]
+    if session.source_filename:
+        story.append(Paragraph(
+            f"<b>Source PDF:</b> {escape(session.source_filename)}", styles["body"]
+        ))
+
+    col_widths = [1.2 * inch, 0.8 * inch, 2.6 * inch, 1.2 * inch, 1.2 * inch]
+    for day in days:
+        story.append(Spacer(1, 0.2 * inch))
+        story.append(Paragraph(day.title, styles["heading"]))
+        if day.trace is not None:
+            story.append(trace_drawing(day.trace, sum(col_widths), 0.9 * inch))
+            story.append(Spacer(1, 0.1 * inch))
+        data = [[Paragraph(escape(h), styles["cell_bold"]) for h in TABLE_HEADER]]
+        for j, row in enumerate(day.rows):
+            style = styles["cell_bold"] if j in day.mood_rows else styles["cell"]
+            data.append([Paragraph(escape(cell), style) for cell in row])
+        table = Table(data, colWidths=col_widths, repeatRows=1)
+        table.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ]))
+        story.append(table)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    doc = SimpleDocTemplate(
+        str(output_path), pagesize=letter,
+        leftMargin=0.6 * inch, rightMargin=0.6 * inch,
+        topMargin=0.6 * inch, bottomMargin=0.6 * inch,
+        title=f"Report {format_day(session.date_range_start)} to "
+              f"{format_day(session.date_range_end)}",
+    )
+    doc.build(story)
+    return output_path
@@ -1,19 +1,48 @@
 from __future__ import annotations
 
 import re
-from collections.abc import Sequence
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterable, Iterator, Sequence
 from dataclasses import dataclass, field
+from datetime import date
+from itertools import chain
+from operator import attrgetter
 from pathlib import Path
 
-import pdfplumber
-
-from src.models import ExerciseEntry, GlucoseEntry, MealType
+from pydantic import TypeAdapter, ValidationError
+
+from src.mapped_io import map_file
+from src.models import (
+    CgmTrace,
+    ExerciseEntry,
+    GlucoseEntry,
+    InsulinEntry,
+    MealType,
+    NoteEntry,
+    parse_day,
+)
 
-_DATE_PATTERN = re.compile(
+# Day headings in Clarity exports, e.g. "Sun, Feb 22, 2026"
+DATE_PATTERN = re.compile(
     r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun), (\w{3}) (\d{1,2}), (\d{4})"
 )
-_GLUCOSE_PATTERN = re.compile(r"^(\d+) mg/dL$")
-_EXERCISE_PATTERN = re.compile(r"^(\d+) min \u2022 (\d+) BPM$")
+_TIME_PATTERN = re.compile(r"^\d{1,2}:\d{2} [AP]M$")
+_GLUCOSE_PATTERN = re.compile(r"\s*(\d+) mg/dL\s*")
+_EXERCISE_PATTERN = re.compile(r"^(\d+) min(?: \u2022 (\d+) BPM)?$")
+_UNITS_PATTERN = re.compile(r"^(\d+(?:\.\d+)?)(?: ?(?:units?|U))?$", re.IGNORECASE)
+
+_EMPTY_CELL = "--"
+_FOOTER_PREFIX = "Data uploaded:"
+
+# Activities whose details should parse as "N min • N BPM"; any other
+# event with such details is also recorded as exercise
+_ACTIVITY_EVENTS = frozenset({
+    "Walking", "Running", "Cycling", "Swimming", "Hiking", "Exercise", "Workout",
+})
+_NOTE_EVENTS = frozenset({"Note", "Notes"})
+
+# A table as returned by pdfplumber's extract_tables(): rows of cells
+Table = Sequence[Sequence[str | None]]
 
 _MONTH_ABBR = {
     "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4,
@@ -22,159 +51,466 @@ _MONTH_ABBR = {
 }
 
 
+ENTRY_LISTS = (
+    "glucose_entries", "exercise_entries", "insulin_entries", "note_entries", "cgm_traces",
+)
+
+# Per entry list: date -> [start, stop) runs of entries on that date
+DateIndex = dict[str, dict[date, list[tuple[int, int]]]]
+
+_entry_date = attrgetter("date")
+
+
+def _date_runs(
+    entries: Sequence[GlucoseEntry | ExerciseEntry | InsulinEntry | NoteEntry | CgmTrace],
+) -> dict[date, list[tuple[int, int]]]:
+    runs: dict[date, list[tuple[int, int]]] = {}
+    start = 0
+    for i in range(1, len(entries) + 1):
+        if i == len(entries) or entries[i].date != entries[start].date:
+            runs.setdefault(entries[start].date, []).append((start, i))
+            start = i
+    return runs
+
+
 @dataclass
 class ParseResult:
     glucose_entries: list[GlucoseEntry] = field(default_factory=list)
     exercise_entries: list[ExerciseEntry] = field(default_factory=list)
-    available_dates: list[str] = field(default_factory=list)
+    insulin_entries: list[InsulinEntry] = field(default_factory=list)
+    note_entries: list[NoteEntry] = field(default_factory=list)
+    # One trace per day chart, in page order
+    cgm_traces: list[CgmTrace] = field(default_factory=list)
+    available_dates: list[date] = field(default_factory=list)
     warnings: list[str] = field(default_factory=list)
+    _index: DateIndex | None = field(default=None, init=False, repr=False, compare=False)
+    _index_key: tuple[tuple[date, ...], ...] = field(
+        default=(), init=False, repr=False, compare=False
+    )
+
+    def date_index(self) -> DateIndex:
+        """Each entry list's runs of same-date entries, keyed by date.
+
+        Entries arrive grouped by day, so a date usually has one run per
+        list. Built on first use (parse_tables builds it) and keyed on
+        every list's sequence of dates, so any append, removal, reorder
+        or re-dated entry since rebuilds it. Checking the key is one pass
+        over the dates; only the runs are re-derived.
+        """
+        key = tuple(tuple(map(_entry_date, getattr(self, name))) for name in ENTRY_LISTS)
+        if self._index is None or key != self._index_key:
+            self._index = {name: _date_runs(getattr(self, name)) for name in ENTRY_LISTS}
+            self._index_key = key
+        return self._index
 
 
-def _parse_iso_date(match: re.Match[str]) -> str:
-    """Convert a regex match from _DATE_PATTERN to an ISO date string."""
+def parse_iso_date(match: re.Match[str]) -> date:
+    """Convert a regex match from DATE_PATTERN to a date."""
     month_str, day_str, year_str = match.group(2), match.group(3), match.group(4)
-    month = _MONTH_ABBR[month_str]
-    return f"{int(year_str):04d}-{month:02d}-{int(day_str):02d}"
+    return date(int(year_str), _MONTH_ABBR[month_str], int(day_str))
+
+
+def _normalize_data_values(values: list[str]) -> list[str] | None:
+    """Map a data row's cells to [time, device, event, details, units, glucose].
+
+    Older exports have 6 cells; a row may lack the details or units cell
+    (e.g. insulin with no details), and long details can be split over
+    several cells. Returns None for any other shape.
+    """
+    if len(values) == 6:
+        return values
+    if len(values) == 5:
+        time_str, device, event, middle, glucose = values
+        if middle == _EMPTY_CELL or _UNITS_PATTERN.match(middle):
+            return [time_str, device, event, "", middle, glucose]
+        return [time_str, device, event, middle, _EMPTY_CELL, glucose]
+    if len(values) > 6:
+        details = " ".join(v for v in values[3:-2] if v)
+        return [*values[:3], details, values[-2], values[-1]]
+    return None
 
 
 def _classify_row(row: Sequence[str | None]) -> tuple[str, list[str]]:
-    """Classify a table row as 'header', 'data', or 'skip'.
+    """Classify a table row as 'header', 'data', 'continuation', or 'skip'.
 
-    Returns (row_type, non-None values).
+    Returns (row_type, values). Data rows are normalized to six values;
+    a continuation row (blank first cell, one text cell) carries the rest
+    of the previous row's details when a table wraps onto another page.
     """
     values = [v for v in row if v is not None]
-    if not values:
+    texts = [v for v in values if v.strip()]
+    if not texts:
         return ("skip", [])
 
-    # Data rows have exactly 6 non-None values
-    if len(values) == 6:
-        return ("data", values)
+    if _TIME_PATTERN.match(values[0].strip()):
+        data = _normalize_data_values(values)
+        if data is not None:
+            return ("data", data)
+        return ("skip", values)
 
-    # Header rows: single long value containing a date pattern
+    # Header rows: single long value containing a date pattern. The page
+    # footer also contains a date (the upload date) and must not change
+    # the current day, or rows continuing on the next page would move.
     if len(values) == 1:
-        match = _DATE_PATTERN.search(values[0])
-        if match:
+        if values[0].startswith(_FOOTER_PREFIX):
+            return ("skip", values)
+        if DATE_PATTERN.search(values[0]):
             return ("header", values)
 
+    if not (row[0] or "").strip() and len(texts) == 1:
+        return ("continuation", texts)
+
     return ("skip", values)
 
 
+def _has_event_rows(table: Table) -> bool:
+    """Layout detection: does this table hold day headers or timed events?
+
+    Pages carry chart-legend and spacer tables next to the event table;
+    skipping them keeps their stray text out of continuation handling.
+    """
+    for row in table:
+        first = (row[0] or "").strip() if row else ""
+        if not first:
+            continue
+        if _TIME_PATTERN.match(first) or (
+            DATE_PATTERN.search(first) and not first.startswith(_FOOTER_PREFIX)
+        ):
+            return True
+    return False
+
+
 def _parse_glucose_value(s: str) -> int | None:
     """Parse '117 mg/dL' to int 117. Returns None if unparseable."""
-    match = _GLUCOSE_PATTERN.match(s.strip())
+    match = _GLUCOSE_PATTERN.fullmatch(s)
     if match:
         return int(match.group(1))
     return None
 
 
 def _parse_exercise_details(s: str) -> tuple[int, int] | None:
-    """Parse '33 min • 88 BPM' to (33, 88). Returns None if unparseable."""
+    """Parse '33 min • 88 BPM' to (33, 88); heart rate is 0 when absent.
+
+    Returns None if unparseable.
+    """
     match = _EXERCISE_PATTERN.match(s.strip())
     if match:
-        return (int(match.group(1)), int(match.group(2)))
+        return (int(match.group(1)), int(match.group(2) or 0))
     return None
 
 
-def parse_pdf(pdf_path: Path) -> ParseResult:
-    """Parse a Dexcom Clarity PDF and return glucose/exercise entries.
+def _parse_insulin_units(s: str) -> float | None:
+    """Parse '4 units', '4.5 U' or '4' to a float. Returns None if unparseable."""
+    match = _UNITS_PATTERN.match(s.strip())
+    if match:
+        return float(match.group(1))
+    return None
+
+
+# Pending entry fields, validated in one batch per page
+_Pending = dict[str, object]
+
+# Core validators, skipping TypeAdapter's per-call Python wrapper
+_GLUCOSE_LIST = TypeAdapter(list[GlucoseEntry]).validator
+_EXERCISE_LIST = TypeAdapter(list[ExerciseEntry]).validator
+_INSULIN_LIST = TypeAdapter(list[InsulinEntry]).validator
+_NOTE_LIST = TypeAdapter(list[NoteEntry]).validator
 
-    Iterates all pages, processing tables[0] on each page. Tracks the
-    current date from header rows. Creates GlucoseEntry (with meal_type
-    defaulting to BREAKFAST) and ExerciseEntry objects from data rows.
+
+@dataclass
+class _PageBatch:
+    """Entries parsed from one page, validated together by flush().
+
+    Also memoizes cell parses for the whole run: an export repeats the
+    same few hundred times and readings, so each distinct string is
+    matched against its regex once.
     """
-    result = ParseResult()
-    current_date: str | None = None
 
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages):
-            tables = page.extract_tables()
-            if not tables:
+    warnings: list[str]
+    glucose: list[_Pending] = field(default_factory=list)
+    exercise: list[_Pending] = field(default_factory=list)
+    insulin: list[_Pending] = field(default_factory=list)
+    notes: list[_Pending] = field(default_factory=list)
+    _times: dict[str, bool] = field(default_factory=dict)
+    _readings: dict[str, int | None] = field(default_factory=dict)
+
+    def is_time(self, s: str) -> bool:
+        try:
+            return self._times[s]
+        except KeyError:
+            result = self._times[s] = bool(_TIME_PATTERN.match(s.strip()))
+            return result
+
+    def reading(self, s: str) -> int | None:
+        try:
+            return self._readings[s]
+        except KeyError:
+            result = self._readings[s] = _parse_glucose_value(s)
+            return result
+
+    def flush(self, result: ParseResult, page_label: str) -> set[int]:
+        """Validate the pending entries into result.
+
+        A page that fails batch validation is revalidated row by row, so
+        an invalid row is skipped with a warning rather than failing the
+        parse. Returns the ids of the skipped pending entries.
+        """
+        skipped: set[int] = set()
+        for kind, pending, entries, validator in (
+            ("meal", self.glucose, result.glucose_entries, _GLUCOSE_LIST),
+            ("exercise", self.exercise, result.exercise_entries, _EXERCISE_LIST),
+            ("insulin", self.insulin, result.insulin_entries, _INSULIN_LIST),
+            ("note", self.notes, result.note_entries, _NOTE_LIST),
+        ):
+            if not pending:
                 continue
+            try:
+                entries.extend(validator.validate_python(pending))
+            except ValidationError:
+                for fields in pending:
+                    try:
+                        entries.extend(validator.validate_python([fields]))
+                    except ValidationError as e:
+                        skipped.add(id(fields))
+                        self.warnings.append(
+                            f"{page_label}: skipped invalid {kind} at {fields['time']}: "
+                            f"{e.errors()[0]['msg']}"
+                        )
+            pending.clear()
+        return skipped
+
+
+# Handlers take (batch, date, cells, page_label), where cells is
+# (time, device, event, details, units, glucose), and return the pending
+# entry a continuation row may extend, if any.
+
+
+def _handle_meal(
+    batch: _PageBatch, date: date, cells: Sequence[str], page_label: str
+) -> _Pending | None:
+    glucose = batch.reading(cells[5])
+    if glucose is None:
+        batch.warnings.append(f"{page_label}: could not parse glucose from '{cells[5]}'")
+        return None
+    entry: _Pending = {
+        "date": date,
+        "time": cells[0],
+        "glucose_reading": glucose,
+        "food_item": cells[3],
+        "meal_type": MealType.BREAKFAST,
+    }
+    batch.glucose.append(entry)
+    return entry
+
+
+def _handle_insulin(
+    batch: _PageBatch, date: date, cells: Sequence[str], page_label: str
+) -> _Pending | None:
+    units = _parse_insulin_units(cells[4])
+    if units is None:
+        batch.warnings.append(
+            f"{page_label}: could not parse insulin units from '{cells[4]}'"
+        )
+        return None
+    batch.insulin.append({
+        "date": date,
+        "time": cells[0],
+        "insulin_type": cells[3] or "Insulin",
+        "units": units,
+        "glucose_reading": batch.reading(cells[5]),
+    })
+    return None
 
-            table = tables[0]
-            for row in table:
-                row_type, values = _classify_row(row)
 
-                if row_type == "header":
-                    match = _DATE_PATTERN.search(values[0])
-                    if match:
-                        current_date = _parse_iso_date(match)
+def _handle_note(
+    batch: _PageBatch, date: date, cells: Sequence[str], page_label: str
+) -> _Pending | None:
+    entry: _Pending = {
+        "date": date,
+        "time": cells[0],
+        "text": cells[3],
+        "glucose_reading": batch.reading(cells[5]),
+    }
+    batch.notes.append(entry)
+    return entry
+
+
+def _handle_activity(
+    batch: _PageBatch, date: date, cells: Sequence[str], page_label: str
+) -> _Pending | None:
+    """Any other event: exercise if its details parse, else a warning."""
+    glucose = batch.reading(cells[5])
+    if glucose is None:
+        batch.warnings.append(f"{page_label}: could not parse glucose from '{cells[5]}'")
+        return None
+    event_type, details = cells[2], cells[3]
+    exercise = _parse_exercise_details(details)
+    if exercise is not None:
+        batch.exercise.append({
+            "date": date,
+            "time": cells[0],
+            "activity_type": event_type,
+            "duration_minutes": exercise[0],
+            "heart_rate_bpm": exercise[1],
+            "glucose_reading": glucose,
+        })
+    elif event_type in _ACTIVITY_EVENTS:
+        batch.warnings.append(f"{page_label}: could not parse exercise details '{details}'")
+    else:
+        batch.warnings.append(f"{page_label}: unknown event type '{event_type}'")
+    return None
 
-                elif row_type == "data":
-                    if current_date is None:
-                        result.warnings.append(
-                            f"Page {page_num + 1}: data row before any date header: {values}"
-                        )
-                        continue
 
-                    time_str = values[0]
-                    event_type = values[2]
-                    details = values[3]
-                    glucose_str = values[5]
+_EVENT_HANDLERS = {
+    "Meal": _handle_meal,
+    "Insulin": _handle_insulin,
+    **{name: _handle_note for name in _NOTE_EVENTS},
+}
 
-                    glucose = _parse_glucose_value(glucose_str)
-                    if glucose is None:
-                        result.warnings.append(
-                            f"Page {page_num + 1}: could not parse glucose from '{glucose_str}'"
-                        )
-                        continue
 
-                    if event_type == "Meal":
-                        entry = GlucoseEntry(
-                            date=current_date,
-                            time=time_str,
-                            glucose_reading=glucose,
-                            food_item=details,
-                            meal_type=MealType.BREAKFAST,
-                        )
-                        result.glucose_entries.append(entry)
-
-                    elif event_type == "Walking":
-                        exercise = _parse_exercise_details(details)
-                        if exercise is None:
-                            result.warnings.append(
-                                f"Page {page_num + 1}: could not parse exercise details '{details}'"
-                            )
-                            continue
-                        duration, bpm = exercise
-                        entry_ex = ExerciseEntry(
-                            date=current_date,
-                            time=time_str,
-                            activity_type="Walking",
-                            duration_minutes=duration,
-                            heart_rate_bpm=bpm,
-                            glucose_reading=glucose,
-                        )
-                        result.exercise_entries.append(entry_ex)
+def _extend_details(entry: GlucoseEntry | NoteEntry | _Pending, text: str) -> None:
+    """Append wrapped details text to a meal's food item or a note's text."""
+    if isinstance(entry, dict):
+        key = "food_item" if "food_item" in entry else "text"
+        entry[key] = f"{str(entry[key]).strip()} {text.strip()}"
+    elif isinstance(entry, GlucoseEntry):
+        entry.food_item = f"{entry.food_item} {text.strip()}"
+    else:
+        entry.text = f"{entry.text} {text.strip()}"
 
-                    else:
-                        result.warnings.append(
-                            f"Page {page_num + 1}: unknown event type '{event_type}'"
-                        )
+
+def parse_tables(page_tables: Iterable[Sequence[Table]]) -> ParseResult:
+    """Parse the extracted tables of each page, in page order.
+
+    Tables without day headers or timed rows (legends, spacers) are
+    skipped. The current date and the last meal/note carry across tables
+    and page breaks, so a day whose table continues on the next page, or
+    details wrapped onto it, are merged. Meals default to BREAKFAST;
+    other activities, insulin and notes become their own entries.
+
+    Data rows take a single pass: one filtered copy of the row, memoized
+    time and reading matches, a dispatch table per event type, and one
+    batched validation of the page's entries.
+    """
+    result = ParseResult()
+    batch = _PageBatch(warnings=result.warnings)
+    current_date: date | None = None
+    last_entry: GlucoseEntry | NoteEntry | _Pending | None = None
+
+    for page_num, tables in enumerate(page_tables):
+        page_label = f"Page {page_num + 1}"
+        for table in tables:
+            if not _has_event_rows(table):
+                continue
+            for row in table:
+                # Fast path: the common six-cell data row, filtered once
+                cells = [v for v in row if v is not None]
+                if len(cells) != 6 or not batch.is_time(cells[0]):
+                    row_type, cells = _classify_row(row)
+                    if row_type == "header":
+                        match = DATE_PATTERN.search(cells[0])
+                        if match:
+                            current_date = parse_iso_date(match)
+                        last_entry = None
+                        continue
+                    if row_type == "continuation":
+                        if last_entry is not None:
+                            _extend_details(last_entry, cells[0])
+                        continue
+                    if row_type != "data":
+                        continue
+
+                if current_date is None:
+                    result.warnings.append(
+                        f"{page_label}: data row before any date header: {cells}"
+                    )
+                    continue
+                handler = _EVENT_HANDLERS.get(cells[2], _handle_activity)
+                last_entry = handler(batch, current_date, cells, page_label)
+
+        skipped = batch.flush(result, page_label)
+        # A meal or note may still be extended by the next page
+        if isinstance(last_entry, dict):
+            if id(last_entry) in skipped:
+                last_entry = None
+            elif "food_item" in last_entry:
+                last_entry = result.glucose_entries[-1]
+            else:
+                last_entry = result.note_entries[-1]
 
     # Build available_dates from actual entries (sorted ascending)
-    dates_seen: set[str] = set()
-    for ge in result.glucose_entries:
-        dates_seen.add(ge.date)
-    for ee in result.exercise_entries:
-        dates_seen.add(ee.date)
+    dates_seen: set[date] = set()
+    for entries in (
+        result.glucose_entries,
+        result.exercise_entries,
+        result.insulin_entries,
+        result.note_entries,
+    ):
+        dates_seen.update(e.date for e in entries)
     result.available_dates = sorted(dates_seen)
+    result.date_index()
 
     return result
 
 
+def parse_pdf(pdf_path: Path) -> ParseResult:
+    """Parse a Dexcom Clarity PDF and return its events by type.
+
+    Every table on every page is extracted once and handed to
+    parse_tables(); each day chart's glucose trace is read alongside.
+    The file is memory-mapped rather than read into a private buffer.
+    """
+    import pdfplumber
+
+    from src.cgm_trace import page_traces
+
+    traces: list[CgmTrace] = []
+
+    def page_tables(pdf: pdfplumber.PDF) -> Iterator[list[Table]]:
+        for page in pdf.pages:
+            traces.extend(page_traces(page))
+            yield page.extract_tables()
+
+    with map_file(pdf_path) as mapped, pdfplumber.open(mapped) as pdf:
+        result = parse_tables(page_tables(pdf))
+    result.cgm_traces = traces
+    return result
+
+
 def filter_by_dates(
-    result: ParseResult, selected_dates: list[str]
+    result: ParseResult, selected_dates: Iterable[str | date]
 ) -> ParseResult:
-    """Return a new ParseResult filtered to only the selected dates."""
-    date_set = set(selected_dates)
+    """Return a new ParseResult filtered to only the selected dates.
+
+    Copies the selected dates' runs from the date index, so the cost is
+    proportional to the selected entries; entries keep their parse order.
+    """
+    date_set = {parse_day(d) for d in selected_dates}
+    index = result.date_index()
+    lists: dict[str, list] = {}
+    for name in ENTRY_LISTS:
+        entries = getattr(result, name)
+        runs = sorted(chain.from_iterable(index[name].get(d, ()) for d in date_set))
+        lists[name] = list(chain.from_iterable(entries[a:b] for a, b in runs))
     return ParseResult(
-        glucose_entries=[
-            e for e in result.glucose_entries if e.date in date_set
-        ],
-        exercise_entries=[
-            e for e in result.exercise_entries if e.date in date_set
-        ],
-        available_dates=sorted(d for d in result.available_dates if d in date_set),
+        **lists,
+        available_dates=[d for d in result.available_dates if d in date_set],
         warnings=list(result.warnings),
     )
+
+
+def dates_between(
+    result: ParseResult, start: str | date | None = None, end: str | date | None = None
+) -> list[date]:
+    """Available dates within [start, end] (inclusive; None is open)."""
+    dates = result.available_dates
+    lo = 0 if start is None else bisect_left(dates, parse_day(start))
+    hi = len(dates) if end is None else bisect_right(dates, parse_day(end))
+    return dates[lo:hi]
+
+
+def filter_by_date_range(
+    result: ParseResult, start: str | date | None = None, end: str | date | None = None
+) -> ParseResult:
+    """Return a new ParseResult with only the entries dated within [start, end]."""
+    return filter_by_dates(result, dates_between(result, start, end))
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date
+
+from src.history_index import time_to_minute
+from src.models import GlucoseEntry, MealType, ReportSession, parse_day
+from src.pdf_parser import ParseResult, filter_by_date_range, filter_by_dates
+
+DEFAULT_REPORT_DAYS = 5
+
+# Meal-type boundaries in minutes since midnight
+_LUNCH_FROM = 11 * 60
+_DINNER_FROM = 17 * 60
+
+
+def default_selected_dates(
+    available_dates: list[date], count: int = DEFAULT_REPORT_DAYS
+) -> list[date]:
+    """Pick the default report dates from a parse's available dates.
+
+    Takes the last `count` dates, skipping the most recent one (usually
+    today, and incomplete) when more than `count` dates are available.
+    """
+    if len(available_dates) > count:
+        return available_dates[-count - 1:-1]
+    return list(available_dates)
+
+
+def default_meal_type(time_str: str) -> MealType:
+    """Guess a meal type from the time of day; unparseable times are breakfast."""
+    minute = time_to_minute(time_str)
+    if minute < _LUNCH_FROM:
+        return MealType.BREAKFAST
+    if minute < _DINNER_FROM:
+        return MealType.LUNCH
+    return MealType.DINNER
+
+
+def apply_meal_type_defaults(entries: list[GlucoseEntry]) -> list[GlucoseEntry]:
+    """Return copies of entries with meal_type set from the time of day.
+
+    Applied to every parse that becomes session data: session_from_parse
+    (CLI, API, watcher) and merge_parse_result (Upload page, watcher).
+    """
+    return [
+        e.model_copy(update={"meal_type": default_meal_type(e.time)}) for e in entries
+    ]
+
+
+def session_from_parse(
+    result: ParseResult,
+    name: str,
+    source_filename: str,
+    selected_dates: Iterable[str | date] | None = None,
+    *,
+    start: str | date | None = None,
+    end: str | date | None = None,
+) -> ReportSession:
+    """Build a draft session from a parse, as the Upload page would.
+
+    Without selected_dates, a start or end selects every date within
+    [start, end]; otherwise default_selected_dates() is used. Meal types
+    are defaulted from the time of day.
+    """
+    if selected_dates is None and (start or end):
+        filtered = filter_by_date_range(result, start, end)
+        selected = filtered.available_dates
+    else:
+        if selected_dates is None:
+            selected_dates = default_selected_dates(result.available_dates)
+        selected = sorted({parse_day(d) for d in selected_dates})
+        filtered = filter_by_dates(result, selected)
+
+    session = ReportSession.create_new(
+        name=name,
+        date_range_start=selected[0] if selected else None,
+        date_range_end=selected[-1] if selected else None,
+        selected_dates=selected,
+    )
+    session.glucose_entries = apply_meal_type_defaults(filtered.glucose_entries)
+    session.exercise_entries = filtered.exercise_entries
+    session.insulin_entries = filtered.insulin_entries
+    session.note_entries = filtered.note_entries
+    session.cgm_traces = filtered.cgm_traces
+    session.source_filename = source_filename
+    return session
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import statistics
+from bisect import bisect_right
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from src.cgm_trace import MINUTES_PER_DAY
+from src.history_index import time_to_minute
+from src.lru import LruCache
+from src.models import ReportSession
+
+DEFAULT_WINDOW_MINUTES = 120
+
+_CACHE_SIZE = 64
+
+
+@dataclass(frozen=True)
+class MealResponse:
+    date: date
+    time: str
+    food_item: str
+    meal_type: str
+    baseline: int
+    peak: int
+    # peak - baseline; 0 when glucose only fell
+    delta: int
+    minutes_to_peak: int
+    # Readings found in the window after the meal
+    readings: int
+
+
+@dataclass(frozen=True)
+class FoodResponse:
+    food_item: str
+    meals: int
+    mean_delta: float
+    max_delta: int
+    mean_minutes_to_peak: float
+
+
+@dataclass
+class Timeline:
+    """Every timed glucose reading of a session, sorted by time.
+
+    Times are minutes since 0001-01-01 so windows may cross midnight.
+    """
+
+    times: list[int]
+    values: list[int]
+
+
+_response_cache: LruCache[list[MealResponse]] = LruCache(_CACHE_SIZE)
+
+
+def _absolute_minute(day: date, minute: int) -> int:
+    return day.toordinal() * MINUTES_PER_DAY + minute
+
+
+def build_timeline(session: ReportSession) -> Timeline:
+    """Merge event readings and CGM trace samples into one sorted timeline."""
+    points: list[tuple[int, int]] = []
+    for entries in (
+        session.glucose_entries, session.exercise_entries,
+        session.insulin_entries, session.note_entries,
+    ):
+        for e in entries:
+            minute = time_to_minute(e.time)
+            if e.glucose_reading is not None and minute >= 0:
+                points.append((_absolute_minute(e.date, minute), e.glucose_reading))
+    for trace in session.cgm_traces:
+        start = _absolute_minute(trace.date, 0)
+        minutes, values = trace.points()
+        points.extend(zip([start + m for m in minutes], values))
+    points.sort()
+    return Timeline(times=[t for t, _ in points], values=[v for _, v in points])
+
+
+def _compute_responses(session: ReportSession, window: int) -> list[MealResponse]:
+    timeline = build_timeline(session)
+    times, values = timeline.times, timeline.values
+    responses: list[MealResponse] = []
+    for meal in session.glucose_entries:
+        minute = time_to_minute(meal.time)
+        if minute < 0:
+            continue
+        start = _absolute_minute(meal.date, minute)
+        lo = bisect_right(times, start)
+        hi = bisect_right(times, start + window, lo)
+        peak, peak_at = meal.glucose_reading, start
+        for i in range(lo, hi):
+            if values[i] > peak:
+                peak, peak_at = values[i], times[i]
+        responses.append(MealResponse(
+            date=meal.date,
+            time=meal.time,
+            food_item=meal.food_item,
+            meal_type=meal.meal_type.value,
+            baseline=meal.glucose_reading,
+            peak=peak,
+            delta=peak - meal.glucose_reading,
+            minutes_to_peak=peak_at - start,
+            readings=hi - lo,
+        ))
+    return responses
+
+
+def meal_responses(
+    session: ReportSession, window: int = DEFAULT_WINDOW_MINUTES
+) -> list[MealResponse]:
+    """Each meal's glucose peak within `window` minutes after it.
+
+    Readings come from exercise, insulin and note rows and the CGM
+    trace. Each meal's window is found by binary search on the sorted
+    timeline. Cached by session content hash and window.
+    """
+    return _response_cache.get_or_compute(
+        (session.content_hash(), window), lambda: _compute_responses(session, window)
+    )
+
+
+def food_responses(responses: Iterable[MealResponse]) -> list[FoodResponse]:
+    """Aggregate meal responses by food item, largest mean rise first.
+
+    Meals with no reading after them are left out; food items match
+    case-insensitively.
+    """
+    by_food: dict[str, list[MealResponse]] = defaultdict(list)
+    names: dict[str, str] = {}
+    for r in responses:
+        if r.readings:
+            key = r.food_item.casefold()
+            by_food[key].append(r)
+            names.setdefault(key, r.food_item)
+    foods = [
+        FoodResponse(
+            food_item=names[key],
+            meals=len(rs),
+            mean_delta=round(statistics.fmean(r.delta for r in rs), 1),
+            max_delta=max(r.delta for r in rs),
+            mean_minutes_to_peak=round(statistics.fmean(r.minutes_to_peak for r in rs), 1),
+        )
+        for key, rs in by_food.items()
+    ]
+    foods.sort(key=lambda f: (-f.mean_delta, f.food_item))
+    return foods
+
+
+def responses_across_sessions(
+    sessions: Iterable[ReportSession], window: int = DEFAULT_WINDOW_MINUTES
+) -> list[MealResponse]:
+    """Meal responses of several sessions, in time order.
+
+    A meal found in more than one session (overlapping uploads) counts once.
+    """
+    seen: dict[tuple[date, int, str], MealResponse] = {}
+    for session in sessions:
+        for r in meal_responses(session, window):
+            seen.setdefault((r.date, time_to_minute(r.time), r.food_item.casefold()), r)
+    return [seen[key] for key in sorted(seen)]
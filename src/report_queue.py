@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+
+from src.models import ReportSession
+from src.pdf_generator import generate_report, report_filename, report_styles
+from src.tenants import SessionStore
+
+# Content hash and file name of each session's last rendered report,
+# kept beside the user's reports
+REPORT_CACHE_FILENAME = "report_cache.json"
+# Part of every cache key; bump it when the report layout changes so
+# cached PDFs are rendered again
+REPORT_LAYOUT_VERSION = 1
+
+ProgressCallback = Callable[["ReportOutcome", int, int], None]
+
+
+@dataclass(frozen=True)
+class ReportOutcome:
+    session_id: str
+    # "rendered", "cached", "skipped" or "failed"
+    action: str
+    path: Path | None = None
+    seconds: float = 0.0
+    detail: str = ""
+
+    def summary(self) -> str:
+        target = f" -> {self.path.name}" if self.path else ""
+        timing = f" in {self.seconds:.2f}s" if self.action == "rendered" else ""
+        detail = f" ({self.detail})" if self.detail else ""
+        return f"{self.action:<8} {self.session_id}{target}{timing}{detail}"
+
+
+@dataclass(frozen=True)
+class _Job:
+    index: int
+    store: SessionStore
+    session: ReportSession
+    key: str
+    path: Path
+
+
+def report_cache_key(session: ReportSession) -> str:
+    return f"{REPORT_LAYOUT_VERSION}:{session.content_hash()}"
+
+
+class _ReportCache:
+    """One user's report cache file, rewritten after every change."""
+
+    def __init__(self, reports_dir: Path) -> None:
+        self.path = reports_dir / REPORT_CACHE_FILENAME
+        try:
+            self._entries: dict[str, dict[str, str]] = json.loads(self.path.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def lookup(self, session_id: str, key: str) -> Path | None:
+        """The cached report for session_id if it was rendered from key and still exists."""
+        entry = self._entries.get(session_id)
+        if entry is None or entry.get("key") != key:
+            return None
+        path = self.path.parent / entry["filename"]
+        return path if path.exists() else None
+
+    def record(self, session_id: str, key: str, path: Path) -> None:
+        previous = self._entries.get(session_id, {}).get("filename")
+        if previous and previous != path.name:
+            # The date range changed the file name; drop the stale report
+            (self.path.parent / previous).unlink(missing_ok=True)
+        self._entries[session_id] = {"key": key, "filename": path.name}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A temp file of our own, as other renders may be recording too
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.path.parent, suffix=".tmp", delete=False
+        ) as tmp:
+            tmp.write(json.dumps(self._entries, indent=1))
+        os.replace(tmp.name, self.path)
+
+
+def init_worker() -> None:
+    """Import ReportLab and build the report styles once per worker process."""
+    report_styles()
+    import reportlab.platypus  # noqa: F401
+
+
+def _error_detail(error: Exception) -> str:
+    first_line = str(error).splitlines()[0] if str(error) else ""
+    return f"{type(error).__name__}: {first_line}"
+
+
+def _render(session: ReportSession, output_path: Path) -> float:
+    start = time.perf_counter()
+    generate_report(session, output_path)
+    return time.perf_counter() - start
+
+
+def render_reports(
+    jobs: Iterable[tuple[SessionStore, str]],
+    workers: int = 0,
+    force: bool = False,
+    progress: ProgressCallback | None = None,
+    executor: Executor | None = None,
+) -> list[ReportOutcome]:
+    """Render the report of each (store, session id), several at a time.
+
+    Sessions are loaded and hashed here; a session whose content hash
+    matches the one its existing report was rendered from is not
+    rendered again unless force is set. The rest are rendered on a
+    process pool of workers processes (default: one per CPU, up to the
+    number of reports), each initialized once with ReportLab and the
+    report styles; with one worker, or a single report to render, they
+    are rendered in this process. Workers are spawned rather than
+    forked, since the caller may be a multi-threaded server. A session
+    that fails to load or render fails only its own report.
+    progress is called with each outcome and the done and total
+    counts as reports finish. Outcomes are returned in job order.
+    """
+    jobs = list(jobs)
+    outcomes: list[ReportOutcome | None] = [None] * len(jobs)
+    caches: dict[Path, _ReportCache] = {}
+    pending: list[_Job] = []
+    done = 0
+
+    def finish(i: int, outcome: ReportOutcome) -> None:
+        nonlocal done
+        outcomes[i] = outcome
+        done += 1
+        if progress is not None:
+            progress(outcome, done, len(jobs))
+
+    for i, (store, session_id) in enumerate(jobs):
+        try:
+            session = store.load(session_id)
+        except FileNotFoundError:
+            finish(i, ReportOutcome(session_id, "failed", detail="session not found"))
+            continue
+        except (OSError, ValueError) as e:
+            # Corrupt files, validation errors and newer schema versions
+            finish(i, ReportOutcome(session_id, "failed", detail=_error_detail(e)))
+            continue
+        if not session.selected_dates or session.date_range_start is None:
+            finish(i, ReportOutcome(session_id, "skipped", detail="no report dates"))
+            continue
+        cache = caches.get(store.reports_dir)
+        if cache is None:
+            cache = caches[store.reports_dir] = _ReportCache(store.reports_dir)
+        key = report_cache_key(session)
+        cached = None if force else cache.lookup(session_id, key)
+        if cached is not None:
+            finish(i, ReportOutcome(session_id, "cached", cached))
+        else:
+            path = store.reports_dir / report_filename(session)
+            pending.append(_Job(i, store, session, key, path))
+
+    def complete(job: _Job, run: Callable[[], float]) -> None:
+        try:
+            seconds = run()
+        except Exception as e:
+            detail = _error_detail(e)
+            finish(job.index, ReportOutcome(job.session.id, "failed", detail=detail))
+            return
+        caches[job.store.reports_dir].record(job.session.id, job.key, job.path)
+        finish(job.index, ReportOutcome(job.session.id, "rendered", job.path, seconds))
+
+    if executor is None and (len(pending) == 1 or workers == 1):
+        for job in pending:
+            complete(job, partial(_render, job.session, job.path))
+    elif pending:
+        pool = executor or ProcessPoolExecutor(
+            max_workers=workers or min(len(pending), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+        try:
+            futures: dict[Future[float], _Job] = {
+                pool.submit(_render, job.session, job.path): job for job in pending
+            }
+            for future in as_completed(futures):
+                complete(futures[future], future.result)
+        finally:
+            if executor is None:
+                pool.shutdown()
+    return [outcome for outcome in outcomes if outcome is not None]
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import typing
+import zlib
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, TypeAdapter
+
+from src.mapped_io import map_file, write_atomic
+from src.migrations import payload_version, session_from_json, session_from_payload
+from src.models import SCHEMA_VERSION, ReportSession
+
+Buffer = bytes | mmap.mmap
+
+BINARY_SUFFIX = ".hrs"
+MAGIC = b"HRS1"
+
+_LENGTH = struct.Struct("<I")
+_PREAMBLE_SIZE = len(MAGIC) + _LENGTH.size
+
+
+class SessionFormatError(ValueError):
+    """Raised when a binary session file is malformed."""
+
+
+def _entry_fields() -> dict[str, type[BaseModel]]:
+    """ReportSession fields that are lists of models, e.g. glucose_entries."""
+    fields: dict[str, type[BaseModel]] = {}
+    for name, info in ReportSession.model_fields.items():
+        if typing.get_origin(info.annotation) is list:
+            (arg,) = typing.get_args(info.annotation)
+            if isinstance(arg, type) and issubclass(arg, BaseModel):
+                fields[name] = arg
+    return fields
+
+
+ENTRY_FIELDS = _entry_fields()
+_BLOCK_ADAPTERS = {
+    name: TypeAdapter(list[model]) for name, model in ENTRY_FIELDS.items()
+}
+
+
+def encode_session(session: ReportSession) -> bytes:
+    """Encode a session as b"HRS1" | u32 header length | header | blocks.
+
+    The JSON header holds every scalar field plus a block table mapping
+    each entry list to (offset, length, count) relative to the end of
+    the header. Each block is a zlib-compressed compact JSON array, which
+    compresses away the repeated field names and is validated in one
+    pass by pydantic's JSON parser on decode.
+    """
+    data = session.model_dump(mode="json")
+    blocks: list[bytes] = []
+    table: dict[str, list[int]] = {}
+    offset = 0
+    for name in ENTRY_FIELDS:
+        rows = data.pop(name)
+        block = zlib.compress(
+            json.dumps(rows, separators=(",", ":")).encode(), level=6
+        )
+        table[name] = [offset, len(block), len(rows)]
+        blocks.append(block)
+        offset += len(block)
+
+    data["blocks"] = table
+    header = json.dumps(data, separators=(",", ":")).encode()
+    return b"".join([MAGIC, _LENGTH.pack(len(header)), header, *blocks])
+
+
+def _decode_header(data: Buffer) -> tuple[dict[str, Any], int]:
+    """Return (header, data_start) from a buffer beginning at the file start."""
+    if data[:len(MAGIC)] != MAGIC:
+        raise SessionFormatError("not a binary session file")
+    (header_len,) = _LENGTH.unpack_from(data, len(MAGIC))
+    end = _PREAMBLE_SIZE + header_len
+    if len(data) < end:
+        raise SessionFormatError("truncated header")
+    header = json.loads(data[_PREAMBLE_SIZE:end])
+    return header, end
+
+
+def _decompress(buffer: Buffer, start: int, length: int) -> bytes:
+    with memoryview(buffer) as view:
+        return zlib.decompress(view[start:start + length])
+
+
+def _decode_block(name: str, buffer: Buffer, start: int, length: int) -> list[BaseModel]:
+    """Decompress and validate one block, reading it straight from buffer."""
+    return _BLOCK_ADAPTERS[name].validate_json(_decompress(buffer, start, length))
+
+
+def decode_stored_session(data: Buffer) -> tuple[ReportSession, int]:
+    """Decode a session and the schema version it was stored with.
+
+    Current files validate each block straight from its JSON; older ones
+    are decoded to a plain payload and upgraded first.
+    """
+    if len(data) < _PREAMBLE_SIZE:
+        raise SessionFormatError("truncated preamble")
+    header, start = _decode_header(data)
+    table = header.pop("blocks")
+    version = payload_version(header)
+    if version != SCHEMA_VERSION:
+        for name, (offset, length, _) in table.items():
+            header[name] = json.loads(_decompress(data, start + offset, length))
+        return session_from_payload(header), version
+    for name, (offset, length, _) in table.items():
+        if name in ENTRY_FIELDS:
+            header[name] = _decode_block(name, data, start + offset, length)
+    return ReportSession.model_validate(header), version
+
+
+def decode_session(data: Buffer) -> ReportSession:
+    """Decode a whole session from bytes or a mapped file."""
+    return decode_stored_session(data)[0]
+
+
+def _read_file_header(path: Path) -> tuple[dict[str, Any], int]:
+    with map_file(path) as data:
+        if len(data) < _PREAMBLE_SIZE:
+            raise SessionFormatError("truncated preamble")
+        return _decode_header(data)
+
+
+def read_header(path: Path) -> dict[str, Any]:
+    """Read only the summary header of a binary session file."""
+    header, _ = _read_file_header(path)
+    return header
+
+
+class LazySession:
+    """A binary session whose entry lists are read on first access.
+
+    Opening reads only the header, so summary fields (id, name, status,
+    dates...) are available without touching any entry block. Accessing
+    e.g. ``lazy.glucose_entries`` reads and decodes just that block.
+    The file stays mapped until close() (or garbage collection), so the
+    block offsets read at open time keep pointing into the file that
+    was opened even if the session is saved again meanwhile.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            self._data: Buffer = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+        try:
+            if len(self._data) < _PREAMBLE_SIZE:
+                raise SessionFormatError("truncated preamble")
+            header, data_start = _decode_header(self._data)
+        except Exception:
+            self.close()
+            raise
+        self._blocks: dict[str, list[int]] = header.pop("blocks")
+        self._header = header
+        self._data_start = data_start
+        self._loaded: dict[str, list[BaseModel]] = {}
+        self._fields: ReportSession | None = None
+
+    def close(self) -> None:
+        """Release the file mapping; loaded blocks stay available."""
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+    def __enter__(self) -> LazySession:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def summary(self) -> dict[str, Any]:
+        return dict(self._header)
+
+    def entry_count(self, name: str) -> int:
+        """Number of entries in a block, without loading it."""
+        return self._blocks[name][2]
+
+    @property
+    def schema_version(self) -> int:
+        return payload_version(self._header)
+
+    def _load_block(self, name: str) -> list[BaseModel]:
+        offset, length, _ = self._blocks[name]
+        return _decode_block(name, self._data, self._data_start + offset, length)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if name in self._blocks and name in ENTRY_FIELDS:
+            if name not in self._loaded:
+                self._loaded[name] = self._load_block(name)
+            return self._loaded[name]
+        if name in ENTRY_FIELDS:
+            return []
+        if name not in ReportSession.model_fields:
+            raise AttributeError(name)
+        if self._fields is None:
+            # Validated like a loaded session's fields: dates, enums, defaults
+            self._fields = ReportSession.model_validate(self._header)
+        return getattr(self._fields, name)
+
+    def to_session(self) -> ReportSession:
+        if self.schema_version != SCHEMA_VERSION:
+            return decode_session(self._data)
+        data = dict(self._header)
+        for name in ENTRY_FIELDS:
+            data[name] = getattr(self, name)
+        return ReportSession.model_validate(data)
+
+
+def write_binary_session(session: ReportSession, path: Path) -> Path:
+    """Write session to path atomically.
+
+    The file is written beside path and renamed into place, so a reader
+    that has the old file mapped keeps a complete file instead of one
+    truncated under its mapping.
+    """
+    write_atomic(path, encode_session(session))
+    return path
+
+
+def read_binary_session(path: Path) -> ReportSession:
+    return read_stored_session(path)[0]
+
+
+def read_stored_session(path: Path) -> tuple[ReportSession, int]:
+    """A binary session file and the schema version it was stored with."""
+    with map_file(path) as data:
+        return decode_stored_session(data)
+
+
+def migrate_json_sessions(base_dir: Path) -> int:
+    """Convert every <id>.json session under base_dir to <id>.hrs.
+
+    Each binary file is verified to decode to an identical session
+    before the JSON file is removed. Returns the number migrated.
+    """
+    migrated = 0
+    for json_path in sorted(base_dir.glob("*.json")):
+        try:
+            session, _ = session_from_json(json_path.read_bytes())
+        except ValueError:
+            continue
+        bin_path = json_path.with_suffix(BINARY_SUFFIX)
+        write_binary_session(session, bin_path)
+        if read_binary_session(bin_path) != session:
+            bin_path.unlink()
+            raise SessionFormatError(f"round-trip mismatch for {json_path.name}")
+        json_path.unlink()
+        migrated += 1
+    return migrated
+
+
+def main(argv: list[str] | None = None) -> int:
+    import argparse
+
+    from src.storage import DEFAULT_SESSIONS_DIR
+
+    parser = argparse.ArgumentParser(
+        description="Migrate JSON session files to the binary session format."
+    )
+    parser.add_argument("base_dir", nargs="?", type=Path, default=DEFAULT_SESSIONS_DIR)
+    args = parser.parse_args(argv)
+
+    count = migrate_json_sessions(args.base_dir)
+    print(f"Migrated {count} session(s) in {args.base_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
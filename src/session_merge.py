@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from collections.abc import Hashable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date
+
+from pydantic import BaseModel
+
+from src.models import ReportSession, parse_day
+from src.pdf_parser import ParseResult, filter_by_dates
+from src.pipeline import apply_meal_type_defaults
+
+
+@dataclass(frozen=True)
+class _MergeSpec:
+    # Field that names the event within its (date, time) slot
+    identity: str
+    # The user can correct the identity on the Review page, so entries left
+    # unmatched fall back to matching on (date, time)
+    match_slot: bool = False
+
+
+_SPECS = {
+    "glucose_entries": _MergeSpec("food_item", match_slot=True),
+    "exercise_entries": _MergeSpec("activity_type"),
+    "insulin_entries": _MergeSpec("insulin_type"),
+    "note_entries": _MergeSpec("text"),
+}
+
+
+@dataclass
+class EntryDiff:
+    added: list[BaseModel] = field(default_factory=list)
+    # (stored, merged) pairs
+    changed: list[tuple[BaseModel, BaseModel]] = field(default_factory=list)
+    unchanged: int = 0
+    # Stored entries the new parse (on the selected dates) does not contain;
+    # kept, not deleted
+    missing: list[BaseModel] = field(default_factory=list)
+
+
+@dataclass
+class SessionDiff:
+    fields: dict[str, EntryDiff] = field(default_factory=dict)
+
+    @property
+    def added(self) -> int:
+        return sum(len(d.added) for d in self.fields.values())
+
+    @property
+    def changed(self) -> int:
+        return sum(len(d.changed) for d in self.fields.values())
+
+    @property
+    def unchanged(self) -> int:
+        return sum(d.unchanged for d in self.fields.values())
+
+    @property
+    def missing(self) -> int:
+        return sum(len(d.missing) for d in self.fields.values())
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.added and not self.changed
+
+    def summary(self) -> str:
+        return (
+            f"{self.added} new, {self.changed} changed, "
+            f"{self.unchanged} unchanged, {self.missing} kept from earlier uploads"
+        )
+
+
+def _key(entry: BaseModel, spec: _MergeSpec) -> tuple[Hashable, ...]:
+    return (getattr(entry, "date"), getattr(entry, "time"), getattr(entry, spec.identity))
+
+
+def _slot(entry: BaseModel) -> tuple[date, str]:
+    return (getattr(entry, "date"), getattr(entry, "time"))
+
+
+def _merge_entries(
+    stored: Sequence[BaseModel],
+    parsed: Sequence[BaseModel],
+    spec: _MergeSpec,
+) -> tuple[list[BaseModel], EntryDiff]:
+    """Merge one entry list in O(len(stored) + len(parsed)).
+
+    Entries match on (date, time, identity). When the identity itself is
+    user-editable (a corrected food name), entries left unmatched fall
+    back to matching on (date, time). A matched entry takes the parsed
+    values except for the fields listed in its edited_fields, which keep
+    the user's corrections. Stored entries the parse lacks are kept, each
+    after the entry it followed in the stored list.
+    """
+    diff = EntryDiff()
+    by_key: defaultdict[tuple[Hashable, ...], deque[BaseModel]] = defaultdict(deque)
+    for entry in stored:
+        by_key[_key(entry, spec)].append(entry)
+
+    merged: list[BaseModel | None] = []
+    unmatched: list[tuple[int, BaseModel]] = []
+    # id(stored entry) -> index of the merged entry it became
+    matched: dict[int, int] = {}
+
+    def take(old: BaseModel, new: BaseModel, index: int) -> BaseModel:
+        matched[id(old)] = index
+        edited = getattr(old, "edited_fields", [])
+        update = {name: getattr(old, name) for name in edited}
+        if edited:
+            update["edited_fields"] = edited
+        result = new.model_copy(update=update)
+        if result == old:
+            diff.unchanged += 1
+            return old
+        diff.changed.append((old, result))
+        return result
+
+    for new in parsed:
+        bucket = by_key.get(_key(new, spec))
+        if bucket:
+            merged.append(take(bucket.popleft(), new, len(merged)))
+        else:
+            unmatched.append((len(merged), new))
+            merged.append(None)
+
+    if unmatched and spec.match_slot:
+        by_slot: defaultdict[tuple[date, str], deque[BaseModel]] = defaultdict(deque)
+        for entry in stored:
+            if id(entry) not in matched:
+                by_slot[_slot(entry)].append(entry)
+        still_unmatched = []
+        for index, new in unmatched:
+            bucket = by_slot.get(_slot(new))
+            if bucket:
+                merged[index] = take(bucket.popleft(), new, index)
+            else:
+                still_unmatched.append((index, new))
+        unmatched = still_unmatched
+
+    for index, new in unmatched:
+        merged[index] = new
+        diff.added.append(new)
+
+    # Missing entries go back after the entry they followed, so the list
+    # stays in export order; -1 is the front
+    following: defaultdict[int, list[BaseModel]] = defaultdict(list)
+    anchor = -1
+    for entry in stored:
+        if id(entry) in matched:
+            anchor = matched[id(entry)]
+        else:
+            following[anchor].append(entry)
+            diff.missing.append(entry)
+    entries = following[-1]
+    for index, entry in enumerate(merged):
+        if entry is not None:
+            entries.append(entry)
+        entries.extend(following[index])
+    return entries, diff
+
+
+def merge_parse_result(
+    session: ReportSession,
+    result: ParseResult,
+    selected_dates: Iterable[str | date],
+) -> tuple[ReportSession, SessionDiff]:
+    """Merge a new parse into a stored session without losing corrections.
+
+    Only the parse's entries on the selected dates are merged, as on a
+    fresh upload, and the selected dates join the session's. New entries
+    are added (meals with the same time-of-day meal types a new session
+    gets), parsed changes are applied to every field the user has not
+    corrected, and stored entries the new parse lacks, including those
+    on dates not selected now, are kept. Each selected day's CGM trace is
+    replaced by the new one. Returns the updated copy and the diff.
+    """
+    date_set = {parse_day(d) for d in selected_dates}
+    selected = sorted(date_set.union(session.selected_dates))
+    update: dict[str, object] = {
+        "selected_dates": selected,
+        "date_range_start": selected[0] if selected else session.date_range_start,
+        "date_range_end": selected[-1] if selected else session.date_range_end,
+    }
+    diff = SessionDiff()
+    selected_result = filter_by_dates(result, date_set)
+    selected_result.glucose_entries = apply_meal_type_defaults(
+        selected_result.glucose_entries
+    )
+    for name, spec in _SPECS.items():
+        stored = getattr(session, name)
+        parsed = getattr(selected_result, name)
+        update[name], diff.fields[name] = _merge_entries(stored, parsed, spec)
+    # Traces carry no user edits: a day's new trace replaces the stored one
+    traces = {t.date: t for t in session.cgm_traces}
+    traces.update((t.date, t) for t in selected_result.cgm_traces)
+    update["cgm_traces"] = [traces[d] for d in sorted(traces)]
+    return session.model_copy(update=update), diff
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from src.pdf_parser import ENTRY_LISTS, ParseResult
+
+DEFAULT_BUDGET_MB = 256
+# One user's uploads may fill at most this share of the budget
+DEFAULT_USER_SHARE = 0.5
+# Parses nobody has read for this long are dropped
+DEFAULT_IDLE_SECONDS = 30 * 60
+
+# Measured with tracemalloc on synthetic parses: about 1 KiB per parsed row
+# (pydantic model, strings and the date index) and twice a trace's packed bytes
+_ENTRY_BYTES = 1024
+_TRACE_OVERHEAD = 2
+
+
+def estimate_size(result: ParseResult) -> int:
+    """Approximate bytes a ParseResult holds in memory."""
+    size = sum(len(getattr(result, name)) for name in ENTRY_LISTS) * _ENTRY_BYTES
+    size += sum(len(t.samples) for t in result.cgm_traces) * _TRACE_OVERHEAD
+    return size + sum(len(w) for w in result.warnings)
+
+
+def budget_from_env() -> int:
+    """The cache budget in bytes from HEALTHCARE_STATE_BUDGET_MB."""
+    value = os.environ.get("HEALTHCARE_STATE_BUDGET_MB", "").strip()
+    return int(float(value or DEFAULT_BUDGET_MB) * 1024 * 1024)
+
+
+@dataclass(frozen=True)
+class Footprint:
+    entries: int
+    bytes: int
+    budget_bytes: int
+    by_user: dict[str, int]
+    hits: int
+    misses: int
+    evictions: int
+
+    def summary(self) -> str:
+        mb = 1024 * 1024
+        return (
+            f"{self.entries} parse(s), {self.bytes / mb:.1f} of "
+            f"{self.budget_bytes / mb:.0f} MB, {len(self.by_user)} user(s), "
+            f"{self.hits} hit(s), {self.misses} miss(es), {self.evictions} evicted"
+        )
+
+
+@dataclass
+class _Entry:
+    owner: str
+    result: ParseResult
+    size: int
+    last_used: float
+
+
+class ParseCache:
+    """Parse results shared by every browser tab, under a memory budget.
+
+    Tabs keep only the handle put() returns in st.session_state. Entries
+    are dropped least recently used first when the budget or a user's
+    share of it is exceeded, and when idle for idle_seconds; the parse
+    being put is always kept, whatever its size. A dropped
+    parse is rebuilt from the saved upload, so get() returning None is
+    a cache miss, never lost data.
+    """
+
+    def __init__(
+        self,
+        budget_bytes: int = DEFAULT_BUDGET_MB * 1024 * 1024,
+        user_share: float = DEFAULT_USER_SHARE,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.budget_bytes = budget_bytes
+        self.user_budget = int(budget_bytes * user_share)
+        self.idle_seconds = idle_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._by_user: dict[str, int] = {}
+        self._hits = self._misses = self._evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def handle(owner: str, content_hash: str) -> str:
+        """The key one user's parse of one upload is stored under.
+
+        Tabs of the same user uploading the same file share one parse;
+        other users never see it.
+        """
+        return f"{owner}:{content_hash}"
+
+    def get(self, handle: str) -> ParseResult | None:
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(handle)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            entry.last_used = self._clock()
+            self._entries.move_to_end(handle)
+            return entry.result
+
+    def put(self, handle: str, owner: str, result: ParseResult) -> str:
+        """Cache a parse and return its handle.
+
+        Older entries make room for it. A parse larger than the owner's
+        share is still kept, alone, so the page that made it is not
+        re-parsing the upload on every rerun.
+        """
+        size = estimate_size(result)
+        with self._lock:
+            self._remove(handle)
+            self._entries[handle] = _Entry(owner, result, size, self._clock())
+            self._bytes += size
+            self._by_user[owner] = self._by_user.get(owner, 0) + size
+            self._expire()
+            self._evict(owner, keep=handle)
+        return handle
+
+    def discard(self, handle: str) -> None:
+        with self._lock:
+            self._remove(handle)
+
+    def footprint(self) -> Footprint:
+        with self._lock:
+            self._expire()
+            return Footprint(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                budget_bytes=self.budget_bytes,
+                by_user=dict(self._by_user),
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+    def _remove(self, handle: str) -> bool:
+        entry = self._entries.pop(handle, None)
+        if entry is None:
+            return False
+        self._bytes -= entry.size
+        remaining = self._by_user[entry.owner] - entry.size
+        if remaining:
+            self._by_user[entry.owner] = remaining
+        else:
+            del self._by_user[entry.owner]
+        return True
+
+    def _drop(self, handle: str) -> None:
+        if self._remove(handle):
+            self._evictions += 1
+
+    def _expire(self) -> None:
+        cutoff = self._clock() - self.idle_seconds
+        # Oldest first, so stop at the first entry still in use
+        while self._entries:
+            handle, entry = next(iter(self._entries.items()))
+            if entry.last_used > cutoff:
+                break
+            self._drop(handle)
+
+    def _evict(self, owner: str, keep: str) -> None:
+        """Trim the owner to their share, then everyone to the budget, LRU first.
+
+        keep, the newest entry, is never dropped.
+        """
+        if self._by_user.get(owner, 0) > self.user_budget:
+            for handle in [
+                h for h, e in self._entries.items() if e.owner == owner and h != keep
+            ]:
+                self._drop(handle)
+                if self._by_user.get(owner, 0) <= self.user_budget:
+                    break
+        # keep is the most recently used, so it is last in the order
+        while self._bytes > self.budget_bytes and len(self._entries) > 1:
+            self._drop(next(iter(self._entries)))
@@ -1,33 +1,156 @@
 from __future__ import annotations
 
 import json
+import os
+from collections.abc import Callable
 from pathlib import Path
+from typing import Any
 
-from src.models import ReportSession
+from src.archive import (
+    discard_archived,
+    has_archive,
+    is_archived,
+    load_archived_session,
+    query_archive,
+)
+from src.history_index import index_session, normalize_food_tokens, remove_session
+from src.mapped_io import write_atomic
+from src.migrations import session_from_json
+from src.models import SCHEMA_VERSION, ReportSession
+from src.session_format import (
+    BINARY_SUFFIX,
+    LazySession,
+    SessionFormatError,
+    read_header,
+    read_stored_session,
+    write_binary_session,
+)
 
 DEFAULT_SESSIONS_DIR = Path("data/sessions")
+SUMMARY_INDEX_FILENAME = "summaries.json"
+
+_SUMMARY_KEYS = (
+    "id", "name", "status", "date_range_start", "date_range_end", "created_at",
+)
 
 
 def save_session(
-    session: ReportSession, base_dir: Path = DEFAULT_SESSIONS_DIR
+    session: ReportSession,
+    base_dir: Path = DEFAULT_SESSIONS_DIR,
+    binary: bool | None = None,
+    food_tokens: Callable[[str], list[str]] = normalize_food_tokens,
 ) -> Path:
-    """Save a session to a JSON file. Returns the file path."""
+    """Save a session file and update the history index.
+
+    binary=None keeps the session's current on-disk format (JSON for new
+    sessions); True/False force the binary or JSON format and remove the
+    file in the other format. food_tokens is passed on to index_session.
+    Returns the file path.
+    """
     base_dir.mkdir(parents=True, exist_ok=True)
-    file_path = base_dir / f"{session.id}.json"
-    file_path.write_text(session.model_dump_json(indent=2))
+    json_path = base_dir / f"{session.id}.json"
+    bin_path = base_dir / f"{session.id}{BINARY_SUFFIX}"
+    if binary is None:
+        binary = bin_path.exists()
+
+    if binary:
+        file_path = write_binary_session(session, bin_path)
+        json_path.unlink(missing_ok=True)
+    else:
+        file_path = json_path
+        write_atomic(file_path, session.model_dump_json(indent=2).encode())
+        bin_path.unlink(missing_ok=True)
+    if has_archive(base_dir):
+        # A saved copy supersedes the archived one
+        discard_archived(session.id, base_dir)
+    index_session(session, base_dir, food_tokens)
     return file_path
 
 
 def load_session(
-    session_id: str, base_dir: Path = DEFAULT_SESSIONS_DIR
+    session_id: str, base_dir: Path = DEFAULT_SESSIONS_DIR, write_back: bool = True
 ) -> ReportSession:
-    """Load a session from a JSON file by ID.
+    """Load a session by ID from its JSON or binary file, or the archive.
 
-    Raises FileNotFoundError if the session does not exist.
+    Sessions stored with an older schema version are upgraded in memory
+    and, with write_back, saved back in their format so the upgrade runs
+    once per file. Archived sessions are upgraded on every load and stay
+    as archived. Raises FileNotFoundError if the session does not exist.
     """
     file_path = base_dir / f"{session_id}.json"
-    content = file_path.read_text()
-    return ReportSession.model_validate_json(content)
+    try:
+        content = file_path.read_bytes()
+    except FileNotFoundError:
+        try:
+            session, version = read_stored_session(base_dir / f"{session_id}{BINARY_SUFFIX}")
+        except FileNotFoundError:
+            return load_archived_session(session_id, base_dir)
+    else:
+        session, version = session_from_json(content)
+    if write_back and version != SCHEMA_VERSION:
+        try:
+            save_session(session, base_dir)
+        except OSError:
+            # Read-only stores still load; the upgrade repeats next time
+            pass
+    return session
+
+
+def session_exists(session_id: str, base_dir: Path = DEFAULT_SESSIONS_DIR) -> bool:
+    """Whether a session is stored under base_dir, as a file or archived."""
+    return (
+        (base_dir / f"{session_id}.json").exists()
+        or (base_dir / f"{session_id}{BINARY_SUFFIX}").exists()
+        or is_archived(session_id, base_dir)
+    )
+
+
+def open_session(
+    session_id: str, base_dir: Path = DEFAULT_SESSIONS_DIR
+) -> ReportSession | LazySession:
+    """Open a session for reading, loading entry lists lazily if possible.
+
+    Binary sessions at the current schema version return a LazySession
+    that has read only the header; JSON and older binary sessions are
+    loaded in full (and upgraded) by load_session. Raises
+    FileNotFoundError if the session does not exist.
+    """
+    bin_path = base_dir / f"{session_id}{BINARY_SUFFIX}"
+    if bin_path.exists():
+        lazy = LazySession(bin_path)
+        if lazy.schema_version == SCHEMA_VERSION:
+            return lazy
+    return load_session(session_id, base_dir)
+
+
+def _read_summary(file_path: Path) -> dict[str, str] | None:
+    """Summary fields of one session file, or None if it is not a valid session."""
+    try:
+        if file_path.suffix == BINARY_SUFFIX:
+            data = read_header(file_path)
+        else:
+            data = json.loads(file_path.read_bytes())
+        return {key: data[key] for key in _SUMMARY_KEYS}
+    except (SessionFormatError, json.JSONDecodeError, KeyError, TypeError, OSError):
+        return None
+
+
+def _load_summary_index(base_dir: Path) -> dict[str, list[Any]]:
+    try:
+        index = json.loads((base_dir / SUMMARY_INDEX_FILENAME).read_bytes())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def _write_summary_index(base_dir: Path, index: dict[str, list[Any]]) -> None:
+    path = base_dir / SUMMARY_INDEX_FILENAME
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        tmp_path.write_text(json.dumps(index, separators=(",", ":")))
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
 
 
 def list_sessions(base_dir: Path = DEFAULT_SESSIONS_DIR) -> list[dict[str, str]]:
@@ -35,26 +158,43 @@ def list_sessions(base_dir: Path = DEFAULT_SESSIONS_DIR) -> list[dict[str, str]]
 
     Returns a list of dicts with keys: id, name, status,
     date_range_start, date_range_end, created_at.
-    Sorted by created_at descending (newest first).
+    Sorted by created_at descending (newest first). Archived sessions
+    are included.
+
+    Summaries are cached in a per-directory index keyed by file name,
+    modification time and size, so only new or changed session files
+    are read; the rest cost one directory scan.
     """
     if not base_dir.exists():
         return []
 
-    summaries: list[dict[str, str]] = []
-    for file_path in base_dir.glob("*.json"):
-        try:
-            data = json.loads(file_path.read_text())
-            summaries.append({
-                "id": data["id"],
-                "name": data["name"],
-                "status": data["status"],
-                "date_range_start": data["date_range_start"],
-                "date_range_end": data["date_range_end"],
-                "created_at": data["created_at"],
-            })
-        except (json.JSONDecodeError, KeyError):
+    cached = _load_summary_index(base_dir)
+    index: dict[str, list[Any]] = {}
+    for entry in os.scandir(base_dir):
+        name = entry.name
+        if name == SUMMARY_INDEX_FILENAME or not (
+            name.endswith(".json") or name.endswith(BINARY_SUFFIX)
+        ):
             continue
+        stat = entry.stat()
+        previous = cached.get(name)
+        if (
+            previous is not None
+            and previous[0] == stat.st_mtime_ns
+            and previous[1] == stat.st_size
+        ):
+            index[name] = previous
+        else:
+            index[name] = [stat.st_mtime_ns, stat.st_size, _read_summary(Path(entry.path))]
+    if index != cached:
+        _write_summary_index(base_dir, index)
 
+    summaries = [summary for _, _, summary in index.values() if summary is not None]
+    live_ids = {summary["id"] for summary in summaries}
+    summaries.extend(
+        archived.summary() for archived in query_archive(base_dir)
+        if archived.id not in live_ids
+    )
     summaries.sort(key=lambda s: s["created_at"], reverse=True)
     return summaries
 
@@ -62,10 +202,19 @@ def list_sessions(base_dir: Path = DEFAULT_SESSIONS_DIR) -> list[dict[str, str]]
 def delete_session(
     session_id: str, base_dir: Path = DEFAULT_SESSIONS_DIR
 ) -> bool:
-    """Delete a session file. Returns True if deleted, False if not found."""
-    file_path = base_dir / f"{session_id}.json"
-    try:
-        file_path.unlink()
-        return True
-    except FileNotFoundError:
-        return False
+    """Delete a session file or archived copy and retract it from the history index.
+
+    Returns True if deleted, False if not found.
+    """
+    deleted = False
+    for suffix in (".json", BINARY_SUFFIX):
+        try:
+            (base_dir / f"{session_id}{suffix}").unlink()
+            deleted = True
+        except FileNotFoundError:
+            continue
+    if discard_archived(session_id, base_dir):
+        deleted = True
+    if deleted:
+        remove_session(session_id, base_dir)
+    return deleted
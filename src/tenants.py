@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import os
+from collections.abc import Iterator
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+from src.food_normalizer import NormalizationCache
+from src.food_search import FoodSearchHit, FoodSearchStats, food_search_stats, search_foods
+from src.models import ReportSession
+from src.pdf_generator import DEFAULT_REPORTS_DIR
+from src.session_format import LazySession
+from src.storage import (
+    DEFAULT_SESSIONS_DIR,
+    delete_session,
+    list_sessions,
+    load_session,
+    open_session,
+    save_session,
+    session_exists,
+)
+
+DEFAULT_UPLOADS_DIR = Path("data/uploads")
+
+# The default (single-user) tenant keeps using the root directories
+DEFAULT_USER_ID = "default"
+TENANTS_DIRNAME = "tenants"
+# In a subdirectory: JSON files directly under base_dir are sessions
+NORMALIZATION_CACHE_PATH = Path("normalization") / "foods.json"
+
+
+def tenant_dir(user_id: str, root: Path = DEFAULT_SESSIONS_DIR) -> Path:
+    """One user's partition of root (sessions, uploads or reports).
+
+    Users are spread over 256 shard directories by a hash of their id,
+    so no directory grows with the number of users, and arbitrary ids
+    (e-mail addresses) never reach the file system.
+    """
+    if user_id == DEFAULT_USER_ID:
+        return root
+    digest = hashlib.sha256(user_id.encode()).hexdigest()
+    return root / TENANTS_DIRNAME / digest[:2] / digest[:32]
+
+
+@dataclass(frozen=True)
+class SessionStore:
+    """One user's partition of session storage.
+
+    Wraps the storage functions with the tenant's directory, which also
+    holds that user's summary index, history index and food
+    normalization cache, so listing, loading and searching only touch
+    this user's data. Uploaded PDFs and
+    generated reports are partitioned the same way.
+    """
+
+    user_id: str
+    base_dir: Path
+    uploads_dir: Path
+    reports_dir: Path
+
+    @cached_property
+    def normalization(self) -> NormalizationCache:
+        """This user's food normalization cache, loaded once per store."""
+        return NormalizationCache(self.base_dir / NORMALIZATION_CACHE_PATH)
+
+    def save(self, session: ReportSession, binary: bool | None = None) -> Path:
+        return save_session(
+            session, base_dir=self.base_dir, binary=binary,
+            food_tokens=self.normalization.tokens,
+        )
+
+    def load(self, session_id: str) -> ReportSession:
+        return load_session(session_id, base_dir=self.base_dir)
+
+    def open(self, session_id: str) -> ReportSession | LazySession:
+        return open_session(session_id, base_dir=self.base_dir)
+
+    def exists(self, session_id: str) -> bool:
+        return session_exists(session_id, base_dir=self.base_dir)
+
+    def list(self) -> list[dict[str, str]]:
+        return list_sessions(base_dir=self.base_dir)
+
+    def delete(self, session_id: str) -> bool:
+        return delete_session(session_id, base_dir=self.base_dir)
+
+    def search_foods(self, query: str, limit: int = 50) -> list[FoodSearchHit]:
+        return search_foods(query, base_dir=self.base_dir, limit=limit)
+
+    def food_search_stats(self, query: str) -> FoodSearchStats | None:
+        return food_search_stats(query, base_dir=self.base_dir)
+
+
+def store_for_user(
+    user_id: str,
+    root: Path = DEFAULT_SESSIONS_DIR,
+    uploads_root: Path = DEFAULT_UPLOADS_DIR,
+    reports_root: Path = DEFAULT_REPORTS_DIR,
+) -> SessionStore:
+    return SessionStore(
+        user_id=user_id,
+        base_dir=tenant_dir(user_id, root),
+        uploads_dir=tenant_dir(user_id, uploads_root),
+        reports_dir=tenant_dir(user_id, reports_root),
+    )
+
+
+def iter_stores(
+    root: Path = DEFAULT_SESSIONS_DIR,
+    uploads_root: Path = DEFAULT_UPLOADS_DIR,
+    reports_root: Path = DEFAULT_REPORTS_DIR,
+) -> Iterator[SessionStore]:
+    """Every tenant with data under the roots, starting with the default user.
+
+    Tenant directories are named by hash, so the stores of other users
+    carry that hash as their user_id.
+    """
+    yield store_for_user(DEFAULT_USER_ID, root, uploads_root, reports_root)
+    hashed: set[tuple[str, str]] = set()
+    for base in (root, uploads_root):
+        shards = base / TENANTS_DIRNAME
+        if shards.is_dir():
+            hashed.update(
+                (shard.name, tenant.name)
+                for shard in shards.iterdir() if shard.is_dir()
+                for tenant in shard.iterdir() if tenant.is_dir()
+            )
+    for shard, digest in sorted(hashed):
+        yield SessionStore(
+            user_id=digest,
+            base_dir=root / TENANTS_DIRNAME / shard / digest,
+            uploads_dir=uploads_root / TENANTS_DIRNAME / shard / digest,
+            reports_dir=reports_root / TENANTS_DIRNAME / shard / digest,
+        )
+
+
+def user_id_from_env() -> str:
+    """User id for headless runs: HEALTHCARE_USER_ID, else the default tenant."""
+    return os.environ.get("HEALTHCARE_USER_ID", "").strip() or DEFAULT_USER_ID
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from src.mapped_io import stream_to_file
+from src.models import SessionStatus, parse_day
+from src.pdf_parser import ParseResult, parse_pdf
+from src.pipeline import DEFAULT_REPORT_DAYS, default_selected_dates, session_from_parse
+from src.session_merge import merge_parse_result
+from src.tenants import SessionStore
+
+# A file must keep its size and mtime this long before it is read
+DEFAULT_SETTLE_SECONDS = 5.0
+DEFAULT_POLL_SECONDS = 10.0
+# A file that failed to ingest is retried after this long, doubling per failure
+DEFAULT_RETRY_SECONDS = 60.0
+_MAX_RETRY_DOUBLINGS = 6
+# Content hashes already ingested, kept beside the user's uploads
+INGESTED_FILENAME = "ingested.json"
+
+# Every complete PDF ends with an %%EOF marker, usually in its last bytes
+_TAIL_BYTES = 1024
+
+
+@dataclass(frozen=True)
+class WatchOutcome:
+    filename: str
+    # "created", "merged", "duplicate" or "failed"
+    action: str
+    session_id: str = ""
+    detail: str = ""
+
+    def summary(self) -> str:
+        target = f" -> {self.session_id}" if self.session_id else ""
+        detail = f" ({self.detail})" if self.detail else ""
+        return f"{self.action:<9} {self.filename}{target}{detail}"
+
+
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def _looks_complete(path: Path) -> bool:
+    """True once a PDF has its header and trailing %%EOF, i.e. is fully written."""
+    try:
+        with path.open("rb") as f:
+            if f.read(5) != b"%PDF-":
+                return False
+            f.seek(max(path.stat().st_size - _TAIL_BYTES, 0))
+            return b"%%EOF" in f.read()
+    except OSError:
+        return False
+
+
+def _parse(path: Path) -> ParseResult:
+    return parse_pdf(path)
+
+
+class FolderWatcher:
+    """Ingest Clarity PDFs dropped into a directory into one user's store.
+
+    Each poll scans the directory (mtime and size only) and treats a PDF
+    as ready once both have stayed unchanged for settle_seconds and the
+    file ends with %%EOF, so exports still being copied are left alone.
+    Ready files are hashed; content already ingested is skipped, anything
+    new is parsed on the executor while polling continues. Finished
+    parses are merged into the newest draft session overlapping their
+    dates, or become a new draft, and the PDF is copied to the user's
+    uploads like an upload from the Upload page. Files that fail are not
+    recorded as ingested; they are retried after retry_seconds, doubling
+    with each further failure.
+    """
+
+    def __init__(
+        self,
+        watch_dir: Path,
+        store: SessionStore,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        days: int = DEFAULT_REPORT_DAYS,
+        executor: Executor | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+    ) -> None:
+        self.watch_dir = watch_dir
+        self.store = store
+        self.settle_seconds = settle_seconds
+        self.days = days
+        self.retry_seconds = retry_seconds
+        self._executor = executor or ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        self._clock = clock
+        # path -> (size, mtime_ns, first seen with that signature)
+        self._pending: dict[Path, tuple[int, int, float]] = {}
+        # path -> (size, mtime_ns) last handled, so unchanged files are not rehashed
+        self._handled: dict[Path, tuple[int, int]] = {}
+        self._parsing: dict[Future[ParseResult], tuple[Path, str]] = {}
+        # path -> (consecutive failures, clock time it may be retried)
+        self._failures: dict[Path, tuple[int, float]] = {}
+        self._ingested = self._load_ingested()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    @property
+    def _ingested_path(self) -> Path:
+        return self.store.uploads_dir / INGESTED_FILENAME
+
+    def _load_ingested(self) -> dict[str, dict[str, str]]:
+        try:
+            return json.loads(self._ingested_path.read_bytes())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _record(self, digest: str, outcome: WatchOutcome) -> None:
+        self._ingested[digest] = {
+            "filename": outcome.filename,
+            "session_id": outcome.session_id,
+            "action": outcome.action,
+            "at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        self._ingested_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._ingested_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._ingested, indent=1))
+        os.replace(tmp_path, self._ingested_path)
+
+    def ready_files(self) -> list[Path]:
+        """PDFs that are new or changed and have settled since the last scan."""
+        if not self.watch_dir.is_dir():
+            return []
+        now = self._clock()
+        ready: list[Path] = []
+        present: set[Path] = set()
+        for entry in os.scandir(self.watch_dir):
+            if not entry.is_file() or not entry.name.lower().endswith(".pdf"):
+                continue
+            path = Path(entry.path)
+            present.add(path)
+            stat = entry.stat()
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if self._handled.get(path) == signature:
+                continue
+            failure = self._failures.get(path)
+            if failure is not None and now < failure[1]:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending[:2] != signature:
+                self._pending[path] = (*signature, now)
+            elif now - pending[2] >= self.settle_seconds and _looks_complete(path):
+                del self._pending[path]
+                self._handled[path] = signature
+                ready.append(path)
+        for path in set(self._pending) - present:
+            del self._pending[path]
+        for path in set(self._failures) - present:
+            del self._failures[path]
+        return sorted(ready)
+
+    def poll(self, wait_for_parses: bool = False) -> list[WatchOutcome]:
+        """Scan once, start parsing ready files and apply finished parses."""
+        outcomes: list[WatchOutcome] = []
+        in_flight = {digest for _, digest in self._parsing.values()}
+        for path in self.ready_files():
+            digest = _file_digest(path)
+            if digest in self._ingested or digest in in_flight:
+                outcomes.append(WatchOutcome(
+                    path.name, "duplicate",
+                    self._ingested.get(digest, {}).get("session_id", ""),
+                    "content already ingested",
+                ))
+                continue
+            in_flight.add(digest)
+            self._parsing[self._executor.submit(_parse, path)] = (path, digest)
+
+        if wait_for_parses and self._parsing:
+            wait(self._parsing)
+        for future in [f for f in self._parsing if f.done()]:
+            path, digest = self._parsing.pop(future)
+            try:
+                outcome = self._apply(path, future.result())
+            except Exception as e:
+                outcome = WatchOutcome(path.name, "failed", detail=f"{type(e).__name__}: {e}")
+                self._fail(path)
+            else:
+                self._failures.pop(path, None)
+                self._record(digest, outcome)
+            outcomes.append(outcome)
+        return outcomes
+
+    def _fail(self, path: Path) -> None:
+        """Offer path again once its retry delay has passed."""
+        failures = self._failures.get(path, (0, 0.0))[0] + 1
+        delay = self.retry_seconds * 2 ** min(failures - 1, _MAX_RETRY_DOUBLINGS)
+        self._failures[path] = (failures, self._clock() + delay)
+        self._handled.pop(path, None)
+
+    def _merge_target(self, dates: list[date]) -> dict[str, Any] | None:
+        """The newest draft session whose date range overlaps dates."""
+        for summary in self.store.list():
+            if (
+                summary["status"] == SessionStatus.DRAFT
+                and summary["date_range_start"]
+                and parse_day(summary["date_range_start"]) <= dates[-1]
+                and parse_day(summary["date_range_end"]) >= dates[0]
+            ):
+                return summary
+        return None
+
+    def _apply(self, path: Path, result: ParseResult) -> WatchOutcome:
+        if not result.available_dates:
+            raise ValueError("no dated entries found")
+        with path.open("rb") as f:
+            stream_to_file(f, self.store.uploads_dir / path.name)
+
+        selected = default_selected_dates(result.available_dates, self.days)
+        target = self._merge_target(result.available_dates)
+        if target is None:
+            session = session_from_parse(
+                result, name=path.stem, source_filename=path.name, selected_dates=selected
+            )
+            self.store.save(session)
+            return WatchOutcome(path.name, "created", session.id)
+
+        session = self.store.load(target["id"])
+        session, diff = merge_parse_result(
+            session, result, sorted(set(session.selected_dates) | set(selected))
+        )
+        session.source_filename = path.name
+        self.store.save(session)
+        return WatchOutcome(path.name, "merged", session.id, diff.summary())
+
+    def run(
+        self,
+        interval: float = DEFAULT_POLL_SECONDS,
+        stop: threading.Event | None = None,
+        report: Callable[[WatchOutcome], None] = lambda outcome: None,
+    ) -> None:
+        """Poll every interval seconds until stop is set."""
+        stop = stop or threading.Event()
+        while not stop.is_set():
+            for outcome in self.poll():
+                report(outcome)
+            stop.wait(interval)
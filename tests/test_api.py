@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.api import ApiApp, session_chunks
+from src.models import SCHEMA_VERSION, GlucoseEntry, MealType, ReportSession
+from src.tenants import store_for_user, user_id_from_env
+
+SAMPLE_PDF = Path("docs/samples/clarity_2026-02-18_to_2026-02-22.pdf")
+
+
+class Response:
+    def __init__(self, messages: list[dict[str, Any]]) -> None:
+        start = messages[0]
+        self.status: int = start["status"]
+        self.headers = dict(start["headers"])
+        self.chunks = [m["body"] for m in messages[1:] if m["body"]]
+        self.body = b"".join(self.chunks)
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+def request(
+    app: ApiApp,
+    method: str,
+    path: str,
+    body: bytes = b"",
+    query: str = "",
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Drive the ASGI app in-process, delivering the body in two parts."""
+    scope = {
+        "type": "http", "method": method, "path": path,
+        "query_string": query.encode(),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    half = len(body) // 2
+    incoming = [
+        {"type": "http.request", "body": body[:half], "more_body": True},
+        {"type": "http.request", "body": body[half:], "more_body": False},
+    ]
+    sent: list[dict[str, Any]] = []
+
+    async def receive() -> dict[str, Any]:
+        return incoming.pop(0)
+
+    async def send(message: dict[str, Any]) -> None:
+        sent.append(message)
+
+    asyncio.run(app(scope, receive, send))
+    return Response(sent)
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = ApiApp(
+        root=tmp_path / "sessions", uploads_root=tmp_path / "uploads",
+        reports_root=tmp_path / "reports", workers=2,
+    )
+    yield app
+    app.close()
+
+
+def _session(meals: int = 3) -> ReportSession:
+    session = ReportSession.create_new(
+        name="Week", date_range_start="2026-02-21", date_range_end="2026-02-21",
+        selected_dates=["2026-02-21"],
+    )
+    session.glucose_entries = [
+        GlucoseEntry(
+            date="2026-02-21", time="8:00 AM", glucose_reading=100 + i,
+            food_item=f"Food {i}", meal_type=MealType.BREAKFAST,
+        )
+        for i in range(meals)
+    ]
+    return session
+
+
+class TestSessionChunks:
+    def test_streamed_json_round_trips(self):
+        session = _session(7)
+        chunks = list(session_chunks(session))
+        assert ReportSession.model_validate_json(b"".join(chunks)) == session
+
+    def test_batches_large_lists(self):
+        session = _session(1200)
+        chunks = list(session_chunks(session))
+        # header, then three batches of glucose entries among the list chunks
+        assert len(chunks) > 10
+        assert ReportSession.model_validate_json(b"".join(chunks)) == session
+
+
+class TestSessionCrud:
+    def test_create_get_update_delete(self, app):
+        session = _session()
+        created = request(app, "POST", "/sessions", session.model_dump_json().encode(),
+                          headers={"Content-Type": "application/json"})
+        assert created.status == 201
+        assert created.json()["id"] == session.id
+
+        listed = request(app, "GET", "/sessions").json()
+        assert [s["id"] for s in listed] == [session.id]
+
+        fetched = request(app, "GET", f"/sessions/{session.id}")
+        assert fetched.status == 200
+        assert ReportSession.model_validate_json(fetched.body) == session
+
+        session.name = "Renamed"
+        updated = request(app, "PUT", f"/sessions/{session.id}",
+                          session.model_dump_json().encode())
+        assert updated.status == 200
+        assert request(app, "GET", f"/sessions/{session.id}").json()["name"] == "Renamed"
+
+        assert request(app, "DELETE", f"/sessions/{session.id}").status == 204
+        assert request(app, "GET", f"/sessions/{session.id}").status == 404
+
+    def test_users_are_partitioned(self, app):
+        session = _session()
+        request(app, "POST", "/sessions", session.model_dump_json().encode(),
+                headers={"Content-Type": "application/json", "X-User-Id": "alice"})
+        assert request(app, "GET", "/sessions", headers={"X-User-Id": "bob"}).json() == []
+        assert request(app, "GET", f"/sessions/{session.id}",
+                       headers={"X-User-Id": "alice"}).status == 200
+
+    def test_rejects_bad_requests(self, app):
+        session = _session()
+        assert request(app, "PUT", "/sessions/other-id",
+                       session.model_dump_json().encode()).status == 409
+        assert request(app, "PUT", f"/sessions/{session.id}", b"{}").status == 422
+        assert request(app, "GET", "/sessions/..%2Fescape").status == 404
+        assert request(app, "POST", "/sessions", b"not a pdf").status == 415
+        assert request(app, "GET", "/nowhere").status == 404
+
+    def test_post_does_not_replace_existing(self, app):
+        session = _session()
+        body = session.model_dump_json().encode()
+        headers = {"Content-Type": "application/json"}
+        assert request(app, "POST", "/sessions", body, headers=headers).status == 201
+        session.name = "Replaced"
+        response = request(app, "POST", "/sessions", session.model_dump_json().encode(),
+                           headers=headers)
+        assert response.status == 409
+        assert "PUT" in response.json()["detail"]
+        assert request(app, "GET", f"/sessions/{session.id}").json()["name"] != "Replaced"
+
+    def test_unreadable_stored_sessions(self, app):
+        store = store_for_user(user_id_from_env(), *app.roots)
+        newer = _session()
+        newer.schema_version = SCHEMA_VERSION + 1
+        store.save(newer)
+        store.base_dir.joinpath("corrupt.json").write_text("{not json")
+        assert request(app, "GET", f"/sessions/{newer.id}").status == 409
+        assert request(app, "POST", f"/sessions/{newer.id}/report").status == 409
+        response = request(app, "GET", "/sessions/corrupt")
+        assert response.status == 422
+        assert "unreadable" in response.json()["detail"]
+
+    def test_busy_executor_returns_503(self, app):
+        app.max_pending = 0
+        response = request(app, "GET", "/sessions")
+        assert response.status == 503
+
+
+class TestPdfEndpoints:
+    def test_parse_streams_entries(self, app, tmp_path):
+        response = request(app, "POST", "/parse", SAMPLE_PDF.read_bytes())
+        assert response.status == 200
+        data = response.json()
+        assert data["available_dates"]
+        assert data["glucose_entries"]
+        # Nothing is stored for a plain parse
+        assert not (tmp_path / "uploads").exists()
+
+    def test_unreadable_pdf_is_422(self, app):
+        for path in ("/parse", "/sessions"):
+            response = request(app, "POST", path, b"%PDF-1.4 truncated",
+                               headers={"Content-Type": "application/pdf"})
+            assert response.status == 422
+            assert response.json()["detail"].startswith("unreadable PDF")
+
+    def test_create_from_pdf_and_render_report(self, app, tmp_path):
+        created = request(app, "POST", "/sessions", SAMPLE_PDF.read_bytes(),
+                          query=f"filename={SAMPLE_PDF.name}&start=2026-02-19&end=2026-02-20",
+                          headers={"Content-Type": "application/pdf"})
+        assert created.status == 201
+        session_id = created.json()["id"]
+        assert (tmp_path / "uploads" / SAMPLE_PDF.name).exists()
+
+        session = ReportSession.model_validate_json(
+            request(app, "GET", f"/sessions/{session_id}").body
+        )
+        assert session.selected_dates == [date(2026, 2, 19), date(2026, 2, 20)]
+        assert session.source_filename == SAMPLE_PDF.name
+
+        report = request(app, "POST", f"/sessions/{session_id}/report")
+        assert report.status == 200
+        assert report.headers[b"content-type"] == b"application/pdf"
+        assert report.body.startswith(b"%PDF")
+
+    def test_unnamed_uploads_are_kept_apart(self, app, tmp_path):
+        for _ in range(2):
+            created = request(app, "POST", "/sessions", SAMPLE_PDF.read_bytes(),
+                              headers={"Content-Type": "application/pdf"})
+            assert created.status == 201
+        assert len(list((tmp_path / "uploads").glob("upload_*.pdf"))) == 2
+
+    def test_invalid_date_is_rejected(self, app):
+        response = request(app, "POST", "/sessions", SAMPLE_PDF.read_bytes(),
+                           query="start=yesterday")
+        assert response.status == 400
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.archive import (
+    archive_session,
+    discard_archived,
+    has_archive,
+    load_archived_session,
+    query_archive,
+)
+from src.models import GlucoseEntry, MealType, ReportSession, SessionStatus
+from src.storage import (
+    delete_session,
+    list_sessions,
+    load_session,
+    save_session,
+    session_exists,
+)
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    """Provide an isolated temporary directory for session storage."""
+    return tmp_path / "sessions"
+
+
+def _make_session(
+    name: str = "Archived", start: str = "2026-02-18", end: str = "2026-02-22"
+) -> ReportSession:
+    session = ReportSession.create_new(
+        name=name, date_range_start=start, date_range_end=end, selected_dates=[start],
+    )
+    session.status = SessionStatus.FINALIZED
+    session.source_filename = f"{name}.pdf"
+    session.glucose_entries.append(GlucoseEntry(
+        date=start, time="8:00 AM", glucose_reading=110,
+        food_item="Oatmeal", meal_type=MealType.BREAKFAST,
+    ))
+    return session
+
+
+class TestArchiveSession:
+    def test_round_trip(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        archive_session(session, sessions_dir)
+        assert load_archived_session(session.id, sessions_dir) == session
+
+    def test_missing_raises(self, sessions_dir: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            load_archived_session("nope", sessions_dir)
+        assert not has_archive(sessions_dir)
+
+    def test_rearchive_replaces(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        archive_session(session, sessions_dir)
+        session.name = "Renamed"
+        archive_session(session, sessions_dir)
+        assert [a.name for a in query_archive(sessions_dir)] == ["Renamed"]
+
+    def test_discard(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        archive_session(session, sessions_dir)
+        assert discard_archived(session.id, sessions_dir)
+        assert not discard_archived(session.id, sessions_dir)
+
+
+class TestQueryArchive:
+    def test_filters_overlapping_ranges(self, sessions_dir: Path) -> None:
+        archive_session(_make_session("Feb", "2026-02-01", "2026-02-14"), sessions_dir)
+        archive_session(_make_session("Mar", "2026-03-01", "2026-03-14"), sessions_dir)
+        names = [a.name for a in query_archive(sessions_dir, start="2026-02-10", end="2026-02-20")]
+        assert names == ["Feb"]
+
+    def test_filters_source(self, sessions_dir: Path) -> None:
+        archive_session(_make_session("Feb"), sessions_dir)
+        archive_session(_make_session("Mar"), sessions_dir)
+        assert [a.name for a in query_archive(sessions_dir, source_filename="Mar.pdf")] == ["Mar"]
+
+    def test_empty_without_archive(self, sessions_dir: Path) -> None:
+        assert query_archive(sessions_dir) == []
+
+
+class TestStorageFallback:
+    def test_load_session_reads_archive(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        archive_session(session, sessions_dir)
+        assert load_session(session.id, base_dir=sessions_dir) == session
+
+    def test_list_sessions_includes_archive(self, sessions_dir: Path) -> None:
+        archived = _make_session("Old")
+        archive_session(archived, sessions_dir)
+        save_session(_make_session("New"), base_dir=sessions_dir)
+        assert sorted(s["name"] for s in list_sessions(sessions_dir)) == ["New", "Old"]
+
+    def test_save_supersedes_archive(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        archive_session(session, sessions_dir)
+        session.name = "Edited"
+        save_session(session, base_dir=sessions_dir)
+        assert query_archive(sessions_dir) == []
+        assert [s["name"] for s in list_sessions(sessions_dir)] == ["Edited"]
+
+    def test_delete_removes_archived(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        archive_session(session, sessions_dir)
+        assert delete_session(session.id, base_dir=sessions_dir)
+        with pytest.raises(FileNotFoundError):
+            load_session(session.id, base_dir=sessions_dir)
+
+    def test_session_exists_sees_archive(self, sessions_dir: Path) -> None:
+        archived, live = _make_session("Old"), _make_session("New")
+        assert not session_exists(archived.id, sessions_dir)
+        archive_session(archived, sessions_dir)
+        save_session(live, base_dir=sessions_dir, binary=True)
+        assert session_exists(archived.id, sessions_dir)
+        assert session_exists(live.id, sessions_dir)
+        assert not session_exists("missing", sessions_dir)
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.cgm_trace import (
+    MINUTES_PER_DAY,
+    chart_series,
+    downsample,
+    extract_traces,
+    lttb,
+)
+from src.history_index import time_to_minute
+from src.models import CgmTrace, ReportSession
+from src.pdf_parser import ParseResult, filter_by_dates, parse_pdf
+from src.session_format import decode_session, encode_session
+
+SAMPLE_PDF = Path("docs/samples/clarity_2026-02-18_to_2026-02-22.pdf")
+
+# A chart spanning x 50..530 (midnight to midnight), gridlines for 300,
+# 200 and 100 mg/dL at tops 100, 120 and 140, labelled right of the chart
+_HEADER = {"text": "Wed, Feb 18, 2026", "top": 80.0, "bottom": 90.0}
+_LINES = [
+    {"x0": 50.0, "x1": 530.0, "top": top, "bottom": top} for top in (100.0, 120.0, 140.0)
+]
+_WORDS = [
+    {"text": text, "x0": 532.0, "top": top - 3, "bottom": top + 3}
+    for text, top in (("300", 100.0), ("200", 120.0), ("100", 140.0))
+]
+
+
+def _curve(pts: list[tuple[float, float]], color: tuple[float, ...] = (0.13, 0.13, 0.13)) -> dict:
+    xs, tops = [x for x, _ in pts], [t for _, t in pts]
+    return {
+        "x0": min(xs), "x1": max(xs), "top": min(tops), "bottom": max(tops),
+        "pts": pts, "stroke": True, "fill": False, "stroking_color": color,
+    }
+
+
+@pytest.fixture(scope="module")
+def parsed() -> ParseResult:
+    return parse_pdf(SAMPLE_PDF)
+
+
+class TestCgmTrace:
+    def test_points_round_trip(self) -> None:
+        trace = CgmTrace.from_points("2026-02-18", [0, 5, 10], [100, 120, 95])
+        minutes, values = trace.points()
+        assert list(minutes) == [0, 5, 10]
+        assert list(values) == [100, 120, 95]
+        assert len(trace.samples) == 12
+
+    def test_json_round_trip(self) -> None:
+        trace = CgmTrace.from_points("2026-02-18", [0, 5], [100, 120])
+        assert CgmTrace.model_validate_json(trace.model_dump_json()) == trace
+
+    def test_binary_session_round_trip(self) -> None:
+        session = ReportSession.create_new("T", "2026-02-18", "2026-02-18", ["2026-02-18"])
+        session.cgm_traces = [CgmTrace.from_points("2026-02-18", [0, 5], [100, 120])]
+        assert decode_session(encode_session(session)) == session
+
+
+class TestExtractTraces:
+    def test_calibrates_axes(self) -> None:
+        curve = _curve([(50.0, 140.0), (290.0, 120.0), (530.0, 110.0)])
+        (trace,) = extract_traces([_HEADER], _LINES, _WORDS, [curve])
+        assert trace.date == date(2026, 2, 18)
+        minutes, values = trace.points()
+        assert list(minutes) == [0, 720, MINUTES_PER_DAY - 1]
+        assert list(values) == [100, 200, 250]
+
+    def test_merges_segments_in_time_order(self) -> None:
+        late = _curve([(410.0, 120.0), (530.0, 120.0)])
+        early = _curve([(50.0, 130.0), (170.0, 130.0)])
+        (trace,) = extract_traces([_HEADER], _LINES, _WORDS, [late, early])
+        minutes, values = trace.points()
+        assert list(minutes) == [0, 360, 1080, 1439]
+        assert list(values) == [150, 150, 200, 200]
+
+    def test_ignores_coloured_lines(self) -> None:
+        target = _curve([(50.0, 130.0), (530.0, 130.0)], color=(1.0, 0.66, 0.28))
+        assert extract_traces([_HEADER], _LINES, _WORDS, [target]) == []
+
+    def test_no_chart_without_labels(self) -> None:
+        curve = _curve([(50.0, 140.0), (530.0, 110.0)])
+        assert extract_traces([_HEADER], _LINES, [], [curve]) == []
+
+
+class TestSamplePdf:
+    def test_one_trace_per_day(self, parsed: ParseResult) -> None:
+        assert sorted(t.date for t in parsed.cgm_traces) == parsed.available_dates
+
+    def test_full_days_at_five_minute_resolution(self, parsed: ParseResult) -> None:
+        (trace,) = [t for t in parsed.cgm_traces if t.date == date(2026, 2, 18)]
+        minutes, _ = trace.points()
+        assert len(minutes) > 270
+        assert minutes[0] == 0 and minutes[-1] == MINUTES_PER_DAY - 1
+
+    def test_matches_event_readings(self, parsed: ParseResult) -> None:
+        traces = {t.date: t.points() for t in parsed.cgm_traces}
+        errors = []
+        for entry in parsed.glucose_entries:
+            minutes, values = traces[entry.date]
+            target = time_to_minute(entry.time)
+            nearest = min(range(len(minutes)), key=lambda i: abs(minutes[i] - target))
+            errors.append(abs(values[nearest] - entry.glucose_reading))
+        # Event times fall between 5-minute samples on a moving curve
+        assert max(errors) <= 10
+        assert sum(errors) / len(errors) <= 3
+
+    def test_filtered_with_dates(self, parsed: ParseResult) -> None:
+        filtered = filter_by_dates(parsed, ["2026-02-18", "2026-02-19"])
+        assert sorted(t.date for t in filtered.cgm_traces) == [
+            date(2026, 2, 18), date(2026, 2, 19),
+        ]
+
+
+class TestLttb:
+    def test_keeps_endpoints_and_count(self) -> None:
+        xs = list(range(1000))
+        ys = [x % 37 for x in xs]
+        kept = lttb(xs, ys, 100)
+        assert len(kept) == 100
+        assert kept[0] == 0 and kept[-1] == 999
+        assert kept == sorted(kept)
+
+    def test_keeps_spike(self) -> None:
+        xs = list(range(500))
+        ys = [100] * 500
+        ys[250] = 300
+        assert 250 in lttb(xs, ys, 20)
+
+    def test_short_series_unchanged(self) -> None:
+        assert lttb([0, 1, 2], [5, 6, 7], 10) == [0, 1, 2]
+
+
+class TestDownsample:
+    def test_month_reduced_to_width(self, parsed: ParseResult) -> None:
+        dates, minutes, values = downsample(parsed.cgm_traces, 200)
+        assert len(dates) == len(minutes) == len(values) == 200
+        assert dates[0] == parsed.available_dates[0]
+        assert dates[-1] == parsed.available_dates[-1]
+
+    def test_chart_series_in_time_order(self, parsed: ParseResult) -> None:
+        series = chart_series(parsed.cgm_traces, 300)
+        assert len(series["time"]) == 300
+        assert series["time"] == sorted(series["time"])
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from src.chat_context import (
+    build_context,
+    estimate_tokens,
+    relevant_dates,
+    session_digest,
+)
+from src.models import (
+    ExerciseEntry,
+    GlucoseEntry,
+    MealType,
+    MoodEntry,
+    ReportSession,
+    TimeSlot,
+)
+
+
+def _make_session(days: int = 5) -> ReportSession:
+    start = date(2026, 2, 18)
+    dates = [str(start + timedelta(days=i)) for i in range(days)]
+    session = ReportSession.create_new(
+        name="Context Test",
+        date_range_start=dates[0],
+        date_range_end=dates[-1],
+        selected_dates=dates,
+    )
+    for i, d in enumerate(dates):
+        session.glucose_entries.extend([
+            GlucoseEntry(date=d, time="9:40 AM", glucose_reading=100 + i,
+                         food_item="Granola, yogurt, blueberries",
+                         meal_type=MealType.BREAKFAST),
+            GlucoseEntry(date=d, time="1:15 PM", glucose_reading=95,
+                         food_item="Tuna salad with cheese",
+                         meal_type=MealType.LUNCH),
+            GlucoseEntry(date=d, time="7:30 PM", glucose_reading=110,
+                         food_item="Chicken with salad" if i % 2 else "Pasta with sauce",
+                         meal_type=MealType.DINNER),
+        ])
+        session.mood_entries.append(
+            MoodEntry(date=d, time_slot=TimeSlot.AROUND_NOON, time="12:00 PM",
+                      energy="Ok", mood=3)
+        )
+    session.exercise_entries.append(
+        ExerciseEntry(date=dates[0], time="10:56 AM", activity_type="Walking",
+                      duration_minutes=33, heart_rate_bpm=88, glucose_reading=108)
+    )
+    session.glucose_entries.append(
+        GlucoseEntry(date=dates[-1], time="9:00 PM", glucose_reading=195,
+                     food_item="Chocolate cake", meal_type=MealType.SNACK)
+    )
+    return session
+
+
+class TestEstimateTokens:
+    def test_four_chars_per_token(self) -> None:
+        assert estimate_tokens("abcd" * 10) == 10
+        assert estimate_tokens("abcde") == 2
+
+
+class TestSessionDigest:
+    def test_day_stats(self) -> None:
+        digest = session_digest(_make_session())
+        first = digest.days[0]
+        assert first.date == date(2026, 2, 18)
+        assert first.weekday == "wednesday"
+        assert first.meals == 3
+        assert first.glucose_min == 95
+        assert first.glucose_max == 110
+        assert first.exercise_minutes == 33
+        assert first.mood_mean == 3
+
+    def test_top_foods_counts(self) -> None:
+        digest = session_digest(_make_session())
+        assert digest.top_foods[0].startswith("salad 7x")
+
+    def test_outliers_include_high_reading(self) -> None:
+        digest = session_digest(_make_session())
+        assert any("195" in line and "Chocolate cake" in line for line in digest.outliers)
+
+    def test_cached_by_content_hash(self) -> None:
+        session = _make_session()
+        assert session_digest(session) is session_digest(session.model_copy(deep=True))
+
+    def test_cache_invalidated_on_change(self) -> None:
+        session = _make_session()
+        before = session_digest(session)
+        session.glucose_entries[0].glucose_reading = 250
+        assert session_digest(session) is not before
+
+
+class TestRelevantDates:
+    def test_iso_date(self) -> None:
+        digest = session_digest(_make_session())
+        assert relevant_dates(digest, "What happened on 2026-02-20?") == [date(2026, 2, 20)]
+
+    def test_month_day(self) -> None:
+        digest = session_digest(_make_session())
+        assert relevant_dates(digest, "How was February 19?") == [date(2026, 2, 19)]
+
+    def test_weekday(self) -> None:
+        digest = session_digest(_make_session())
+        assert relevant_dates(digest, "Why was Sunday high?") == [date(2026, 2, 22)]
+
+    def test_food(self) -> None:
+        digest = session_digest(_make_session())
+        assert relevant_dates(digest, "What did pasta do?") == [
+            date(2026, 2, 22), date(2026, 2, 20), date(2026, 2, 18),
+        ]
+
+    def test_general_question_matches_nothing(self) -> None:
+        digest = session_digest(_make_session())
+        assert relevant_dates(digest, "How was my week?") == []
+
+
+class TestBuildContext:
+    def test_respects_budget(self) -> None:
+        session = _make_session(days=60)
+        for budget in (50, 200, 800):
+            context = build_context(session, "How was my week?", token_budget=budget)
+            assert estimate_tokens(context) <= budget
+
+    def test_much_smaller_than_json(self) -> None:
+        session = _make_session(days=90)
+        context = build_context(session, "How was my quarter?")
+        assert estimate_tokens(context) * 10 < estimate_tokens(session.model_dump_json())
+
+    def test_includes_sections(self) -> None:
+        context = build_context(_make_session(), token_budget=2000)
+        assert "Session 'Context Test'" in context
+        assert "2026-02-18 Wed|3|" in context
+        assert "Top foods:" in context
+        assert "Outliers:" in context
+        assert "Tuna salad with cheese" in context
+
+    def test_relevant_day_meals_first(self) -> None:
+        context = build_context(_make_session(days=30), "What about 2026-02-20?",
+                                token_budget=400)
+        meals = context.split("Meals (date time type mg/dL food):")[1]
+        assert meals.strip().startswith("2026-02-20 9:40 AM")
+
+    def test_tiny_budget_returns_empty(self) -> None:
+        assert build_context(_make_session(), token_budget=1) == ""
+
+    def test_empty_session(self) -> None:
+        session = ReportSession.create_new(
+            name="Empty", date_range_start="2026-02-18",
+            date_range_end="2026-02-22", selected_dates=[],
+        )
+        assert build_context(session).startswith("Session 'Empty'")
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import shutil
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.storage import list_sessions, load_session
+
+SAMPLE_PDF = Path("docs/samples/clarity_2026-02-18_to_2026-02-22.pdf")
+
+
+@pytest.fixture()
+def input_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "inbox"
+    directory.mkdir()
+    shutil.copy(SAMPLE_PDF, directory / SAMPLE_PDF.name)
+    return directory
+
+
+def _run(input_dir: Path, tmp_path: Path, *extra: str) -> int:
+    return main([
+        "ingest", str(input_dir),
+        "--sessions-dir", str(tmp_path / "sessions"),
+        "--reports-dir", str(tmp_path / "reports"),
+        "--workers", "1",
+        *extra,
+    ])
+
+
+class TestIngest:
+    def test_creates_session_and_report(
+        self, input_dir: Path, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        assert _run(input_dir, tmp_path) == 0
+        summaries = list_sessions(tmp_path / "sessions")
+        assert len(summaries) == 1
+        session = load_session(summaries[0]["id"], tmp_path / "sessions")
+        assert session.selected_dates == [date(2026, 2, d) for d in range(18, 23)]
+        assert len(session.glucose_entries) == 20
+        assert session.source_filename == SAMPLE_PDF.name
+        assert len(list((tmp_path / "reports").glob("*.pdf"))) == 1
+        out = capsys.readouterr().out
+        assert "parse " in out and "report " in out
+
+    def test_date_range(self, input_dir: Path, tmp_path: Path) -> None:
+        assert _run(input_dir, tmp_path, "--no-report",
+                    "--start", "2026-02-20", "--end", "2026-02-21") == 0
+        (summary,) = list_sessions(tmp_path / "sessions")
+        session = load_session(summary["id"], tmp_path / "sessions")
+        assert session.selected_dates == [date(2026, 2, 20), date(2026, 2, 21)]
+
+    def test_no_report(self, input_dir: Path, tmp_path: Path) -> None:
+        assert _run(input_dir, tmp_path, "--no-report") == 0
+        assert not (tmp_path / "reports").exists()
+
+    def test_bad_pdf_fails(self, input_dir: Path, tmp_path: Path) -> None:
+        (input_dir / "broken.pdf").write_bytes(b"not a pdf")
+        assert _run(input_dir, tmp_path, "--no-report") == 1
+        assert len(list_sessions(tmp_path / "sessions")) == 1
+
+    def test_warnings_are_not_errors(
+        self, input_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from src import cli
+        from src.pdf_parser import parse_pdf
+
+        def parse_with_warning(path: Path):  # type: ignore[no-untyped-def]
+            result = parse_pdf(path)
+            result.warnings.append("Page 1: unknown event type 'Insulin'")
+            return result
+
+        monkeypatch.setattr(cli, "parse_pdf", parse_with_warning)
+        options = cli.IngestOptions(sessions_dir=tmp_path / "sessions", report=False)
+        result = cli.ingest_pdf(input_dir / SAMPLE_PDF.name, options)
+        assert result.warnings
+        assert not result.error
+
+    def test_empty_directory(self, tmp_path: Path) -> None:
+        empty = tmp_path / "empty"
+        empty.mkdir()
+        assert _run(empty, tmp_path) == 1
+
+
+class TestStartup:
+    def test_does_not_import_ui_or_llm(self) -> None:
+        code = (
+            "import sys, src.cli; "
+            "print(','.join(m for m in ('streamlit', 'litellm') if m in sys.modules))"
+        )
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        assert out.strip() == ""
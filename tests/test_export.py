@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import csv
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.export import (
+    EXPORT_TABLES,
+    export_sessions,
+    export_zip,
+    iter_sessions,
+    table_columns,
+)
+from src.models import (
+    ExerciseEntry,
+    GlucoseEntry,
+    InsulinEntry,
+    MealType,
+    MoodEntry,
+    ReportSession,
+    TimeSlot,
+)
+from src.storage import save_session
+from src.tenants import store_for_user
+
+
+def _session(name: str, dates: list[str]) -> ReportSession:
+    session = ReportSession.create_new(
+        name=name, date_range_start=dates[0], date_range_end=dates[-1],
+        selected_dates=dates,
+    )
+    for i, d in enumerate(dates):
+        session.glucose_entries.append(GlucoseEntry(
+            date=d, time="8:00 AM", glucose_reading=100 + i,
+            food_item="Oatmeal, berries", meal_type=MealType.BREAKFAST,
+        ))
+        session.exercise_entries.append(ExerciseEntry(
+            date=d, time="6:00 PM", activity_type="Walking",
+            duration_minutes=30, heart_rate_bpm=95, glucose_reading=110,
+        ))
+        session.mood_entries.append(MoodEntry(
+            date=d, time_slot=TimeSlot.BEFORE_BED, time="10:00 PM",
+            energy="tired", mood=3,
+        ))
+    session.insulin_entries.append(InsulinEntry(
+        date=dates[0], time="8:05 AM", insulin_type="Rapid", units=4.5,
+    ))
+    return session
+
+
+def _read_csv(path: Path) -> list[dict[str, str]]:
+    with path.open(newline="") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    base_dir = tmp_path / "sessions"
+    save_session(_session("February", ["2026-02-18", "2026-02-19", "2026-02-20"]), base_dir)
+    save_session(_session("March", ["2026-03-01", "2026-03-02"]), base_dir, binary=True)
+    return base_dir
+
+
+class TestExportSessions:
+    def test_csv_tables(self, sessions_dir: Path, tmp_path: Path) -> None:
+        result = export_sessions(iter_sessions(sessions_dir), tmp_path / "out")
+        assert result.sessions == 2
+        assert result.rows == {"glucose": 5, "exercise": 5, "insulin": 2, "notes": 0, "mood": 5}
+        rows = _read_csv(result.paths["glucose"])
+        assert list(rows[0]) == list(table_columns("glucose"))
+        assert {r["session_name"] for r in rows} == {"February", "March"}
+        assert rows[0]["food_item"] == "Oatmeal, berries"
+        assert rows[0]["meal_type"] == "breakfast"
+        # Empty tables still get their header
+        assert _read_csv(result.paths["notes"]) == []
+        assert result.paths["notes"].read_text().startswith("session_id,session_name,date")
+
+    def test_date_range_and_session_filters(self, sessions_dir: Path, tmp_path: Path) -> None:
+        sessions = iter_sessions(sessions_dir, start="2026-02-19", end="2026-02-28")
+        result = export_sessions(
+            sessions, tmp_path / "out", start="2026-02-19", end="2026-02-28"
+        )
+        assert result.sessions == 1
+        dates = [r["date"] for r in _read_csv(result.paths["glucose"])]
+        assert dates == ["2026-02-19", "2026-02-20"]
+
+        (march,) = [s for s in iter_sessions(sessions_dir) if s.name == "March"]
+        result = export_sessions(
+            iter_sessions(sessions_dir, session_ids={march.id}), tmp_path / "only",
+            tables=["mood"],
+        )
+        assert list(result.paths) == ["mood"]
+        assert result.rows == {"mood": 2}
+
+    def test_flushes_in_chunks(self, sessions_dir: Path, tmp_path: Path) -> None:
+        result = export_sessions(iter_sessions(sessions_dir), tmp_path / "out", chunk_rows=1)
+        assert result.rows["glucose"] == 5
+        assert len(_read_csv(result.paths["glucose"])) == 5
+
+    @pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+    def test_columnar_formats(self, fmt: str, sessions_dir: Path, tmp_path: Path) -> None:
+        pa = pytest.importorskip("pyarrow")
+        result = export_sessions(
+            iter_sessions(sessions_dir), tmp_path / "out", fmt, chunk_rows=2
+        )
+        if fmt == "parquet":
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(result.paths["insulin"])
+        else:
+            table = pa.ipc.open_file(result.paths["insulin"]).read_all()
+        assert table.num_rows == 2
+        assert table.schema.field("units").type == pa.float64()
+        assert table.column("glucose_reading").to_pylist() == [None, None]
+        assert table.column("units").to_pylist() == [4.5, 4.5]
+
+    def test_rejects_unknown_format_and_table(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="format"):
+            export_sessions([], tmp_path, "xlsx")
+        with pytest.raises(ValueError, match="tables"):
+            export_sessions([], tmp_path, tables=["meals"])
+
+    def test_zip(self, sessions_dir: Path) -> None:
+        data = export_zip(iter_sessions(sessions_dir))
+        with zipfile.ZipFile(io.BytesIO(data)) as zf:
+            assert sorted(zf.namelist()) == sorted(f"{t}.csv" for t in EXPORT_TABLES)
+
+
+class TestExportCli:
+    def test_export_command(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        store = store_for_user("alice")
+        save_session(_session("February", ["2026-02-18", "2026-02-19"]), store.base_dir)
+        assert main(["export", "out", "--user", "alice", "--start", "2026-02-19",
+                     "--table", "glucose"]) == 0
+        assert "1 session(s) exported: 1 glucose" in capsys.readouterr().out
+        assert [r["date"] for r in _read_csv(tmp_path / "out" / "glucose.csv")] == [
+            "2026-02-19"
+        ]
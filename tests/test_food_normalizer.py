@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.food_normalizer import (
+    DEFAULT_CACHE_PATH,
+    NormalizationCache,
+    NormalizationError,
+    RateLimiter,
+    cache_key,
+    fake_normalization_responder,
+    normalize_foods,
+    normalize_foods_sync,
+)
+from src.food_search import search_foods
+from src.llm_client import ChatClient, FakeProvider, Message, ResponseCache
+from src.models import GlucoseEntry, MealType, ReportSession
+from src.tenants import store_for_user
+
+
+@pytest.fixture()
+def cache_path(tmp_path: Path) -> Path:
+    return tmp_path / "food_normalization.json"
+
+
+def _client() -> tuple[ChatClient, FakeProvider]:
+    provider = FakeProvider(responder=fake_normalization_responder)
+    return ChatClient(provider=provider), provider
+
+
+class TestCacheKey:
+    def test_case_and_punctuation(self) -> None:
+        assert cache_key("Coffee") == cache_key("coffee.") == "coffee"
+
+    def test_collapses_whitespace(self) -> None:
+        assert cache_key("  Granola,   yogurt ") == "granola, yogurt"
+
+
+class TestNormalizationCache:
+    def test_persists(self, cache_path: Path) -> None:
+        cache = NormalizationCache(cache_path)
+        cache.update({"Coffee.": ["coffee"]})
+        cache.save()
+        reloaded = NormalizationCache(cache_path)
+        assert reloaded.get("coffee") == ["coffee"]
+        assert len(reloaded) == 1
+
+    def test_tokens_add_canonical_names(self, cache_path: Path) -> None:
+        cache = NormalizationCache(cache_path)
+        cache.update({"OJ and toast": ["orange juice", "toast"]})
+        assert cache.tokens("oj and toast") == ["oj", "toast", "orange", "juice"]
+        assert cache.tokens("Coffee") == ["coffee"]
+
+
+class TestNormalizeFoods:
+    def test_batches_requests(self, cache_path: Path) -> None:
+        client, provider = _client()
+        items = [f"Food number {i}" for i in range(120)]
+        result = normalize_foods_sync(
+            items, client, NormalizationCache(cache_path),
+            batch_size=50, requests_per_second=0,
+        )
+        assert provider.calls == 3
+        assert result["Food number 7"] == ["food", "number"]
+
+    def test_dedupes_equivalent_strings(self, cache_path: Path) -> None:
+        client, provider = _client()
+        result = normalize_foods_sync(
+            ["Coffee", "coffee.", "Coffee", "Granola, yogurt, blueberries"],
+            client, NormalizationCache(cache_path), requests_per_second=0,
+        )
+        assert provider.calls == 1
+        assert result["Coffee"] == result["coffee."] == ["coffee"]
+        assert result["Granola, yogurt, blueberries"] == ["granola", "yogurt", "blueberry"]
+
+    def test_cached_items_not_resent(self, cache_path: Path) -> None:
+        client, provider = _client()
+        normalize_foods_sync(["Coffee"], client, NormalizationCache(cache_path),
+                             requests_per_second=0)
+        result = normalize_foods_sync(["coffee."], client, NormalizationCache(cache_path),
+                                      requests_per_second=0)
+        assert provider.calls == 1
+        assert result == {"coffee.": ["coffee"]}
+
+    def test_retries_bad_response(self, cache_path: Path) -> None:
+        attempts = 0
+
+        def flaky(messages: list[Message]) -> str:
+            nonlocal attempts
+            attempts += 1
+            if attempts == 1:
+                return "Sorry, I can't help with that."
+            return fake_normalization_responder(messages)
+
+        client = ChatClient(provider=FakeProvider(responder=flaky))
+        result = normalize_foods_sync(
+            ["Nuts"], client, NormalizationCache(cache_path),
+            requests_per_second=0, retry_base_delay=0,
+        )
+        assert attempts == 2
+        assert result == {"Nuts": ["nut"]}
+
+    def test_bad_response_is_not_replayed_from_cache(
+        self, cache_path: Path, tmp_path: Path
+    ) -> None:
+        replies = iter(["no JSON here", '{"0": ["nut"]}'])
+        provider = FakeProvider(responder=lambda messages: next(replies))
+        client = ChatClient(provider=provider, cache=ResponseCache(tmp_path / "llm"))
+        result = normalize_foods_sync(
+            ["Nuts"], client, NormalizationCache(cache_path),
+            requests_per_second=0, retry_base_delay=0,
+        )
+        assert provider.calls == 2
+        assert result == {"Nuts": ["nut"]}
+        assert len(client.cache) == 1
+
+    def test_gives_up_after_max_retries(self, cache_path: Path) -> None:
+        client = ChatClient(provider=FakeProvider(responder=lambda m: json.dumps({})))
+        with pytest.raises(NormalizationError):
+            normalize_foods_sync(
+                ["Nuts"], client, NormalizationCache(cache_path),
+                requests_per_second=0, max_retries=2, retry_base_delay=0,
+            )
+
+    def test_bounded_concurrency(self, cache_path: Path) -> None:
+        active = 0
+        peak = 0
+
+        class SlowProvider(FakeProvider):
+            async def acomplete(self, messages: list[Message], model: str) -> str:
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return fake_normalization_responder(messages)
+
+        client = ChatClient(provider=SlowProvider())
+        asyncio.run(normalize_foods(
+            [f"item {i}" for i in range(10)], client, NormalizationCache(cache_path),
+            batch_size=1, max_concurrency=3, requests_per_second=0,
+        ))
+        assert peak == 3
+
+
+class TestRateLimiter:
+    def test_spaces_requests(self) -> None:
+        async def run() -> float:
+            limiter = RateLimiter(requests_per_second=50)
+            start = time.monotonic()
+            for _ in range(4):
+                await limiter.wait()
+            return time.monotonic() - start
+
+        assert asyncio.run(run()) >= 0.06
+
+
+class TestNormalizeFoodsCommand:
+    def test_indexes_canonical_tokens(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("LLM_PROVIDER", "fake")
+        store = store_for_user("alice")
+        session = ReportSession.create_new(
+            name="February", date_range_start="2026-02-18", date_range_end="2026-02-18",
+            selected_dates=["2026-02-18"],
+        )
+        session.glucose_entries = [
+            GlucoseEntry(
+                date="2026-02-18", time=time, glucose_reading=110,
+                food_item=food, meal_type=MealType.BREAKFAST,
+            )
+            for time, food in (("8:00 AM", "OJ"), ("9:00 AM", "Coffee."))
+        ]
+        store.save(session)
+
+        assert main(["normalize-foods", "--user", "alice", "--requests-per-second", "0"]) == 0
+        assert "2 distinct food item(s), 2 newly normalized" in capsys.readouterr().out
+        assert store_for_user("alice").normalization.get("coffee") == ["coffee"]
+        # Each user has their own cache, and nothing lands in the working directory
+        assert len(store_for_user("bob").normalization) == 0
+        assert not (tmp_path / DEFAULT_CACHE_PATH).exists()
+
+        # A canonical name the LLM supplied is searchable once re-indexed
+        cache = store_for_user("alice").normalization
+        cache.update({"OJ": ["orange juice"]})
+        cache.save()
+        assert search_foods("orange", store.base_dir) == []
+        assert main(["normalize-foods", "--user", "alice"]) == 0
+        assert [hit.record.food_item for hit in search_foods("orange", store.base_dir)] == ["OJ"]
+
+    def test_store_saves_index_canonical_tokens(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        store = store_for_user("alice")
+        store.normalization.update({"OJ": ["orange juice"]})
+        store.normalization.save()
+        session = ReportSession.create_new(
+            name="February", date_range_start="2026-02-18", date_range_end="2026-02-18",
+            selected_dates=["2026-02-18"],
+        )
+        session.glucose_entries = [
+            GlucoseEntry(
+                date="2026-02-18", time="8:00 AM", glucose_reading=110,
+                food_item="OJ", meal_type=MealType.BREAKFAST,
+            )
+        ]
+        store_for_user("alice").save(session)
+        assert [hit.record.food_item for hit in search_foods("orange", store.base_dir)] == ["OJ"]
+        assert store_for_user("alice").list()[0]["id"] == session.id
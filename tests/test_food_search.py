@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.food_search import food_search_stats, search_foods
+from src.models import GlucoseEntry, MealType, ReportSession
+from src.storage import delete_session, save_session
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    """Provide an isolated temporary directory for session storage."""
+    return tmp_path / "sessions"
+
+
+def _make_session(*foods: tuple[str, str, int]) -> ReportSession:
+    session = ReportSession.create_new(
+        name="Search Test",
+        date_range_start="2026-02-18",
+        date_range_end="2026-02-22",
+        selected_dates=[],
+    )
+    session.glucose_entries = [
+        GlucoseEntry(
+            date=date,
+            time="9:40 AM",
+            glucose_reading=reading,
+            food_item=food,
+            meal_type=MealType.BREAKFAST,
+        )
+        for date, food, reading in foods
+    ]
+    return session
+
+
+class TestSearchFoods:
+    def test_missing_index_returns_empty(self, sessions_dir: Path) -> None:
+        assert search_foods("granola", base_dir=sessions_dir) == []
+
+    def test_exact_token_match(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(
+                ("2026-02-21", "Granola, yogurt, blueberries", 119),
+                ("2026-02-22", "Egg omelette", 117),
+            ),
+            base_dir=sessions_dir,
+        )
+        hits = search_foods("granola", base_dir=sessions_dir)
+        assert [h.record.glucose_reading for h in hits] == [119]
+
+    def test_prefix_match(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(("2026-02-21", "Granola, yogurt, blueberries", 119)),
+            base_dir=sessions_dir,
+        )
+        hits = search_foods("blue", base_dir=sessions_dir)
+        assert len(hits) == 1
+        assert hits[0].record.food_item == "Granola, yogurt, blueberries"
+
+    def test_searches_across_sessions(self, sessions_dir: Path) -> None:
+        first = _make_session(("2026-02-18", "Coffee", 100))
+        second = _make_session(("2026-02-19", "coffee.", 110))
+        save_session(first, base_dir=sessions_dir)
+        save_session(second, base_dir=sessions_dir)
+        hits = search_foods("coffee", base_dir=sessions_dir)
+        assert {h.record.session_id for h in hits} == {first.id, second.id}
+
+    def test_more_matched_tokens_rank_higher(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(
+                ("2026-02-22", "Salad", 90),
+                ("2026-02-18", "Tuna salad with cheese", 88),
+                ("2026-02-20", "Cheese crackers", 103),
+            ),
+            base_dir=sessions_dir,
+        )
+        hits = search_foods("tuna salad", base_dir=sessions_dir)
+        assert hits[0].record.food_item == "Tuna salad with cheese"
+        assert len(hits) == 2
+
+    def test_exact_outranks_prefix(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(
+                ("2026-02-22", "Eggplant parmesan", 120),
+                ("2026-02-18", "Boiled egg", 95),
+            ),
+            base_dir=sessions_dir,
+        )
+        hits = search_foods("egg", base_dir=sessions_dir)
+        assert [h.record.food_item for h in hits] == ["Boiled egg", "Eggplant parmesan"]
+
+    def test_ties_break_by_most_recent(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(
+                ("2026-02-18", "Nuts", 123),
+                ("2026-02-20", "Nuts", 110),
+            ),
+            base_dir=sessions_dir,
+        )
+        hits = search_foods("nuts", base_dir=sessions_dir)
+        assert [h.record.date for h in hits] == [date(2026, 2, 20), date(2026, 2, 18)]
+
+    def test_limit(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(*[(f"2026-02-{d:02d}", "Coffee", 100) for d in range(1, 21)]),
+            base_dir=sessions_dir,
+        )
+        assert len(search_foods("coffee", base_dir=sessions_dir, limit=5)) == 5
+
+    def test_deleted_session_not_found(self, sessions_dir: Path) -> None:
+        session = _make_session(("2026-02-18", "Stolis martini", 104))
+        save_session(session, base_dir=sessions_dir)
+        delete_session(session.id, base_dir=sessions_dir)
+        assert search_foods("martini", base_dir=sessions_dir) == []
+
+
+class TestFoodSearchStats:
+    def test_missing_index_returns_none(self, sessions_dir: Path) -> None:
+        assert food_search_stats("granola", base_dir=sessions_dir) is None
+
+    def test_covers_every_match_beyond_the_limit(self, sessions_dir: Path) -> None:
+        save_session(
+            _make_session(
+                *((f"2026-02-{day:02d}", "Granola bar", 100 + day) for day in range(1, 21)),
+                ("2026-02-21", "Blueberry muffin", 150),
+                ("2026-02-22", "Egg omelette", 90),
+            ),
+            base_dir=sessions_dir,
+        )
+        assert len(search_foods("gran blue", base_dir=sessions_dir, limit=5)) == 5
+        stats = food_search_stats("gran blue", base_dir=sessions_dir)
+        assert stats is not None
+        assert stats.matches == 21
+        assert (stats.min_glucose, stats.max_glucose) == (101, 150)
+        assert stats.mean_glucose == pytest.approx((sum(range(101, 121)) + 150) / 21)
+
+    def test_no_match_returns_none(self, sessions_dir: Path) -> None:
+        save_session(_make_session(("2026-02-22", "Egg omelette", 90)), base_dir=sessions_dir)
+        assert food_search_stats("pasta", base_dir=sessions_dir) is None
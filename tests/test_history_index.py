@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.history_index import (
+    INDEX_FILENAME,
+    index_session,
+    normalize_food_tokens,
+    query_exercise,
+    query_glucose,
+    rebuild_index,
+    time_to_minute,
+)
+from src.models import ExerciseEntry, GlucoseEntry, MealType, ReportSession
+from src.storage import delete_session, save_session
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    """Provide an isolated temporary directory for session storage."""
+    return tmp_path / "sessions"
+
+
+def _glucose(date: str, time: str, food: str, reading: int,
+             meal_type: MealType = MealType.BREAKFAST) -> GlucoseEntry:
+    return GlucoseEntry(
+        date=date,
+        time=time,
+        glucose_reading=reading,
+        food_item=food,
+        meal_type=meal_type,
+    )
+
+
+def _make_session(name: str = "Test Session") -> ReportSession:
+    session = ReportSession.create_new(
+        name=name,
+        date_range_start="2026-02-18",
+        date_range_end="2026-02-22",
+        selected_dates=["2026-02-18", "2026-02-22"],
+    )
+    session.glucose_entries = [
+        _glucose("2026-02-22", "8:44 PM", "Salad with bread, spaghetti sauce", 80,
+                 MealType.DINNER),
+        _glucose("2026-02-22", "9:40 AM", "Egg omelette, salad, blueberries", 117),
+        _glucose("2026-02-18", "6:47 PM", "Stolis martini", 104, MealType.SNACK),
+    ]
+    session.exercise_entries = [
+        ExerciseEntry(
+            date="2026-02-22",
+            time="10:56 AM",
+            activity_type="Walking",
+            duration_minutes=33,
+            heart_rate_bpm=88,
+            glucose_reading=108,
+        )
+    ]
+    return session
+
+
+class TestNormalizeFoodTokens:
+    def test_lowercases_and_strips_punctuation(self) -> None:
+        assert normalize_food_tokens("Coffee.") == ["coffee"]
+
+    def test_drops_stopwords_and_plurals(self) -> None:
+        tokens = normalize_food_tokens("Granola, yogurt, blueberries and coffee.")
+        assert tokens == ["granola", "yogurt", "blueberry", "coffee"]
+
+    def test_deduplicates(self) -> None:
+        assert normalize_food_tokens("Cheese and more cheese") == ["cheese", "more"]
+
+    def test_keeps_double_s(self) -> None:
+        assert normalize_food_tokens("Glass of white wine") == ["glass", "white", "wine"]
+
+
+class TestTimeToMinute:
+    def test_morning(self) -> None:
+        assert time_to_minute("9:40 AM") == 580
+
+    def test_noon_and_midnight(self) -> None:
+        assert time_to_minute("12:05 PM") == 725
+        assert time_to_minute("12:05 AM") == 5
+
+    def test_unparseable(self) -> None:
+        assert time_to_minute("Not available") == -1
+
+
+class TestStorageHooks:
+    def test_save_indexes_entries(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        assert (sessions_dir / INDEX_FILENAME).exists()
+        assert len(query_glucose(sessions_dir)) == 3
+        assert len(query_exercise(sessions_dir)) == 1
+
+    def test_resave_replaces_entries(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        save_session(session, base_dir=sessions_dir)
+        session.glucose_entries = session.glucose_entries[:1]
+        save_session(session, base_dir=sessions_dir)
+        assert len(query_glucose(sessions_dir)) == 1
+
+    def test_unchanged_session_is_not_reindexed(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        save_session(session, base_dir=sessions_dir)
+        session.name = "Renamed"
+        assert index_session(session, sessions_dir) is False
+
+    def test_delete_retracts_entries(self, sessions_dir: Path) -> None:
+        keep = _make_session("Keep")
+        drop = _make_session("Drop")
+        save_session(keep, base_dir=sessions_dir)
+        save_session(drop, base_dir=sessions_dir)
+        delete_session(drop.id, base_dir=sessions_dir)
+        records = query_glucose(sessions_dir)
+        assert len(records) == 3
+        assert {r.session_id for r in records} == {keep.id}
+        assert {r.session_id for r in query_exercise(sessions_dir)} == {keep.id}
+
+    def test_rebuild_from_session_files(self, sessions_dir: Path) -> None:
+        save_session(_make_session("A"), base_dir=sessions_dir)
+        save_session(_make_session("B"), base_dir=sessions_dir)
+        (sessions_dir / INDEX_FILENAME).unlink()
+        assert rebuild_index(sessions_dir) == 2
+        assert len(query_glucose(sessions_dir)) == 6
+
+
+class TestQueries:
+    def test_missing_index_returns_empty(self, sessions_dir: Path) -> None:
+        assert query_glucose(sessions_dir) == []
+        assert query_exercise(sessions_dir) == []
+
+    def test_chronological_order(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        times = [(r.date, r.time) for r in query_glucose(sessions_dir)]
+        assert times == [
+            (date(2026, 2, 18), "6:47 PM"),
+            (date(2026, 2, 22), "9:40 AM"),
+            (date(2026, 2, 22), "8:44 PM"),
+        ]
+
+    def test_date_range_is_inclusive(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        records = query_glucose(sessions_dir, start="2026-02-19", end="2026-02-22")
+        assert {r.date for r in records} == {date(2026, 2, 22)}
+
+    def test_food_lookup_matches_all_tokens(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        assert len(query_glucose(sessions_dir, food="salad")) == 2
+        records = query_glucose(sessions_dir, food="Blueberries salad")
+        assert [r.glucose_reading for r in records] == [117]
+
+    def test_meal_type_filter(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        records = query_glucose(sessions_dir, meal_type="dinner")
+        assert [r.food_item for r in records] == ["Salad with bread, spaghetti sauce"]
+
+    def test_stopword_only_food_returns_empty(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        assert query_glucose(sessions_dir, food="and with") == []
+
+    def test_exercise_activity_filter(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        assert len(query_exercise(sessions_dir, activity_type="Walking")) == 1
+        assert query_exercise(sessions_dir, activity_type="Cycling") == []
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.bench_import_time import (
+    HEAVY_MODULES,
+    IMPORT_BUDGET_MS,
+    measure_imports,
+    parse_importtime,
+    src_modules,
+)
+
+SAMPLE_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 | _io
+import time:      2000 |       5000 |   pydantic
+import time:       300 |       5300 | src.models
+some other stderr line
+"""
+
+
+class TestParseImporttime:
+    def test_parses_rows(self) -> None:
+        timings = parse_importtime(SAMPLE_OUTPUT)
+        assert [t.module for t in timings] == ["_io", "pydantic", "src.models"]
+        assert timings[1].self_us == 2000
+        assert timings[2].cumulative_us == 5300
+
+    def test_depth(self) -> None:
+        timings = parse_importtime(SAMPLE_OUTPUT)
+        assert [t.depth for t in timings] == [0, 1, 0]
+
+    def test_ignores_other_output(self) -> None:
+        assert parse_importtime("Traceback (most recent call last):\n") == []
+
+
+@pytest.fixture(scope="module")
+def src_timings() -> dict[str, int]:
+    modules = src_modules()
+    timings = measure_imports(modules)
+    return {t.module: t.cumulative_us for t in timings}
+
+
+class TestColdStartBudget:
+    def test_no_heavy_dependencies_at_import(self, src_timings: dict[str, int]) -> None:
+        loaded = [m for m in HEAVY_MODULES if m in src_timings]
+        assert loaded == []
+
+    def test_every_src_module_within_budget(self, src_timings: dict[str, int]) -> None:
+        over = {
+            m: us / 1000 for m, us in src_timings.items()
+            if m.startswith("src.") and us / 1000 > IMPORT_BUDGET_MS
+        }
+        assert over == {}
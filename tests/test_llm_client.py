@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from src.llm_client import (
+    ChatClient,
+    FakeProvider,
+    Message,
+    ResponseCache,
+    client_from_env,
+)
+
+MESSAGES: list[Message] = [
+    {"role": "system", "content": "Be brief."},
+    {"role": "user", "content": "Is oatmeal a good breakfast?"},
+]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture()
+def cache_dir(tmp_path: Path) -> Path:
+    return tmp_path / "llm_cache"
+
+
+class TestFakeProvider:
+    def test_deterministic(self) -> None:
+        provider = FakeProvider()
+        first = "".join(provider.stream(MESSAGES, "m"))
+        second = "".join(provider.stream(MESSAGES, "m"))
+        assert first == second
+        assert "Is oatmeal a good breakfast?" in first
+        assert provider.calls == 2
+
+    def test_streams_multiple_chunks(self) -> None:
+        chunks = list(FakeProvider(responder=lambda m: "one two three").stream(MESSAGES, "m"))
+        assert chunks == ["one ", "two ", "three"]
+
+
+class TestResponseCache:
+    def test_miss_then_hit(self, cache_dir: Path) -> None:
+        cache = ResponseCache(cache_dir)
+        assert cache.get("k") is None
+        cache.put("k", "hello")
+        assert cache.get("k") == "hello"
+
+    def test_key_depends_on_model_and_messages(self) -> None:
+        key = ResponseCache.make_key("a", MESSAGES)
+        assert key == ResponseCache.make_key("a", list(MESSAGES))
+        assert key != ResponseCache.make_key("b", MESSAGES)
+        assert key != ResponseCache.make_key("a", MESSAGES[:1])
+
+    def test_ttl_expiry(self, cache_dir: Path) -> None:
+        clock = FakeClock()
+        cache = ResponseCache(cache_dir, ttl_seconds=60, clock=clock)
+        cache.put("k", "hello")
+        clock.now += 61
+        assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self, cache_dir: Path) -> None:
+        clock = FakeClock()
+        cache = ResponseCache(cache_dir, max_entries=2, clock=clock)
+        cache.put("a", "A")
+        clock.now += 1
+        cache.put("b", "B")
+        clock.now += 1
+        assert cache.get("a") == "A"  # touch 'a' so 'b' is least recent
+        clock.now += 1
+        cache.put("c", "C")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+
+class TestChatClient:
+    def test_streams_provider_chunks(self, cache_dir: Path) -> None:
+        client = ChatClient(
+            provider=FakeProvider(responder=lambda m: "a b c"),
+            cache=ResponseCache(cache_dir),
+        )
+        assert list(client.stream_chat(MESSAGES)) == ["a ", "b ", "c"]
+
+    def test_repeated_question_served_from_cache(self, cache_dir: Path) -> None:
+        provider = FakeProvider()
+        client = ChatClient(provider=provider, cache=ResponseCache(cache_dir))
+        first = client.complete(MESSAGES)
+        second = client.complete(MESSAGES)
+        assert first == second
+        assert provider.calls == 1
+
+    def test_without_cache(self) -> None:
+        provider = FakeProvider()
+        client = ChatClient(provider=provider)
+        client.complete(MESSAGES)
+        client.complete(MESSAGES)
+        assert provider.calls == 2
+
+    def test_first_chunk_arrives_before_completion(self) -> None:
+        client = ChatClient(
+            provider=FakeProvider(responder=lambda m: "w " * 20, token_delay=0.01)
+        )
+        start = time.perf_counter()
+        stream = client.stream_chat(MESSAGES)
+        next(stream)
+        first_chunk = time.perf_counter() - start
+        for _ in stream:
+            pass
+        total = time.perf_counter() - start
+        assert first_chunk < total / 4
+
+    def test_bounded_concurrency(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        class SlowProvider:
+            def stream(self, messages: list[Message], model: str) -> Iterator[str]:
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+                yield "done"
+
+        client = ChatClient(provider=SlowProvider(), max_concurrency=2)
+        threads = [
+            threading.Thread(target=client.complete, args=(MESSAGES,))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert peak == 2
+
+
+class TestClientFromEnv:
+    def test_fake_provider(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("LLM_PROVIDER", "fake")
+        monkeypatch.setenv("LLM_MODEL", "test-model")
+        client = client_from_env()
+        assert isinstance(client.provider, FakeProvider)
+        assert client.model == "test-model"
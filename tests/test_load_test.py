@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from benchmarks.load_test import _APPTEST_LOCK, _Recorder, _run, compare, percentile
+
+
+class _FakePage:
+    """Stands in for an AppTest: run() takes a while and returns itself."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    def run(self) -> _FakePage:
+        time.sleep(self.seconds)
+        return self
+
+
+def _report(throughput: float, flow_p95: float, wait_p95: float | None = None) -> dict:
+    report: dict = {
+        "throughput_flows_per_s": throughput,
+        "steps": {"flow": {"p50_ms": flow_p95 / 2, "p95_ms": flow_p95}},
+    }
+    if wait_p95 is not None:
+        report["lock_wait"] = {"flow": {"p95_ms": wait_p95}}
+    return report
+
+
+class TestPercentile:
+    def test_empty(self) -> None:
+        assert percentile([], 95) == 0.0
+
+    def test_single_value(self) -> None:
+        assert percentile([0.4], 0) == 0.4
+        assert percentile([0.4], 100) == 0.4
+
+    def test_nearest_rank(self) -> None:
+        values = [float(v) for v in range(10, 0, -1)]
+        assert percentile(values, 50) == 5.0
+        assert percentile(values, 90) == 9.0
+        assert percentile(values, 95) == 10.0
+        assert percentile(values, 100) == 10.0
+        assert percentile(values, 0) == 1.0
+
+    def test_rank_is_not_rounded_to_even(self) -> None:
+        values = [float(v) for v in range(1, 21)]
+        assert percentile(values, 50) == 10.0
+        assert percentile(values, 95) == 19.0
+        assert percentile(values, 99) == 20.0
+
+    def test_does_not_reorder_input(self) -> None:
+        values = [3.0, 1.0, 2.0]
+        percentile(values, 50)
+        assert values == [3.0, 1.0, 2.0]
+
+
+class TestCompare:
+    def test_lines_per_metric(self) -> None:
+        lines = compare(_report(2.0, 300.0, 50.0), _report(1.0, 400.0, 100.0))
+        assert lines[0].split() == ["metric", "baseline", "current", "change"]
+        rows = {line[:26].strip(): line[26:].split() for line in lines[1:]}
+        assert rows["throughput_flows_per_s"] == ["1.00", "2.00", "+100%"]
+        assert rows["flow p95 (ms)"] == ["400.00", "300.00", "-25%"]
+        assert rows["flow lock wait p95 (ms)"] == ["100.00", "50.00", "-50%"]
+
+    def test_skips_metrics_missing_from_either_report(self) -> None:
+        lines = compare(_report(2.0, 300.0, 50.0), _report(1.0, 400.0))
+        labels = [line[:26].strip() for line in lines[1:]]
+        assert labels == ["throughput_flows_per_s", "flow p50 (ms)", "flow p95 (ms)"]
+
+    def test_zero_baseline(self) -> None:
+        lines = compare(_report(1.0, 300.0), _report(0.0, 400.0))
+        assert lines[1].split()[-1] == "n/a"
+
+
+class TestRecorder:
+    def test_lock_wait_is_recorded_apart(self) -> None:
+        recorder = _Recorder()
+        _APPTEST_LOCK.acquire()
+        releaser = threading.Timer(0.2, _APPTEST_LOCK.release)
+        releaser.start()
+        recorder.time("home", lambda: _run(_FakePage(0.05)))
+        releaser.join()
+        assert recorder.lock_waits["home"][0] == pytest.approx(0.2, abs=0.1)
+        assert recorder.latencies["home"][0] == pytest.approx(0.05, abs=0.04)
+
+    def test_nested_steps_share_waits(self) -> None:
+        recorder = _Recorder()
+
+        def flow() -> None:
+            recorder.time("home", lambda: _run(_FakePage(0.01)))
+            recorder.time("review", lambda: _run(_FakePage(0.01)))
+
+        recorder.time("flow", flow)
+        waits = recorder.lock_waits
+        assert waits["flow"][0] == pytest.approx(waits["home"][0] + waits["review"][0])
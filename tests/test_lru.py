@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+from src.lru import LruCache
+
+
+class TestLruCache:
+    def test_computes_once_per_key(self) -> None:
+        cache: LruCache[int] = LruCache(4)
+        calls: list[str] = []
+
+        def compute(key: str) -> int:
+            calls.append(key)
+            return len(key)
+
+        assert cache.get_or_compute("abc", lambda: compute("abc")) == 3
+        assert cache.get_or_compute("abc", lambda: compute("abc")) == 3
+        assert calls == ["abc"]
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache: LruCache[str] = LruCache(2)
+        cache.get_or_compute("a", lambda: "A")
+        cache.get_or_compute("b", lambda: "B")
+        cache.get_or_compute("a", lambda: "unused")
+        cache.get_or_compute("c", lambda: "C")
+        assert len(cache) == 2
+        assert cache.get_or_compute("a", lambda: "recomputed") == "A"
+        assert cache.get_or_compute("b", lambda: "recomputed") == "recomputed"
+
+    def test_clear(self) -> None:
+        cache: LruCache[int] = LruCache(2)
+        cache.get_or_compute("a", lambda: 1)
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_concurrent_use_stays_bounded(self) -> None:
+        cache: LruCache[int] = LruCache(8)
+        errors: list[BaseException] = []
+
+        def worker(offset: int) -> None:
+            try:
+                for i in range(2000):
+                    key = (offset + i) % 32
+                    assert cache.get_or_compute(key, lambda: key * 2) == key * 2
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert len(cache) == 8
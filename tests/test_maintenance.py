@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.archive import query_archive
+from src.cli import main
+from src.maintenance import (
+    archive_finalized,
+    collect_orphan_uploads,
+    deduplicate_uploads,
+    referenced_uploads,
+    run_maintenance,
+)
+from src.models import ReportSession, SessionStatus
+from src.storage import list_sessions, load_session, save_session
+from src.tenants import iter_stores, store_for_user
+
+_OLD = time.time() - 90 * 24 * 60 * 60
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    """Provide an isolated temporary directory for session storage."""
+    return tmp_path / "sessions"
+
+
+@pytest.fixture()
+def uploads_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "uploads"
+    directory.mkdir()
+    return directory
+
+
+def _save(
+    sessions_dir: Path,
+    name: str,
+    status: SessionStatus = SessionStatus.FINALIZED,
+    age: float | None = _OLD,
+    binary: bool = False,
+) -> ReportSession:
+    session = ReportSession.create_new(
+        name=name,
+        date_range_start="2026-02-18",
+        date_range_end="2026-02-22",
+        selected_dates=["2026-02-18"],
+    )
+    session.status = status
+    session.source_filename = f"{name}.pdf"
+    path = save_session(session, base_dir=sessions_dir, binary=binary)
+    if age is not None:
+        os.utime(path, (age, age))
+    return session
+
+
+def _upload(uploads_dir: Path, name: str, content: bytes = b"%PDF-1.4 data") -> Path:
+    path = uploads_dir / name
+    path.write_bytes(content)
+    os.utime(path, (_OLD, _OLD))
+    return path
+
+
+class TestArchiveFinalized:
+    def test_archives_old_finalized_only(self, sessions_dir: Path) -> None:
+        old = _save(sessions_dir, "Old")
+        _save(sessions_dir, "Recent", age=None)
+        _save(sessions_dir, "Draft", status=SessionStatus.DRAFT)
+        report = archive_finalized(sessions_dir, older_than_days=30)
+        assert report.archived == [old.id]
+        assert not (sessions_dir / f"{old.id}.json").exists()
+        assert load_session(old.id, base_dir=sessions_dir) == old
+
+    def test_archives_binary_sessions(self, sessions_dir: Path) -> None:
+        old = _save(sessions_dir, "Old", binary=True)
+        archive_finalized(sessions_dir)
+        assert [a.id for a in query_archive(sessions_dir)] == [old.id]
+
+    def test_listing_unchanged(self, sessions_dir: Path) -> None:
+        _save(sessions_dir, "Old")
+        _save(sessions_dir, "Draft", status=SessionStatus.DRAFT)
+        before = list_sessions(sessions_dir)
+        archive_finalized(sessions_dir)
+        assert list_sessions(sessions_dir) == before
+
+    def test_dry_run_changes_nothing(self, sessions_dir: Path) -> None:
+        old = _save(sessions_dir, "Old")
+        report = archive_finalized(sessions_dir, dry_run=True)
+        assert report.archived == [old.id]
+        assert (sessions_dir / f"{old.id}.json").exists()
+        assert query_archive(sessions_dir) == []
+
+
+class TestUploads:
+    def test_referenced_includes_archived(self, sessions_dir: Path) -> None:
+        _save(sessions_dir, "Old")
+        _save(sessions_dir, "Draft", status=SessionStatus.DRAFT)
+        archive_finalized(sessions_dir)
+        assert referenced_uploads(sessions_dir) == {"Old.pdf", "Draft.pdf"}
+
+    def test_removes_orphans(self, sessions_dir: Path, uploads_dir: Path) -> None:
+        _save(sessions_dir, "Kept")
+        _upload(uploads_dir, "Kept.pdf")
+        _upload(uploads_dir, "Orphan.pdf")
+        report = collect_orphan_uploads(uploads_dir, sessions_dir)
+        assert report.removed_orphans == ["Orphan.pdf"]
+        assert [p.name for p in uploads_dir.iterdir()] == ["Kept.pdf"]
+
+    def test_keeps_upload_saved_under_sanitized_name(
+        self, sessions_dir: Path, uploads_dir: Path
+    ) -> None:
+        session = _save(sessions_dir, "Nested")
+        session.source_filename = "exports/week 8/Nested.pdf"
+        save_session(session, base_dir=sessions_dir)
+        _upload(uploads_dir, "Nested.pdf")
+        assert collect_orphan_uploads(uploads_dir, sessions_dir).removed_orphans == []
+
+    def test_keeps_recent_orphans(self, sessions_dir: Path, uploads_dir: Path) -> None:
+        (uploads_dir / "Pending.pdf").write_bytes(b"%PDF")
+        assert collect_orphan_uploads(uploads_dir, sessions_dir).removed_orphans == []
+
+    def test_links_duplicates(self, uploads_dir: Path) -> None:
+        a = _upload(uploads_dir, "a.pdf")
+        b = _upload(uploads_dir, "b.pdf")
+        c = _upload(uploads_dir, "c.pdf", b"%PDF-1.4 diff")
+        report = deduplicate_uploads(uploads_dir)
+        assert report.deduplicated == ["b.pdf"]
+        assert a.stat().st_ino == b.stat().st_ino != c.stat().st_ino
+        assert b.read_bytes() == b"%PDF-1.4 data"
+
+    def test_dedupe_is_idempotent(self, uploads_dir: Path) -> None:
+        _upload(uploads_dir, "a.pdf")
+        _upload(uploads_dir, "b.pdf")
+        deduplicate_uploads(uploads_dir)
+        assert deduplicate_uploads(uploads_dir).deduplicated == []
+
+
+class TestRunMaintenance:
+    def test_full_job(self, tmp_path: Path) -> None:
+        store = store_for_user(
+            "alice", tmp_path / "sessions", tmp_path / "uploads", tmp_path / "reports"
+        )
+        old = _save(store.base_dir, "Old")
+        store.uploads_dir.mkdir(parents=True)
+        _upload(store.uploads_dir, "Old.pdf")
+        _upload(store.uploads_dir, "Copy.pdf")
+        _upload(store.uploads_dir, "Orphan.pdf", b"other")
+
+        report = run_maintenance(store)
+        assert report.archived == [old.id]
+        assert report.removed_orphans == ["Copy.pdf", "Orphan.pdf"]
+        assert store.load(old.id) == old
+
+    def test_iter_stores_finds_tenants(self, tmp_path: Path) -> None:
+        roots = (tmp_path / "sessions", tmp_path / "uploads", tmp_path / "reports")
+        alice = store_for_user("alice", *roots)
+        _save(alice.base_dir, "Alice")
+        stores = list(iter_stores(*roots))
+        assert [s.base_dir for s in stores] == [roots[0], alice.base_dir]
+        assert stores[1].uploads_dir == alice.uploads_dir
+
+    def test_cli(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        old = _save(store_for_user("default").base_dir, "Old")
+        assert main(["maintain", "--dry-run"]) == 0
+        assert "[dry run] default: 1 session(s) archived" in capsys.readouterr().out
+        assert main(["maintain", "--all-users"]) == 0
+        assert [a.id for a in query_archive(tmp_path / "data" / "sessions")] == [old.id]
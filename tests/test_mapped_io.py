@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+
+from src.mapped_io import map_file, stream_to_file, write_atomic
+
+
+class TestMapFile:
+    def test_maps_contents(self, tmp_path: Path) -> None:
+        path = tmp_path / "data.bin"
+        path.write_bytes(b"hello world")
+        with map_file(path) as data:
+            assert data[:5] == b"hello"
+            assert len(data) == 11
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        path = tmp_path / "empty.bin"
+        path.write_bytes(b"")
+        with map_file(path) as data:
+            assert data == b""
+
+
+class TestStreamToFile:
+    def test_copies_in_chunks(self, tmp_path: Path) -> None:
+        payload = bytes(range(256)) * 1000
+        dest = tmp_path / "uploads" / "file.pdf"
+        written = stream_to_file(io.BytesIO(payload), dest, chunk_size=4096)
+        assert written == len(payload)
+        assert dest.read_bytes() == payload
+
+    def test_no_partial_file_left(self, tmp_path: Path) -> None:
+        dest = tmp_path / "file.pdf"
+        stream_to_file(io.BytesIO(b"abc"), dest)
+        assert [p.name for p in tmp_path.iterdir()] == ["file.pdf"]
+
+    def test_overwrites_existing(self, tmp_path: Path) -> None:
+        dest = tmp_path / "file.pdf"
+        dest.write_bytes(b"old contents")
+        stream_to_file(io.BytesIO(b"new"), dest)
+        assert dest.read_bytes() == b"new"
+
+
+class TestWriteAtomic:
+    def test_replaces_contents(self, tmp_path: Path) -> None:
+        dest = tmp_path / "session.json"
+        dest.write_bytes(b"old")
+        write_atomic(dest, b"new")
+        assert dest.read_bytes() == b"new"
+        assert [p.name for p in tmp_path.iterdir()] == ["session.json"]
+
+    def test_failed_write_keeps_old_file(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        dest = tmp_path / "session.json"
+        dest.write_bytes(b"old")
+
+        def fail(*args: object) -> None:
+            raise OSError("disk full")
+
+        monkeypatch.setattr("src.mapped_io.os.replace", fail)
+        with pytest.raises(OSError):
+            write_atomic(dest, b"new")
+        assert dest.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["session.json"]
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+import zlib
+from pathlib import Path
+
+import pytest
+
+from src import migrations
+from src.cli import main
+from src.maintenance import run_maintenance, stored_version, upgrade_sessions
+from src.migrations import SchemaVersionError, session_from_json, upgrade_payload
+from src.models import SCHEMA_VERSION, GlucoseEntry, MealType, ReportSession
+from src.session_format import (
+    ENTRY_FIELDS,
+    MAGIC,
+    LazySession,
+    read_stored_session,
+)
+from src.storage import load_session, open_session, save_session
+from src.tenants import store_for_user
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    directory = tmp_path / "sessions"
+    directory.mkdir()
+    return directory
+
+
+def _session(name: str = "February") -> ReportSession:
+    session = ReportSession.create_new(
+        name=name, date_range_start="2026-02-18", date_range_end="2026-02-19",
+        selected_dates=["2026-02-18", "2026-02-19"],
+    )
+    session.glucose_entries.append(
+        GlucoseEntry(
+            date="2026-02-18", time="8:00 AM", glucose_reading=110,
+            food_item="Oatmeal", meal_type=MealType.BREAKFAST,
+        )
+    )
+    return session
+
+
+def _unversioned_payload(session: ReportSession) -> dict:
+    """The payload an app from before schema versioning would have saved."""
+    payload = session.model_dump(mode="json")
+    del payload["schema_version"]
+    return payload
+
+
+def _write_unversioned_json(session: ReportSession, sessions_dir: Path) -> Path:
+    path = sessions_dir / f"{session.id}.json"
+    path.write_text(json.dumps(_unversioned_payload(session), indent=2))
+    return path
+
+
+def _write_unversioned_binary(session: ReportSession, sessions_dir: Path) -> Path:
+    header = _unversioned_payload(session)
+    blocks, table, offset = [], {}, 0
+    for name in ENTRY_FIELDS:
+        block = zlib.compress(json.dumps(header.pop(name)).encode())
+        table[name] = [offset, len(block), 0]
+        blocks.append(block)
+        offset += len(block)
+    header["blocks"] = table
+    raw = json.dumps(header).encode()
+    path = sessions_dir / f"{session.id}.hrs"
+    path.write_bytes(b"".join([MAGIC, len(raw).to_bytes(4, "little"), raw, *blocks]))
+    return path
+
+
+class TestUpgradePayload:
+    def test_stamps_current_version(self) -> None:
+        payload = upgrade_payload(_unversioned_payload(_session()))
+        assert payload["schema_version"] == SCHEMA_VERSION
+
+    def test_newer_version_is_rejected(self) -> None:
+        payload = {**_unversioned_payload(_session()), "schema_version": SCHEMA_VERSION + 1}
+        with pytest.raises(SchemaVersionError, match="newer"):
+            upgrade_payload(payload)
+
+    def test_applies_registered_steps_in_order(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(migrations, "SCHEMA_VERSION", 3)
+        monkeypatch.setattr(migrations, "_MIGRATIONS", {
+            0: lambda p: {**p, "steps": ["0"]},
+            1: lambda p: {**p, "steps": p["steps"] + ["1"]},
+            2: lambda p: {**p, "steps": p["steps"] + ["2"]},
+        })
+        assert upgrade_payload({"schema_version": 1, "steps": []}) == {
+            "schema_version": 3, "steps": ["1", "2"],
+        }
+
+    def test_duplicate_registration_is_an_error(self) -> None:
+        with pytest.raises(ValueError, match="already registered"):
+            migrations.migration(0)(lambda p: p)
+
+
+class TestSessionFromJson:
+    def test_current_payload(self) -> None:
+        session = _session()
+        loaded, version = session_from_json(session.model_dump_json())
+        assert (loaded, version) == (session, SCHEMA_VERSION)
+
+    def test_unversioned_payload(self) -> None:
+        session = _session()
+        loaded, version = session_from_json(json.dumps(_unversioned_payload(session)))
+        assert version == 0
+        assert loaded == session
+
+    def test_version_1_glucose_entries_count_as_corrected(self) -> None:
+        payload = {**_unversioned_payload(_session()), "schema_version": 1}
+        del payload["glucose_entries"][0]["edited_fields"]
+        loaded, version = session_from_json(json.dumps(payload))
+        assert version == 1
+        assert loaded.glucose_entries[0].edited_fields == [
+            "food_item", "meal_type", "glucose_reading",
+        ]
+
+    def test_rejects_non_object(self) -> None:
+        with pytest.raises(ValueError, match="JSON object"):
+            session_from_json("[1, 2]")
+
+
+class TestLoadOnRead:
+    def test_json_is_written_back_stamped(self, sessions_dir: Path) -> None:
+        session = _session()
+        path = _write_unversioned_json(session, sessions_dir)
+        assert stored_version(path) == 0
+        assert load_session(session.id, sessions_dir) == session
+        assert stored_version(path) == SCHEMA_VERSION
+
+    def test_load_without_write_back(self, sessions_dir: Path) -> None:
+        session = _session()
+        path = _write_unversioned_json(session, sessions_dir)
+        assert load_session(session.id, sessions_dir, write_back=False) == session
+        assert stored_version(path) == 0
+
+    def test_binary_is_upgraded(self, sessions_dir: Path) -> None:
+        session = _session()
+        path = _write_unversioned_binary(session, sessions_dir)
+        assert read_stored_session(path) == (session, 0)
+        assert LazySession(path).schema_version == 0
+        assert open_session(session.id, sessions_dir) == session
+        assert stored_version(path) == SCHEMA_VERSION
+        assert LazySession(path).to_session() == session
+
+    def test_newer_file_is_not_touched(self, sessions_dir: Path) -> None:
+        session = _session()
+        path = sessions_dir / f"{session.id}.json"
+        original = session.model_dump_json().replace(
+            f'"schema_version":{SCHEMA_VERSION}', f'"schema_version":{SCHEMA_VERSION + 1}'
+        )
+        path.write_text(original)
+        with pytest.raises(SchemaVersionError):
+            load_session(session.id, sessions_dir)
+        assert path.read_text() == original
+
+
+class TestUpgradeSessions:
+    def test_respects_limit_and_dry_run(self, sessions_dir: Path) -> None:
+        old = [_write_unversioned_json(_session(f"S{i}"), sessions_dir) for i in range(3)]
+        save_session(_session("current"), sessions_dir)
+
+        report = upgrade_sessions(sessions_dir, limit=2, pause=0, dry_run=True)
+        assert len(report.upgraded) == 2
+        assert [stored_version(p) for p in old] == [0, 0, 0]
+
+        report = upgrade_sessions(sessions_dir, limit=2, pause=0)
+        assert len(report.upgraded) == 2
+        report = upgrade_sessions(sessions_dir, limit=2, pause=0)
+        assert len(report.upgraded) == 1
+        assert [stored_version(p) for p in old] == [SCHEMA_VERSION] * 3
+        assert upgrade_sessions(sessions_dir, pause=0).upgraded == []
+
+    def test_run_maintenance_and_cli(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        monkeypatch.chdir(tmp_path)
+        store = store_for_user("alice")
+        store.base_dir.mkdir(parents=True)
+        paths = [_write_unversioned_json(_session(f"S{i}"), store.base_dir) for i in range(2)]
+        report = run_maintenance(store, upgrade_limit=1)
+        assert len(report.upgraded) == 1
+        assert main(["maintain", "--user", "alice"]) == 0
+        assert "1 session(s) upgraded" in capsys.readouterr().out
+        assert [stored_version(p) for p in paths] == [SCHEMA_VERSION] * 2
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import json
+from datetime import date
+
 import pytest
 from pydantic import ValidationError
 
@@ -11,6 +14,8 @@ from src.models import (
     ReportSession,
     SessionStatus,
     TimeSlot,
+    format_day,
+    parse_day,
 )
 
 
@@ -67,6 +72,24 @@ class TestGlucoseEntry:
         )
         assert entry.food_item == "Oatmeal"
 
+    def test_corrected_records_changed_fields(self) -> None:
+        entry = GlucoseEntry(
+            date="2026-02-22",
+            time="9:40 AM",
+            glucose_reading=100,
+            food_item="Oatmeal",
+            meal_type=MealType.BREAKFAST,
+        )
+        assert entry.edited_fields == []
+        corrected = entry.corrected(food_item=" Oatmeal ", glucose_reading=110)
+        assert corrected.glucose_reading == 110
+        assert corrected.edited_fields == ["glucose_reading"]
+        again = corrected.corrected(meal_type=MealType.SNACK)
+        assert again.edited_fields == ["glucose_reading", "meal_type"]
+        assert entry.edited_fields == []
+        with pytest.raises(ValidationError):
+            entry.corrected(glucose_reading=0)
+
 
 class TestExerciseEntry:
     def test_create_valid(self) -> None:
@@ -236,3 +259,49 @@ class TestReportSession:
         assert len(restored.exercise_entries) == 1
         assert len(restored.mood_entries) == 1
         assert restored.glucose_entries[0].food_item == "Egg omelette"
+
+
+class TestDates:
+    def test_entry_dates_are_typed(self) -> None:
+        entry = GlucoseEntry(
+            date="2026-02-22", time="9:40 AM", glucose_reading=117,
+            food_item="Egg omelette", meal_type=MealType.BREAKFAST,
+        )
+        assert entry.date == date(2026, 2, 22)
+        assert json.loads(entry.model_dump_json())["date"] == "2026-02-22"
+
+    @pytest.mark.parametrize("value", ["2026-2-22", "2026-02-30", "Feb 22", ""])
+    def test_rejects_malformed_dates(self, value: str) -> None:
+        with pytest.raises(ValidationError):
+            GlucoseEntry(
+                date=value, time="9:40 AM", glucose_reading=117,
+                food_item="Egg omelette", meal_type=MealType.BREAKFAST,
+            )
+
+    def test_session_dates_are_typed(self) -> None:
+        session = ReportSession.create_new(
+            name="Test", date_range_start="2026-02-18", date_range_end=date(2026, 2, 22),
+            selected_dates=["2026-02-19", date(2026, 2, 18)],
+        )
+        assert session.date_range_start == date(2026, 2, 18)
+        assert session.date_range_end == date(2026, 2, 22)
+        assert session.selected_dates == [date(2026, 2, 19), date(2026, 2, 18)]
+
+    def test_empty_range_is_stored_as_before(self) -> None:
+        session = ReportSession.create_new(
+            name="Test", date_range_start="", date_range_end=None, selected_dates=[],
+        )
+        assert session.date_range_start is None
+        assert session.date_range_end is None
+        data = json.loads(session.model_dump_json())
+        assert data["date_range_start"] == data["date_range_end"] == ""
+        assert ReportSession.model_validate(data) == session
+
+    def test_parse_day(self) -> None:
+        assert parse_day("2026-02-22") == date(2026, 2, 22)
+        assert parse_day(" 2026-02-22 ") == date(2026, 2, 22)
+        assert parse_day(date(2026, 2, 22)) == date(2026, 2, 22)
+        with pytest.raises(ValueError):
+            parse_day("Feb 22")
+        assert format_day(date(2026, 2, 22)) == "2026-02-22"
+        assert format_day(None) == ""
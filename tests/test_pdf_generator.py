@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.models import (
+    CgmTrace,
+    ExerciseEntry,
+    GlucoseEntry,
+    InsulinEntry,
+    MealType,
+    MoodEntry,
+    NoteEntry,
+    ReportSession,
+    TimeSlot,
+)
+from src.pdf_generator import (
+    build_report_days,
+    generate_report,
+    report_filename,
+    trace_drawing,
+)
+
+
+def _make_session() -> ReportSession:
+    session = ReportSession.create_new(
+        name="Report & Test",
+        date_range_start="2026-02-21",
+        date_range_end="2026-02-22",
+        selected_dates=["2026-02-21", "2026-02-22"],
+    )
+    session.glucose_entries = [
+        GlucoseEntry(date="2026-02-22", time="2:54 PM", glucose_reading=88,
+                     food_item="Tuna salad with cheese & pickle",
+                     meal_type=MealType.LUNCH),
+        GlucoseEntry(date="2026-02-22", time="9:40 AM", glucose_reading=117,
+                     food_item="Egg omelette", meal_type=MealType.BREAKFAST),
+        GlucoseEntry(date="2026-02-21", time="3:00 PM", glucose_reading=99,
+                     food_item="Burger", meal_type=MealType.LUNCH),
+    ]
+    session.exercise_entries = [
+        ExerciseEntry(date="2026-02-22", time="10:56 AM", activity_type="Walking",
+                      duration_minutes=33, heart_rate_bpm=88, glucose_reading=108),
+    ]
+    session.mood_entries = [
+        MoodEntry(date="2026-02-22", time_slot=TimeSlot.AROUND_NOON,
+                  time="12:00 PM", energy="Ok", mood=3),
+        MoodEntry(date="2026-02-22", time_slot=TimeSlot.BEFORE_BED,
+                  time="Not available", energy="Tired", mood=3),
+    ]
+    return session
+
+
+class TestBuildReportDays:
+    def test_most_recent_day_first(self) -> None:
+        days = build_report_days(_make_session())
+        assert [d.title for d in days] == [
+            "Day 1: Sunday, Feb 22, 2026",
+            "Day 2: Saturday, Feb 21, 2026",
+        ]
+
+    def test_rows_in_time_order(self) -> None:
+        day = build_report_days(_make_session())[0]
+        assert [row[0] for row in day.rows] == [
+            "Breakfast", "Exercise", "Around Noon", "Lunch", "Before Bed",
+        ]
+
+    def test_mood_rows_marked(self) -> None:
+        day = build_report_days(_make_session())[0]
+        assert day.mood_rows == {2, 4}
+        assert day.rows[2][3:] == ["Ok", "3"]
+
+    def test_exercise_details(self) -> None:
+        day = build_report_days(_make_session())[0]
+        assert day.rows[1][2] == "33 min • 88 BPM"
+
+    def test_insulin_and_note_rows(self) -> None:
+        session = _make_session()
+        session.insulin_entries = [InsulinEntry(
+            date="2026-02-21", time="8:00 AM", insulin_type="Fast-Acting", units=4,
+        )]
+        session.note_entries = [NoteEntry(date="2026-02-21", time="9:00 PM", text="Late walk")]
+        day = build_report_days(session)[1]
+        assert day.rows[0] == ["Insulin", "8:00 AM", "4 units • Fast-Acting", "", ""]
+        assert day.rows[-1] == ["Note", "9:00 PM", "Late walk", "", ""]
+
+
+    def test_trace_attached_to_day(self) -> None:
+        session = _make_session()
+        session.cgm_traces = [CgmTrace.from_points("2026-02-22", [0, 5], [100, 120])]
+        days = build_report_days(session)
+        assert days[0].trace == session.cgm_traces[0]
+        assert days[1].trace is None
+
+
+class TestGenerateReport:
+    def test_writes_pdf(self, tmp_path: Path) -> None:
+        session = _make_session()
+        path = generate_report(session, tmp_path / "reports" / report_filename(session))
+        assert path.exists()
+        assert path.read_bytes().startswith(b"%PDF")
+
+    def test_filename(self) -> None:
+        session = _make_session()
+        assert report_filename(session) == (
+            f"report_2026-02-21_to_2026-02-22_{session.id[:8]}.pdf"
+        )
+
+    def test_trace_drawing_downsampled_to_width(self) -> None:
+        minutes = list(range(0, 1440, 1))
+        trace = CgmTrace.from_points("2026-02-22", minutes, [100 + m % 50 for m in minutes])
+        drawing = trace_drawing(trace, 200, 60)
+        polyline = drawing.contents[-1]
+        assert len(polyline.points) == 2 * 200
+
+    def test_writes_pdf_with_traces(self, tmp_path: Path) -> None:
+        session = _make_session()
+        session.cgm_traces = [CgmTrace.from_points("2026-02-22", [0, 5], [100, 120])]
+        path = generate_report(session, tmp_path / report_filename(session))
+        assert path.read_bytes().startswith(b"%PDF")
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 import re
+from datetime import date
 from pathlib import Path
 
 import pytest
 
-from src.models import MealType
+from src.models import GlucoseEntry, MealType
 from src.pdf_parser import (
+    DATE_PATTERN,
     ParseResult,
     _classify_row,
     _parse_exercise_details,
     _parse_glucose_value,
-    _parse_iso_date,
+    dates_between,
+    filter_by_date_range,
     filter_by_dates,
+    parse_iso_date,
     parse_pdf,
-    _DATE_PATTERN,
+    parse_tables,
 )
 
 SAMPLE_PDF = Path("docs/samples/clarity_2026-02-18_to_2026-02-22.pdf")
@@ -79,26 +83,26 @@ class TestClassifyRow:
 
 class TestDateParsing:
     def test_iso_conversion(self) -> None:
-        match = _DATE_PATTERN.search("Sun, Feb 22, 2026")
+        match = DATE_PATTERN.search("Sun, Feb 22, 2026")
         assert match is not None
-        assert _parse_iso_date(match) == "2026-02-22"
+        assert parse_iso_date(match) == date(2026, 2, 22)
 
     def test_single_digit_day(self) -> None:
-        match = _DATE_PATTERN.search("Mon, Mar 3, 2026")
+        match = DATE_PATTERN.search("Mon, Mar 3, 2026")
         assert match is not None
-        assert _parse_iso_date(match) == "2026-03-03"
+        assert parse_iso_date(match) == date(2026, 3, 3)
 
     def test_all_day_abbreviations(self) -> None:
         for day in ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"):
             text = f"{day}, Jan 15, 2026"
-            match = _DATE_PATTERN.search(text)
+            match = DATE_PATTERN.search(text)
             assert match is not None, f"Failed to match {day}"
 
     def test_date_embedded_in_noise(self) -> None:
         text = "Daily\n14 days\nSun, Feb 22, 2026\n400\nGlucos\n350"
-        match = _DATE_PATTERN.search(text)
+        match = DATE_PATTERN.search(text)
         assert match is not None
-        assert _parse_iso_date(match) == "2026-02-22"
+        assert parse_iso_date(match) == date(2026, 2, 22)
 
 
 # ── TestGlucoseValueParsing ──────────────────────────────────────────
@@ -166,7 +170,7 @@ class TestParsePdf:
     def test_known_entry_feb22_egg_omelette(self, parsed: ParseResult) -> None:
         matches = [
             e for e in parsed.glucose_entries
-            if e.date == "2026-02-22" and e.time == "9:40 AM"
+            if e.date == date(2026, 2, 22) and e.time == "9:40 AM"
         ]
         assert len(matches) == 1
         assert matches[0].glucose_reading == 117
@@ -175,7 +179,7 @@ class TestParsePdf:
     def test_exercise_feb22(self, parsed: ParseResult) -> None:
         matches = [
             e for e in parsed.exercise_entries
-            if e.date == "2026-02-22"
+            if e.date == date(2026, 2, 22)
         ]
         assert len(matches) == 1
         assert matches[0].duration_minutes == 33
@@ -185,8 +189,8 @@ class TestParsePdf:
         assert len(parsed.warnings) == 0
 
     def test_expected_date_range(self, parsed: ParseResult) -> None:
-        assert parsed.available_dates[0] == "2026-02-10"
-        assert parsed.available_dates[-1] == "2026-02-23"
+        assert parsed.available_dates[0] == date(2026, 2, 10)
+        assert parsed.available_dates[-1] == date(2026, 2, 23)
         assert len(parsed.available_dates) == 14
 
     def test_feb18_to_22_meal_count(self, parsed: ParseResult) -> None:
@@ -207,7 +211,7 @@ class TestFilterByDates:
     def test_filters_correctly(self, parsed: ParseResult) -> None:
         filtered = filter_by_dates(parsed, ["2026-02-22"])
         for e in filtered.glucose_entries:
-            assert e.date == "2026-02-22"
+            assert e.date == date(2026, 2, 22)
         assert len(filtered.glucose_entries) == 4
 
     def test_empty_selection_returns_empty(self, parsed: ParseResult) -> None:
@@ -223,3 +227,261 @@ class TestFilterByDates:
         original_count = len(parsed.glucose_entries)
         filter_by_dates(parsed, ["2026-02-22"])
         assert len(parsed.glucose_entries) == original_count
+
+    def test_matches_linear_scan(self, parsed: ParseResult) -> None:
+        selected = [date(2026, 2, 22), date(2026, 2, 12), date(2026, 2, 19)]
+        filtered = filter_by_dates(parsed, selected)
+        assert filtered.glucose_entries == [
+            e for e in parsed.glucose_entries if e.date in selected
+        ]
+        assert filtered.exercise_entries == [
+            e for e in parsed.exercise_entries if e.date in selected
+        ]
+        assert filtered.available_dates == [
+            date(2026, 2, 12), date(2026, 2, 19), date(2026, 2, 22),
+        ]
+
+
+def _meal(date: str, food: str) -> GlucoseEntry:
+    return GlucoseEntry(
+        date=date, time="8:00 AM", glucose_reading=100,
+        food_item=food, meal_type=MealType.BREAKFAST,
+    )
+
+
+class TestDateIndex:
+    def test_runs_per_date(self) -> None:
+        result = ParseResult(glucose_entries=[
+            _meal("2026-02-18", "a"), _meal("2026-02-18", "b"), _meal("2026-02-19", "c"),
+        ])
+        assert result.date_index()["glucose_entries"] == {
+            date(2026, 2, 18): [(0, 2)], date(2026, 2, 19): [(2, 3)],
+        }
+
+    def test_non_contiguous_date_keeps_order(self) -> None:
+        entries = [
+            _meal("2026-02-18", "a"), _meal("2026-02-19", "b"), _meal("2026-02-18", "c"),
+        ]
+        result = ParseResult(glucose_entries=entries)
+        filtered = filter_by_dates(result, ["2026-02-18"])
+        assert [e.food_item for e in filtered.glucose_entries] == ["a", "c"]
+        filtered = filter_by_dates(result, ["2026-02-19", "2026-02-18"])
+        assert filtered.glucose_entries == entries
+
+    def test_rebuilt_after_append(self) -> None:
+        result = ParseResult(glucose_entries=[_meal("2026-02-18", "a")])
+        assert filter_by_dates(result, [date(2026, 2, 19)]).glucose_entries == []
+        result.glucose_entries.append(_meal("2026-02-19", "b"))
+        assert len(filter_by_dates(result, [date(2026, 2, 19)]).glucose_entries) == 1
+
+    def test_rebuilt_after_in_place_edit(self) -> None:
+        result = ParseResult(glucose_entries=[
+            _meal("2026-02-18", "a"), _meal("2026-02-18", "b"),
+        ])
+        assert len(filter_by_dates(result, ["2026-02-18"]).glucose_entries) == 2
+        result.glucose_entries[1] = _meal("2026-02-19", "b")
+        assert [e.food_item for e in filter_by_dates(result, ["2026-02-19"]).glucose_entries] == [
+            "b"
+        ]
+        result.glucose_entries.reverse()
+        assert result.date_index()["glucose_entries"] == {
+            date(2026, 2, 19): [(0, 1)], date(2026, 2, 18): [(1, 2)],
+        }
+
+    def test_rebuilt_after_reassignment(self) -> None:
+        result = ParseResult(glucose_entries=[_meal("2026-02-18", "a")])
+        result.date_index()
+        result.glucose_entries = [_meal("2026-02-19", "b")]
+        assert filter_by_dates(result, ["2026-02-18"]).glucose_entries == []
+
+    def test_not_part_of_equality(self) -> None:
+        a = ParseResult(glucose_entries=[_meal("2026-02-18", "a")])
+        b = ParseResult(glucose_entries=[_meal("2026-02-18", "a")])
+        a.date_index()
+        assert a == b
+
+
+class TestDateRange:
+    def test_dates_between_inclusive(self, parsed: ParseResult) -> None:
+        assert dates_between(parsed, "2026-02-18", date(2026, 2, 20)) == [
+            date(2026, 2, 18), date(2026, 2, 19), date(2026, 2, 20),
+        ]
+
+    def test_open_ends(self, parsed: ParseResult) -> None:
+        assert dates_between(parsed, start="2026-02-22") == [
+            date(2026, 2, 22), date(2026, 2, 23),
+        ]
+        assert dates_between(parsed, end="2026-02-11") == [date(2026, 2, 10), date(2026, 2, 11)]
+        assert dates_between(parsed) == parsed.available_dates
+
+    def test_range_outside_parse(self, parsed: ParseResult) -> None:
+        assert dates_between(parsed, "2026-03-01", "2026-03-31") == []
+
+    def test_filter_by_date_range(self, parsed: ParseResult) -> None:
+        filtered = filter_by_date_range(parsed, "2026-02-18", "2026-02-22")
+        assert len(filtered.glucose_entries) == 20
+        assert len(filtered.exercise_entries) == 3
+
+
+# ── TestLayoutHandling ────────────────────────────────────────────────
+
+
+def _header(day: str) -> list[str | None]:
+    return [f"Daily\n14 days\n{day}\n400\nGlucos\nTime Device Event Details Glucose", None]
+
+
+FOOTER: list[str | None] = [
+    "Data uploaded: Mon, Feb 23, 2026 10:22 AM MST • Dexcom Clarity", None,
+]
+
+
+class TestClassifyRowLayouts:
+    def test_footer_skipped(self) -> None:
+        row_type, _ = _classify_row(FOOTER)
+        assert row_type == "skip"
+
+    def test_missing_details_cell(self) -> None:
+        row = ["8:00 AM", "CGM", "Insulin", "4 units", "120 mg/dL"]
+        row_type, values = _classify_row(row)
+        assert row_type == "data"
+        assert values == ["8:00 AM", "CGM", "Insulin", "", "4 units", "120 mg/dL"]
+
+    def test_missing_units_cell(self) -> None:
+        row = ["8:00 AM", "CGM", "Meal", "Toast", "120 mg/dL"]
+        _, values = _classify_row(row)
+        assert values == ["8:00 AM", "CGM", "Meal", "Toast", "--", "120 mg/dL"]
+
+    def test_split_details_joined(self) -> None:
+        row = ["8:00 AM", "CGM", "Meal", "Toast with", "jam", "--", "120 mg/dL"]
+        _, values = _classify_row(row)
+        assert values[3] == "Toast with jam"
+
+    def test_continuation(self) -> None:
+        row = ["", None, None, "and a banana", None, None]
+        assert _classify_row(row) == ("continuation", ["and a banana"])
+
+
+class TestParseTables:
+    def test_every_table_processed(self) -> None:
+        page = [
+            [_header("Sun, Feb 22, 2026"),
+             ["9:40 AM", "CGM", "Meal", "Egg omelette", "--", "117 mg/dL"]],
+            [_header("Sat, Feb 21, 2026"),
+             ["9:16 AM", "CGM", "Meal", "Granola", "--", "119 mg/dL"]],
+        ]
+        result = parse_tables([page])
+        assert [e.date for e in result.glucose_entries] == [date(2026, 2, 22), date(2026, 2, 21)]
+
+    def test_continuation_table_across_pages(self) -> None:
+        page1 = [[
+            _header("Sun, Feb 22, 2026"),
+            ["9:40 AM", "CGM", "Meal", "Egg omelette with", "--", "117 mg/dL"],
+            FOOTER,
+        ]]
+        page2 = [
+            [[""], ["x 2"]],
+            [
+                ["", None, None, "salad and cottage cheese", None, None],
+                ["2:54 PM", "CGM", "Meal", "Tuna salad", "--", "88 mg/dL"],
+            ],
+        ]
+        result = parse_tables([page1, page2])
+        assert [e.date for e in result.glucose_entries] == [date(2026, 2, 22), date(2026, 2, 22)]
+        assert result.glucose_entries[0].food_item == (
+            "Egg omelette with salad and cottage cheese"
+        )
+        assert result.warnings == []
+
+    def test_other_event_types(self) -> None:
+        table = [
+            _header("Sun, Feb 22, 2026"),
+            ["7:30 AM", "CGM", "Insulin", "Fast-Acting", "4 units", "140 mg/dL"],
+            ["8:00 AM", "CGM", "Cycling", "45 min • 120 BPM", "--", "130 mg/dL"],
+            ["9:00 AM", "CGM", "Running", "20 min", "--", "125 mg/dL"],
+            ["10:00 AM", "CGM", "Note", "Felt dizzy", "--", "--"],
+        ]
+        result = parse_tables([[table]])
+        assert result.warnings == []
+        (insulin,) = result.insulin_entries
+        assert (insulin.insulin_type, insulin.units, insulin.glucose_reading) == (
+            "Fast-Acting", 4.0, 140,
+        )
+        assert [(e.activity_type, e.duration_minutes, e.heart_rate_bpm)
+                for e in result.exercise_entries] == [("Cycling", 45, 120), ("Running", 20, 0)]
+        (note,) = result.note_entries
+        assert note.text == "Felt dizzy"
+        assert note.glucose_reading is None
+        assert result.available_dates == [date(2026, 2, 22)]
+
+    def test_unknown_event_still_warns(self) -> None:
+        table = [
+            _header("Sun, Feb 22, 2026"),
+            ["7:30 AM", "CGM", "Calibration", "--", "--", "140 mg/dL"],
+        ]
+        result = parse_tables([[table]])
+        assert result.warnings == ["Page 1: unknown event type 'Calibration'"]
+
+    def test_filter_keeps_new_types(self) -> None:
+        table = [
+            _header("Sun, Feb 22, 2026"),
+            ["7:30 AM", "CGM", "Insulin", "Fast-Acting", "4 units", "140 mg/dL"],
+            ["10:00 AM", "CGM", "Note", "Felt dizzy", "--", "--"],
+        ]
+        result = parse_tables([[table]])
+        filtered = filter_by_dates(result, ["2026-02-22"])
+        assert len(filtered.insulin_entries) == 1
+        assert len(filtered.note_entries) == 1
+        assert filter_by_dates(result, []).insulin_entries == []
+
+
+class TestRowPipeline:
+    def test_matches_reference_path(self) -> None:
+        from benchmarks.bench_parse_rows import (
+            reference_parse_tables,
+            synthetic_page_tables,
+        )
+
+        pages = list(synthetic_page_tables(500))
+        result = parse_tables(pages)
+        assert result == reference_parse_tables(pages)
+        assert len(result.insulin_entries) > 0
+        assert "and a banana" in result.glucose_entries[0].food_item
+
+    def test_continuation_after_page_flush(self) -> None:
+        page1 = [[
+            _header("Sun, Feb 22, 2026"),
+            ["10:00 AM", "CGM", "Note", "Felt dizzy", "--", "--"],
+        ]]
+        page2 = [[
+            ["", None, "after the walk", None],
+            ["2:54 PM", "CGM", "Meal", "Tuna salad", "--", "88 mg/dL"],
+        ]]
+        result = parse_tables([page1, page2])
+        assert result.note_entries[0].text == "Felt dizzy after the walk"
+        assert result.glucose_entries[0].date == date(2026, 2, 22)
+
+    def test_invalid_rows_are_skipped_with_warnings(self) -> None:
+        table = [
+            _header("Sun, Feb 22, 2026"),
+            ["7:30 AM", "CGM", "Insulin", "Fast-Acting", "0 units", "140 mg/dL"],
+            ["8:30 AM", "CGM", "Insulin", "Fast-Acting", "4 units", "140 mg/dL"],
+            ["9:40 AM", "CGM", "Meal", "Egg omelette", "--", "117 mg/dL"],
+            ["1:00 PM", "CGM", "Meal", "Toast", "--", "0 mg/dL"],
+        ]
+        result = parse_tables([[table]])
+        assert [e.units for e in result.insulin_entries] == [4.0]
+        assert [e.food_item for e in result.glucose_entries] == ["Egg omelette"]
+        assert len(result.warnings) == 2
+        assert result.warnings[0].startswith("Page 1: skipped invalid meal at 1:00 PM")
+        assert result.warnings[1].startswith("Page 1: skipped invalid insulin at 7:30 AM")
+        assert "units must be positive" in result.warnings[1]
+
+    def test_skipped_row_is_not_continued(self) -> None:
+        page1 = [[
+            _header("Sun, Feb 22, 2026"),
+            ["9:40 AM", "CGM", "Meal", "Egg omelette", "--", "117 mg/dL"],
+            ["1:00 PM", "CGM", "Meal", "Toast with", "--", "0 mg/dL"],
+        ]]
+        page2 = [[["", None, "jam", None]]]
+        result = parse_tables([page1, page2])
+        assert [e.food_item for e in result.glucose_entries] == ["Egg omelette"]
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+from src.models import ExerciseEntry, GlucoseEntry, MealType, ReportSession
+from src.pdf_parser import ParseResult, parse_pdf
+from src.pipeline import (
+    apply_meal_type_defaults,
+    default_meal_type,
+    default_selected_dates,
+    session_from_parse,
+)
+from src.session_merge import merge_parse_result
+
+SAMPLE_PDF = Path("docs/samples/clarity_2026-02-18_to_2026-02-22.pdf")
+
+
+def _glucose(date: str, time: str) -> GlucoseEntry:
+    return GlucoseEntry(
+        date=date,
+        time=time,
+        glucose_reading=100,
+        food_item="Test food",
+        meal_type=MealType.BREAKFAST,
+    )
+
+
+class TestDefaultSelectedDates:
+    def test_skips_most_recent_when_more_than_count(self) -> None:
+        dates = [date(2026, 2, d) for d in range(10, 24)]
+        assert default_selected_dates(dates) == dates[8:13]
+
+    def test_returns_all_when_few(self) -> None:
+        dates = [date(2026, 2, 21), date(2026, 2, 22)]
+        assert default_selected_dates(dates) == dates
+
+    def test_custom_count(self) -> None:
+        dates = [date(2026, 2, d) for d in range(10, 24)]
+        assert default_selected_dates(dates, count=2) == dates[11:13]
+
+
+class TestDefaultMealType:
+    def test_breakfast(self) -> None:
+        assert default_meal_type("10:54 AM") == MealType.BREAKFAST
+
+    def test_lunch(self) -> None:
+        assert default_meal_type("11:50 AM") == MealType.LUNCH
+        assert default_meal_type("2:54 PM") == MealType.LUNCH
+
+    def test_dinner(self) -> None:
+        assert default_meal_type("8:44 PM") == MealType.DINNER
+
+    def test_unparseable_is_breakfast(self) -> None:
+        assert default_meal_type("Not available") == MealType.BREAKFAST
+
+    def test_apply_does_not_mutate(self) -> None:
+        entries = [_glucose("2026-02-22", "8:44 PM")]
+        updated = apply_meal_type_defaults(entries)
+        assert updated[0].meal_type == MealType.DINNER
+        assert entries[0].meal_type == MealType.BREAKFAST
+
+
+class TestSessionFromParse:
+    def test_builds_draft_session(self) -> None:
+        result = ParseResult(
+            glucose_entries=[
+                _glucose("2026-02-21", "9:16 AM"),
+                _glucose("2026-02-22", "2:54 PM"),
+                _glucose("2026-02-23", "9:25 AM"),
+            ],
+            exercise_entries=[
+                ExerciseEntry(
+                    date="2026-02-22", time="10:56 AM", activity_type="Walking",
+                    duration_minutes=33, heart_rate_bpm=88, glucose_reading=108,
+                )
+            ],
+            available_dates=["2026-02-21", "2026-02-22", "2026-02-23"],
+        )
+        session = session_from_parse(
+            result, name="Batch", source_filename="clarity.pdf",
+            selected_dates=["2026-02-22", "2026-02-21"],
+        )
+        assert session.selected_dates == [date(2026, 2, 21), date(2026, 2, 22)]
+        assert session.date_range_start == date(2026, 2, 21)
+        assert session.date_range_end == date(2026, 2, 22)
+        assert len(session.glucose_entries) == 2
+        assert session.glucose_entries[1].meal_type == MealType.LUNCH
+        assert len(session.exercise_entries) == 1
+        assert session.source_filename == "clarity.pdf"
+
+    def test_date_range(self) -> None:
+        result = ParseResult(
+            glucose_entries=[
+                _glucose("2026-02-23", "9:25 AM"),
+                _glucose("2026-02-22", "2:54 PM"),
+                _glucose("2026-02-21", "9:16 AM"),
+            ],
+            available_dates=[date(2026, 2, 21), date(2026, 2, 22), date(2026, 2, 23)],
+        )
+        session = session_from_parse(
+            result, name="Range", source_filename="clarity.pdf", start="2026-02-22"
+        )
+        assert session.selected_dates == [date(2026, 2, 22), date(2026, 2, 23)]
+        assert session.date_range_start == date(2026, 2, 22)
+        assert [e.date for e in session.glucose_entries] == [
+            date(2026, 2, 23), date(2026, 2, 22),
+        ]
+
+    def test_empty_parse(self) -> None:
+        session = session_from_parse(ParseResult(), name="Empty", source_filename="x.pdf")
+        assert session.selected_dates == []
+        assert session.glucose_entries == []
+
+
+class TestIngestionPaths:
+    def test_upload_and_batch_paths_agree_on_meal_types(self) -> None:
+        result = parse_pdf(SAMPLE_PDF)
+        dates = result.available_dates
+        batch = session_from_parse(result, "Batch", SAMPLE_PDF.name, dates)
+        # The Upload page merges the parse into the session made on the Home page
+        empty = ReportSession.create_new(
+            name="Upload", date_range_start=None, date_range_end=None, selected_dates=[]
+        )
+        uploaded, _ = merge_parse_result(empty, result, dates)
+        assert [e.meal_type for e in uploaded.glucose_entries] == [
+            e.meal_type for e in batch.glucose_entries
+        ]
+        assert {e.meal_type for e in batch.glucose_entries} != {MealType.BREAKFAST}
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from src.models import (
+    CgmTrace,
+    ExerciseEntry,
+    GlucoseEntry,
+    MealType,
+    ReportSession,
+)
+from src.postprandial import (
+    build_timeline,
+    food_responses,
+    meal_responses,
+    responses_across_sessions,
+)
+
+DATES = ["2026-02-21", "2026-02-22"]
+
+
+def _meal(date: str, time: str, food: str, reading: int) -> GlucoseEntry:
+    return GlucoseEntry(
+        date=date, time=time, glucose_reading=reading,
+        food_item=food, meal_type=MealType.BREAKFAST,
+    )
+
+
+def _session(*meals: GlucoseEntry, traces: list[CgmTrace] | None = None) -> ReportSession:
+    session = ReportSession.create_new(
+        name="Week", date_range_start=DATES[0], date_range_end=DATES[-1],
+        selected_dates=DATES,
+    )
+    session.glucose_entries = list(meals)
+    session.cgm_traces = traces or []
+    return session
+
+
+def _trace(date: str, start: int, values: list[int]) -> CgmTrace:
+    return CgmTrace.from_points(date, [start + 5 * i for i in range(len(values))], values)
+
+
+class TestBuildTimeline:
+    def test_sorted_across_sources(self) -> None:
+        session = _session(
+            _meal("2026-02-22", "8:00 AM", "Oatmeal", 100),
+            _meal("2026-02-21", "8:00 AM", "Toast", 90),
+            traces=[_trace("2026-02-21", 475, [85, 95])],
+        )
+        timeline = build_timeline(session)
+        assert timeline.times == sorted(timeline.times)
+        assert timeline.values == [85, 90, 95, 100]
+
+
+class TestMealResponses:
+    def test_peak_from_trace(self) -> None:
+        # 8:00 AM meal at 100; trace every 5 min from 8:05 rising to 160 at 9:00
+        values = [110, 120, 130, 140, 150, 155, 158, 159, 160, 150, 140, 130]
+        session = _session(
+            _meal("2026-02-21", "8:00 AM", "Pasta", 100),
+            traces=[_trace("2026-02-21", 485, values)],
+        )
+        (r,) = meal_responses(session)
+        assert (r.baseline, r.peak, r.delta, r.minutes_to_peak) == (100, 160, 60, 45)
+        assert r.readings == len(values)
+
+    def test_window_excludes_later_readings(self) -> None:
+        session = _session(
+            _meal("2026-02-21", "8:00 AM", "Pasta", 100),
+            traces=[_trace("2026-02-21", 480 + 125, [250])],
+        )
+        (r,) = meal_responses(session)
+        assert (r.peak, r.delta, r.readings) == (100, 0, 0)
+        (r,) = meal_responses(session, window=180)
+        assert r.peak == 250
+
+    def test_reading_at_meal_time_excluded(self) -> None:
+        session = _session(
+            _meal("2026-02-21", "8:00 AM", "Pasta", 100),
+            traces=[_trace("2026-02-21", 480, [300, 120])],
+        )
+        (r,) = meal_responses(session)
+        assert r.peak == 120
+
+    def test_window_crosses_midnight(self) -> None:
+        session = _session(
+            _meal("2026-02-21", "11:30 PM", "Snack", 100),
+            traces=[_trace("2026-02-22", 30, [140])],
+        )
+        (r,) = meal_responses(session)
+        assert (r.peak, r.minutes_to_peak) == (140, 60)
+
+    def test_uses_exercise_readings(self) -> None:
+        session = _session(_meal("2026-02-21", "8:00 AM", "Pasta", 100))
+        session.exercise_entries = [ExerciseEntry(
+            date="2026-02-21", time="8:40 AM", activity_type="Walking",
+            duration_minutes=30, heart_rate_bpm=90, glucose_reading=135,
+        )]
+        (r,) = meal_responses(session)
+        assert (r.delta, r.minutes_to_peak) == (35, 40)
+
+    def test_cached_by_content(self) -> None:
+        session = _session(_meal("2026-02-21", "8:00 AM", "Pasta", 100))
+        assert meal_responses(session) is meal_responses(session)
+        session.glucose_entries.append(_meal("2026-02-21", "1:00 PM", "Salad", 90))
+        assert len(meal_responses(session)) == 2
+
+
+class TestFoodResponses:
+    def test_aggregates_case_insensitively(self) -> None:
+        session = _session(
+            _meal("2026-02-21", "8:00 AM", "Pasta", 100),
+            _meal("2026-02-22", "8:00 AM", "pasta", 100),
+            _meal("2026-02-22", "1:00 PM", "Salad", 100),
+            traces=[
+                _trace("2026-02-21", 510, [140]),
+                _trace("2026-02-22", 510, [120]),
+                _trace("2026-02-22", 810, [105]),
+            ],
+        )
+        pasta, salad = food_responses(meal_responses(session))
+        assert (pasta.food_item, pasta.meals, pasta.mean_delta, pasta.max_delta) == (
+            "Pasta", 2, 30.0, 40,
+        )
+        assert salad.mean_delta == 5.0
+
+    def test_meals_without_readings_left_out(self) -> None:
+        session = _session(_meal("2026-02-21", "8:00 AM", "Pasta", 100))
+        assert food_responses(meal_responses(session)) == []
+
+
+class TestAcrossSessions:
+    def test_overlapping_meals_count_once(self) -> None:
+        trace = _trace("2026-02-21", 510, [140])
+        first = _session(_meal("2026-02-21", "8:00 AM", "Pasta", 100), traces=[trace])
+        second = _session(
+            _meal("2026-02-21", "8:00 AM", "Pasta", 100),
+            _meal("2026-02-22", "8:00 AM", "Toast", 90),
+            traces=[trace],
+        )
+        responses = responses_across_sessions([first, second])
+        assert [r.food_item for r in responses] == ["Pasta", "Toast"]
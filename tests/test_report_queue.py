@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.cli import main
+from src.models import SCHEMA_VERSION, GlucoseEntry, MealType, ReportSession
+from src.report_queue import REPORT_CACHE_FILENAME, render_reports
+from src.tenants import SessionStore, store_for_user
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> SessionStore:
+    return store_for_user(
+        "alice", tmp_path / "sessions", tmp_path / "uploads", tmp_path / "reports"
+    )
+
+
+def _session(name: str = "February", end: str = "2026-02-19") -> ReportSession:
+    session = ReportSession.create_new(
+        name=name, date_range_start="2026-02-18", date_range_end=end,
+        selected_dates=["2026-02-18", "2026-02-19"],
+    )
+    session.glucose_entries.append(
+        GlucoseEntry(
+            date="2026-02-18", time="8:00 AM", glucose_reading=110,
+            food_item="Oatmeal", meal_type=MealType.BREAKFAST,
+        )
+    )
+    return session
+
+
+def _saved(store: SessionStore, count: int) -> list[str]:
+    ids = []
+    for i in range(count):
+        session = _session(f"S{i}")
+        store.save(session)
+        ids.append(session.id)
+    return ids
+
+
+def _run(store: SessionStore, ids: list[str], **kwargs) -> list[str]:
+    kwargs.setdefault("executor", ThreadPoolExecutor(2))
+    return [o.action for o in render_reports([(store, i) for i in ids], **kwargs)]
+
+
+class TestRenderReports:
+    def test_renders_and_records(self, store):
+        ids = _saved(store, 3)
+        outcomes = render_reports(
+            [(store, i) for i in ids], executor=ThreadPoolExecutor(2)
+        )
+        assert [o.session_id for o in outcomes] == ids
+        assert all(o.action == "rendered" and o.path.exists() for o in outcomes)
+        cache = json.loads((store.reports_dir / REPORT_CACHE_FILENAME).read_text())
+        assert set(cache) == set(ids)
+
+    def test_unchanged_sessions_are_cached(self, store):
+        ids = _saved(store, 2)
+        _run(store, ids)
+        assert _run(store, ids) == ["cached", "cached"]
+        assert _run(store, ids, force=True) == ["rendered", "rendered"]
+
+    def test_changed_session_is_rendered_again(self, store):
+        ids = _saved(store, 2)
+        _run(store, ids)
+        session = store.load(ids[0])
+        session.glucose_entries[0].food_item = "Toast"
+        store.save(session)
+        assert _run(store, ids) == ["rendered", "cached"]
+
+    def test_deleted_report_is_rendered_again(self, store):
+        (session_id,) = _saved(store, 1)
+        (outcome,) = render_reports([(store, session_id)])
+        outcome.path.unlink()
+        assert _run(store, [session_id]) == ["rendered"]
+
+    def test_stale_report_is_removed(self, store):
+        (session_id,) = _saved(store, 1)
+        (first,) = render_reports([(store, session_id)])
+        session = store.load(session_id)
+        session.date_range_start = session.date_range_start.replace(day=17)
+        store.save(session)
+        (second,) = render_reports([(store, session_id)])
+        assert second.path != first.path
+        assert second.path.exists() and not first.path.exists()
+
+    def test_missing_and_undated_sessions(self, store):
+        undated = ReportSession.create_new(
+            name="Empty", date_range_start=None, date_range_end=None, selected_dates=[]
+        )
+        store.save(undated)
+        assert _run(store, ["missing", undated.id]) == ["failed", "skipped"]
+
+    def test_unreadable_sessions_fail_only_their_report(self, store):
+        ids = _saved(store, 1)
+        (store.base_dir / "corrupt.json").write_text("{not json")
+        (store.base_dir / "invalid.json").write_text('{"id": "invalid"}')
+        newer = _session("Newer")
+        newer.schema_version = SCHEMA_VERSION + 1
+        store.save(newer)
+        outcomes = render_reports(
+            [(store, i) for i in ["corrupt", "invalid", newer.id, *ids]],
+            executor=ThreadPoolExecutor(2),
+        )
+        assert [o.action for o in outcomes] == ["failed", "failed", "failed", "rendered"]
+        assert outcomes[0].detail.startswith("JSONDecodeError")
+        assert outcomes[1].detail.startswith("ValidationError")
+        assert outcomes[2].detail.startswith("SchemaVersionError")
+
+    def test_cache_writes_leave_no_temp_files(self, store):
+        _run(store, _saved(store, 3))
+        assert list(store.reports_dir.glob("*.tmp")) == []
+
+    def test_render_errors_fail_only_that_report(self, store):
+        ids = _saved(store, 2)
+        broken = store.load(ids[1])
+        broken.date_range_end = None
+        store.save(broken)
+        outcomes = render_reports([(store, i) for i in ids], executor=ThreadPoolExecutor(2))
+        assert [o.action for o in outcomes] == ["rendered", "failed"]
+        assert "ValueError" in outcomes[1].detail
+        assert _run(store, ids) == ["cached", "failed"]
+
+    def test_progress_counts(self, store):
+        ids = _saved(store, 3)
+        _run(store, ids[:1])
+        seen = []
+        render_reports(
+            [(store, i) for i in ids], executor=ThreadPoolExecutor(2),
+            progress=lambda outcome, done, total: seen.append((done, total)),
+        )
+        assert seen == [(1, 3), (2, 3), (3, 3)]
+
+    def test_process_pool(self, store):
+        ids = _saved(store, 2)
+        assert _run(store, ids, executor=None, workers=2) == ["rendered", "rendered"]
+
+
+class TestCli:
+    def test_reports_command(self, tmp_path, monkeypatch, capsys):
+        monkeypatch.chdir(tmp_path)
+        store = store_for_user("alice")
+        ids = _saved(store, 2)
+        assert main(["reports", "--user", "alice", "--workers", "1"]) == 0
+        assert "2 report(s)" in capsys.readouterr().out
+        assert main(["reports", "--user", "alice", ids[0]]) == 0
+        out = capsys.readouterr().out
+        assert "[1/1] cached" in out
+        assert "1 cached" in out
+        assert main(["reports", "--user", "alice", "missing"]) == 1
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from src.mapped_io import map_file
+from src.models import (
+    ExerciseEntry,
+    GlucoseEntry,
+    MealType,
+    MoodEntry,
+    ReportSession,
+    SessionStatus,
+    TimeSlot,
+)
+from src.session_format import (
+    BINARY_SUFFIX,
+    LazySession,
+    SessionFormatError,
+    decode_session,
+    encode_session,
+    main,
+    migrate_json_sessions,
+    read_header,
+    write_binary_session,
+)
+from src.storage import (
+    delete_session,
+    list_sessions,
+    load_session,
+    open_session,
+    save_session,
+)
+
+
+@pytest.fixture()
+def sessions_dir(tmp_path: Path) -> Path:
+    """Provide an isolated temporary directory for session storage."""
+    return tmp_path / "sessions"
+
+
+def _make_session(name: str = "Binary Test", meals: int = 3) -> ReportSession:
+    session = ReportSession.create_new(
+        name=name,
+        date_range_start="2026-02-18",
+        date_range_end="2026-02-22",
+        selected_dates=["2026-02-18", "2026-02-22"],
+    )
+    session.status = SessionStatus.FINALIZED
+    session.source_filename = "clarity.pdf"
+    session.glucose_entries = [
+        GlucoseEntry(
+            date="2026-02-22",
+            time="9:40 AM",
+            glucose_reading=100 + i,
+            food_item=f"Egg omelette {i}",
+            meal_type=MealType.LUNCH,
+        )
+        for i in range(meals)
+    ]
+    session.exercise_entries = [
+        ExerciseEntry(
+            date="2026-02-22",
+            time="10:56 AM",
+            activity_type="Walking",
+            duration_minutes=33,
+            heart_rate_bpm=88,
+            glucose_reading=108,
+        )
+    ]
+    session.mood_entries = [
+        MoodEntry(
+            date="2026-02-22",
+            time_slot=TimeSlot.BEFORE_BED,
+            time="Not available",
+            energy="Tired",
+            mood=3,
+        )
+    ]
+    return session
+
+
+class TestEncoding:
+    def test_round_trip(self) -> None:
+        session = _make_session()
+        assert decode_session(encode_session(session)) == session
+
+    def test_empty_session_round_trip(self) -> None:
+        session = _make_session(meals=0)
+        session.exercise_entries = []
+        session.mood_entries = []
+        assert decode_session(encode_session(session)) == session
+
+    def test_smaller_than_json(self) -> None:
+        session = _make_session(meals=200)
+        assert len(encode_session(session)) * 4 < len(session.model_dump_json(indent=2))
+
+    def test_rejects_bad_magic(self) -> None:
+        with pytest.raises(SessionFormatError):
+            decode_session(b"{}" * 10)
+
+
+class TestLazySession:
+    def test_header_only(self, tmp_path: Path) -> None:
+        path = write_binary_session(_make_session(meals=5), tmp_path / f"x{BINARY_SUFFIX}")
+        lazy = LazySession(path)
+        assert lazy.name == "Binary Test"
+        assert lazy.status == "finalized"
+        assert lazy.entry_count("glucose_entries") == 5
+        assert lazy._loaded == {}
+
+    def test_header_fields_are_typed(self, tmp_path: Path) -> None:
+        session = _make_session()
+        lazy = LazySession(write_binary_session(session, tmp_path / f"x{BINARY_SUFFIX}"))
+        assert lazy.date_range_start == date(2026, 2, 18)
+        assert lazy.selected_dates == [date(2026, 2, 18), date(2026, 2, 22)]
+        assert lazy.status is SessionStatus.FINALIZED
+        for name in ReportSession.model_fields:
+            assert getattr(lazy, name) == getattr(session, name), name
+
+    def test_empty_date_range_is_none(self, tmp_path: Path) -> None:
+        session = ReportSession.create_new(
+            name="Empty", date_range_start=None, date_range_end=None, selected_dates=[]
+        )
+        lazy = LazySession(write_binary_session(session, tmp_path / f"x{BINARY_SUFFIX}"))
+        assert lazy.date_range_start is None
+        assert lazy.date_range_end is None
+
+    def test_entries_load_on_access(self, tmp_path: Path) -> None:
+        path = write_binary_session(_make_session(meals=5), tmp_path / f"x{BINARY_SUFFIX}")
+        lazy = LazySession(path)
+        assert lazy.glucose_entries[0].food_item == "Egg omelette 0"
+        assert set(lazy._loaded) == {"glucose_entries"}
+        assert lazy.glucose_entries is lazy.glucose_entries
+
+    def test_to_session(self, tmp_path: Path) -> None:
+        session = _make_session()
+        path = write_binary_session(session, tmp_path / f"x{BINARY_SUFFIX}")
+        assert LazySession(path).to_session() == session
+
+    def test_open_session_survives_resave(self, sessions_dir: Path) -> None:
+        session = _make_session(meals=50)
+        save_session(session, base_dir=sessions_dir, binary=True)
+        with open_session(session.id, base_dir=sessions_dir) as lazy:
+            resaved = session.model_copy(update={
+                "name": "Resaved", "glucose_entries": session.glucose_entries[:2],
+            })
+            save_session(resaved, base_dir=sessions_dir)
+            assert lazy.glucose_entries == session.glucose_entries
+            assert lazy.to_session() == session
+        assert open_session(session.id, base_dir=sessions_dir).to_session() == resaved
+
+    def test_unknown_attribute(self, tmp_path: Path) -> None:
+        path = write_binary_session(_make_session(), tmp_path / f"x{BINARY_SUFFIX}")
+        with pytest.raises(AttributeError):
+            LazySession(path).nonexistent
+
+    def test_read_header(self, tmp_path: Path) -> None:
+        session = _make_session()
+        path = write_binary_session(session, tmp_path / f"x{BINARY_SUFFIX}")
+        header = read_header(path)
+        assert header["id"] == session.id
+        assert "glucose_entries" not in header
+
+
+class TestStorageIntegration:
+    def test_save_binary_and_load(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        path = save_session(session, base_dir=sessions_dir, binary=True)
+        assert path.suffix == BINARY_SUFFIX
+        assert load_session(session.id, base_dir=sessions_dir) == session
+
+    def test_resave_keeps_binary_format(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        save_session(session, base_dir=sessions_dir, binary=True)
+        session.name = "Renamed"
+        path = save_session(session, base_dir=sessions_dir)
+        assert path.suffix == BINARY_SUFFIX
+        assert not (sessions_dir / f"{session.id}.json").exists()
+
+    def test_resave_keeps_mapped_file_intact(self, sessions_dir: Path) -> None:
+        session = _make_session(meals=50)
+        path = save_session(session, base_dir=sessions_dir, binary=True)
+        with map_file(path) as data:
+            resaved = session.model_copy(update={"glucose_entries": []})
+            save_session(resaved, base_dir=sessions_dir)
+            assert decode_session(data) == session
+        assert load_session(session.id, base_dir=sessions_dir) == resaved
+        assert not list(sessions_dir.glob("*.tmp"))
+
+    def test_switch_back_to_json(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        save_session(session, base_dir=sessions_dir, binary=True)
+        path = save_session(session, base_dir=sessions_dir, binary=False)
+        assert path.suffix == ".json"
+        assert not (sessions_dir / f"{session.id}{BINARY_SUFFIX}").exists()
+
+    def test_list_includes_both_formats(self, sessions_dir: Path) -> None:
+        save_session(_make_session("JSON"), base_dir=sessions_dir)
+        save_session(_make_session("Binary"), base_dir=sessions_dir, binary=True)
+        names = {s["name"] for s in list_sessions(base_dir=sessions_dir)}
+        assert names == {"JSON", "Binary"}
+
+    def test_open_session_is_lazy_for_binary(self, sessions_dir: Path) -> None:
+        binary = _make_session()
+        plain = _make_session()
+        save_session(binary, base_dir=sessions_dir, binary=True)
+        save_session(plain, base_dir=sessions_dir)
+        assert isinstance(open_session(binary.id, base_dir=sessions_dir), LazySession)
+        assert isinstance(open_session(plain.id, base_dir=sessions_dir), ReportSession)
+
+    def test_open_missing_raises(self, sessions_dir: Path) -> None:
+        sessions_dir.mkdir(parents=True)
+        with pytest.raises(FileNotFoundError):
+            open_session("nonexistent-id", base_dir=sessions_dir)
+
+    def test_delete_binary(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        save_session(session, base_dir=sessions_dir, binary=True)
+        assert delete_session(session.id, base_dir=sessions_dir) is True
+        with pytest.raises(FileNotFoundError):
+            load_session(session.id, base_dir=sessions_dir)
+
+
+class TestMigration:
+    def test_migrates_json_files(self, sessions_dir: Path) -> None:
+        sessions = [_make_session(f"S{i}") for i in range(3)]
+        for s in sessions:
+            save_session(s, base_dir=sessions_dir)
+        assert migrate_json_sessions(sessions_dir) == 3
+        assert list(sessions_dir.glob("*.json")) == []
+        for s in sessions:
+            assert load_session(s.id, base_dir=sessions_dir) == s
+
+    def test_skips_invalid_json(self, sessions_dir: Path) -> None:
+        sessions_dir.mkdir(parents=True)
+        (sessions_dir / "broken.json").write_text("{not json")
+        assert migrate_json_sessions(sessions_dir) == 0
+        assert (sessions_dir / "broken.json").exists()
+
+    def test_cli(self, sessions_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        assert main([str(sessions_dir)]) == 0
+        assert "Migrated 1 session(s)" in capsys.readouterr().out
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+from datetime import date
+
+from src.models import (
+    CgmTrace,
+    ExerciseEntry,
+    GlucoseEntry,
+    MealType,
+    NoteEntry,
+    ReportSession,
+)
+from src.pdf_parser import ParseResult
+from src.pipeline import default_meal_type, session_from_parse
+from src.session_merge import merge_parse_result
+
+DATES = ["2026-02-21", "2026-02-22"]
+
+
+def _meal(date: str, time: str, food: str, reading: int = 100) -> GlucoseEntry:
+    return GlucoseEntry(
+        date=date, time=time, glucose_reading=reading,
+        food_item=food, meal_type=MealType.BREAKFAST,
+    )
+
+
+def _walk(date: str, time: str, minutes: int) -> ExerciseEntry:
+    return ExerciseEntry(
+        date=date, time=time, activity_type="Walking",
+        duration_minutes=minutes, heart_rate_bpm=90, glucose_reading=110,
+    )
+
+
+def _parse(*meals: GlucoseEntry, exercise: list[ExerciseEntry] | None = None) -> ParseResult:
+    return ParseResult(glucose_entries=list(meals), exercise_entries=exercise or [])
+
+
+def _stored_session() -> ReportSession:
+    session = ReportSession.create_new(
+        name="Week", date_range_start=DATES[0], date_range_end=DATES[-1],
+        selected_dates=DATES,
+    )
+    session.glucose_entries = [
+        _meal("2026-02-21", "9:16 AM", "Granola"),
+        _meal("2026-02-21", "3:00 PM", "Burger").corrected(meal_type=MealType.LUNCH),
+        _meal("2026-02-22", "9:40 AM", "Egg omelette"),
+    ]
+    session.exercise_entries = [_walk("2026-02-22", "10:56 AM", 30)]
+    return session
+
+
+def _new_export() -> ParseResult:
+    return _parse(
+        _meal("2026-02-21", "9:16 AM", "Granola"),
+        _meal("2026-02-21", "3:00 PM", "Burger"),
+        _meal("2026-02-22", "9:40 AM", "Egg omelette"),
+        _meal("2026-02-22", "2:54 PM", "Tuna salad"),
+        exercise=[_walk("2026-02-22", "10:56 AM", 33)],
+    )
+
+
+class TestMergeParseResult:
+    def test_keeps_meal_type_corrections(self) -> None:
+        merged, _ = merge_parse_result(_stored_session(), _new_export(), DATES)
+        burger = next(e for e in merged.glucose_entries if e.food_item == "Burger")
+        assert burger.meal_type == MealType.LUNCH
+
+    def test_adds_new_entries(self) -> None:
+        merged, diff = merge_parse_result(_stored_session(), _new_export(), DATES)
+        assert [e.food_item for e in merged.glucose_entries] == [
+            "Granola", "Burger", "Egg omelette", "Tuna salad",
+        ]
+        assert diff.added == 1
+        assert [e.food_item for e in diff.fields["glucose_entries"].added] == ["Tuna salad"]
+
+    def test_applies_parsed_changes(self) -> None:
+        merged, diff = merge_parse_result(_stored_session(), _new_export(), DATES)
+        assert merged.exercise_entries[0].duration_minutes == 33
+        assert diff.changed == 1
+        old, new = diff.fields["exercise_entries"].changed[0]
+        assert (old.duration_minutes, new.duration_minutes) == (30, 33)
+
+    def test_unchanged_entries_are_identical_objects(self) -> None:
+        stored = _stored_session()
+        merged, diff = merge_parse_result(stored, _new_export(), DATES)
+        assert merged.glucose_entries[0] is stored.glucose_entries[0]
+        assert diff.unchanged == 3
+
+    def test_corrected_food_name_matches_by_time(self) -> None:
+        stored = _stored_session()
+        stored.glucose_entries[2] = stored.glucose_entries[2].corrected(
+            food_item="Egg omelette with salad", glucose_reading=120
+        )
+        merged, diff = merge_parse_result(stored, _new_export(), DATES)
+        assert len(merged.glucose_entries) == 4
+        assert merged.glucose_entries[2].food_item == "Egg omelette with salad"
+        assert merged.glucose_entries[2].glucose_reading == 120
+        assert diff.added == 1
+
+    def test_parser_changes_reach_uncorrected_fields(self) -> None:
+        export = _new_export()
+        export.glucose_entries[1] = _meal("2026-02-21", "3:00 PM", "Burger", reading=140)
+        export.glucose_entries[2] = _meal("2026-02-22", "9:40 AM", "Egg omelet", reading=95)
+        merged, diff = merge_parse_result(_stored_session(), export, DATES)
+        burger, omelet = merged.glucose_entries[1], merged.glucose_entries[2]
+        # The corrected meal type stays; the reading the user never touched updates
+        assert (burger.meal_type, burger.glucose_reading) == (MealType.LUNCH, 140)
+        assert burger.edited_fields == ["meal_type"]
+        # An untouched food name takes the parser's new spelling
+        assert (omelet.food_item, omelet.glucose_reading) == ("Egg omelet", 95)
+        assert diff.changed == 3 and diff.added == 1
+
+    def test_repeat_upload_is_a_no_op(self) -> None:
+        once, _ = merge_parse_result(_stored_session(), _new_export(), DATES)
+        twice, diff = merge_parse_result(once, _new_export(), DATES)
+        assert diff.is_empty
+        assert twice.glucose_entries == once.glucose_entries
+        assert twice.exercise_entries == once.exercise_entries
+
+    def test_missing_entries_are_kept(self) -> None:
+        export = _parse(_meal("2026-02-22", "9:40 AM", "Egg omelette"))
+        merged, diff = merge_parse_result(_stored_session(), export, DATES)
+        assert len(merged.glucose_entries) == 3
+        assert diff.missing == 3  # two meals and the walk
+
+    def test_missing_entries_keep_their_place(self) -> None:
+        export = _parse(
+            _meal("2026-02-21", "9:16 AM", "Granola"),
+            _meal("2026-02-22", "9:40 AM", "Egg omelette"),
+            _meal("2026-02-22", "2:54 PM", "Tuna salad"),
+        )
+        merged, _ = merge_parse_result(_stored_session(), export, DATES)
+        assert [e.food_item for e in merged.glucose_entries] == [
+            "Granola", "Burger", "Egg omelette", "Tuna salad",
+        ]
+
+    def test_keeps_entries_on_unselected_dates(self) -> None:
+        stored = _stored_session()
+        merged, diff = merge_parse_result(stored, _new_export(), ["2026-02-22"])
+        assert [e.food_item for e in merged.glucose_entries] == [
+            "Granola", "Burger", "Egg omelette", "Tuna salad",
+        ]
+        assert merged.glucose_entries[1] is stored.glucose_entries[1]
+        assert diff.missing == 2
+        assert diff.added == 1
+        assert merged.selected_dates == [date(2026, 2, 21), date(2026, 2, 22)]
+        assert merged.date_range_start == date(2026, 2, 21)
+        assert merged.date_range_end == date(2026, 2, 22)
+
+    def test_new_meals_get_default_meal_types(self) -> None:
+        merged, _ = merge_parse_result(_stored_session(), _new_export(), DATES)
+        by_food = {e.food_item: e.meal_type for e in merged.glucose_entries}
+        # The stored lunch correction stays; the new meal is typed by time of day
+        assert by_food["Burger"] == MealType.LUNCH
+        assert by_food["Tuna salad"] == default_meal_type("2:54 PM")
+        assert by_food["Tuna salad"] != MealType.BREAKFAST
+
+    def test_merge_into_empty_session_matches_new_session(self) -> None:
+        empty = ReportSession.create_new(
+            name="Empty", date_range_start=None, date_range_end=None, selected_dates=[]
+        )
+        merged, _ = merge_parse_result(empty, _new_export(), DATES)
+        fresh = session_from_parse(_new_export(), "Fresh", "week.pdf", DATES)
+        assert merged.glucose_entries == fresh.glucose_entries
+
+    def test_duplicate_keys_match_one_to_one(self) -> None:
+        stored = _stored_session()
+        stored.glucose_entries.append(_meal("2026-02-22", "9:40 AM", "Egg omelette"))
+        export = _parse(
+            _meal("2026-02-22", "9:40 AM", "Egg omelette"),
+            _meal("2026-02-22", "9:40 AM", "Egg omelette"),
+        )
+        merged, diff = merge_parse_result(stored, export, ["2026-02-22"])
+        assert [e.date for e in merged.glucose_entries].count(date(2026, 2, 22)) == 2
+        assert diff.added == 0
+
+    def test_notes_keyed_by_text(self) -> None:
+        stored = _stored_session()
+        stored.note_entries = [NoteEntry(date="2026-02-22", time="9:00 PM", text="Tired")]
+        export = ParseResult(note_entries=[
+            NoteEntry(date="2026-02-22", time="9:00 PM", text="Tired"),
+            NoteEntry(date="2026-02-22", time="9:00 PM", text="Headache"),
+        ])
+        merged, diff = merge_parse_result(stored, export, DATES)
+        assert [n.text for n in merged.note_entries] == ["Tired", "Headache"]
+        assert len(diff.fields["note_entries"].added) == 1
+
+    def test_does_not_mutate_input(self) -> None:
+        stored = _stored_session()
+        merge_parse_result(stored, _new_export(), DATES)
+        assert len(stored.glucose_entries) == 3
+        assert stored.exercise_entries[0].duration_minutes == 30
+
+    def test_replaces_traces_per_day(self) -> None:
+        stored = _stored_session()
+        stored.cgm_traces = [
+            CgmTrace.from_points("2026-02-21", [0], [100]),
+            CgmTrace.from_points("2026-02-22", [0], [100]),
+        ]
+        result = _new_export()
+        result.cgm_traces = [CgmTrace.from_points("2026-02-22", [0, 5], [110, 115])]
+        merged, _ = merge_parse_result(stored, result, DATES)
+        assert [t.date for t in merged.cgm_traces] == [date(2026, 2, 21), date(2026, 2, 22)]
+        assert merged.cgm_traces[0] is stored.cgm_traces[0]
+        assert merged.cgm_traces[1] == result.cgm_traces[0]
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import pytest
+
+from src.models import GlucoseEntry, MealType
+from src.pdf_parser import ParseResult
+from src.state_cache import ParseCache, budget_from_env, estimate_size
+
+
+def _result(rows: int) -> ParseResult:
+    return ParseResult(glucose_entries=[
+        GlucoseEntry(
+            date="2026-02-21", time="8:00 AM", glucose_reading=100,
+            food_item=f"Food {i}", meal_type=MealType.BREAKFAST,
+        )
+        for i in range(rows)
+    ])
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> _Clock:
+    return _Clock()
+
+
+def _cache(clock: _Clock, rows: int, share: float = 1.0, idle: float = 60) -> ParseCache:
+    """A cache whose budget holds `rows` one-row parses."""
+    return ParseCache(
+        budget_bytes=rows * estimate_size(_result(1)),
+        user_share=share, idle_seconds=idle, clock=clock,
+    )
+
+
+class TestParseCache:
+    def test_get_returns_put_result(self, clock):
+        cache = _cache(clock, 4)
+        result = _result(1)
+        handle = cache.put(ParseCache.handle("alice", "abc"), "alice", result)
+        assert cache.get(handle) is result
+        assert cache.get(ParseCache.handle("bob", "abc")) is None
+
+    def test_evicts_least_recently_used_over_budget(self, clock):
+        cache = _cache(clock, 2)
+        cache.put("a", "alice", _result(1))
+        cache.put("b", "alice", _result(1))
+        cache.get("a")
+        cache.put("c", "alice", _result(1))
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.footprint().evictions == 1
+
+    def test_user_share_protects_other_users(self, clock):
+        cache = _cache(clock, 4, share=0.5)
+        cache.put("bob", "bob", _result(1))
+        for name in ("a1", "a2", "a3"):
+            cache.put(name, "alice", _result(1))
+        assert cache.get("bob") is not None
+        assert cache.get("a1") is None
+        assert cache.footprint().by_user["alice"] == 2 * estimate_size(_result(1))
+
+    def test_idle_entries_expire(self, clock):
+        cache = _cache(clock, 4, idle=60)
+        cache.put("old", "alice", _result(1))
+        clock.now = 30
+        cache.put("new", "alice", _result(1))
+        clock.now = 70
+        assert cache.get("old") is None
+        assert cache.get("new") is not None
+
+    def test_oversized_parse_is_kept_alone(self, clock):
+        cache = _cache(clock, 2, share=0.5)
+        cache.put("bob", "bob", _result(1))
+        cache.put("small", "alice", _result(1))
+        result = _result(3)
+        cache.put("big", "alice", result)
+        # The newest parse stays so the page does not re-parse on every rerun
+        assert cache.get("big") is result
+        assert cache.get("small") is None
+        assert cache.get("bob") is None
+        assert cache.footprint().entries == 1
+        # It is evicted like any other entry once something newer arrives
+        cache.put("next", "alice", _result(1))
+        assert cache.get("big") is None
+
+    def test_footprint_tracks_replace_and_discard(self, clock):
+        cache = _cache(clock, 10)
+        cache.put("a", "alice", _result(1))
+        cache.put("a", "alice", _result(2))
+        assert cache.footprint().bytes == estimate_size(_result(2))
+        cache.discard("a")
+        footprint = cache.footprint()
+        assert (footprint.entries, footprint.bytes, footprint.by_user) == (0, 0, {})
+        assert "0 parse(s)" in footprint.summary()
+
+
+class TestEstimateSize:
+    def test_grows_with_rows(self):
+        assert estimate_size(_result(10)) > estimate_size(_result(1)) > 0
+
+    def test_budget_from_env(self, monkeypatch):
+        monkeypatch.setenv("HEALTHCARE_STATE_BUDGET_MB", "1.5")
+        assert budget_from_env() == 1536 * 1024
+        monkeypatch.delenv("HEALTHCARE_STATE_BUDGET_MB")
+        assert budget_from_env() == 256 * 1024 * 1024
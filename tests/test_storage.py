@@ -4,6 +4,7 @@ from pathlib import Path
 
 import pytest
 
+from src import storage
 from src.models import (
     GlucoseEntry,
     MealType,
@@ -11,7 +12,13 @@ from src.models import (
     ReportSession,
     TimeSlot,
 )
-from src.storage import delete_session, list_sessions, load_session, save_session
+from src.storage import (
+    SUMMARY_INDEX_FILENAME,
+    delete_session,
+    list_sessions,
+    load_session,
+    save_session,
+)
 
 
 @pytest.fixture()
@@ -42,6 +49,22 @@ class TestSaveSession:
         loaded = ReportSession.model_validate_json(path.read_text())
         assert loaded.id == session.id
 
+    def test_resave_replaces_file_atomically(
+        self, sessions_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        session = _make_session()
+        path = save_session(session, base_dir=sessions_dir)
+        before = path.read_bytes()
+
+        def fail(*args: object) -> None:
+            raise OSError("disk full")
+
+        # A write that fails before the rename leaves the stored file whole
+        monkeypatch.setattr("src.mapped_io.os.replace", fail)
+        with pytest.raises(OSError):
+            save_session(session.model_copy(update={"name": "Renamed"}), base_dir=sessions_dir)
+        assert path.read_bytes() == before
+
 
 class TestLoadSession:
     def test_returns_correct_data(self, sessions_dir: Path) -> None:
@@ -134,3 +157,52 @@ class TestRoundTrip:
         assert loaded.glucose_entries[0].food_item == "Egg omelette"
         assert len(loaded.mood_entries) == 1
         assert loaded.mood_entries[0].energy == "Tired"
+
+
+class TestSummaryIndex:
+    def test_writes_index(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        list_sessions(base_dir=sessions_dir)
+        assert (sessions_dir / SUMMARY_INDEX_FILENAME).exists()
+
+    def test_index_is_not_listed(self, sessions_dir: Path) -> None:
+        save_session(_make_session(), base_dir=sessions_dir)
+        list_sessions(base_dir=sessions_dir)
+        assert len(list_sessions(base_dir=sessions_dir)) == 1
+
+    def test_rereads_only_changed_files(
+        self, sessions_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        first = _make_session("First")
+        save_session(first, base_dir=sessions_dir)
+        save_session(_make_session("Second"), base_dir=sessions_dir)
+        list_sessions(base_dir=sessions_dir)
+
+        reads: list[Path] = []
+        original = storage._read_summary
+
+        def counting(path: Path) -> dict[str, str] | None:
+            reads.append(path)
+            return original(path)
+
+        monkeypatch.setattr(storage, "_read_summary", counting)
+        list_sessions(base_dir=sessions_dir)
+        assert reads == []
+
+        first.name = "Renamed"
+        save_session(first, base_dir=sessions_dir)
+        names = {s["name"] for s in list_sessions(base_dir=sessions_dir)}
+        assert [p.stem for p in reads] == [first.id]
+        assert names == {"Renamed", "Second"}
+
+    def test_deleted_session_drops_out(self, sessions_dir: Path) -> None:
+        session = _make_session()
+        save_session(session, base_dir=sessions_dir)
+        list_sessions(base_dir=sessions_dir)
+        delete_session(session.id, base_dir=sessions_dir)
+        assert list_sessions(base_dir=sessions_dir) == []
+
+    def test_corrupt_index_is_rebuilt(self, sessions_dir: Path) -> None:
+        save_session(_make_session("Kept"), base_dir=sessions_dir)
+        sessions_dir.joinpath(SUMMARY_INDEX_FILENAME).write_text("{not json")
+        assert [s["name"] for s in list_sessions(base_dir=sessions_dir)] == ["Kept"]
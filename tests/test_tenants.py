@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.models import GlucoseEntry, MealType, ReportSession
+from src.tenants import (
+    DEFAULT_USER_ID,
+    TENANTS_DIRNAME,
+    SessionStore,
+    store_for_user,
+    tenant_dir,
+    user_id_from_env,
+)
+
+
+@pytest.fixture()
+def root(tmp_path: Path) -> Path:
+    """Provide an isolated temporary root for all tenants' data."""
+    return tmp_path
+
+
+def _store(root: Path, user_id: str) -> SessionStore:
+    return store_for_user(
+        user_id,
+        root=root / "sessions",
+        uploads_root=root / "uploads",
+        reports_root=root / "reports",
+    )
+
+
+def _make_session(name: str, food: str) -> ReportSession:
+    session = ReportSession.create_new(
+        name=name,
+        date_range_start="2026-02-18",
+        date_range_end="2026-02-18",
+        selected_dates=["2026-02-18"],
+    )
+    session.glucose_entries.append(GlucoseEntry(
+        date="2026-02-18", time="8:00 AM", glucose_reading=110,
+        food_item=food, meal_type=MealType.BREAKFAST,
+    ))
+    return session
+
+
+class TestTenantDir:
+    def test_default_user_uses_root(self, root: Path) -> None:
+        assert tenant_dir(DEFAULT_USER_ID, root) == root
+
+    def test_other_users_are_sharded(self, root: Path) -> None:
+        path = tenant_dir("alice@example.com", root)
+        assert path.parent.parent == root / TENANTS_DIRNAME
+        assert len(path.parent.name) == 2
+        assert path.name.startswith(path.parent.name)
+
+    def test_id_never_reaches_path(self, root: Path) -> None:
+        path = tenant_dir("../../etc", root)
+        assert ".." not in path.relative_to(root).parts
+
+    def test_stable_and_distinct(self, root: Path) -> None:
+        assert tenant_dir("alice", root) == tenant_dir("alice", root)
+        assert tenant_dir("alice", root) != tenant_dir("bob", root)
+
+
+class TestSessionStore:
+    def test_list_is_per_user(self, root: Path) -> None:
+        alice, bob = _store(root, "alice"), _store(root, "bob")
+        alice.save(_make_session("Alice", "Oatmeal"))
+        assert [s["name"] for s in alice.list()] == ["Alice"]
+        assert bob.list() == []
+
+    def test_load_is_per_user(self, root: Path) -> None:
+        alice, bob = _store(root, "alice"), _store(root, "bob")
+        session = _make_session("Alice", "Oatmeal")
+        alice.save(session)
+        assert alice.load(session.id).name == "Alice"
+        with pytest.raises(FileNotFoundError):
+            bob.load(session.id)
+
+    def test_search_is_per_user(self, root: Path) -> None:
+        alice, bob = _store(root, "alice"), _store(root, "bob")
+        alice.save(_make_session("Alice", "Oatmeal"))
+        bob.save(_make_session("Bob", "Pancakes"))
+        assert [h.record.food_item for h in alice.search_foods("oat")] == ["Oatmeal"]
+        assert bob.search_foods("oat") == []
+
+    def test_delete_is_per_user(self, root: Path) -> None:
+        alice, bob = _store(root, "alice"), _store(root, "bob")
+        session = _make_session("Alice", "Oatmeal")
+        alice.save(session)
+        assert not bob.delete(session.id)
+        assert alice.delete(session.id)
+
+    def test_uploads_and_reports_are_partitioned(self, root: Path) -> None:
+        alice, bob = _store(root, "alice"), _store(root, "bob")
+        assert alice.uploads_dir != bob.uploads_dir
+        assert alice.reports_dir != bob.reports_dir
+        assert alice.uploads_dir.is_relative_to(root / "uploads")
+        assert alice.reports_dir.is_relative_to(root / "reports")
+
+
+class TestUserIdFromEnv:
+    def test_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("HEALTHCARE_USER_ID", raising=False)
+        assert user_id_from_env() == DEFAULT_USER_ID
+
+    def test_reads_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("HEALTHCARE_USER_ID", " alice ")
+        assert user_id_from_env() == "alice"
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import copy
+import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src import watcher as watcher_module
+from src.models import SessionStatus
+from src.pdf_parser import ParseResult, parse_pdf
+from src.tenants import SessionStore, store_for_user
+from src.watcher import INGESTED_FILENAME, FolderWatcher
+
+SAMPLE_PDF = Path("docs/samples/clarity_2026-02-18_to_2026-02-22.pdf")
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def sample_result() -> ParseResult:
+    return parse_pdf(SAMPLE_PDF)
+
+
+@pytest.fixture(autouse=True)
+def parse_sample_once(monkeypatch: pytest.MonkeyPatch, sample_result: ParseResult) -> None:
+    """Copies of the sample (possibly with bytes appended) reuse one parse."""
+    sample = SAMPLE_PDF.read_bytes()
+
+    def parse(path: Path) -> ParseResult:
+        if path.read_bytes().startswith(sample):
+            return copy.deepcopy(sample_result)
+        return parse_pdf(path)
+
+    monkeypatch.setattr(watcher_module, "_parse", parse)
+
+
+@pytest.fixture()
+def store(tmp_path: Path) -> SessionStore:
+    return store_for_user(
+        "alice", tmp_path / "sessions", tmp_path / "uploads", tmp_path / "reports"
+    )
+
+
+@pytest.fixture()
+def inbox(tmp_path: Path) -> Path:
+    directory = tmp_path / "inbox"
+    directory.mkdir()
+    return directory
+
+
+@pytest.fixture()
+def clock() -> _Clock:
+    return _Clock()
+
+
+@pytest.fixture()
+def watcher(inbox: Path, store: SessionStore, clock: _Clock):
+    watcher = FolderWatcher(
+        inbox, store, settle_seconds=5, executor=ThreadPoolExecutor(1), clock=clock
+    )
+    yield watcher
+    watcher.close()
+
+
+def _settle(watcher: FolderWatcher, clock: _Clock) -> list:
+    """Poll, let the settle time pass, poll again and wait for parses."""
+    first = watcher.poll()
+    clock.now += 10
+    return first + watcher.poll(wait_for_parses=True)
+
+
+class TestReadyFiles:
+    def test_waits_for_settle_time(self, watcher, inbox, clock):
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        assert watcher.ready_files() == []
+        clock.now += 2
+        assert watcher.ready_files() == []
+        clock.now += 5
+        assert watcher.ready_files() == [inbox / "week.pdf"]
+        # Handled files are not offered again
+        clock.now += 10
+        assert watcher.ready_files() == []
+
+    def test_growing_file_restarts_the_wait(self, watcher, inbox, clock):
+        data = SAMPLE_PDF.read_bytes()
+        path = inbox / "week.pdf"
+        path.write_bytes(data[: len(data) // 2])
+        watcher.ready_files()
+        clock.now += 10
+        # Half a PDF has no %%EOF yet
+        assert watcher.ready_files() == []
+        path.write_bytes(data)
+        assert watcher.ready_files() == []
+        clock.now += 10
+        assert watcher.ready_files() == [path]
+
+    def test_ignores_other_files(self, watcher, inbox, clock):
+        (inbox / "notes.txt").write_text("hello")
+        watcher.ready_files()
+        clock.now += 10
+        assert watcher.ready_files() == []
+
+
+class TestIngest:
+    def test_creates_draft_session(self, watcher, inbox, store, clock):
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        (outcome,) = _settle(watcher, clock)
+        assert outcome.action == "created"
+        session = store.load(outcome.session_id)
+        assert session.status == SessionStatus.DRAFT
+        assert session.source_filename == "week.pdf"
+        assert session.glucose_entries
+        assert (store.uploads_dir / "week.pdf").exists()
+        ingested = json.loads((store.uploads_dir / INGESTED_FILENAME).read_text())
+        assert [r["session_id"] for r in ingested.values()] == [session.id]
+
+    def test_same_content_is_ingested_once(self, watcher, inbox, store, clock):
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        _settle(watcher, clock)
+        shutil.copy(SAMPLE_PDF, inbox / "copy.pdf")
+        (outcome,) = _settle(watcher, clock)
+        assert outcome.action == "duplicate"
+        assert len(store.list()) == 1
+
+    def test_dedup_survives_restart(self, inbox, store, clock):
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        for expected in ("created", "duplicate"):
+            watcher = FolderWatcher(
+                inbox, store, settle_seconds=5, executor=ThreadPoolExecutor(1), clock=clock
+            )
+            (outcome,) = _settle(watcher, clock)
+            watcher.close()
+            assert outcome.action == expected
+
+    def test_overlapping_export_merges_into_draft(self, watcher, inbox, store, clock):
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        (created,) = _settle(watcher, clock)
+        session = store.load(created.session_id)
+        session.glucose_entries[0] = session.glucose_entries[0].corrected(food_item="Corrected")
+        store.save(session)
+
+        # A re-export of the same days with one more byte of content
+        (inbox / "week.pdf").write_bytes(SAMPLE_PDF.read_bytes() + b"\n")
+        (merged,) = _settle(watcher, clock)
+        assert merged.action == "merged"
+        assert merged.session_id == created.session_id
+        assert len(store.list()) == 1
+        assert store.load(created.session_id).glucose_entries[0].food_item == "Corrected"
+
+    def test_finalized_sessions_are_not_merged(self, watcher, inbox, store, clock):
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        (created,) = _settle(watcher, clock)
+        session = store.load(created.session_id)
+        session.status = SessionStatus.FINALIZED
+        store.save(session)
+
+        (inbox / "again.pdf").write_bytes(SAMPLE_PDF.read_bytes() + b"\n")
+        (outcome,) = _settle(watcher, clock)
+        assert outcome.action == "created"
+        assert outcome.session_id != created.session_id
+
+    def test_unparseable_pdf_fails_once(self, watcher, inbox, store, clock):
+        (inbox / "broken.pdf").write_bytes(b"%PDF-1.4\nnot really a pdf\n%%EOF\n")
+        (outcome,) = _settle(watcher, clock)
+        assert outcome.action == "failed"
+        assert store.list() == []
+        # Failures are not recorded as ingested, and wait out the retry delay
+        assert not (store.uploads_dir / INGESTED_FILENAME).exists()
+        assert _settle(watcher, clock) == []
+
+    def test_failed_file_is_retried_with_backoff(
+        self, watcher, inbox, store, clock, monkeypatch, sample_result
+    ):
+        attempts = []
+
+        def flaky(path: Path) -> ParseResult:
+            attempts.append(path)
+            if len(attempts) < 3:
+                raise OSError("upload directory is locked")
+            return copy.deepcopy(sample_result)
+
+        monkeypatch.setattr(watcher_module, "_parse", flaky)
+        shutil.copy(SAMPLE_PDF, inbox / "week.pdf")
+        (first,) = _settle(watcher, clock)
+        assert first.action == "failed"
+
+        clock.now += watcher.retry_seconds
+        (second,) = _settle(watcher, clock)
+        assert second.action == "failed"
+        # The second failure doubles the delay
+        clock.now += watcher.retry_seconds
+        assert _settle(watcher, clock) == []
+        clock.now += watcher.retry_seconds
+        (third,) = _settle(watcher, clock)
+        assert third.action == "created"
+        assert len(attempts) == 3
+        assert watcher.poll() == []